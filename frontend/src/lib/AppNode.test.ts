@@ -876,6 +876,35 @@ describe("AppRoot.applyDelta", () => {
     expect(newRoot.sidebar.scriptRunId).toBe(NO_SCRIPT_RUN_ID)
   })
 
+  it("handles 'unchangedElement' deltas", () => {
+    const delta = makeProto(DeltaProto, { unchangedElement: true })
+    const newRoot = ROOT.applyDelta(
+      "new_session_id",
+      delta,
+      forwardMsgMetadata([0, 1, 0])
+    )
+
+    // The existing element is kept.
+    const newNode = newRoot.main.getIn([1, 0]) as ElementNode
+    const oldNode = ROOT.main.getIn([1, 0]) as ElementNode
+    expect(newNode).toBeTextNode("2")
+    expect(newNode.element).toBe(oldNode.element)
+
+    // Check that our new scriptRunId has been set only on the touched nodes
+    expect(newRoot.main.scriptRunId).toBe("new_session_id")
+    expect(newRoot.main.getIn([0])?.scriptRunId).toBe(NO_SCRIPT_RUN_ID)
+    expect(newRoot.main.getIn([1])?.scriptRunId).toBe("new_session_id")
+    expect(newRoot.main.getIn([1, 0])?.scriptRunId).toBe("new_session_id")
+    expect(newRoot.sidebar.scriptRunId).toBe(NO_SCRIPT_RUN_ID)
+  })
+
+  it("throws on 'unchangedElement' deltas without an element", () => {
+    const delta = makeProto(DeltaProto, { unchangedElement: true })
+    expect(() =>
+      ROOT.applyDelta("new_session_id", delta, forwardMsgMetadata([0, 1]))
+    ).toThrow("Can't keep element: invalid deltaPath: 0,1")
+  })
+
   const addRowsTypes = ["dataFrame", "table", "vegaLiteChart"]
   it.each(addRowsTypes)("handles 'addRows' for %s", elementType => {
     // Create an app with a dataframe node
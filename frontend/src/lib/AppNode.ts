@@ -236,6 +236,18 @@ export class ElementNode implements AppNode {
     return elements
   }
 
+  /**
+   * Return a copy of this node that belongs to the given script run. The
+   * copy shares this node's element, and its lazily-created versions of it.
+   */
+  public withScriptRunId(scriptRunId: string): ElementNode {
+    const newNode = new ElementNode(this.element, this.metadata, scriptRunId)
+    newNode.lazyImmutableElement = this.lazyImmutableElement
+    newNode.lazyQuiverElement = this.lazyQuiverElement
+    newNode.lazyVegaLiteChartElement = this.lazyVegaLiteChartElement
+    return newNode
+  }
+
   public addRows(
     namedDataSet: NamedDataSet,
     scriptRunId: string
@@ -571,6 +583,11 @@ export class AppRoot {
         }
       }
 
+      case "unchangedElement": {
+        this.metricsMgr.incrementDeltaCounter("unchanged element")
+        return this.keepElement(deltaPath, scriptRunId)
+      }
+
       default: {
         throw new Error(`Unrecognized deltaType: '${delta.type}'`)
       }
@@ -634,6 +651,24 @@ export class AppRoot {
     )
   }
 
+  private keepElement(deltaPath: number[], scriptRunId: string): AppRoot {
+    // The server sends an unchanged element in place of an element that's
+    // identical to the one we already have at its deltaPath.
+    const existingNode = this.root.getIn(deltaPath)
+    if (!(existingNode instanceof ElementNode)) {
+      throw new Error(`Can't keep element: invalid deltaPath: ${deltaPath}`)
+    }
+
+    return new AppRoot(
+      this.metricsMgr,
+      this.root.setIn(
+        deltaPath,
+        existingNode.withScriptRunId(scriptRunId),
+        scriptRunId
+      )
+    )
+  }
+
   private addRows(
     deltaPath: number[],
     namedDataSet: NamedDataSet,
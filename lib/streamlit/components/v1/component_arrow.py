@@ -289,12 +289,7 @@ def _dataframe_to_pybytes(df):
         A dataframe to convert.
 
     """
-    table = pa.Table.from_pandas(df)
-    sink = pa.BufferOutputStream()
-    writer = pa.RecordBatchStreamWriter(sink, table.schema)
-    writer.write_table(table)
-    writer.close()
-    return sink.getvalue().to_pybytes()
+    return type_util.data_frame_to_bytes(df)
 
 
 def _marshall_index(proto, index):
@@ -37,8 +37,9 @@ _section_descriptions: Dict[str, str] = OrderedDict(
     _test="Special test section just used for unit tests."
 )
 
-# Ensures that we don't try to get or set config options when config.toml files
-# change so are re-parsed.
+# Ensures that we don't try to set config options when config.toml files
+# change so are re-parsed. Reading options doesn't need the lock: see
+# _config_options below.
 _config_lock = threading.RLock()
 
 # Stores config options with their default values (or None if they don't have
@@ -49,6 +50,12 @@ _config_lock = threading.RLock()
 _config_options_template: Dict[str, ConfigOption] = OrderedDict()
 
 # Stores the current state of config options.
+#
+# When config files are re-parsed, a new dict is built and then swapped in, so
+# that readers (get_option is called on hot paths, e.g. for every message sent
+# to the browser) can use this without taking _config_lock, and never see a
+# partially parsed config. Its keys don't change once it's swapped in, and
+# set_option replaces an option's value in a single assignment.
 _config_options: Optional[Dict[str, ConfigOption]] = None
 
 
@@ -136,12 +143,12 @@ def get_option(key: str) -> Any:
         The config option key of the form "section.optionName". To see all
         available options, run `streamlit config show` on a terminal.
     """
-    with _config_lock:
-        config_options = get_config_options()
+    config_options = get_config_options()
 
-        if key not in config_options:
-            raise RuntimeError('Config key "%s" not defined.' % key)
-        return config_options[key].value
+    option = config_options.get(key)
+    if option is None:
+        raise RuntimeError('Config key "%s" not defined.' % key)
+    return option.value
 
 
 def get_options_for_section(section: str) -> Dict[str, Any]:
@@ -160,14 +167,13 @@ def get_options_for_section(section: str) -> Dict[str, Any]:
         A dict mapping the names of the options in the given section (without
         the section name as a prefix) to their values.
     """
-    with _config_lock:
-        config_options = get_config_options()
+    config_options = get_config_options()
 
-        options_for_section = {}
-        for option in config_options.values():
-            if option.section == section:
-                options_for_section[option.name] = option.value
-        return options_for_section
+    options_for_section = {}
+    for option in config_options.values():
+        if option.section == section:
+            options_for_section[option.name] = option.value
+    return options_for_section
 
 
 def _create_section(section: str, description: str) -> None:
@@ -353,6 +359,55 @@ _create_option(
     type_=int,
 )
 
+_create_option(
+    "global.maxMessageCacheSize",
+    description="""Max total size, in bytes, of the ForwardMsgs kept in the
+        server's message cache across all sessions. When it's exceeded, the
+        least recently used messages are evicted.""",
+    visibility="hidden",
+    default_val=500 * 1e6,
+    type_=float,
+)  # 500MB
+
+_create_option(
+    "global.skipUnchangedElements",
+    description="""If true, an element that's identical to the one a client
+        already has at the same position is sent as a small "unchanged" delta
+        instead of being sent again.""",
+    visibility="hidden",
+    default_val=False,
+    type_=bool,
+)
+
+_create_option(
+    "global.maxArrowBytesCacheSize",
+    description="""Max total size, in bytes, of the serialized Arrow tables
+        (e.g. from st.dataframe) that the server keeps around for reuse
+        across reruns and sessions.""",
+    visibility="hidden",
+    default_val=256 * 1e6,
+    type_=float,
+)  # 256MB
+
+_create_option(
+    "global.hashAlgorithm",
+    description="""
+        Hash algorithm used to identify ForwardMsgs, st.cache_data and
+        st.cache_resource keys, and changes to watched files. None of these
+        hashes need to be cryptographically secure.
+
+        Allowed values:
+        * "auto"    : Use xxh3 if the xxhash package is installed, and
+                      BLAKE2b otherwise.
+        * "xxh3"    : Use xxh3. Requires the xxhash package.
+        * "blake2b" : Use BLAKE2b with a 128-bit digest.
+        * "md5"     : Use MD5.
+    """,
+    visibility="hidden",
+    default_val="auto",
+    type_=str,
+)
+
 _create_option(
     "global.dataFrameSerialization",
     description="""
@@ -501,6 +556,18 @@ _create_option(
     type_=bool,
 )
 
+_create_option(
+    "runner.maxScriptThreads",
+    description="""
+        The maximum number of threads that sessions run their scripts on.
+        Threads are reused across script runs. When all of them are busy, a
+        session that needs to run its script waits for a thread to be free.
+        A value of 0 means that there is no maximum.
+        """,
+    default_val=0,
+    type_=int,
+)
+
 _create_option(
     "runner.fastReruns",
     description="""
@@ -676,6 +743,43 @@ _create_option(
     type_=int,
 )
 
+_create_option(
+    "server.maxUploadedFilesSessionSize",
+    description="""
+        Max total size, in megabytes, of the files that a single session can
+        have uploaded at once. Uploads beyond this are rejected. If 0, there is
+        no limit.
+        """,
+    visibility="hidden",
+    default_val=0,
+    type_=float,
+)
+
+_create_option(
+    "server.maxUploadedFilesTotalSize",
+    description="""
+        Max total size, in megabytes, of the files uploaded by all sessions.
+        Once this is reached, files from sessions that are no longer connected
+        are removed, least recently used first, and uploads that still don't
+        fit are rejected. If 0, there is no limit.
+        """,
+    visibility="hidden",
+    default_val=0,
+    type_=float,
+)
+
+_create_option(
+    "server.uploadedFileMemorySize",
+    description="""
+        Max size, in megabytes, of files uploaded with the file_uploader that
+        are kept in memory. Larger files are written to a temporary file as
+        they're received, and read from a memory mapping of it.
+        """,
+    visibility="hidden",
+    default_val=5,
+    type_=float,
+)
+
 _create_option(
     "server.maxMessageSize",
     description="""
@@ -685,6 +789,54 @@ _create_option(
     type_=int,
 )
 
+_create_option(
+    "server.maxWebsocketWriteBufferSize",
+    description="""
+        Max size, in megabytes, of data that can be waiting to be written to a
+        single WebSocket connection. Once this is exceeded, Streamlit stops sending
+        new messages to that connection until its buffered data has been written,
+        so a slow client doesn't hold up messages for every other client.
+        """,
+    visibility="hidden",
+    default_val=8,
+    type_=int,
+)
+
+_create_option(
+    "server.mediaFileStorage",
+    description="""
+        Where media files (images, audio, video and downloadable files) are
+        stored while they're in use: "memory" or "disk". Files on disk are
+        memory-mapped, and only the requested byte ranges are read.
+        """,
+    visibility="hidden",
+    default_val="memory",
+    type_=str,
+)
+
+_create_option(
+    "server.mediaFileStorageDir",
+    description="""
+        The directory that media files are stored in when
+        server.mediaFileStorage is "disk". If empty, a temporary directory is
+        used.
+        """,
+    visibility="hidden",
+    default_val="",
+    type_=str,
+)
+
+_create_option(
+    "server.mediaFileMemorySize",
+    description="""
+        Max size, in megabytes, of the recently used media files that are also
+        kept in memory when server.mediaFileStorage is "disk".
+        """,
+    visibility="hidden",
+    default_val=64,
+    type_=float,
+)
+
 _create_option(
     "server.enableWebsocketCompression",
     description="""
@@ -903,12 +1055,12 @@ def get_where_defined(key: str) -> str:
         The config option key of the form "section.optionName"
 
     """
-    with _config_lock:
-        config_options = get_config_options()
+    config_options = get_config_options()
 
-        if key not in config_options:
-            raise RuntimeError('Config key "%s" not defined.' % key)
-        return config_options[key].where_defined
+    option = config_options.get(key)
+    if option is None:
+        raise RuntimeError('Config key "%s" not defined.' % key)
+    return option.where_defined
 
 
 def _is_unset(option_name: str) -> bool:
@@ -961,7 +1113,12 @@ def show_config() -> None:
 # Load Config Files #
 
 
-def _set_option(key: str, value: Any, where_defined: str) -> None:
+def _set_option(
+    key: str,
+    value: Any,
+    where_defined: str,
+    config_options: Optional[Dict[str, ConfigOption]] = None,
+) -> None:
     """Set a config option by key / value pair.
 
     This function assumes that the _config_options dictionary has already been
@@ -975,12 +1132,16 @@ def _set_option(key: str, value: Any, where_defined: str) -> None:
         The value of the option.
     where_defined : str
         Tells the config system where this was set.
+    config_options : Optional[Dict[str, ConfigOption]]
+        The options to set the option in. Defaults to _config_options.
 
     """
+    if config_options is None:
+        config_options = _config_options
     assert (
-        _config_options is not None
+        config_options is not None
     ), "_config_options should always be populated here."
-    if key not in _config_options:
+    if key not in config_options:
         # Import logger locally to prevent circular references
         from streamlit.logger import get_logger
 
@@ -991,10 +1152,14 @@ def _set_option(key: str, value: Any, where_defined: str) -> None:
         )
 
     else:
-        _config_options[key].set_value(value, where_defined)
+        config_options[key].set_value(value, where_defined)
 
 
-def _update_config_with_toml(raw_toml: str, where_defined: str) -> None:
+def _update_config_with_toml(
+    raw_toml: str,
+    where_defined: str,
+    config_options: Optional[Dict[str, ConfigOption]] = None,
+) -> None:
     """Update the config system by parsing this string.
 
     This should only be called from get_config_options.
@@ -1005,6 +1170,8 @@ def _update_config_with_toml(raw_toml: str, where_defined: str) -> None:
         The TOML file to parse to update the config values.
     where_defined : str
         Tells the config system where this was set.
+    config_options : Optional[Dict[str, ConfigOption]]
+        The options to update. Defaults to _config_options.
 
     """
     parsed_config_file = toml.loads(raw_toml)
@@ -1012,7 +1179,7 @@ def _update_config_with_toml(raw_toml: str, where_defined: str) -> None:
     for section, options in parsed_config_file.items():
         for name, value in options.items():
             value = _maybe_read_env_variable(value)
-            _set_option(f"{section}.{name}", value, where_defined)
+            _set_option(f"{section}.{name}", value, where_defined, config_options)
 
 
 def _maybe_read_env_variable(value: Any) -> Any:
@@ -1118,7 +1285,9 @@ def get_config_options(
             return _config_options
 
         old_options = _config_options
-        _config_options = copy.deepcopy(_config_options_template)
+        # Build the new options on the side, and swap them in once they're
+        # complete: get_option reads _config_options without the lock.
+        new_options = copy.deepcopy(_config_options_template)
 
         # Values set in files later in the CONFIG_FILENAMES list overwrite those
         # set earlier.
@@ -1129,10 +1298,12 @@ def get_config_options(
             with open(filename, "r", encoding="utf-8") as input:
                 file_contents = input.read()
 
-            _update_config_with_toml(file_contents, filename)
+            _update_config_with_toml(file_contents, filename, new_options)
 
         for opt_name, opt_val in options_from_flags.items():
-            _set_option(opt_name, opt_val, _DEFINED_BY_FLAG)
+            _set_option(opt_name, opt_val, _DEFINED_BY_FLAG, new_options)
+
+        _config_options = new_options
 
         if old_options and config_util.server_option_changed(
             old_options, _config_options
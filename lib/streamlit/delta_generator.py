@@ -416,6 +416,7 @@ class DeltaGenerator(
         last_index: Hashable | None = None,
         element_width: int | None = None,
         element_height: int | None = None,
+        forward_msg: ForwardMsg_pb2.ForwardMsg | None = None,
     ) -> DeltaGenerator:
         ...
 
@@ -428,6 +429,7 @@ class DeltaGenerator(
         last_index: Hashable | None = None,
         element_width: int | None = None,
         element_height: int | None = None,
+        forward_msg: ForwardMsg_pb2.ForwardMsg | None = None,
     ) -> None:
         ...
 
@@ -440,6 +442,7 @@ class DeltaGenerator(
         last_index: Hashable | None = None,
         element_width: int | None = None,
         element_height: int | None = None,
+        forward_msg: ForwardMsg_pb2.ForwardMsg | None = None,
     ) -> Value:
         ...
 
@@ -452,6 +455,7 @@ class DeltaGenerator(
         last_index: Hashable | None = None,
         element_width: int | None = None,
         element_height: int | None = None,
+        forward_msg: ForwardMsg_pb2.ForwardMsg | None = None,
     ) -> DeltaGenerator:
         ...
 
@@ -464,6 +468,7 @@ class DeltaGenerator(
         last_index: Hashable | None = None,
         element_width: int | None = None,
         element_height: int | None = None,
+        forward_msg: ForwardMsg_pb2.ForwardMsg | None = None,
     ) -> DeltaGenerator | Value | None:
         ...
 
@@ -475,6 +480,7 @@ class DeltaGenerator(
         last_index: Hashable | None = None,
         element_width: int | None = None,
         element_height: int | None = None,
+        forward_msg: ForwardMsg_pb2.ForwardMsg | None = None,
     ) -> DeltaGenerator | Value | None:
         """Create NewElement delta, fill it, and enqueue it.
 
@@ -490,6 +496,11 @@ class DeltaGenerator(
             Desired width for the element
         element_height : int or None
             Desired height for the element
+        forward_msg : ForwardMsg or None
+            The ForwardMsg that element_proto was marshalled into, if the
+            caller created element_proto as its delta.new_element sub-message.
+            The message is then enqueued as-is, instead of copying
+            element_proto into a new ForwardMsg.
 
         Returns
         -------
@@ -522,10 +533,17 @@ class DeltaGenerator(
         if proto_type in ARROW_DELTA_TYPES_THAT_MELT_DATAFRAMES:
             proto_type = "arrow_vega_lite_chart"
 
-        # Copy the marshalled proto into the overall msg proto
-        msg = ForwardMsg_pb2.ForwardMsg()
-        msg_el_proto = getattr(msg.delta.new_element, proto_type)
-        msg_el_proto.CopyFrom(element_proto)
+        if forward_msg is not None:
+            # The element was marshalled directly into the msg proto, so its
+            # (possibly large) fields don't need to be copied. Mark the element
+            # as set, in case all of its fields have default values.
+            msg = forward_msg
+            getattr(msg.delta.new_element, proto_type).SetInParent()
+        else:
+            # Copy the marshalled proto into the overall msg proto
+            msg = ForwardMsg_pb2.ForwardMsg()
+            msg_el_proto = getattr(msg.delta.new_element, proto_type)
+            msg_el_proto.CopyFrom(element_proto)
 
         # Only enqueue message and fill in metadata if there's a container.
         msg_was_enqueued = False
@@ -25,19 +25,24 @@ from typing import (
     cast,
 )
 
-import pyarrow as pa
-from numpy import ndarray
-from pandas import DataFrame
-from pandas.io.formats.style import Styler
+from typing_extensions import TypeAlias
 
 from streamlit import type_util
 from streamlit.proto.Arrow_pb2 import Arrow as ArrowProto
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime.metrics_util import gather_metrics
 
 if TYPE_CHECKING:
+    import pyarrow as pa
+    from numpy import ndarray
+    from pandas import DataFrame
+    from pandas.io.formats.style import Styler
+
     from streamlit.delta_generator import DeltaGenerator
 
-Data = Union[DataFrame, Styler, pa.Table, ndarray, Iterable, Dict[str, List[Any]], None]
+Data: TypeAlias = Union[
+    "DataFrame", "Styler", "pa.Table", "ndarray", Iterable, Dict[str, List[Any]], None
+]
 
 
 class ArrowMixin:
@@ -104,7 +109,8 @@ class ArrowMixin:
         delta_path = self.dg._get_delta_path_str()
         default_uuid = str(hash(delta_path))
 
-        proto = ArrowProto()
+        msg = ForwardMsg()
+        proto = msg.delta.new_element.arrow_data_frame
         proto.use_container_width = use_container_width
         if width:
             proto.width = width
@@ -114,7 +120,7 @@ class ArrowMixin:
 
         marshall(proto, data, default_uuid)
 
-        return self.dg._enqueue("arrow_data_frame", proto)
+        return self.dg._enqueue("arrow_data_frame", proto, forward_msg=msg)
 
     @gather_metrics("_arrow_table")
     def _arrow_table(self, data: Data = None) -> "DeltaGenerator":
@@ -155,9 +161,10 @@ class ArrowMixin:
         delta_path = self.dg._get_delta_path_str()
         default_uuid = str(hash(delta_path))
 
-        proto = ArrowProto()
+        msg = ForwardMsg()
+        proto = msg.delta.new_element.arrow_table
         marshall(proto, data, default_uuid)
-        return self.dg._enqueue("arrow_table", proto)
+        return self.dg._enqueue("arrow_table", proto, forward_msg=msg)
 
     @property
     def dg(self) -> "DeltaGenerator":
@@ -190,14 +197,14 @@ def marshall(proto: ArrowProto, data: Data, default_uuid: Optional[str] = None)
         ), "Default UUID must be a string for Styler data."
         _marshall_styler(proto, data, default_uuid)
 
-    if isinstance(data, pa.Table):
+    if type_util.is_pyarrow_table(data):
         proto.data = type_util.pyarrow_table_to_bytes(data)
     else:
         df = type_util.convert_anything_to_df(data)
         proto.data = type_util.data_frame_to_bytes(df)
 
 
-def _marshall_styler(proto: ArrowProto, styler: Styler, default_uuid: str) -> None:
+def _marshall_styler(proto: ArrowProto, styler: "Styler", default_uuid: str) -> None:
     """Marshall pandas.Styler into an Arrow proto.
 
     Parameters
@@ -232,7 +239,7 @@ def _marshall_styler(proto: ArrowProto, styler: Styler, default_uuid: str) -> No
     _marshall_display_values(proto, styler.data, pandas_styles)
 
 
-def _marshall_uuid(proto: ArrowProto, styler: Styler, default_uuid: str) -> None:
+def _marshall_uuid(proto: ArrowProto, styler: "Styler", default_uuid: str) -> None:
     """Marshall pandas.Styler uuid into an Arrow proto.
 
     Parameters
@@ -253,7 +260,7 @@ def _marshall_uuid(proto: ArrowProto, styler: Styler, default_uuid: str) -> None
     proto.styler.uuid = str(styler.uuid)
 
 
-def _marshall_caption(proto: ArrowProto, styler: Styler) -> None:
+def _marshall_caption(proto: ArrowProto, styler: "Styler") -> None:
     """Marshall pandas.Styler caption into an Arrow proto.
 
     Parameters
@@ -270,7 +277,7 @@ def _marshall_caption(proto: ArrowProto, styler: Styler) -> None:
 
 
 def _marshall_styles(
-    proto: ArrowProto, styler: Styler, styles: Mapping[str, Any]
+    proto: ArrowProto, styler: "Styler", styles: Mapping[str, Any]
 ) -> None:
     """Marshall pandas.Styler styles into an Arrow proto.
 
@@ -396,7 +403,7 @@ def _pandas_style_to_css(
 
 
 def _marshall_display_values(
-    proto: ArrowProto, df: DataFrame, styles: Mapping[str, Any]
+    proto: ArrowProto, df: "DataFrame", styles: Mapping[str, Any]
 ) -> None:
     """Marshall pandas.Styler display values into an Arrow proto.
 
@@ -416,7 +423,7 @@ def _marshall_display_values(
     proto.styler.display_values = type_util.data_frame_to_bytes(new_df)
 
 
-def _use_display_values(df: DataFrame, styles: Mapping[str, Any]) -> DataFrame:
+def _use_display_values(df: "DataFrame", styles: Mapping[str, Any]) -> "DataFrame":
     """Create a new pandas.DataFrame where display values are used instead of original ones.
 
     Parameters
@@ -19,6 +19,7 @@ a nice JSON schema for expressing graphs and charts.
 
 from datetime import date
 from enum import Enum
+from types import ModuleType
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -31,33 +32,40 @@ from typing import (
     cast,
 )
 
-import altair as alt
-import pandas as pd
-from altair.vegalite.v4.api import Chart
-from pandas.api.types import infer_dtype, is_integer_dtype
 from typing_extensions import Literal
 
 import streamlit.elements.arrow_vega_lite as arrow_vega_lite
-from streamlit import type_util
+from streamlit import import_hooks, type_util
 from streamlit.elements.arrow import Data
 from streamlit.elements.utils import last_index_for_melted_dataframes
 from streamlit.errors import StreamlitAPIException
 from streamlit.proto.ArrowVegaLiteChart_pb2 import (
     ArrowVegaLiteChart as ArrowVegaLiteChartProto,
 )
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime.metrics_util import gather_metrics
 
 if TYPE_CHECKING:
+    import pandas as pd
+    from altair.vegalite.v4.api import Chart
+
     from streamlit.delta_generator import DeltaGenerator
 
 # Create and enable streamlit theme
 STREAMLIT_THEME = {"embedOptions": {"theme": "streamlit"}}
 
-# This allows to use alt.themes.enable("streamlit") to activate Streamlit theme.
-alt.themes.register("streamlit", lambda: {"usermeta": STREAMLIT_THEME})
 
-# no theme applied to charts
-alt.themes.enable("none")
+def _register_streamlit_theme(alt: ModuleType) -> None:
+    # This allows to use alt.themes.enable("streamlit") to activate Streamlit theme.
+    alt.themes.register("streamlit", lambda: {"usermeta": STREAMLIT_THEME})
+
+    # no theme applied to charts
+    alt.themes.enable("none")
+
+
+# Altair is only imported by apps that use it, so we set up its themes once
+# it's imported.
+import_hooks.on_import("altair", _register_streamlit_theme)
 
 
 class ChartType(Enum):
@@ -133,12 +141,15 @@ class ArrowAltairMixin:
            height: 220px
 
         """
-        proto = ArrowVegaLiteChartProto()
+        msg = ForwardMsg()
+        proto = msg.delta.new_element.arrow_vega_lite_chart
         chart = _generate_chart(ChartType.LINE, data, x, y, width, height)
         marshall(proto, chart, use_container_width, theme="streamlit")
         last_index = last_index_for_melted_dataframes(data)
 
-        return self.dg._enqueue("arrow_line_chart", proto, last_index=last_index)
+        return self.dg._enqueue(
+            "arrow_line_chart", proto, last_index=last_index, forward_msg=msg
+        )
 
     @gather_metrics("_arrow_area_chart")
     def _arrow_area_chart(
@@ -206,12 +217,15 @@ class ArrowAltairMixin:
 
         """
 
-        proto = ArrowVegaLiteChartProto()
+        msg = ForwardMsg()
+        proto = msg.delta.new_element.arrow_vega_lite_chart
         chart = _generate_chart(ChartType.AREA, data, x, y, width, height)
         marshall(proto, chart, use_container_width, theme="streamlit")
         last_index = last_index_for_melted_dataframes(data)
 
-        return self.dg._enqueue("arrow_area_chart", proto, last_index=last_index)
+        return self.dg._enqueue(
+            "arrow_area_chart", proto, last_index=last_index, forward_msg=msg
+        )
 
     @gather_metrics("_arrow_bar_chart")
     def _arrow_bar_chart(
@@ -280,17 +294,20 @@ class ArrowAltairMixin:
 
         """
 
-        proto = ArrowVegaLiteChartProto()
+        msg = ForwardMsg()
+        proto = msg.delta.new_element.arrow_vega_lite_chart
         chart = _generate_chart(ChartType.BAR, data, x, y, width, height)
         marshall(proto, chart, use_container_width, theme="streamlit")
         last_index = last_index_for_melted_dataframes(data)
 
-        return self.dg._enqueue("arrow_bar_chart", proto, last_index=last_index)
+        return self.dg._enqueue(
+            "arrow_bar_chart", proto, last_index=last_index, forward_msg=msg
+        )
 
     @gather_metrics("_arrow_altair_chart")
     def _arrow_altair_chart(
         self,
-        altair_chart: Chart,
+        altair_chart: "Chart",
         use_container_width: bool = False,
         theme: Union[None, Literal["streamlit"]] = "streamlit",
     ) -> "DeltaGenerator":
@@ -333,7 +350,8 @@ class ArrowAltairMixin:
             raise StreamlitAPIException(
                 f'You set theme="{theme}" while Streamlit charts only support theme=”streamlit” or theme=None to fallback to the default library theme.'
             )
-        proto = ArrowVegaLiteChartProto()
+        msg = ForwardMsg()
+        proto = msg.delta.new_element.arrow_vega_lite_chart
         marshall(
             proto,
             altair_chart,
@@ -341,7 +359,7 @@ class ArrowAltairMixin:
             theme=theme,
         )
 
-        return self.dg._enqueue("arrow_vega_lite_chart", proto)
+        return self.dg._enqueue("arrow_vega_lite_chart", proto, forward_msg=msg)
 
     @property
     def dg(self) -> "DeltaGenerator":
@@ -349,7 +367,7 @@ class ArrowAltairMixin:
         return cast("DeltaGenerator", self)
 
 
-def _is_date_column(df: pd.DataFrame, name: str) -> bool:
+def _is_date_column(df: "pd.DataFrame", name: str) -> bool:
     """True if the column with the given name stores datetime.date values.
 
     This function just checks the first value in the given column, so
@@ -374,13 +392,15 @@ def _is_date_column(df: pd.DataFrame, name: str) -> bool:
 
 
 def _melt_data(
-    data_df: pd.DataFrame,
+    data_df: "pd.DataFrame",
     x_column: str,
     y_column: str,
     color_column: str,
     value_columns: Optional[List[str]] = None,
-) -> pd.DataFrame:
+) -> "pd.DataFrame":
     """Converts a wide-format dataframe to a long-format dataframe."""
+    import pandas as pd
+    from pandas.api.types import infer_dtype
 
     data_df = pd.melt(
         data_df,
@@ -410,10 +430,10 @@ def _melt_data(
 
 
 def _maybe_melt(
-    data_df: pd.DataFrame,
+    data_df: "pd.DataFrame",
     x: Union[str, None] = None,
     y: Union[str, Sequence[str], None] = None,
-) -> Tuple[pd.DataFrame, str, str, str, str, Optional[str], Optional[str]]:
+) -> Tuple["pd.DataFrame", str, str, str, str, Optional[str], Optional[str]]:
     """Determines based on the selected x & y parameter, if the data needs to
     be converted to a long-format dataframe. If so, it returns the melted dataframe
     and the x, y, and color columns used for rendering the chart.
@@ -498,8 +518,11 @@ def _generate_chart(
     y: Union[str, Sequence[str], None] = None,
     width: int = 0,
     height: int = 0,
-) -> Chart:
+) -> "Chart":
     """Function to use the chart's type, data columns and indices to figure out the chart's spec."""
+    import altair as alt
+    import pandas as pd
+    from pandas.api.types import is_integer_dtype
 
     if data is None:
         # Use an empty-ish dict because if we use None the x axis labels rotate
@@ -584,7 +607,7 @@ def _generate_chart(
 
 def marshall(
     vega_lite_chart: ArrowVegaLiteChartProto,
-    altair_chart: Chart,
+    altair_chart: "Chart",
     use_container_width: bool = False,
     theme: Union[None, Literal["streamlit"]] = "streamlit",
     **kwargs: Any,
@@ -27,6 +27,7 @@ from streamlit.logger import get_logger
 from streamlit.proto.ArrowVegaLiteChart_pb2 import (
     ArrowVegaLiteChart as ArrowVegaLiteChartProto,
 )
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime.metrics_util import gather_metrics
 
 if TYPE_CHECKING:
@@ -99,7 +100,8 @@ class ArrowVegaLiteMixin:
             raise StreamlitAPIException(
                 f'You set theme="{theme}" while Streamlit charts only support theme=”streamlit” or theme=None to fallback to the default library theme.'
             )
-        proto = ArrowVegaLiteChartProto()
+        msg = ForwardMsg()
+        proto = msg.delta.new_element.arrow_vega_lite_chart
         marshall(
             proto,
             data,
@@ -108,7 +110,7 @@ class ArrowVegaLiteMixin:
             theme=theme,
             **kwargs,
         )
-        return self.dg._enqueue("arrow_vega_lite_chart", proto)
+        return self.dg._enqueue("arrow_vega_lite_chart", proto, forward_msg=msg)
 
     @property
     def dg(self) -> "DeltaGenerator":
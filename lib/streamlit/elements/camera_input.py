@@ -33,13 +33,17 @@ from streamlit.runtime.state import (
     WidgetKwargs,
     register_widget,
 )
-from streamlit.runtime.uploaded_file_manager import UploadedFile, UploadedFileRec
+from streamlit.runtime.uploaded_file_manager import (
+    AnyUploadedFile,
+    UploadedFileRec,
+    open_uploaded_file,
+)
 from streamlit.type_util import Key, LabelVisibility, maybe_raise_label_warnings, to_key
 
 if TYPE_CHECKING:
     from streamlit.delta_generator import DeltaGenerator
 
-SomeUploadedSnapshotFile = Optional[UploadedFile]
+SomeUploadedSnapshotFile = Optional[AnyUploadedFile]
 
 
 def _get_file_recs_for_camera_input_widget(
@@ -101,7 +105,7 @@ class CameraInputSerde:
         if len(file_recs) == 0:
             return_value = None
         else:
-            return_value = UploadedFile(file_recs[0])
+            return_value = open_uploaded_file(file_recs[0])
         return return_value
 
 
@@ -184,7 +188,9 @@ class CameraInputMixin:
         None or UploadedFile
             The UploadedFile class is a subclass of BytesIO, and therefore
             it is "file-like". This means you can pass them anywhere where
-            a file is expected.
+            a file is expected. Large files are returned as read-only
+            MemoryMappedUploadedFile objects, which are file-like too and
+            have the same attributes.
 
         Examples
         --------
@@ -32,10 +32,6 @@ from typing import (
     overload,
 )
 
-import pandas as pd
-import pyarrow as pa
-from pandas.api.types import is_datetime64_any_dtype, is_float_dtype, is_integer_dtype
-from pandas.io.formats.style import Styler
 from typing_extensions import Final, Literal, TypeAlias, TypedDict
 
 from streamlit import type_util
@@ -55,6 +51,9 @@ from streamlit.type_util import DataFormat, DataFrameGenericAlias, Key, is_type,
 
 if TYPE_CHECKING:
     import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    from pandas.io.formats.style import Styler
 
     from streamlit.delta_generator import DeltaGenerator
 
@@ -79,10 +78,10 @@ EditableData = TypeVar(
 
 # All data types supported by the data editor.
 DataTypes: TypeAlias = Union[
-    pd.DataFrame,
-    pd.Index,
-    Styler,
-    pa.Table,
+    "pd.DataFrame",
+    "pd.Index",
+    "Styler",
+    "pa.Table",
     "np.ndarray[Any, np.dtype[np.float64]]",
     Tuple[Any],
     List[Any],
@@ -205,6 +204,13 @@ def _parse_value(value: Union[str, int, float, bool, None], dtype) -> Any:
     -------
     The converted value.
     """
+    import pandas as pd
+    from pandas.api.types import (
+        is_datetime64_any_dtype,
+        is_float_dtype,
+        is_integer_dtype,
+    )
+
     if value is None:
         return None
 
@@ -279,7 +285,7 @@ def _apply_row_additions(df: pd.DataFrame, added_rows: List[Dict[str, Any]]) ->
     # combination with loc. As a workaround, we manually track the values here:
     range_index_stop = None
     range_index_step = None
-    if type(df.index) == pd.RangeIndex:
+    if is_type(df.index, "pandas.core.indexes.range.RangeIndex"):
         range_index_stop = df.index.stop
         range_index_step = df.index.step
 
@@ -571,6 +577,8 @@ class DataEditorMixin:
         # since we will apply edits directly to it.
         data_df = type_util.convert_anything_to_df(data, ensure_copy=True)
 
+        import pandas as pd
+
         # Check if the index is supported.
         if not (
             type(data_df.index)
@@ -18,6 +18,7 @@ from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, cast
 from typing_extensions import Final
 
 from streamlit.proto.DeckGlJsonChart_pb2 import DeckGlJsonChart as PydeckProto
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime.metrics_util import gather_metrics
 
 if TYPE_CHECKING:
@@ -121,9 +122,10 @@ class PydeckMixin:
            you can set ``map_style=None`` in the ``pydeck.Deck`` object.
 
         """
-        pydeck_proto = PydeckProto()
+        msg = ForwardMsg()
+        pydeck_proto = msg.delta.new_element.deck_gl_json_chart
         marshall(pydeck_proto, pydeck_obj, use_container_width)
-        return self.dg._enqueue("deck_gl_json_chart", pydeck_proto)
+        return self.dg._enqueue("deck_gl_json_chart", pydeck_proto, forward_msg=msg)
 
     @property
     def dg(self) -> "DeltaGenerator":
@@ -37,10 +37,14 @@ from streamlit.runtime.state import (
     WidgetKwargs,
     register_widget,
 )
-from streamlit.runtime.uploaded_file_manager import UploadedFile, UploadedFileRec
+from streamlit.runtime.uploaded_file_manager import (
+    AnyUploadedFile,
+    UploadedFileRec,
+    open_uploaded_file,
+)
 from streamlit.type_util import Key, LabelVisibility, maybe_raise_label_warnings, to_key
 
-SomeUploadedFiles = Optional[Union[UploadedFile, List[UploadedFile]]]
+SomeUploadedFiles = Optional[Union[AnyUploadedFile, List[AnyUploadedFile]]]
 
 
 def _get_file_recs(
@@ -76,11 +80,11 @@ class FileUploaderSerde:
     ) -> SomeUploadedFiles:
         file_recs = _get_file_recs(widget_id, ui_value)
         if len(file_recs) == 0:
-            return_value: Optional[Union[List[UploadedFile], UploadedFile]] = (
+            return_value: Optional[Union[List[AnyUploadedFile], AnyUploadedFile]] = (
                 [] if self.accept_multiple_files else None
             )
         else:
-            files = [UploadedFile(rec) for rec in file_recs]
+            files = [open_uploaded_file(rec) for rec in file_recs]
             return_value = files if self.accept_multiple_files else files[0]
         return return_value
 
@@ -137,7 +141,7 @@ class FileUploaderMixin:
         *,
         disabled: bool = False,
         label_visibility: LabelVisibility = "visible",
-    ) -> Optional[List[UploadedFile]]:
+    ) -> Optional[List[AnyUploadedFile]]:
         ...
 
     # 1. type is given as not a keyword-only argument
@@ -156,7 +160,7 @@ class FileUploaderMixin:
         *,
         disabled: bool = False,
         label_visibility: LabelVisibility = "visible",
-    ) -> Optional[UploadedFile]:
+    ) -> Optional[AnyUploadedFile]:
         ...
 
     # The following 2 overloads represent the cases where
@@ -180,7 +184,7 @@ class FileUploaderMixin:
         kwargs: Optional[WidgetKwargs] = None,
         disabled: bool = False,
         label_visibility: LabelVisibility = "visible",
-    ) -> Optional[List[UploadedFile]]:
+    ) -> Optional[List[AnyUploadedFile]]:
         ...
 
     # 1. type is skipped or a keyword argument
@@ -199,7 +203,7 @@ class FileUploaderMixin:
         kwargs: Optional[WidgetKwargs] = None,
         disabled: bool = False,
         label_visibility: LabelVisibility = "visible",
-    ) -> Optional[UploadedFile]:
+    ) -> Optional[AnyUploadedFile]:
         ...
 
     @gather_metrics("file_uploader")
@@ -301,7 +305,9 @@ class FileUploaderMixin:
 
             The UploadedFile class is a subclass of BytesIO, and therefore
             it is "file-like". This means you can pass them anywhere where
-            a file is expected.
+            a file is expected. Large files are returned as read-only
+            MemoryMappedUploadedFile objects, which are file-like too and
+            have the same attributes.
 
         Examples
         --------
@@ -18,10 +18,7 @@ import datetime
 import re
 from typing import TYPE_CHECKING, Any, Dict, NamedTuple, Optional, cast
 
-import pyarrow as pa
 import tzlocal
-from pandas import DataFrame
-from pandas.io.formats.style import Styler
 from typing_extensions import Final
 
 from streamlit import errors, type_util
@@ -32,6 +29,9 @@ from streamlit.proto.DataFrame_pb2 import TableStyle as TableStyleProto
 from streamlit.runtime.metrics_util import gather_metrics
 
 if TYPE_CHECKING:
+    from pandas import DataFrame
+    from pandas.io.formats.style import Styler
+
     from streamlit.delta_generator import DeltaGenerator
 
 LOGGER: Final = get_logger(__name__)
@@ -167,7 +167,7 @@ def marshall_data_frame(data: Data, proto_df: DataFrameProto) -> None:
     proto_df : proto.DataFrame
         Output. The protobuf for a Streamlit DataFrame proto.
     """
-    if isinstance(data, pa.Table):
+    if type_util.is_pyarrow_table(data):
         raise errors.StreamlitAPIException(
             """
 pyarrow tables are not supported  by Streamlit's legacy DataFrame serialization (i.e. with `config.dataFrameSerialization = "legacy"`).
@@ -190,7 +190,9 @@ To be able to use pyarrow tables, please enable pyarrow by changing the config s
 
 
 def _marshall_styles(
-    proto_table_style: TableStyleProto, df: DataFrame, styler: Optional[Styler] = None
+    proto_table_style: TableStyleProto,
+    df: "DataFrame",
+    styler: Optional["Styler"] = None,
 ) -> None:
     """Adds pandas.Styler styling data to a proto.DataFrame
 
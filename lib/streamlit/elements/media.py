@@ -17,7 +17,6 @@ import re
 from typing import TYPE_CHECKING, Optional, Tuple, Union, cast
 
 from typing_extensions import Final, TypeAlias
-from validators import url
 
 import streamlit as st
 from streamlit import runtime, type_util
@@ -289,6 +288,8 @@ def marshall_video(
     # "type" distinguishes between YouTube and non-YouTube links
     proto.type = VideoProto.Type.NATIVE
 
+    from validators import url
+
     if isinstance(data, str) and url(data):
         youtube_url = _reshape_youtube_url(data)
         if youtube_url:
@@ -410,6 +411,8 @@ def marshall_audio(
 
     proto.start_time = start_time
 
+    from validators import url
+
     if isinstance(data, str) and url(data):
         proto.url = data
 
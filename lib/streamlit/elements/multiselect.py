@@ -293,7 +293,7 @@ class MultiSelectMixin:
         multiselect_proto.label = label
         default_value: List[int] = [] if indices is None else indices
         multiselect_proto.default[:] = default_value
-        multiselect_proto.options[:] = [str(format_func(option)) for option in opt]
+        option_labels = [str(format_func(option)) for option in opt]
         multiselect_proto.form_id = current_form_id(self.dg)
         multiselect_proto.max_selections = max_selections or 0
         if help is not None:
@@ -304,6 +304,7 @@ class MultiSelectMixin:
         widget_state = register_widget(
             "multiselect",
             multiselect_proto,
+            options=option_labels,
             user_key=key,
             on_change_handler=on_change,
             args=args,
@@ -312,6 +313,9 @@ class MultiSelectMixin:
             serializer=serde.serialize,
             ctx=ctx,
         )
+        # The options are included in the widget's ID by register_widget, so
+        # they're only set afterwards.
+        multiselect_proto.options[:] = option_labels
         default_count = _get_default_count(widget_state.value)
         if max_selections and default_count > max_selections:
             raise StreamlitAPIException(
@@ -16,13 +16,15 @@
 
 import json
 import urllib.parse
+from types import ModuleType
 from typing import TYPE_CHECKING, Any, Dict, List, Set, Union, cast
 
 from typing_extensions import Final, Literal, TypeAlias
 
-from streamlit import type_util
+from streamlit import import_hooks, type_util
 from streamlit.errors import StreamlitAPIException
 from streamlit.logger import get_logger
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
 from streamlit.runtime.legacy_caching import caching
 from streamlit.runtime.metrics_util import gather_metrics
@@ -35,16 +37,16 @@ if TYPE_CHECKING:
     from streamlit.delta_generator import DeltaGenerator
 
 
-try:
-    import plotly.io as pio
-
+def _set_streamlit_template(pio: ModuleType) -> None:
     import streamlit.elements.lib.streamlit_plotly_theme
 
     pio.templates.default = "streamlit"
-except ModuleNotFoundError:
-    # We have imports here because it takes too loo long to load the template default for the first graph to load
-    # We do nothing if Plotly is not installed. This is expected since Plotly is an optional dependency.
-    pass
+
+
+# The template has to be the default before the app creates its figures, but
+# Plotly is an optional dependency that takes a while to import. So we set it
+# up as soon as the app imports Plotly.
+import_hooks.on_import("plotly.io", _set_streamlit_template)
 
 LOGGER: Final = get_logger(__name__)
 
@@ -155,7 +157,8 @@ class PlotlyMixin:
         # for their main parameter. I don't like the name, but it's best to
         # keep it in sync with what Plotly calls it.
 
-        plotly_chart_proto = PlotlyChartProto()
+        msg = ForwardMsg()
+        plotly_chart_proto = msg.delta.new_element.plotly_chart
         if theme != "streamlit" and theme != None:
             raise StreamlitAPIException(
                 f'You set theme="{theme}" while Streamlit charts only support theme=”streamlit” or theme=None to fallback to the default library theme.'
@@ -168,7 +171,7 @@ class PlotlyMixin:
             theme,
             **kwargs,
         )
-        return self.dg._enqueue("plotly_chart", plotly_chart_proto)
+        return self.dg._enqueue("plotly_chart", plotly_chart_proto, forward_msg=msg)
 
     @property
     def dg(self) -> "DeltaGenerator":
@@ -233,7 +233,7 @@ class RadioMixin:
         radio_proto = RadioProto()
         radio_proto.label = label
         radio_proto.default = index
-        radio_proto.options[:] = [str(format_func(option)) for option in opt]
+        option_labels = [str(format_func(option)) for option in opt]
         radio_proto.form_id = current_form_id(self.dg)
         radio_proto.horizontal = horizontal
         if help is not None:
@@ -244,6 +244,7 @@ class RadioMixin:
         widget_state = register_widget(
             "radio",
             radio_proto,
+            options=option_labels,
             user_key=key,
             on_change_handler=on_change,
             args=args,
@@ -252,6 +253,9 @@ class RadioMixin:
             serializer=serde.serialize,
             ctx=ctx,
         )
+        # The options are included in the widget's ID by register_widget, so
+        # they're only set afterwards.
+        radio_proto.options[:] = option_labels
 
         # This needs to be done after register_widget because we don't want
         # the following proto fields to affect a widget's ID.
@@ -293,7 +293,7 @@ class SelectSliderMixin:
         slider_proto.max = len(opt) - 1
         slider_proto.step = 1  # default for index changes
         slider_proto.data_type = SliderProto.INT
-        slider_proto.options[:] = [str(format_func(option)) for option in opt]
+        option_labels = [str(format_func(option)) for option in opt]
         slider_proto.form_id = current_form_id(self.dg)
         if help is not None:
             slider_proto.help = dedent(help)
@@ -303,6 +303,7 @@ class SelectSliderMixin:
         widget_state = register_widget(
             "slider",
             slider_proto,
+            options=option_labels,
             user_key=key,
             on_change_handler=on_change,
             args=args,
@@ -311,6 +312,9 @@ class SelectSliderMixin:
             serializer=serde.serialize,
             ctx=ctx,
         )
+        # The options are included in the widget's ID by register_widget, so
+        # they're only set afterwards.
+        slider_proto.options[:] = option_labels
 
         # This needs to be done after register_widget because we don't want
         # the following proto fields to affect a widget's ID.
@@ -217,7 +217,7 @@ class SelectboxMixin:
         selectbox_proto = SelectboxProto()
         selectbox_proto.label = label
         selectbox_proto.default = index
-        selectbox_proto.options[:] = [str(format_func(option)) for option in opt]
+        option_labels = [str(format_func(option)) for option in opt]
         selectbox_proto.form_id = current_form_id(self.dg)
         if help is not None:
             selectbox_proto.help = dedent(help)
@@ -227,6 +227,7 @@ class SelectboxMixin:
         widget_state = register_widget(
             "selectbox",
             selectbox_proto,
+            options=option_labels,
             user_key=key,
             on_change_handler=on_change,
             args=args,
@@ -235,6 +236,9 @@ class SelectboxMixin:
             serializer=serde.serialize,
             ctx=ctx,
         )
+        # The options are included in the widget's ID by register_widget, so
+        # they're only set afterwards.
+        selectbox_proto.options[:] = option_labels
 
         # This needs to be done after register_widget because we don't want
         # the following proto fields to affect a widget's ID.
@@ -0,0 +1,181 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Non-cryptographic hashing for ForwardMsgs, cache keys, and watched files.
+
+None of these hashes need to be secure, just unique and fast, so the hash
+algorithm is configurable via the `global.hashAlgorithm` config option.
+"""
+
+import hashlib
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from typing_extensions import Final, Protocol
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+# Digest size of our BLAKE2b hashes, in bytes. 16 bytes gives us 128-bit hashes,
+# the same size as MD5's.
+_BLAKE2B_DIGEST_SIZE: Final = 16
+
+HASH_ALGORITHMS: Final = ("auto", "xxh3", "blake2b", "md5")
+
+# Buffers larger than this are hashed in chunks of this size, in parallel.
+_CHUNK_SIZE: Final = 8 * 1024 * 1024
+
+# The maximum number of threads that hash chunks.
+_MAX_CHUNK_THREADS: Final = 4
+
+
+class Hasher(Protocol):
+    """The subset of the hashlib hash object interface that we use."""
+
+    def update(self, data: bytes) -> None:
+        ...
+
+    def digest(self) -> bytes:
+        ...
+
+    def hexdigest(self) -> str:
+        ...
+
+
+def _new_blake2b() -> Hasher:
+    return hashlib.blake2b(digest_size=_BLAKE2B_DIGEST_SIZE)
+
+
+def _new_md5() -> Hasher:
+    return hashlib.new("md5")
+
+
+def _get_xxh3_factory() -> Optional[Callable[[], Hasher]]:
+    """Return a factory for xxh3 hashers, or None if xxhash isn't installed."""
+    try:
+        import xxhash
+    except ImportError:
+        return None
+    return xxhash.xxh3_128  # type: ignore[no-any-return]
+
+
+def get_hasher_factory(algorithm: str) -> Callable[[], Hasher]:
+    """Return a function that creates new hashers for the given algorithm.
+
+    Parameters
+    ----------
+    algorithm : str
+        One of HASH_ALGORITHMS. "auto" selects xxh3 if the xxhash package is
+        installed, and BLAKE2b otherwise.
+
+    Returns
+    -------
+    Callable[[], Hasher]
+
+    """
+    if algorithm == "md5":
+        return _new_md5
+    if algorithm == "blake2b":
+        return _new_blake2b
+
+    if algorithm in ("xxh3", "auto"):
+        xxh3_factory = _get_xxh3_factory()
+        if xxh3_factory is not None:
+            return xxh3_factory
+        if algorithm == "xxh3":
+            raise RuntimeError(
+                'global.hashAlgorithm is "xxh3", but the xxhash package is not '
+                "installed. Run `pip install xxhash`."
+            )
+        return _new_blake2b
+
+    raise ValueError(
+        f'Unrecognized hash algorithm "{algorithm}". Must be one of {HASH_ALGORITHMS}.'
+    )
+
+
+# This needs to be initialized lazily to avoid calling config.get_option() and
+# thus initializing config options when this file is first imported.
+_hasher_factory: Optional[Callable[[], Hasher]] = None
+
+
+def new_hasher() -> Hasher:
+    """Create a new hasher using the configured `global.hashAlgorithm`.
+
+    The algorithm is read from the config the first time this is called, and
+    stays the same for the rest of the process's lifetime: hashes computed
+    with different algorithms are never comparable.
+    """
+    global _hasher_factory
+
+    if _hasher_factory is None:
+        from streamlit import config
+
+        _hasher_factory = get_hasher_factory(config.get_option("global.hashAlgorithm"))
+
+    return _hasher_factory()
+
+
+_chunk_pool: Optional["ThreadPoolExecutor"] = None
+_chunk_pool_lock = threading.Lock()
+
+
+def _get_chunk_pool() -> Optional["ThreadPoolExecutor"]:
+    """Return the thread pool that hashes chunks, or None if there's only
+    one CPU to hash them with.
+    """
+    global _chunk_pool
+
+    num_threads = min(os.cpu_count() or 1, _MAX_CHUNK_THREADS)
+    if num_threads < 2:
+        return None
+
+    with _chunk_pool_lock:
+        if _chunk_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            _chunk_pool = ThreadPoolExecutor(
+                max_workers=num_threads, thread_name_prefix="HashChunk"
+            )
+        return _chunk_pool
+
+
+def _digest(data: Any) -> bytes:
+    hasher = new_hasher()
+    hasher.update(data)
+    return hasher.digest()
+
+
+def hash_buffer(data: Any) -> bytes:
+    """Return the digest of a C-contiguous bytes-like object.
+
+    Buffers larger than a few megabytes are split into chunks, and the
+    digests of the chunks are hashed in order. The chunks are hashed in
+    parallel if there are several CPUs, since hashlib releases the GIL while
+    it hashes large buffers. The result doesn't depend on the number of CPUs.
+    """
+    view = memoryview(data).cast("B")
+    if view.nbytes <= _CHUNK_SIZE:
+        return _digest(view)
+
+    chunks = [view[i : i + _CHUNK_SIZE] for i in range(0, view.nbytes, _CHUNK_SIZE)]
+    pool = _get_chunk_pool()
+    digests = pool.map(_digest, chunks) if pool is not None else map(_digest, chunks)
+
+    hasher = new_hasher()
+    hasher.update(b"chunks:%d:" % view.nbytes)
+    for digest in digests:
+        hasher.update(digest)
+    return hasher.digest()
@@ -0,0 +1,136 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Run callbacks when third-party modules are imported.
+
+Streamlit configures some optional libraries (e.g. it registers its chart
+themes with Altair and Plotly). Importing those libraries takes a while, so
+rather than importing them when Streamlit is imported, we configure them right
+after the app imports them.
+"""
+
+import importlib.abc
+import importlib.util
+import sys
+import threading
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+from typing_extensions import Final, TypeAlias
+
+from streamlit.logger import get_logger
+
+_LOGGER: Final = get_logger(__name__)
+
+ImportCallback: TypeAlias = Callable[[ModuleType], None]
+
+_lock = threading.Lock()
+
+# The callbacks of the modules that weren't imported yet.
+_callbacks: Dict[str, List[ImportCallback]] = {}
+
+_finder: Optional["_ImportHookFinder"] = None
+
+
+def on_import(module_name: str, callback: ImportCallback) -> None:
+    """Call `callback(module)` once the module with the given name has been
+    imported, or right away if it already was.
+
+    Exceptions raised by the callback are logged, so that they don't break
+    the import.
+    """
+    global _finder
+
+    with _lock:
+        module = sys.modules.get(module_name)
+        if module is None:
+            _callbacks.setdefault(module_name, []).append(callback)
+            if _finder is None:
+                _finder = _ImportHookFinder()
+                sys.meta_path.insert(0, _finder)
+            return
+
+    _run_callback(callback, module)
+
+
+def _run_callbacks(module: ModuleType) -> None:
+    with _lock:
+        callbacks = _callbacks.pop(module.__name__, [])
+    for callback in callbacks:
+        _run_callback(callback, module)
+
+
+def _run_callback(callback: ImportCallback, module: ModuleType) -> None:
+    try:
+        callback(module)
+    except Exception:
+        _LOGGER.exception("Failed to set up %s for Streamlit", module.__name__)
+
+
+class _ImportHookFinder(importlib.abc.MetaPathFinder):
+    """Finds modules that have callbacks with the other finders, and wraps
+    their loaders so that the callbacks are run once the modules are executed.
+    """
+
+    def __init__(self):
+        # The modules we're finding the specs of. The import system holds a
+        # per-module lock while it finds a module's spec, so concurrent
+        # imports can't find the same module at once.
+        self._finding: Set[str] = set()
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Optional[ModuleType] = None,
+    ) -> Optional[ModuleSpec]:
+        if fullname not in _callbacks or fullname in self._finding:
+            return None
+
+        # Let the other finders find the module. (While we do so, this
+        # finder ignores it.)
+        self._finding.add(fullname)
+        try:
+            spec = importlib.util.find_spec(fullname)
+        finally:
+            self._finding.discard(fullname)
+
+        if spec is None or not hasattr(spec.loader, "exec_module"):
+            return None
+
+        spec.loader = _ImportHookLoader(spec.loader)
+        return spec
+
+
+class _ImportHookLoader(importlib.abc.Loader):
+    """Wraps a module's loader, and runs the module's callbacks after the
+    loader has executed it.
+    """
+
+    def __init__(self, loader: importlib.abc.Loader):
+        self._loader = loader
+
+    def create_module(self, spec: ModuleSpec) -> Optional[ModuleType]:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        # Put the original loader back, so that the module looks like it was
+        # imported without us.
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+
+        self._loader.exec_module(module)
+        _run_callbacks(module)
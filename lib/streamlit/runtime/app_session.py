@@ -37,7 +37,12 @@ from streamlit.runtime.credentials import Credentials
 from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
 from streamlit.runtime.metrics_util import Installation
 from streamlit.runtime.script_data import ScriptData
-from streamlit.runtime.scriptrunner import RerunData, ScriptRunner, ScriptRunnerEvent
+from streamlit.runtime.scriptrunner import (
+    RerunData,
+    ScriptCache,
+    ScriptRunner,
+    ScriptRunnerEvent,
+)
 from streamlit.runtime.secrets import secrets_singleton
 from streamlit.runtime.uploaded_file_manager import UploadedFileManager
 from streamlit.version import STREAMLIT_VERSION_STRING
@@ -75,7 +80,8 @@ class AppSession:
         self,
         script_data: ScriptData,
         uploaded_file_manager: UploadedFileManager,
-        message_enqueued_callback: Optional[Callable[[], None]],
+        script_cache: ScriptCache,
+        message_enqueued_callback: Optional[Callable[[str], None]],
         local_sources_watcher: LocalSourcesWatcher,
         user_info: Dict[str, Optional[str]],
     ) -> None:
@@ -89,8 +95,13 @@ class AppSession:
         uploaded_file_manager : UploadedFileManager
             Used to manage files uploaded by users via the Streamlit web client.
 
-        message_enqueued_callback : Callable[[], None]
-            After enqueuing a message, this callable notification will be invoked.
+        script_cache : ScriptCache
+            The ScriptCache instance that holds the compiled code of the app's
+            scripts. It's shared by all of the Runtime's sessions.
+
+        message_enqueued_callback : Callable[[str], None]
+            After enqueuing a message, this callable notification will be invoked
+            with the session's ID.
 
         local_sources_watcher: LocalSourcesWatcher
             The file watcher that lets the session know local files have changed.
@@ -113,6 +124,7 @@ class AppSession:
         self._event_loop = asyncio.get_running_loop()
         self._script_data = script_data
         self._uploaded_file_mgr = uploaded_file_manager
+        self._script_cache = script_cache
 
         # The browser queue contains messages that haven't yet been
         # delivered to the browser. Periodically, the server flushes
@@ -200,8 +212,8 @@ class AppSession:
     def flush_browser_queue(self) -> List[ForwardMsg]:
         """Clear the forward message queue and return the messages it contained.
 
-        The Server calls this periodically to deliver new messages
-        to the browser connected to this app.
+        The Runtime calls this after messages have been enqueued, to deliver
+        them to the browser connected to this app.
 
         Returns
         -------
@@ -259,7 +271,7 @@ class AppSession:
 
         self._browser_queue.enqueue(msg)
         if self._message_enqueued_callback:
-            self._message_enqueued_callback()
+            self._message_enqueued_callback(self.id)
 
     def handle_backmsg(self, msg: BackMsg) -> None:
         """Process a BackMsg."""
@@ -378,8 +390,12 @@ class AppSession:
             client_state=self._client_state,
             session_state=self._session_state,
             uploaded_file_mgr=self._uploaded_file_mgr,
+            script_cache=self._script_cache,
             initial_rerun_data=initial_rerun_data,
             user_info=self._user_info,
+            thread_pool=(
+                runtime.get_instance().script_thread_pool if runtime.exists() else None
+            ),
         )
         self._scriptrunner.on_event.connect(self._on_scriptrunner_event)
         self._scriptrunner.start()
@@ -405,6 +421,11 @@ class AppSession:
 
     def _on_source_file_changed(self, filepath: Optional[str] = None) -> None:
         """One of our source files changed. Schedule a rerun if appropriate."""
+        if filepath is not None:
+            # The cache also notices changed scripts by their modification time
+            # and size, but those can miss quick successive edits.
+            self._script_cache.invalidate(filepath)
+
         if filepath is not None and not self._should_rerun_on_file_change(filepath):
             return
 
@@ -59,7 +59,7 @@ from streamlit.runtime.caching.storage.dummy_cache_storage import (
 )
 from streamlit.runtime.metrics_util import gather_metrics
 from streamlit.runtime.scriptrunner.script_run_context import get_script_run_ctx
-from streamlit.runtime.stats import CacheStat, CacheStatsProvider
+from streamlit.runtime.stats import CacheStat, CacheStatsProvider, CounterStat
 
 _LOGGER = get_logger(__name__)
 
@@ -235,6 +235,15 @@ class DataCaches(CacheStatsProvider):
             stats.extend(cache.get_stats())
         return stats
 
+    def get_counter_stats(self) -> list[CounterStat]:
+        with self._caches_lock:
+            function_caches = self._function_caches.copy()
+
+        stats: list[CounterStat] = []
+        for cache in function_caches.values():
+            stats.extend(cache.get_counter_stats())
+        return stats
+
     def validate_cache_params(
         self,
         function_name: str,
@@ -612,13 +621,15 @@ class DataCache(Cache):
             raise CacheError(f"Failed to unpickle {key}") from exc
 
     @gather_metrics("_cache_data_object")
-    def write_result(self, key: str, value: Any, messages: list[MsgData]) -> None:
+    def write_result(
+        self, key: str, value: Any, messages: list[MsgData]
+    ) -> CachedResult | None:
         """Write a value and associated messages to the cache.
         The value must be pickleable.
         """
         ctx = get_script_run_ctx()
         if ctx is None:
-            return
+            return None
 
         main_id = st._main.id
         sidebar_id = st.sidebar.id
@@ -654,6 +665,19 @@ class DataCache(Cache):
             raise CacheError(f"Failed to pickle {key}") from exc
 
         self.storage.set(key, pickled_entry)
+        return result
+
+    def share_result(self, result: CachedResult) -> Callable[[], CachedResult]:
+        """st.cache_data returns a copy of the value to every caller, so each
+        thread that waited for a computation unpickles its own copy of the
+        result. That's just the one result, rather than the function's whole
+        entry in the cache storage.
+        """
+        pickled_result = pickle.dumps(result)
+        return lambda: pickle.loads(pickled_result)
+
+    def get_counter_stats(self) -> list[CounterStat]:
+        return self.counters.get_counter_stats("st_cache_data", self.display_name)
 
     def _clear(self) -> None:
         self.storage.clear()
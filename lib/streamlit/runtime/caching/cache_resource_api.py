@@ -23,7 +23,6 @@ from datetime import timedelta
 from typing import Any, Callable, TypeVar, cast, overload
 
 from cachetools import TTLCache
-from pympler import asizeof
 from typing_extensions import TypeAlias
 
 import streamlit as st
@@ -47,7 +46,7 @@ from streamlit.runtime.caching.cached_message_replay import (
 )
 from streamlit.runtime.metrics_util import gather_metrics
 from streamlit.runtime.scriptrunner.script_run_context import get_script_run_ctx
-from streamlit.runtime.stats import CacheStat, CacheStatsProvider
+from streamlit.runtime.stats import CacheStat, CacheStatsProvider, CounterStat
 
 _LOGGER = get_logger(__name__)
 
@@ -132,6 +131,15 @@ class ResourceCaches(CacheStatsProvider):
             stats.extend(cache.get_stats())
         return stats
 
+    def get_counter_stats(self) -> list[CounterStat]:
+        with self._caches_lock:
+            function_caches = self._function_caches.copy()
+
+        stats: list[CounterStat] = []
+        for cache in function_caches.values():
+            stats.extend(cache.get_counter_stats())
+        return stats
+
 
 # Singleton ResourceCaches instance
 _resource_caches = ResourceCaches()
@@ -469,11 +477,13 @@ class ResourceCache(Cache):
             return result
 
     @gather_metrics("_cache_resource_object")
-    def write_result(self, key: str, value: Any, messages: list[MsgData]) -> None:
+    def write_result(
+        self, key: str, value: Any, messages: list[MsgData]
+    ) -> CachedResult | None:
         """Write a value and associated messages to the cache."""
         ctx = get_script_run_ctx()
         if ctx is None:
-            return
+            return None
 
         main_id = st._main.id
         sidebar_id = st.sidebar.id
@@ -498,6 +508,7 @@ class ResourceCache(Cache):
             result = CachedResult(value, messages, main_id, sidebar_id)
             multi_results.results[widget_key] = result
             self._mem_cache[key] = multi_results
+        return result
 
     def _clear(self) -> None:
         with self._mem_cache_lock:
@@ -510,6 +521,9 @@ class ResourceCache(Cache):
         with self._mem_cache_lock:
             cache_entries = list(self._mem_cache.values())
 
+        # Pympler imports numpy, which we don't want to load until it's needed.
+        from pympler import asizeof
+
         return [
             CacheStat(
                 category_name="st_cache_resource",
@@ -518,3 +532,6 @@ class ResourceCache(Cache):
             )
             for entry in cache_entries
         ]
+
+    def get_counter_stats(self) -> list[CounterStat]:
+        return self.counters.get_counter_stats("st_cache_resource", self.display_name)
@@ -16,21 +16,21 @@
 
 from __future__ import annotations
 
+import contextlib
 import functools
-import hashlib
 import inspect
 import math
 import threading
 import time
 import types
 from abc import abstractmethod
-from collections import defaultdict
 from datetime import timedelta
-from typing import Any, Callable, overload
+from timeit import default_timer as timer
+from typing import Any, Callable, ContextManager, overload
 
 from typing_extensions import Literal
 
-from streamlit import type_util
+from streamlit import hash_util, type_util
 from streamlit.elements.spinner import spinner
 from streamlit.logger import get_logger
 from streamlit.runtime.caching.cache_errors import (
@@ -50,6 +50,7 @@ from streamlit.runtime.caching.cached_message_replay import (
     replay_cached_messages,
 )
 from streamlit.runtime.caching.hashing import update_hash
+from streamlit.runtime.stats import CounterStat
 
 _LOGGER = get_logger(__name__)
 
@@ -92,12 +93,84 @@ UNEVALUATED_DATAFRAME_TYPES = (
 )
 
 
+class ValueComputation:
+    """A cached value that one thread is computing, and that other threads
+    needing the same value wait for.
+    """
+
+    def __init__(self):
+        self._done = threading.Event()
+        # The number of threads waiting for the computation. Guarded by the
+        # owning Cache's _computations_lock.
+        self.num_waiters = 0
+        self._get_shared_result: Callable[[], CachedResult] | None = None
+
+    def wait(self) -> None:
+        """Block until the computation is finished."""
+        self._done.wait()
+
+    def finish(self, get_shared_result: Callable[[], CachedResult] | None) -> None:
+        """Publish the function that gives waiting threads the computed
+        result (or None, if the computation failed).
+        """
+        self._get_shared_result = get_shared_result
+        self._done.set()
+
+    def get_shared_result(self) -> CachedResult | None:
+        """Return the computed result for a waiting thread, or None if the
+        computation failed.
+        """
+        if self._get_shared_result is None:
+            return None
+        return self._get_shared_result()
+
+
+class CacheCounters:
+    """Counts a function cache's hits, misses and waits. Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self._hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self._misses += 1
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._waits += 1
+            self._wait_seconds += seconds
+
+    def get_counter_stats(
+        self, category_name: str, cache_name: str
+    ) -> list[CounterStat]:
+        with self._lock:
+            values: list[tuple[str, int | float]] = [
+                ("cache_hits", self._hits),
+                ("cache_misses", self._misses),
+                ("cache_waits", self._waits),
+                ("cache_wait_seconds", self._wait_seconds),
+            ]
+        return [
+            CounterStat(family_name, category_name, cache_name, value)
+            for family_name, value in values
+        ]
+
+
 class Cache:
     """Function cache interface. Caches persist across script runs."""
 
     def __init__(self):
-        self._value_locks: dict[str, threading.Lock] = defaultdict(threading.Lock)
-        self._value_locks_lock = threading.Lock()
+        self._computations: dict[str, ValueComputation] = {}
+        self._computations_lock = threading.Lock()
+        self.counters = CacheCounters()
 
     @abstractmethod
     def read_result(self, value_key: str) -> CachedResult:
@@ -112,28 +185,70 @@ class Cache:
         raise NotImplementedError
 
     @abstractmethod
-    def write_result(self, value_key: str, value: Any, messages: list[MsgData]) -> None:
+    def write_result(
+        self, value_key: str, value: Any, messages: list[MsgData]
+    ) -> CachedResult | None:
         """Write a value and associated messages to the cache, overwriting any existing
         result that uses the value_key.
+
+        Returns the written result, or None if nothing was written.
         """
-        # We *could* `del self._value_locks[value_key]` here, since nobody will be taking
-        # a compute_value_lock for this value_key after the result is written.
         raise NotImplementedError
 
-    def compute_value_lock(self, value_key: str) -> threading.Lock:
-        """Return the lock that should be held while computing a new cached value.
+    def share_result(self, result: CachedResult) -> Callable[[], CachedResult]:
+        """Return a function that gives each thread that waited for a
+        computation its result. This is called as soon as the computation
+        finishes, before its result is returned to its own caller.
+
+        By default, every waiter gets the result itself.
+        """
+        return lambda: result
+
+    def start_computation(self, value_key: str) -> tuple[ValueComputation, bool]:
+        """Return the computation of the given value, and whether the caller
+        started it.
+
         In a popular app with a cache that hasn't been pre-warmed, many sessions may try
-        to access a not-yet-cached value simultaneously. We use a lock to ensure that
-        only one of those sessions computes the value, and the others block until
-        the value is computed.
+        to access a not-yet-cached value simultaneously. Only the session that starts the
+        computation computes the value. The others wait for it to finish, and receive
+        its result directly rather than reading it back from the cache.
+
+        The caller that started the computation must pass it to `finish_computation`.
         """
-        with self._value_locks_lock:
-            return self._value_locks[value_key]
+        with self._computations_lock:
+            computation = self._computations.get(value_key)
+            if computation is not None:
+                computation.num_waiters += 1
+                return computation, False
+            computation = ValueComputation()
+            self._computations[value_key] = computation
+            return computation, True
+
+    def finish_computation(
+        self,
+        value_key: str,
+        computation: ValueComputation,
+        result: CachedResult | None,
+    ) -> None:
+        """Finish a computation started with `start_computation`."""
+        with self._computations_lock:
+            if self._computations.get(value_key) is computation:
+                del self._computations[value_key]
+            num_waiters = computation.num_waiters
+
+        get_shared_result = None
+        if result is not None and num_waiters > 0:
+            try:
+                get_shared_result = self.share_result(result)
+            except Exception:
+                # The waiters will read the value from the cache instead.
+                _LOGGER.exception("Failed to share a cached result")
+        computation.finish(get_shared_result)
 
     def clear(self):
         """Clear all values from this cache."""
-        with self._value_locks_lock:
-            self._value_locks.clear()
+        with self._computations_lock:
+            self._computations.clear()
         self._clear()
 
     @abstractmethod
@@ -179,6 +294,9 @@ def make_cached_func_wrapper(info: CachedFuncInfo) -> Callable[..., Any]:
     computed, and will call the underlying function to compute and cache the
     value otherwise.
 
+    If the underlying function is a coroutine function, the wrapper is one
+    too, and caches the awaited value.
+
     The wrapper also has a `clear` function that can be called to clear
     all of the wrapper's cached values.
     """
@@ -189,9 +307,18 @@ def make_cached_func_wrapper(info: CachedFuncInfo) -> Callable[..., Any]:
     # itself results in errors when our caching decorators are used to decorate
     # member functions. (See https://github.com/streamlit/streamlit/issues/6109)
 
-    @functools.wraps(info.func)
-    def wrapper(*args, **kwargs):
-        return cached_func(*args, **kwargs)
+    wrapper: Callable[..., Any]
+    if inspect.iscoroutinefunction(info.func):
+
+        @functools.wraps(info.func)
+        async def wrapper(*args, **kwargs):
+            return await cached_func.call_async(*args, **kwargs)
+
+    else:
+
+        @functools.wraps(info.func)
+        def wrapper(*args, **kwargs):
+            return cached_func(*args, **kwargs)
 
     # Give our wrapper its `clear` function.
     # (This results in a spurious mypy error that we suppress.)
@@ -207,22 +334,33 @@ class CachedFunc:
 
     def __call__(self, *args, **kwargs) -> Any:
         """The wrapper. We'll only call our underlying function on a cache miss."""
+        with self._maybe_show_spinner(args, kwargs):
+            return self._get_or_create_cached_value(args, kwargs)
+
+    async def call_async(self, *args, **kwargs) -> Any:
+        """The wrapper for coroutine functions. We'll only await our underlying
+        function on a cache miss."""
+        with self._maybe_show_spinner(args, kwargs):
+            return await self._get_or_create_cached_value_async(args, kwargs)
+
+    def _maybe_show_spinner(
+        self, func_args: tuple[Any, ...], func_kwargs: dict[str, Any]
+    ) -> ContextManager[Any]:
+        """Return a context that shows the spinner, if it's enabled."""
+        if not (self._info.show_spinner or isinstance(self._info.show_spinner, str)):
+            return contextlib.nullcontext()
 
         name = self._info.func.__qualname__
 
         if isinstance(self._info.show_spinner, bool):
-            if len(args) == 0 and len(kwargs) == 0:
+            if len(func_args) == 0 and len(func_kwargs) == 0:
                 message = f"Running `{name}()`."
             else:
                 message = f"Running `{name}(...)`."
         else:
             message = self._info.show_spinner
 
-        if self._info.show_spinner or isinstance(self._info.show_spinner, str):
-            with spinner(message):
-                return self._get_or_create_cached_value(args, kwargs)
-        else:
-            return self._get_or_create_cached_value(args, kwargs)
+        return spinner(message)
 
     def _get_or_create_cached_value(
         self, func_args: tuple[Any, ...], func_kwargs: dict[str, Any]
@@ -243,10 +381,43 @@ class CachedFunc:
 
         try:
             cached_result = cache.read_result(value_key)
+            cache.counters.record_hit()
             return self._handle_cache_hit(cached_result)
         except CacheKeyNotFoundError:
             return self._handle_cache_miss(cache, value_key, func_args, func_kwargs)
 
+    async def _get_or_create_cached_value_async(
+        self, func_args: tuple[Any, ...], func_kwargs: dict[str, Any]
+    ) -> Any:
+        cache = self._info.get_function_cache(self._function_key)
+        value_key = _make_value_key(
+            cache_type=self._info.cache_type,
+            func=self._info.func,
+            func_args=func_args,
+            func_kwargs=func_kwargs,
+        )
+
+        try:
+            cached_result = cache.read_result(value_key)
+            cache.counters.record_hit()
+            return self._handle_cache_hit(cached_result)
+        except CacheKeyNotFoundError:
+            pass
+
+        # Unlike _handle_cache_miss, we don't wait for other callers' computations
+        # of the value: that blocks the thread, and so every other task on this
+        # event loop. So concurrent callers may each compute the value, and the
+        # last one to finish wins.
+        #
+        # We also don't record "replay messages": other tasks on the script's
+        # event loop may create elements while the coroutine is suspended, and
+        # they'd be recorded too. So elements created by a cached coroutine
+        # function aren't replayed on cache hits.
+        cache.counters.record_miss()
+        computed_value = await self._info.func(*func_args, **func_kwargs)
+        self._write_result(cache, value_key, computed_value, [])
+        return computed_value
+
     def _handle_cache_hit(self, result: CachedResult) -> Any:
         """Handle a cache hit: replay the result's cached messages, and return its value."""
         replay_cached_messages(
@@ -268,62 +439,103 @@ class CachedFunc:
         """
 
         # Implementation notes:
-        # - We take a "compute_value_lock" before computing our value. This ensures that
-        #   multiple sessions don't try to compute the same value simultaneously.
+        # - Only one thread computes a given value at a time ("single-flight"). Others
+        #   that need the value meanwhile wait for that computation, and get its result
+        #   directly, rather than each reading it back from the cache (which, for
+        #   st.cache_data, means fetching and unpickling the function's whole entry).
         #
-        # - We use a different lock for each value_key, as opposed to a single lock for
-        #   the entire cache, so that unrelated value computations don't block on each other.
+        # - Computations are tracked per value_key, so that unrelated value computations
+        #   don't block on each other.
         #
-        # - When retrieving a cache entry that may not yet exist, we use a "double-checked locking"
-        #   strategy: first we try to retrieve the cache entry without taking a value lock. (This
-        #   happens in `_get_or_create_cached_value()`.) If that fails because the value hasn't
-        #   been computed yet, we take the value lock and then immediately try to retrieve cache entry
-        #   *again*, while holding the lock. If the cache entry exists at this point, it means that
-        #   another thread computed the value before us.
+        # - When retrieving a cache entry that may not yet exist, we use a "double-checked
+        #   locking" strategy: first we try to retrieve the cache entry without starting
+        #   a computation. (This happens in `_get_or_create_cached_value()`.) If that fails
+        #   because the value hasn't been computed yet, we start a computation and then
+        #   immediately try to retrieve the cache entry *again*. If the cache entry exists
+        #   at this point, it means that another thread computed the value before us.
         #
-        #   This means that the happy path ("cache entry exists") is a wee bit faster because
-        #   no lock is acquired. But the unhappy path ("cache entry needs to be recomputed") is
-        #   a wee bit slower, because we do two lookups for the entry.
-
-        with cache.compute_value_lock(value_key):
-            # We've acquired the lock - but another thread may have acquired it first
-            # and already computed the value. So we need to test for a cache hit again,
-            # before computing.
+        # - If the computation fails, or if the function uses widgets (in which case the
+        #   result depends on each session's widget values), waiters look the value up
+        #   in the cache themselves, and compute it if it's not there.
+
+        while True:
+            computation, started = cache.start_computation(value_key)
+            if started:
+                break
+
+            wait_start = timer()
+            computation.wait()
+            cache.counters.record_wait(timer() - wait_start)
+
+            if not self._info.allow_widgets:
+                shared_result = computation.get_shared_result()
+                if shared_result is not None:
+                    return self._handle_cache_hit(shared_result)
+
+            try:
+                return self._handle_cache_hit(cache.read_result(value_key))
+            except CacheKeyNotFoundError:
+                # Try to compute the value ourselves.
+                pass
+
+        result: CachedResult | None = None
+        try:
+            # We've started the computation - but another thread may have finished
+            # its own just before. So we need to test for a cache hit again, before
+            # computing.
             try:
                 cached_result = cache.read_result(value_key)
                 # Another thread computed the value before us. Early exit!
+                cache.counters.record_hit()
+                result = cached_result
                 return self._handle_cache_hit(cached_result)
-
             except CacheKeyNotFoundError:
-                # We acquired the lock before any other thread. Compute the value!
-                with self._info.cached_message_replay_ctx.calling_cached_function(
-                    self._info.func, self._info.allow_widgets
-                ):
-                    computed_value = self._info.func(*func_args, **func_kwargs)
-
-                # We've computed our value, and now we need to write it back to the cache
-                # along with any "replay messages" that were generated during value computation.
-                messages = self._info.cached_message_replay_ctx._most_recent_messages
-                try:
-                    cache.write_result(value_key, computed_value, messages)
-                    return computed_value
-                except (CacheError, RuntimeError):
-                    # An exception was thrown while we tried to write to the cache. Report it to the user.
-                    # (We catch `RuntimeError` here because it will be raised by Apache Spark if we do not
-                    # collect dataframe before using `st.cache_data`.)
-                    if True in [
-                        type_util.is_type(computed_value, type_name)
-                        for type_name in UNEVALUATED_DATAFRAME_TYPES
-                    ]:
-                        raise UnevaluatedDataFrameError(
-                            f"""
-                            The function {get_cached_func_name_md(self._info.func)} is decorated with `st.cache_data` but it returns an unevaluated dataframe
-                            of type `{type_util.get_fqn_type(computed_value)}`. Please call `collect()` or `to_pandas()` on the dataframe before returning it,
-                            so `st.cache_data` can serialize and cache it."""
-                        )
-                    raise UnserializableReturnValueError(
-                        return_value=computed_value, func=self._info.func
-                    )
+                pass
+
+            # Compute the value!
+            cache.counters.record_miss()
+            with self._info.cached_message_replay_ctx.calling_cached_function(
+                self._info.func, self._info.allow_widgets
+            ):
+                computed_value = self._info.func(*func_args, **func_kwargs)
+
+            # We've computed our value, and now we need to write it back to the cache
+            # along with any "replay messages" that were generated during value computation.
+            messages = self._info.cached_message_replay_ctx._most_recent_messages
+            result = self._write_result(cache, value_key, computed_value, messages)
+            return computed_value
+        finally:
+            cache.finish_computation(value_key, computation, result)
+
+    def _write_result(
+        self,
+        cache: Cache,
+        value_key: str,
+        computed_value: Any,
+        messages: list[MsgData],
+    ) -> CachedResult | None:
+        """Write a newly-computed value to the cache, and return the written
+        result.
+        """
+        try:
+            return cache.write_result(value_key, computed_value, messages)
+        except (CacheError, RuntimeError):
+            # An exception was thrown while we tried to write to the cache. Report it to the user.
+            # (We catch `RuntimeError` here because it will be raised by Apache Spark if we do not
+            # collect dataframe before using `st.cache_data`.)
+            if True in [
+                type_util.is_type(computed_value, type_name)
+                for type_name in UNEVALUATED_DATAFRAME_TYPES
+            ]:
+                raise UnevaluatedDataFrameError(
+                    f"""
+                    The function {get_cached_func_name_md(self._info.func)} is decorated with `st.cache_data` but it returns an unevaluated dataframe
+                    of type `{type_util.get_fqn_type(computed_value)}`. Please call `collect()` or `to_pandas()` on the dataframe before returning it,
+                    so `st.cache_data` can serialize and cache it."""
+                )
+            raise UnserializableReturnValueError(
+                return_value=computed_value, func=self._info.func
+            )
 
     def clear(self):
         """Clear the wrapped function's associated cache."""
@@ -365,7 +577,7 @@ def _make_value_key(
     # Create the hash from each arg value, except for those args whose name
     # starts with "_". (Underscore-prefixed args are deliberately excluded from
     # hashing.)
-    args_hasher = hashlib.new("md5")
+    args_hasher = hash_util.new_hasher()
     for arg_name, arg_value in arg_pairs:
         if arg_name is not None and arg_name.startswith("_"):
             _LOGGER.debug("Not hashing %s because it starts with _", arg_name)
@@ -392,7 +604,7 @@ def _make_function_key(cache_type: CacheType, func: types.FunctionType) -> str:
     A function's key is stable across reruns of the app, and changes when
     the function's source code changes.
     """
-    func_hasher = hashlib.new("md5")
+    func_hasher = hash_util.new_hasher()
 
     # Include the function's __module__ and __qualname__ strings in the hash.
     # This means that two identical functions in different modules
@@ -15,7 +15,6 @@
 from __future__ import annotations
 
 import contextlib
-import hashlib
 import threading
 import types
 from dataclasses import dataclass
@@ -25,7 +24,7 @@ from google.protobuf.message import Message
 from typing_extensions import Protocol, runtime_checkable
 
 import streamlit as st
-from streamlit import runtime, util
+from streamlit import hash_util, runtime, util
 from streamlit.elements import NONWIDGET_ELEMENTS, WIDGETS
 from streamlit.logger import get_logger
 from streamlit.proto.Block_pb2 import Block
@@ -471,7 +470,7 @@ def _make_widget_key(widgets: list[tuple[str, Any]], cache_type: CacheType) -> s
 
     Keys are generated by hashing the IDs and values of the widgets in the given list.
     """
-    func_hasher = hashlib.new("md5")
+    func_hasher = hash_util.new_hasher()
     for widget_id_val in widgets:
         update_hash(widget_id_val, func_hasher, cache_type)
 
@@ -16,7 +16,6 @@
 import collections
 import dataclasses
 import functools
-import hashlib
 import inspect
 import io
 import os
@@ -27,20 +26,15 @@ import threading
 import unittest.mock
 import weakref
 from enum import Enum
-from typing import Any, Dict, List, Optional, Pattern
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
 
-from streamlit import type_util, util
+from streamlit import hash_util, type_util, util
 from streamlit.runtime.caching.cache_errors import UnhashableTypeError
 from streamlit.runtime.caching.cache_type import CacheType
-from streamlit.runtime.uploaded_file_manager import UploadedFile
-
-# If a dataframe has more than this many rows, we consider it large and hash a sample.
-_PANDAS_ROWS_LARGE = 100000
-_PANDAS_SAMPLE_SIZE = 10000
-
-# Similar to dataframes, we also sample large numpy arrays.
-_NP_SIZE_LARGE = 1000000
-_NP_SAMPLE_SIZE = 100000
+from streamlit.runtime.uploaded_file_manager import (
+    MemoryMappedUploadedFile,
+    UploadedFile,
+)
 
 # Arbitrary item to denote where we found a cycle in a hashed object.
 # This allows us to hash self-referencing lists, dictionaries, etc.
@@ -48,7 +42,7 @@ _CYCLE_PLACEHOLDER = b"streamlit-57R34ML17-hesamagicalponyflyingthroughthesky-CY
 
 
 def update_hash(val: Any, hasher, cache_type: CacheType) -> None:
-    """Updates a hashlib hasher with the hash of val.
+    """Updates a hash_util.Hasher with the hash of val.
 
     This is the main entrypoint to hashing.py.
     """
@@ -111,6 +105,138 @@ class _HashStacks:
 hash_stacks = _HashStacks()
 
 
+class _DigestMemo:
+    """Remembers the digests of large immutable objects, like pyarrow tables
+    and read-only numpy arrays, so that they're only hashed once.
+
+    Digests are keyed by the objects' ids, and forgotten when the objects are
+    garbage collected. Each digest is stored with a version of its object,
+    which must still match for the digest to be used.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._digests: Dict[int, Tuple[Any, bytes]] = {}
+
+    def get(self, obj: Any, version: Any, compute: Callable[[], bytes]) -> bytes:
+        key = id(obj)
+        with self._lock:
+            entry = self._digests.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        digest = compute()
+        with self._lock:
+            is_new = key not in self._digests
+            self._digests[key] = (version, digest)
+        if is_new:
+            weakref.finalize(obj, self._forget, key)
+        return digest
+
+    def _forget(self, key: int) -> None:
+        with self._lock:
+            self._digests.pop(key, None)
+
+
+_digest_memo = _DigestMemo()
+
+
+def _is_polars_data(obj: Any) -> bool:
+    # polars moved its classes between modules across versions.
+    obj_type = type(obj)
+    return obj_type.__module__.split(".")[0] == "polars" and obj_type.__name__ in (
+        "DataFrame",
+        "Series",
+    )
+
+
+def _read_only_array_version(arr: Any) -> Optional[Tuple[Any, ...]]:
+    """Return what identifies the contents of a read-only numpy array, or None
+    if the contents can change, i.e. if the array or one of its bases is
+    writeable.
+    """
+    import numpy as np
+
+    base = arr
+    while isinstance(base, np.ndarray):
+        if base.flags.writeable:
+            return None
+        base = base.base
+    if base is not None and not isinstance(base, bytes):
+        # E.g. an mmap or a buffer from another library.
+        return None
+
+    return (
+        arr.__array_interface__["data"][0],
+        arr.shape,
+        arr.strides,
+        arr.dtype.str,
+    )
+
+
+def _hash_ndarray_buffer(arr: Any) -> bytes:
+    """Hash the shape, dtype and contents of a numpy array without objects."""
+    import numpy as np
+
+    h = hash_util.new_hasher()
+    h.update(repr((arr.shape, arr.dtype.descr)).encode())
+    h.update(
+        hash_util.hash_buffer(np.ascontiguousarray(arr).reshape(-1).view(np.uint8))
+    )
+    return h.digest()
+
+
+def _arrow_type_has_dictionary(arrow_type: Any) -> bool:
+    import pyarrow as pa
+
+    if pa.types.is_dictionary(arrow_type):
+        return True
+    return any(
+        _arrow_type_has_dictionary(arrow_type.field(i).type)
+        for i in range(arrow_type.num_fields)
+    )
+
+
+def _update_with_arrow_array(h: Any, arr: Any) -> None:
+    """Update a hasher with the contents of a pyarrow.Array."""
+    import pyarrow as pa
+
+    h.update(b"%d:%d:%d:" % (arr.offset, len(arr), arr.null_count))
+
+    if pa.types.is_dictionary(arr.type):
+        _update_with_arrow_array(h, arr.indices)
+        _update_with_arrow_array(h, arr.dictionary)
+
+    elif pa.types.is_nested(arr.type) or _arrow_type_has_dictionary(arr.type):
+        # The buffers of nested arrays don't include their children's offsets,
+        # so serialize them instead.
+        batch = pa.RecordBatch.from_arrays([arr], ["a"])
+        h.update(hash_util.hash_buffer(batch.serialize()))
+
+    else:
+        # Flat arrays are hashed straight from their buffers. Together with the
+        # offset and length, these determine the array's contents.
+        for buffer in arr.buffers():
+            if buffer is None:
+                h.update(b"none")
+            else:
+                h.update(hash_util.hash_buffer(buffer))
+
+
+def _hash_arrow_table(table: Any) -> bytes:
+    """Hash the schema and contents of a pyarrow.Table or RecordBatch."""
+    h = hash_util.new_hasher()
+    h.update(table.schema.serialize())
+    h.update(b"%d:" % table.num_rows)
+    for column in table.columns:
+        # Table columns are ChunkedArrays, RecordBatch columns are Arrays.
+        chunks = column.chunks if hasattr(column, "chunks") else [column]
+        h.update(b"%d:" % len(chunks))
+        for chunk in chunks:
+            _update_with_arrow_array(h, chunk)
+    return h.digest()
+
+
 def _int_to_bytes(i: int) -> bytes:
     num_bytes = (i.bit_length() + 8) // 8
     return i.to_bytes(num_bytes, "little", signed=True)
@@ -234,13 +360,13 @@ class _CacheFuncHasher:
             return _int_to_bytes(obj)
 
         elif isinstance(obj, (list, tuple)):
-            h = hashlib.new("md5")
+            h = hash_util.new_hasher()
             for item in obj:
                 self.update(h, item)
             return h.digest()
 
         elif isinstance(obj, dict):
-            h = hashlib.new("md5")
+            h = hash_util.new_hasher()
             for item in obj.items():
                 self.update(h, item)
             return h.digest()
@@ -263,36 +389,55 @@ class _CacheFuncHasher:
         elif type_util.is_type(obj, "pandas.core.frame.DataFrame") or type_util.is_type(
             obj, "pandas.core.series.Series"
         ):
-            import pandas as pd
-
-            if len(obj) >= _PANDAS_ROWS_LARGE:
-                obj = obj.sample(n=_PANDAS_SAMPLE_SIZE, random_state=0)
-            try:
-                return b"%s" % pd.util.hash_pandas_object(obj).sum()
-            except TypeError:
+            # Dataframes are mutable, and pandas doesn't tell us when they
+            # change, so they're hashed in full every time.
+            if type_util.is_type(obj, "pandas.core.series.Series"):
+                fingerprint = type_util.data_frame_fingerprint(obj.to_frame())
+                fingerprint = f"{obj.name!r}:{fingerprint}"
+            else:
+                fingerprint = type_util.data_frame_fingerprint(obj)
+
+            if fingerprint is None:
                 # Use pickle if pandas cannot hash the object for example if
                 # it contains unhashable objects.
                 return b"%s" % pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+            return fingerprint.encode()
 
         elif type_util.is_type(obj, "numpy.ndarray"):
-            h = hashlib.new("md5")
-            self.update(h, obj.shape)
-
-            if obj.size >= _NP_SIZE_LARGE:
-                import numpy as np
+            if obj.dtype.hasobject:
+                h = hash_util.new_hasher()
+                self.update(h, obj.shape)
+                self.update(h, obj.tolist())
+                return h.digest()
+
+            version = _read_only_array_version(obj)
+            if version is None:
+                return _hash_ndarray_buffer(obj)
+            return _digest_memo.get(obj, version, lambda: _hash_ndarray_buffer(obj))
+
+        elif type_util.is_type(obj, "pyarrow.lib.Table") or type_util.is_type(
+            obj, "pyarrow.lib.RecordBatch"
+        ):
+            # Arrow data is immutable, so its digest can be reused.
+            return _digest_memo.get(obj, None, lambda: _hash_arrow_table(obj))
 
-                state = np.random.RandomState(0)
-                obj = state.choice(obj.flat, size=_NP_SAMPLE_SIZE)
+        elif _is_polars_data(obj):
+            arrow_data = obj.to_arrow()
+            if type_util.is_type(arrow_data, "pyarrow.lib.Table"):
+                return _hash_arrow_table(arrow_data)
 
-            self.update(h, obj.tobytes())
+            h = hash_util.new_hasher()
+            self.update(h, obj.name)
+            chunks = getattr(arrow_data, "chunks", [arrow_data])
+            for chunk in chunks:
+                _update_with_arrow_array(h, chunk)
             return h.digest()
-        elif type_util.is_type(obj, "PIL.Image.Image"):
-            import numpy as np
 
-            # we don't just hash the results of obj.tobytes() because we want to use
-            # the sampling logic for numpy data
-            np_array = np.frombuffer(obj.tobytes(), dtype="uint8")
-            return self.to_bytes(np_array)
+        elif type_util.is_type(obj, "PIL.Image.Image"):
+            h = hash_util.new_hasher()
+            self.update(h, (obj.mode, obj.size))
+            h.update(hash_util.hash_buffer(obj.tobytes()))
+            return h.digest()
 
         elif inspect.isbuiltin(obj):
             return bytes(obj.__name__.encode())
@@ -305,11 +450,11 @@ class _CacheFuncHasher:
         elif type_util.is_type(obj, "builtins.getset_descriptor"):
             return bytes(obj.__qualname__.encode())
 
-        elif isinstance(obj, UploadedFile):
+        elif isinstance(obj, (UploadedFile, MemoryMappedUploadedFile)):
             # UploadedFile is a BytesIO (thus IOBase) but has a name.
             # It does not have a timestamp so this must come before
             # temporary files
-            h = hashlib.new("md5")
+            h = hash_util.new_hasher()
             self.update(h, obj.name)
             self.update(h, obj.tell())
             self.update(h, obj.getvalue())
@@ -325,7 +470,7 @@ class _CacheFuncHasher:
             # on-disk and in-memory StringIO/BytesIO file representations.
             # That means that this condition must come *before* the next
             # condition, which just checks for StringIO/BytesIO.
-            h = hashlib.new("md5")
+            h = hash_util.new_hasher()
             obj_name = getattr(obj, "name", "wonthappen")  # Just to appease MyPy.
             self.update(h, obj_name)
             self.update(h, os.path.getmtime(obj_name))
@@ -338,7 +483,7 @@ class _CacheFuncHasher:
         elif isinstance(obj, io.StringIO) or isinstance(obj, io.BytesIO):
             # Hash in-memory StringIO/BytesIO by their full contents
             # and seek position.
-            h = hashlib.new("md5")
+            h = hash_util.new_hasher()
             self.update(h, obj.tell())
             self.update(h, obj.getvalue())
             return h.digest()
@@ -370,7 +515,7 @@ class _CacheFuncHasher:
             # The return value of functools.partial is not a plain function:
             # it's a callable object that remembers the original function plus
             # the values you pickled into it. So here we need to special-case it.
-            h = hashlib.new("md5")
+            h = hash_util.new_hasher()
             self.update(h, obj.args)
             self.update(h, obj.func)
             self.update(h, obj.keywords)
@@ -378,7 +523,7 @@ class _CacheFuncHasher:
 
         else:
             # As a last resort, hash the output of the object's __reduce__ method
-            h = hashlib.new("md5")
+            h = hash_util.new_hasher()
             try:
                 reduce_data = obj.__reduce__()
             except Exception as ex:
@@ -0,0 +1,286 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""MediaFileStorage implementation that stores files on disk, and keeps
+recently used files in memory."""
+
+import contextlib
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+from cachetools import LRUCache
+from typing_extensions import Final
+
+from streamlit.logger import get_logger
+from streamlit.runtime.media_file_storage import (
+    MediaFileKind,
+    MediaFileStorage,
+    MediaFileStorageError,
+)
+from streamlit.runtime.memory_media_file_storage import (
+    MemoryFile,
+    get_extension_for_mimetype,
+)
+from streamlit.runtime.stats import CacheStat, CacheStatsProvider
+
+LOGGER = get_logger(__name__)
+
+# Files are hashed, copied and served in chunks of this size.
+CHUNK_SIZE: Final = 64 * 1024
+
+
+class DiskFile(NamedTuple):
+    """A MediaFile stored on disk."""
+
+    path: str
+    content_size: int
+    mimetype: str
+    kind: MediaFileKind
+    filename: Optional[str]
+
+    def read_chunks(
+        self, start: Optional[int] = None, end: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Yield the file's content from `start` up to (but not including)
+        `end`, in chunks of at most CHUNK_SIZE bytes.
+
+        The file is memory-mapped, so only the requested range is read, and
+        it's paged in from the OS's cache as it's sent.
+        """
+        start = 0 if start is None else start
+        end = self.content_size if end is None else end
+        if start >= end:
+            return
+
+        with open(self.path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            for chunk_start in range(start, end, CHUNK_SIZE):
+                yield mapped[chunk_start : min(chunk_start + CHUNK_SIZE, end)]
+
+
+class DiskMediaFileStorage(MediaFileStorage, CacheStatsProvider):
+    def __init__(
+        self,
+        media_endpoint: str,
+        directory: Optional[str] = None,
+        max_memory_bytes: int = 0,
+    ):
+        """Create a new DiskMediaFileStorage instance
+
+        Parameters
+        ----------
+        media_endpoint
+            The name of the local endpoint that media is served from.
+            This endpoint should start with a forward-slash (e.g. "/media").
+        directory
+            The directory that files are stored in. If None, a temporary
+            directory is created, and removed when the storage is garbage
+            collected (or at exit).
+        max_memory_bytes
+            The total size of the recently used files that are also kept in
+            memory (the "hot tier"). Files are evicted from memory in least
+            recently used order, but stay on disk.
+        """
+        self._media_endpoint = media_endpoint
+
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="streamlit-media-")
+            weakref.finalize(self, shutil.rmtree, directory, ignore_errors=True)
+        else:
+            os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+
+        # Guards _files_by_id and _hot_files, which the MediaFileHandler reads
+        # from the server's thread.
+        self._lock = threading.Lock()
+        self._files_by_id: Dict[str, DiskFile] = {}
+        self._hot_files: LRUCache[str, bytes] = LRUCache(
+            maxsize=max_memory_bytes, getsizeof=len
+        )
+
+    def load_and_get_id(
+        self,
+        path_or_data: Union[str, bytes],
+        mimetype: str,
+        kind: MediaFileKind,
+        filename: Optional[str] = None,
+    ) -> str:
+        """Add a file to the storage and return its ID."""
+        # The ID is computed the same way as MemoryMediaFileStorage's (a
+        # SHA-224 of the content, mimetype and filename), but files that are
+        # passed as paths are hashed and copied in chunks, so they're never
+        # read into memory whole.
+        filehash = hashlib.new("sha224")
+        if isinstance(path_or_data, str):
+            try:
+                with open(path_or_data, "rb") as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                        filehash.update(chunk)
+            except Exception as ex:
+                raise MediaFileStorageError(f"Error opening '{path_or_data}'") from ex
+        else:
+            filehash.update(path_or_data)
+        filehash.update(bytes(mimetype.encode()))
+        if filename is not None:
+            filehash.update(bytes(filename.encode()))
+        file_id = filehash.hexdigest()
+
+        # Because our file_ids are stable, if we already have a file with the
+        # given ID, we don't need to create a new one.
+        with self._lock:
+            if file_id in self._files_by_id:
+                return file_id
+
+        LOGGER.debug("Adding media file %s", file_id)
+        path = os.path.join(self._directory, file_id)
+        tmp_path: Optional[str] = None
+        try:
+            # Write to a temporary file first, so that a file with the final
+            # name is always complete.
+            fd, tmp_path = tempfile.mkstemp(dir=self._directory)
+            with os.fdopen(fd, "wb") as f:
+                if isinstance(path_or_data, str):
+                    with open(path_or_data, "rb") as src:
+                        shutil.copyfileobj(src, f, CHUNK_SIZE)
+                else:
+                    f.write(path_or_data)
+            os.replace(tmp_path, path)
+            content_size = os.path.getsize(path)
+        except Exception as ex:
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+            raise MediaFileStorageError(f"Error storing media file {file_id}") from ex
+
+        media_file = DiskFile(
+            path=path,
+            content_size=content_size,
+            mimetype=mimetype,
+            kind=kind,
+            filename=filename,
+        )
+        with self._lock:
+            self._files_by_id[file_id] = media_file
+            if isinstance(path_or_data, bytes):
+                self._add_hot_file(file_id, path_or_data)
+
+        return file_id
+
+    def get_file(self, filename: str) -> Union[MemoryFile, DiskFile]:
+        """Return the file with the given filename. Filenames are of the
+        form "file_id.extension". (Note that this is *not* the optional
+        user-specified filename for download files.)
+
+        Files in the hot tier are returned as MemoryFiles, and others as
+        DiskFiles.
+
+        Raises a MediaFileStorageError if no such file exists.
+        """
+        file_id = os.path.splitext(filename)[0]
+        with self._lock:
+            try:
+                media_file = self._files_by_id[file_id]
+            except KeyError as e:
+                raise MediaFileStorageError(
+                    f"Bad filename '{filename}'. (No media file with id '{file_id}')"
+                ) from e
+
+            content = self._hot_files.get(file_id)
+
+        if content is None:
+            if media_file.content_size > self._hot_files.maxsize:
+                return media_file
+
+            # The file fits in the hot tier: it's read back into memory, and
+            # may evict less recently used files.
+            try:
+                with open(media_file.path, "rb") as f:
+                    content = f.read()
+            except OSError:
+                # The file was just deleted.
+                return media_file
+            with self._lock:
+                if file_id in self._files_by_id:
+                    self._add_hot_file(file_id, content)
+
+        return MemoryFile(
+            content=content,
+            mimetype=media_file.mimetype,
+            kind=media_file.kind,
+            filename=media_file.filename,
+        )
+
+    def get_url(self, file_id: str) -> str:
+        """Get a URL for a given media file. Raise a MediaFileStorageError if
+        no such file exists.
+        """
+        # Only the file's metadata is needed, so this never touches the disk:
+        # it's called for every new media file, with the MediaFileManager's
+        # lock held.
+        with self._lock:
+            media_file = self._files_by_id.get(file_id)
+        if media_file is None:
+            raise MediaFileStorageError(f"No media file with id '{file_id}'")
+
+        extension = get_extension_for_mimetype(media_file.mimetype)
+        return f"{self._media_endpoint}/{file_id}{extension}"
+
+    def delete_file(self, file_id: str) -> None:
+        """Delete the file with the given ID."""
+        with self._lock:
+            media_file = self._files_by_id.pop(file_id, None)
+            self._hot_files.pop(file_id, None)
+
+        # It's not an error to delete a file that doesn't exist.
+        if media_file is None:
+            return
+
+        # Requests that are still reading the file keep their own mapping of
+        # it, which stays valid after it's removed (except on Windows, where
+        # removing a mapped file fails).
+        try:
+            os.remove(media_file.path)
+        except OSError as ex:
+            raise MediaFileStorageError(f"Error deleting media file {file_id}") from ex
+
+    def _add_hot_file(self, file_id: str, content: bytes) -> None:
+        """Keep a file's content in memory, if it fits. Must be called with
+        the lock held.
+        """
+        if len(content) <= self._hot_files.maxsize:
+            self._hot_files[file_id] = content
+
+    def get_stats(self) -> List[CacheStat]:
+        # Only files in the hot tier take up memory. (Reading the hot tier's
+        # values would also mark them as recently used, so only its total
+        # size is reported.)
+        with self._lock:
+            hot_bytes = self._hot_files.currsize
+
+        if hot_bytes == 0:
+            return []
+        return [
+            CacheStat(
+                category_name="st_disk_media_file_storage",
+                cache_name="",
+                byte_length=int(hot_bytes),
+            )
+        ]
@@ -0,0 +1,156 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict, Optional, Set, Tuple
+
+from typing_extensions import TypeAlias
+
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.runtime.forward_msg_cache import populate_hash_if_needed
+
+DeltaPath: TypeAlias = Tuple[int, ...]
+
+# An element's content hash, and its width and height.
+Fingerprint: TypeAlias = Tuple[str, int, int]
+
+
+def create_unchanged_element_msg(msg: ForwardMsg) -> ForwardMsg:
+    """Create a ForwardMsg that tells the frontend to keep the element it
+    already has at the given new_element message's delta path.
+    """
+    unchanged_msg = ForwardMsg()
+    unchanged_msg.delta.unchanged_element = True
+    unchanged_msg.metadata.delta_path[:] = msg.metadata.delta_path
+    return unchanged_msg
+
+
+class ElementFingerprintIndex:
+    """Tracks the fingerprint of the element that a client has at each delta
+    path, so that elements that a script rerun sends again without changes can
+    be replaced with "unchanged" deltas.
+
+    The index mirrors what the frontend does with the messages it's sent:
+    - A new_element delta sets the element at its path. If a block was there,
+      its children are gone.
+    - add_block, add_rows and arrow_add_rows deltas replace or modify the
+      element at their path.
+    - A script run that finishes successfully clears the elements that weren't
+      sent during that run.
+    - A new_session message for a different page clears all elements.
+
+    So it must be given every message that's sent to the client, in order.
+    ElementFingerprintIndex is not thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._fingerprints: Dict[DeltaPath, Fingerprint] = {}
+        self._block_paths: Set[DeltaPath] = set()
+        # The paths of the elements and blocks sent during the current run.
+        self._current_run_paths: Set[DeltaPath] = set()
+        self._page_script_hash: Optional[str] = None
+
+    def process(self, msg: ForwardMsg) -> ForwardMsg:
+        """Record a message that's about to be sent to the client, and return
+        the message to send in its place. That's an "unchanged" delta for a
+        new_element message whose element the client already has, and the
+        message itself otherwise.
+        """
+        msg_type = msg.WhichOneof("type")
+        if msg_type == "delta":
+            return self._process_delta(msg)
+
+        if msg_type == "new_session":
+            if msg.new_session.page_script_hash != self._page_script_hash:
+                # The frontend clears the app when it switches pages.
+                self._fingerprints.clear()
+                self._block_paths.clear()
+            self._page_script_hash = msg.new_session.page_script_hash
+            self._current_run_paths.clear()
+
+        elif (
+            msg_type == "script_finished"
+            and msg.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY
+        ):
+            self._fingerprints = {
+                path: fingerprint
+                for path, fingerprint in self._fingerprints.items()
+                if path in self._current_run_paths
+            }
+            self._block_paths &= self._current_run_paths
+
+        return msg
+
+    def _process_delta(self, msg: ForwardMsg) -> ForwardMsg:
+        path = tuple(msg.metadata.delta_path)
+        self._current_run_paths.add(path)
+
+        delta_type = msg.delta.WhichOneof("type")
+        if delta_type == "new_element":
+            if path in self._block_paths:
+                self._remove_block(path)
+
+            fingerprint = _get_fingerprint(msg)
+            if fingerprint is None:
+                self._fingerprints.pop(path, None)
+            elif self._fingerprints.get(path) == fingerprint:
+                return create_unchanged_element_msg(msg)
+            else:
+                self._fingerprints[path] = fingerprint
+
+        elif delta_type == "add_block":
+            self._fingerprints.pop(path, None)
+            self._block_paths.add(path)
+
+        else:
+            # The frontend changes the element at the path in place.
+            self._fingerprints.pop(path, None)
+
+        return msg
+
+    def _remove_block(self, path: DeltaPath) -> None:
+        """Forget the block at the given path, along with its descendants."""
+
+        def in_block(other_path: DeltaPath) -> bool:
+            return other_path[: len(path)] == path
+
+        self._fingerprints = {
+            other_path: fingerprint
+            for other_path, fingerprint in self._fingerprints.items()
+            if not in_block(other_path)
+        }
+        self._block_paths = {
+            other_path for other_path in self._block_paths if not in_block(other_path)
+        }
+
+
+def _get_fingerprint(msg: ForwardMsg) -> Optional[Fingerprint]:
+    """Return the fingerprint of a new_element message's element, or None if
+    it must always be sent.
+    """
+    element = msg.delta.new_element
+    element_type = element.WhichOneof("type")
+    if element_type is not None and getattr(
+        getattr(element, element_type), "set_value", False
+    ):
+        # A widget whose value is set by the script must always be sent, even
+        # if it's the same as before, since the user may have changed the
+        # widget's value in the meantime.
+        return None
+
+    dimension_spec = msg.metadata.element_dimension_spec
+    return (
+        populate_hash_if_needed(msg),
+        dimension_spec.width,
+        dimension_spec.height,
+    )
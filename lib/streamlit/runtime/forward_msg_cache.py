@@ -12,13 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import hashlib
-from typing import TYPE_CHECKING, Dict, List, MutableMapping, Optional
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    MutableMapping,
+    Optional,
+)
 from weakref import WeakKeyDictionary
 
-from streamlit import config, util
+from streamlit import config, hash_util, util
 from streamlit.logger import get_logger
-from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg, ForwardMsgMetadata
 from streamlit.runtime.stats import CacheStat, CacheStatsProvider
 
 if TYPE_CHECKING:
@@ -27,6 +35,47 @@ if TYPE_CHECKING:
 LOGGER = get_logger(__name__)
 
 
+def serialize_payload(msg: ForwardMsg) -> bytes:
+    """Serialize a ForwardMsg without its hash and metadata, populating its
+    hash if needed.
+
+    The payload is what a ForwardMsg's hash is computed from. Appending the
+    serialized hash and metadata to it produces the serialized message, since
+    protobuf parsers merge concatenated messages. So a message that's hashed
+    and then sent only needs to be serialized once.
+
+    Parameters
+    ----------
+    msg : ForwardMsg
+
+    Returns
+    -------
+    bytes
+        The message's serialized payload.
+
+    """
+    # Move the message's hash and metadata aside. They're not part of the
+    # payload.
+    msg_hash = msg.hash
+    metadata = msg.metadata
+    msg.ClearField("hash")
+    msg.ClearField("metadata")
+
+    payload = msg.SerializeToString()
+
+    # Restore metadata.
+    msg.metadata.CopyFrom(metadata)
+
+    if msg_hash == "":
+        # We only need uniqueness, so a fast non-cryptographic hash will do.
+        hasher = hash_util.new_hasher()
+        hasher.update(payload)
+        msg_hash = hasher.hexdigest()
+    msg.hash = msg_hash
+
+    return payload
+
+
 def populate_hash_if_needed(msg: ForwardMsg) -> str:
     """Computes and assigns the unique hash for a ForwardMsg.
 
@@ -45,18 +94,7 @@ def populate_hash_if_needed(msg: ForwardMsg) -> str:
 
     """
     if msg.hash == "":
-        # Move the message's metadata aside. It's not part of the
-        # hash calculation.
-        metadata = msg.metadata
-        msg.ClearField("metadata")
-
-        # MD5 is good enough for what we need, which is uniqueness.
-        hasher = hashlib.md5()
-        hasher.update(msg.SerializeToString())
-        msg.hash = hasher.hexdigest()
-
-        # Restore metadata.
-        msg.metadata.CopyFrom(metadata)
+        serialize_payload(msg)
 
     return msg.hash
 
@@ -93,6 +131,12 @@ class ForwardMsgCache(CacheStatsProvider):
     rather than the message itself, to a client. Clients can then
     request messages from this cache via another endpoint.
 
+    The total size of the cached messages is bounded by the
+    `global.maxMessageCacheSize` config option. When it's exceeded, the least
+    recently used messages are evicted. An evicted message no longer counts as
+    referenced by any session, so we'll send the full message again rather
+    than a reference the client may be unable to resolve.
+
     This cache is *not* thread safe. It's intended to only be accessed by
     the server thread.
 
@@ -101,13 +145,23 @@ class ForwardMsgCache(CacheStatsProvider):
     class Entry:
         """Cache entry.
 
-        Stores the cached message, and the set of AppSessions
-        that we've sent the cached message to.
+        Stores the cached message's serialized payload and metadata, its
+        payload compressed for websocket connections, and the set of
+        AppSessions that we've sent the cached message to.
 
         """
 
-        def __init__(self, msg: ForwardMsg):
-            self.msg = msg
+        def __init__(self, msg_hash: str, payload: bytes, metadata: ForwardMsgMetadata):
+            self.payload = payload
+            self.metadata = ForwardMsgMetadata()
+            self.metadata.CopyFrom(metadata)
+            # The compressed payloads, by their compression parameters.
+            self.compressed_payloads: Dict[Hashable, bytes] = {}
+            # The size of the whole serialized message, and of its compressed
+            # payloads.
+            self.byte_length = (
+                len(payload) + ForwardMsg(hash=msg_hash, metadata=metadata).ByteSize()
+            )
             self._session_script_run_counts: MutableMapping[
                 "AppSession", int
             ] = WeakKeyDictionary()
@@ -158,13 +212,19 @@ class ForwardMsgCache(CacheStatsProvider):
             return len(self._session_script_run_counts) > 0
 
     def __init__(self):
-        self._entries: Dict[str, "ForwardMsgCache.Entry"] = {}
+        # Entries are ordered from least to most recently used.
+        self._entries: OrderedDict[str, "ForwardMsgCache.Entry"] = OrderedDict()
+        self._total_byte_length = 0
 
     def __repr__(self) -> str:
         return util.repr_(self)
 
     def add_message(
-        self, msg: ForwardMsg, session: "AppSession", script_run_count: int
+        self,
+        msg: ForwardMsg,
+        session: "AppSession",
+        script_run_count: int,
+        payload: Optional[bytes] = None,
     ) -> None:
         """Add a ForwardMsg to the cache.
 
@@ -178,18 +238,87 @@ class ForwardMsgCache(CacheStatsProvider):
         session : AppSession
         script_run_count : int
             The number of times the session's script has run
+        payload : bytes or None
+            The message's serialized payload, if the caller already has it
+            (see `serialize_payload`). Otherwise, it's serialized if the
+            message isn't cached yet.
 
         """
-        populate_hash_if_needed(msg)
+        if msg.hash == "":
+            payload = serialize_payload(msg)
         entry = self._entries.get(msg.hash, None)
         if entry is None:
-            entry = ForwardMsgCache.Entry(msg)
+            if payload is None:
+                payload = serialize_payload(msg)
+            entry = ForwardMsgCache.Entry(msg.hash, payload, msg.metadata)
             self._entries[msg.hash] = entry
+            self._total_byte_length += entry.byte_length
+            self._evict_to_budget(keep_hash=msg.hash)
+        else:
+            self._entries.move_to_end(msg.hash)
         entry.add_session_ref(session, script_run_count)
 
+    def _evict_to_budget(self, keep_hash: str) -> None:
+        """Evict least recently used entries until the cache fits within
+        `global.maxMessageCacheSize`.
+
+        The entry with the given hash is never evicted: it's the message we're
+        about to send, and clients may need to fetch it from us.
+        """
+        max_bytes = config.get_option("global.maxMessageCacheSize")
+        for msg_hash in list(self._entries.keys()):
+            if self._total_byte_length <= max_bytes:
+                return
+            if msg_hash == keep_hash:
+                continue
+
+            LOGGER.debug("Evicting entry to stay in budget [hash=%s]", msg_hash)
+            self._remove_entry(msg_hash)
+
+    def _remove_entry(self, msg_hash: str) -> None:
+        entry = self._entries.pop(msg_hash)
+        self._total_byte_length -= entry.byte_length
+
+    def get_compressed_payload(
+        self, hash: str, params: Hashable, compress: Callable[[bytes], bytes]
+    ) -> bytes:
+        """Return the payload of the message with the given ID, compressed
+        by `compress`.
+
+        The compressed payload is cached along with the message, so that
+        sending the message to many clients compresses it only once.
+
+        Parameters
+        ----------
+        hash : string
+            The id of the message. It must be in the cache.
+        params : Hashable
+            The parameters that `compress` compresses the payload with.
+        compress : Callable[[bytes], bytes]
+            Compresses the payload, if it isn't cached with these parameters.
+
+        """
+        entry = self._entries[hash]
+        compressed = entry.compressed_payloads.get(params)
+        if compressed is None:
+            compressed = compress(entry.payload)
+            entry.compressed_payloads[params] = compressed
+            entry.byte_length += len(compressed)
+            self._total_byte_length += len(compressed)
+            self._evict_to_budget(keep_hash=hash)
+        return compressed
+
+    @property
+    def total_byte_length(self) -> int:
+        """The total size, in bytes, of all the messages in the cache."""
+        return self._total_byte_length
+
     def get_message(self, hash: str) -> Optional[ForwardMsg]:
         """Return the message with the given ID if it exists in the cache.
 
+        The message is deserialized from its cached payload, so prefer
+        `get_serialized_payload` when the message is just going to be sent.
+
         Parameters
         ----------
         hash : string
@@ -201,7 +330,31 @@ class ForwardMsgCache(CacheStatsProvider):
 
         """
         entry = self._entries.get(hash, None)
-        return entry.msg if entry else None
+        if entry is None:
+            return None
+        msg = ForwardMsg()
+        msg.ParseFromString(entry.payload)
+        msg.hash = hash
+        msg.metadata.CopyFrom(entry.metadata)
+        return msg
+
+    def get_serialized_payload(self, hash: str) -> Optional[bytes]:
+        """Return the serialized payload of the message with the given ID, if
+        it exists in the cache.
+        """
+        entry = self._entries.get(hash, None)
+        return entry.payload if entry else None
+
+    def get_serialized_message(self, hash: str) -> Optional[bytes]:
+        """Return the message with the given ID, serialized to send to a
+        client, if it exists in the cache.
+        """
+        entry = self._entries.get(hash, None)
+        if entry is None:
+            return None
+        envelope = ForwardMsg(hash=hash)
+        envelope.metadata.CopyFrom(entry.metadata)
+        return entry.payload + envelope.SerializeToString()
 
     def has_message_reference(
         self, msg: ForwardMsg, session: "AppSession", script_run_count: int
@@ -251,11 +404,12 @@ class ForwardMsgCache(CacheStatsProvider):
                 if not entry.has_refs():
                     # The entry has no more references. Remove it from
                     # the cache completely.
-                    del self._entries[msg_hash]
+                    self._remove_entry(msg_hash)
 
     def clear(self) -> None:
         """Remove all entries from the cache"""
         self._entries.clear()
+        self._total_byte_length = 0
 
     def get_stats(self) -> List[CacheStat]:
         stats: List[CacheStat] = []
@@ -264,7 +418,7 @@ class ForwardMsgCache(CacheStatsProvider):
                 CacheStat(
                     category_name="ForwardMessageCache",
                     cache_name="",
-                    byte_length=entry.msg.ByteSize(),
+                    byte_length=entry.byte_length,
                 )
             )
         return stats
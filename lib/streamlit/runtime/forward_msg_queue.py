@@ -12,9 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 from typing import Any, Dict, List, Optional, Tuple
 
 from streamlit.logger import get_logger
+from streamlit.proto.Arrow_pb2 import Arrow
 from streamlit.proto.Delta_pb2 import Delta
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 
@@ -40,6 +42,15 @@ class ForwardMsgQueue:
         # an older Delta, with the same delta_path, that's still in the
         # queue).
         self._delta_index_map: Dict[Tuple[int, ...], int] = dict()
+        # A mapping of (delta_path -> _queue.indexof(msg)) for the last
+        # arrow_add_rows Delta in the queue for each element. Consecutive
+        # arrow_add_rows Deltas for the same element are coalesced into one.
+        self._add_rows_index_map: Dict[Tuple[int, ...], int] = dict()
+        # The arrow_add_rows Deltas that were coalesced into the one at the
+        # given index in the queue. Their Arrow data is only concatenated when
+        # the queue is flushed, so that coalescing many small Deltas doesn't
+        # re-serialize the same rows over and over.
+        self._pending_add_rows: Dict[int, List[ForwardMsg]] = dict()
 
     def get_debug(self) -> Dict[str, Any]:
         from google.protobuf.json_format import MessageToDict
@@ -54,6 +65,24 @@ class ForwardMsgQueue:
 
     def enqueue(self, msg: ForwardMsg) -> None:
         """Add message into queue, possibly composing it with another message."""
+        if not msg.HasField("delta"):
+            # Don't coalesce arrow_add_rows Deltas across other messages
+            # (like script_finished), which may change how they're applied.
+            self._add_rows_index_map.clear()
+            self._queue.append(msg)
+            return
+
+        delta_key = tuple(msg.metadata.delta_path)
+        if msg.delta.WhichOneof("type") == "arrow_add_rows":
+            if not self._maybe_coalesce_add_rows(delta_key, msg):
+                self._add_rows_index_map[delta_key] = len(self._queue)
+                self._queue.append(msg)
+            return
+
+        # Any other Delta for the element means that later arrow_add_rows
+        # Deltas must be applied after it.
+        self._add_rows_index_map.pop(delta_key, None)
+
         if not _is_composable_message(msg):
             self._queue.append(msg)
             return
@@ -63,7 +92,6 @@ class ForwardMsgQueue:
         # the app - we attempt to combine this new Delta into the old
         # one. This is an optimization that prevents redundant Deltas
         # from being sent to the frontend.
-        delta_key = tuple(msg.metadata.delta_path)
         if delta_key in self._delta_index_map:
             index = self._delta_index_map[delta_key]
             old_msg = self._queue[index]
@@ -80,18 +108,71 @@ class ForwardMsgQueue:
         self._delta_index_map[delta_key] = len(self._queue)
         self._queue.append(msg)
 
+    def _maybe_coalesce_add_rows(
+        self, delta_key: Tuple[int, ...], msg: ForwardMsg
+    ) -> bool:
+        """Append the rows of an arrow_add_rows Delta to the previous
+        arrow_add_rows Delta for the same element, if possible.
+
+        Returns True if the message was coalesced, and shouldn't be added to
+        the queue.
+        """
+        index = self._add_rows_index_map.get(delta_key)
+        if index is None:
+            return False
+
+        old_add_rows = self._queue[index].delta.arrow_add_rows
+        new_add_rows = msg.delta.arrow_add_rows
+        if (
+            old_add_rows.name != new_add_rows.name
+            or old_add_rows.has_name != new_add_rows.has_name
+            or old_add_rows.data.HasField("styler")
+            or new_add_rows.data.HasField("styler")
+            or not _have_same_arrow_schema(old_add_rows.data, new_add_rows.data)
+        ):
+            return False
+
+        self._pending_add_rows.setdefault(index, []).append(msg)
+        return True
+
     def clear(self) -> None:
         """Clear the queue."""
         self._queue = []
         self._delta_index_map = dict()
+        self._add_rows_index_map = dict()
+        self._pending_add_rows = dict()
 
     def flush(self) -> List[ForwardMsg]:
         """Clear the queue and return a list of the messages it contained
         before being cleared.
         """
         queue = self._queue
+        pending_add_rows = self._pending_add_rows
         self.clear()
-        return queue
+
+        if not pending_add_rows:
+            return queue
+
+        flushed: List[ForwardMsg] = []
+        for index, msg in enumerate(queue):
+            flushed.append(msg)
+            coalesced_msgs = pending_add_rows.get(index)
+            if coalesced_msgs is None:
+                continue
+
+            arrow_data = msg.delta.arrow_add_rows.data
+            try:
+                arrow_data.data = _concat_arrow_data(
+                    [
+                        arrow_data.data,
+                        *(m.delta.arrow_add_rows.data.data for m in coalesced_msgs),
+                    ]
+                )
+            except Exception:
+                # Send the Deltas as they were enqueued instead.
+                LOGGER.exception("Failed to coalesce arrow_add_rows Deltas")
+                flushed.extend(coalesced_msgs)
+        return flushed
 
 
 def _is_composable_message(msg: ForwardMsg) -> bool:
@@ -100,9 +181,11 @@ def _is_composable_message(msg: ForwardMsg) -> bool:
         # Non-delta messages are never composable.
         return False
 
-    # We never compose add_rows messages in Python, because the add_rows
-    # operation can raise errors, and we don't have a good way of handling
-    # those errors in the message queue.
+    # We never compose add_rows messages with other Deltas in Python, because
+    # the add_rows operation can raise errors, and we don't have a good way of
+    # handling those errors in the message queue. (arrow_add_rows Deltas with
+    # the same schema are coalesced with each other, though. See
+    # ForwardMsgQueue._maybe_coalesce_add_rows.)
     delta_type = msg.delta.WhichOneof("type")
     return delta_type != "add_rows" and delta_type != "arrow_add_rows"
 
@@ -141,3 +224,68 @@ def _maybe_compose_deltas(old_delta: Delta, new_delta: Delta) -> Optional[Delta]
         return new_delta
 
     return None
+
+
+def _get_range_indexes(pandas_metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the RangeIndex entries of a table's pandas metadata."""
+    return [
+        index
+        for index in pandas_metadata.get("index_columns", [])
+        if isinstance(index, dict) and index.get("kind") == "range"
+    ]
+
+
+def _have_same_arrow_schema(arrow1: Arrow, arrow2: Arrow) -> bool:
+    """True if two serialized Arrow tables can be concatenated into one table,
+    without changing how the frontend adds their rows to an element.
+    """
+    import pyarrow as pa
+
+    try:
+        schema1 = pa.ipc.open_stream(arrow1.data).schema
+        schema2 = pa.ipc.open_stream(arrow2.data).schema
+    except pa.ArrowInvalid:
+        return False
+
+    if not schema1.equals(schema2, check_metadata=False):
+        return False
+
+    pandas_metadata1 = schema1.pandas_metadata or {}
+    pandas_metadata2 = schema2.pandas_metadata or {}
+    # RangeIndexes are only stored as metadata, and will differ in their start
+    # and stop. The frontend only uses their length when adding rows, though.
+    for range_index in _get_range_indexes(pandas_metadata1) + _get_range_indexes(
+        pandas_metadata2
+    ):
+        range_index["start"] = range_index["stop"] = None
+    return pandas_metadata1 == pandas_metadata2
+
+
+def _concat_arrow_data(data: List[bytes]) -> bytes:
+    """Concatenate serialized Arrow tables with the same schema into a single
+    table with one record batch.
+    """
+    import pyarrow as pa
+
+    from streamlit import type_util
+
+    tables = [pa.ipc.open_stream(table_data).read_all() for table_data in data]
+    # The tables' schemas may only differ in their metadata, so use the first
+    # table's.
+    schema = tables[0].schema
+    table = pa.concat_tables(
+        [table.replace_schema_metadata(schema.metadata) for table in tables]
+    ).combine_chunks()
+
+    pandas_metadata = schema.pandas_metadata
+    if pandas_metadata is not None:
+        # Extend the RangeIndex to cover all rows.
+        for range_index in _get_range_indexes(pandas_metadata):
+            range_index["stop"] = (
+                range_index["start"] + table.num_rows * range_index["step"]
+            )
+        table = table.replace_schema_metadata(
+            {**schema.metadata, b"pandas": json.dumps(pandas_metadata).encode()}
+        )
+
+    return type_util._serialize_pyarrow_table(table)
@@ -40,7 +40,6 @@ from typing import (
 )
 
 from cachetools import TTLCache
-from pympler.asizeof import asizeof
 
 import streamlit as st
 from streamlit import config, file_util, util
@@ -225,6 +224,9 @@ class _MemCaches(CacheStatsProvider):
             # lock during stats-gathering.
             function_caches = self._function_caches.copy()
 
+        # Pympler imports numpy, which we don't want to load until it's needed.
+        from pympler.asizeof import asizeof
+
         stats = [
             CacheStat("st_cache", cache.display_name, asizeof(c))
             for cache in function_caches.values()
@@ -35,7 +35,10 @@ from typing import Any, Callable, Dict, List, Optional, Pattern, Type, Union
 from streamlit import config, file_util, type_util, util
 from streamlit.errors import MarkdownFormattedException, StreamlitAPIException
 from streamlit.folder_black_list import FolderBlackList
-from streamlit.runtime.uploaded_file_manager import UploadedFile
+from streamlit.runtime.uploaded_file_manager import (
+    MemoryMappedUploadedFile,
+    UploadedFile,
+)
 
 # If a dataframe has more than this many rows, we consider it large and hash a sample.
 _PANDAS_ROWS_LARGE = 100000
@@ -498,7 +501,7 @@ class _CodeHasher:
         elif type_util.is_type(obj, "builtins.getset_descriptor"):
             return bytes(obj.__qualname__.encode())
 
-        elif isinstance(obj, UploadedFile):
+        elif isinstance(obj, (UploadedFile, MemoryMappedUploadedFile)):
             # UploadedFile is a BytesIO (thus IOBase) but has a name.
             # It does not have a timestamp so this must come before
             # temporary files
@@ -19,7 +19,11 @@ import threading
 from typing import Dict, Optional, Set, Union
 
 from streamlit.logger import get_logger
-from streamlit.runtime.media_file_storage import MediaFileKind, MediaFileStorage
+from streamlit.runtime.media_file_storage import (
+    MediaFileKind,
+    MediaFileStorage,
+    MediaFileStorageError,
+)
 
 LOGGER = get_logger(__name__)
 
@@ -87,9 +91,11 @@ class MediaFileManager:
             str, Dict[str, str]
         ] = collections.defaultdict(dict)
 
-        # MediaFileManager is used from multiple threads, so all operations
-        # need to be protected with a Lock. (This is not an RLock, which
-        # means taking it multiple times from the same thread will deadlock.)
+        # MediaFileManager is used from multiple threads, so all operations on
+        # its metadata need to be protected with a Lock. (This is not an
+        # RLock, which means taking it multiple times from the same thread
+        # will deadlock.) Files are loaded into storage outside the lock, so
+        # storage implementations must be safe to call from multiple threads.
         self._lock = threading.Lock()
 
     def _get_inactive_file_ids(self) -> Set[str]:
@@ -212,19 +218,33 @@ class MediaFileManager:
         """
 
         session_id = _get_session_id()
+        kind = (
+            MediaFileKind.DOWNLOADABLE
+            if is_for_static_download
+            else MediaFileKind.MEDIA
+        )
 
-        with self._lock:
-            kind = (
-                MediaFileKind.DOWNLOADABLE
-                if is_for_static_download
-                else MediaFileKind.MEDIA
-            )
+        while True:
+            # Reading and hashing the file is the slow part of adding it, so
+            # it happens outside the lock; otherwise a large file being added
+            # by one session would hold up media in every other session.
             file_id = self._storage.load_and_get_id(
                 path_or_data, mimetype, kind, file_name
             )
-            metadata = MediaFileMetadata(kind=kind)
 
-            self._file_metadata[file_id] = metadata
-            self._files_by_session_and_coord[session_id][coordinates] = file_id
+            with self._lock:
+                try:
+                    url = self._storage.get_url(file_id)
+                except MediaFileStorageError:
+                    # An identical file that wasn't used by any session was
+                    # removed by `remove_orphaned_files` before we could
+                    # reference it, so it needs to be added again.
+                    LOGGER.debug("File %s was removed while adding it", file_id)
+                    continue
+
+                metadata = MediaFileMetadata(kind=kind)
+
+                self._file_metadata[file_id] = metadata
+                self._files_by_session_and_coord[session_id][coordinates] = file_id
 
-            return self._storage.get_url(file_id)
+                return url
@@ -332,12 +332,14 @@ def create_page_profile_message(
     exec_time: int,
     prep_time: int,
     uncaught_exception: Optional[str] = None,
+    script_cache_hit: bool = False,
 ) -> ForwardMsg:
     """Create and return the full PageProfile ForwardMsg."""
     msg = ForwardMsg()
     msg.page_profile.commands.extend(commands)
     msg.page_profile.exec_time = exec_time
     msg.page_profile.prep_time = prep_time
+    msg.page_profile.script_cache_hit = script_cache_hit
 
     msg.page_profile.headless = config.get_option("server.headless")
 
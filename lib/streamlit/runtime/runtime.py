@@ -39,7 +39,7 @@ from streamlit.runtime.caching.storage.local_disk_cache_storage import (
 from streamlit.runtime.forward_msg_cache import (
     ForwardMsgCache,
     create_reference_msg,
-    populate_hash_if_needed,
+    serialize_payload,
 )
 from streamlit.runtime.legacy_caching.caching import _mem_caches
 from streamlit.runtime.media_file_manager import MediaFileManager
@@ -47,6 +47,7 @@ from streamlit.runtime.media_file_storage import MediaFileStorage
 from streamlit.runtime.memory_session_storage import MemorySessionStorage
 from streamlit.runtime.runtime_util import is_cacheable_msg
 from streamlit.runtime.script_data import ScriptData
+from streamlit.runtime.scriptrunner import ScriptCache, ScriptThreadPool
 from streamlit.runtime.session_manager import (
     ActiveSessionInfo,
     SessionClient,
@@ -61,6 +62,7 @@ from streamlit.runtime.state import (
 from streamlit.runtime.stats import StatsManager
 from streamlit.runtime.uploaded_file_manager import UploadedFileManager
 from streamlit.runtime.websocket_session_manager import WebsocketSessionManager
+from streamlit.type_util import get_arrow_bytes_cache_stats_provider
 from streamlit.watcher import LocalSourcesWatcher
 
 if TYPE_CHECKING:
@@ -121,12 +123,6 @@ class AsyncObjects(NamedTuple):
     # Set after Runtime.stop() is called. Never cleared.
     must_stop: asyncio.Event
 
-    # Set when a client connects; cleared when we have no connected clients.
-    has_connection: asyncio.Event
-
-    # Set after a ForwardMsg is enqueued; cleared when we flush ForwardMsgs.
-    need_send_data: asyncio.Event
-
     # Completed when the Runtime has started.
     started: asyncio.Future[None]
 
@@ -134,6 +130,19 @@ class AsyncObjects(NamedTuple):
     stopped: asyncio.Future[None]
 
 
+class SessionSender(NamedTuple):
+    """Container for the asyncio objects that deliver a single session's
+    ForwardMsgs to its client.
+    """
+
+    # Set after the session enqueues a ForwardMsg; cleared when we flush the
+    # session's ForwardMsgs.
+    need_send_data: asyncio.Event
+
+    # The task running the session's send loop.
+    task: asyncio.Task[None]
+
+
 class Runtime:
     _instance: Optional[Runtime] = None
 
@@ -179,6 +188,9 @@ class Runtime:
         # to it so that it doesn't get garbage collected while running.
         self._loop_coroutine_task: Optional[asyncio.Task[None]] = None
 
+        # Mapping of AppSession.id -> SessionSender for each active session.
+        self._session_senders: Dict[str, SessionSender] = {}
+
         self._main_script_path = config.script_path
         self._command_line = config.command_line or ""
 
@@ -188,12 +200,15 @@ class Runtime:
         self._message_cache = ForwardMsgCache()
         self._uploaded_file_mgr = UploadedFileManager()
         self._uploaded_file_mgr.on_files_updated.connect(self._on_files_updated)
+        self._script_cache = ScriptCache()
+        self._script_thread_pool = _create_script_thread_pool()
         self._media_file_mgr = MediaFileManager(storage=config.media_file_storage)
         self._cache_storage_manager = config.cache_storage_manager
 
         self._session_mgr = config.session_manager_class(
             session_storage=config.session_storage,
             uploaded_file_manager=self._uploaded_file_mgr,
+            script_cache=self._script_cache,
             message_enqueued_callback=self._enqueued_some_message,
         )
 
@@ -203,6 +218,8 @@ class Runtime:
         self._stats_mgr.register_provider(_mem_caches)
         self._stats_mgr.register_provider(self._message_cache)
         self._stats_mgr.register_provider(self._uploaded_file_mgr)
+        self._stats_mgr.register_provider(self._script_thread_pool)
+        self._stats_mgr.register_provider(get_arrow_bytes_cache_stats_provider())
         self._stats_mgr.register_provider(SessionStateStatProvider(self._session_mgr))
 
     @property
@@ -225,6 +242,10 @@ class Runtime:
     def media_file_mgr(self) -> MediaFileManager:
         return self._media_file_mgr
 
+    @property
+    def script_thread_pool(self) -> ScriptThreadPool:
+        return self._script_thread_pool
+
     @property
     def stats_mgr(self) -> StatsManager:
         return self._stats_mgr
@@ -282,8 +303,6 @@ class Runtime:
         async_objs = AsyncObjects(
             eventloop=asyncio.get_running_loop(),
             must_stop=asyncio.Event(),
-            has_connection=asyncio.Event(),
-            need_send_data=asyncio.Event(),
             started=asyncio.Future(),
             stopped=asyncio.Future(),
         )
@@ -370,7 +389,7 @@ class Runtime:
             existing_session_id=existing_session_id,
         )
         self._set_state(RuntimeState.ONE_OR_MORE_SESSIONS_CONNECTED)
-        self._get_async_objs().has_connection.set()
+        self._start_session_sender(session_id)
 
         return session_id
 
@@ -411,6 +430,7 @@ class Runtime:
         -----
         Threading: UNSAFE. Must be called on the eventloop thread.
         """
+        self._stop_session_sender(session_id)
         self._session_mgr.close_session(session_id)
         self._on_session_disconnected()
 
@@ -433,6 +453,7 @@ class Runtime:
         -----
         Threading: UNSAFE. Must be called on the eventloop thread.
         """
+        self._stop_session_sender(session_id)
         self._session_mgr.disconnect_session(session_id)
         self._on_session_disconnected()
 
@@ -522,6 +543,7 @@ class Runtime:
         session = AppSession(
             script_data=ScriptData(self._main_script_path, self._command_line),
             uploaded_file_manager=self._uploaded_file_mgr,
+            script_cache=self._script_cache,
             message_enqueued_callback=self._enqueued_some_message,
             local_sources_watcher=LocalSourcesWatcher(self._main_script_path),
             user_info={"email": "test@test.com"},
@@ -574,47 +596,17 @@ class Runtime:
             # Signal that we're started and ready to accept sessions
             async_objs.started.set_result(None)
 
-            while not async_objs.must_stop.is_set():
-                if self._state == RuntimeState.NO_SESSIONS_CONNECTED:
-                    await asyncio.wait(
-                        (
-                            asyncio.create_task(async_objs.must_stop.wait()),
-                            asyncio.create_task(async_objs.has_connection.wait()),
-                        ),
-                        return_when=asyncio.FIRST_COMPLETED,
-                    )
-
-                elif self._state == RuntimeState.ONE_OR_MORE_SESSIONS_CONNECTED:
-                    async_objs.need_send_data.clear()
-
-                    for active_session_info in self._session_mgr.list_active_sessions():
-                        msg_list = active_session_info.session.flush_browser_queue()
-                        for msg in msg_list:
-                            try:
-                                self._send_message(active_session_info, msg)
-                            except SessionClientDisconnectedError:
-                                self._session_mgr.disconnect_session(
-                                    active_session_info.session.id
-                                )
-
-                            # Yield for a tick after sending a message.
-                            await asyncio.sleep(0)
-
-                    # Yield for a few milliseconds between session message
-                    # flushing.
-                    await asyncio.sleep(0.01)
-
-                else:
-                    # Break out of the thread loop if we encounter any other state.
-                    break
-
-                await asyncio.wait(
-                    (
-                        asyncio.create_task(async_objs.must_stop.wait()),
-                        asyncio.create_task(async_objs.need_send_data.wait()),
-                    ),
-                    return_when=asyncio.FIRST_COMPLETED,
-                )
+            # Each active session delivers its ForwardMsgs in its own send loop
+            # (see `_session_send_loop`), so all that's left for us to do here
+            # is to wait until we're asked to stop.
+            await async_objs.must_stop.wait()
+
+            send_tasks = [sender.task for sender in self._session_senders.values()]
+            for session_id in list(self._session_senders.keys()):
+                self._stop_session_sender(session_id)
+            # Wait for the cancelled send loops to actually finish, so that none
+            # of them is still running once we report that we've stopped.
+            await asyncio.gather(*send_tasks, return_exceptions=True)
 
             # Shut down all AppSessions.
             for session_info in self._session_mgr.list_sessions():
@@ -623,6 +615,7 @@ class Runtime:
                 # is no longer so tightly coupled to a browser tab.
                 self._session_mgr.close_session(session_info.session.id)
 
+            self._script_thread_pool.shutdown()
             self._set_state(RuntimeState.STOPPED)
             async_objs.stopped.set_result(None)
 
@@ -635,12 +628,101 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
 """
             )
 
+    def _start_session_sender(self, session_id: str) -> None:
+        """Create the send loop task for a newly connected session.
+
+        Notes
+        -----
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        self._stop_session_sender(session_id)
+
+        need_send_data = asyncio.Event()
+        # A reconnecting session may have ForwardMsgs that were enqueued while
+        # it was disconnected, so we flush its queue straight away.
+        need_send_data.set()
+
+        coroutine = self._session_send_loop(session_id, need_send_data)
+        if sys.version_info >= (3, 8, 0):
+            task = asyncio.create_task(
+                coroutine, name=f"Runtime.session_send_loop({session_id})"
+            )
+        else:
+            task = asyncio.create_task(coroutine)
+
+        self._session_senders[session_id] = SessionSender(need_send_data, task)
+
+    def _stop_session_sender(self, session_id: str) -> None:
+        """Cancel the send loop task for a session, if it has one.
+
+        Notes
+        -----
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        sender = self._session_senders.pop(session_id, None)
+        if sender is not None and sender.task is not asyncio.current_task():
+            sender.task.cancel()
+
+    async def _session_send_loop(
+        self, session_id: str, need_send_data: asyncio.Event
+    ) -> None:
+        """Deliver a single session's ForwardMsgs to its client.
+
+        Each active session gets its own send loop, so a session that's sending
+        a large number of messages (or whose client is slow to read them) doesn't
+        hold up message delivery to every other session.
+
+        Notes
+        -----
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        while True:
+            await need_send_data.wait()
+            need_send_data.clear()
+
+            session_info = self._session_mgr.get_active_session_info(session_id)
+            if session_info is None:
+                return
+
+            # An unexpected error must never end the send loop: nothing awaits
+            # its task, so the session would silently stop receiving messages.
+            try:
+                msgs = session_info.session.flush_browser_queue()
+            except Exception:
+                LOGGER.exception("Failed to flush messages [session=%s]", session_id)
+                continue
+
+            for msg in msgs:
+                try:
+                    self._send_message(session_info, msg)
+
+                    # Apply backpressure: don't write more messages to a client
+                    # that hasn't yet read the ones we've already sent it.
+                    await session_info.client.wait_for_write_buffer_to_drain()
+                except SessionClientDisconnectedError:
+                    self._stop_session_sender(session_id)
+                    self._session_mgr.disconnect_session(session_id)
+                    self._on_session_disconnected()
+                    return
+                except asyncio.CancelledError:
+                    # (CancelledError is an Exception before Python 3.8.)
+                    raise
+                except Exception:
+                    LOGGER.exception("Failed to send message [session=%s]", session_id)
+
+                # Yield for a tick after sending a message. Every session's send
+                # loop does the same, so sessions with pending messages take
+                # turns on the eventloop rather than one session's large rerun
+                # delaying everyone else's deltas.
+                await asyncio.sleep(0)
+
     def _send_message(self, session_info: ActiveSessionInfo, msg: ForwardMsg) -> None:
         """Send a message to a client.
 
         If the client is likely to have already cached the message, we may
         instead send a "reference" message that contains only the hash of the
-        message.
+        message. And if the message is a new element that's identical to the
+        one the client has at the same position, we send an "unchanged" delta.
 
         Parameters
         ----------
@@ -654,9 +736,17 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
         Threading: UNSAFE. Must be called on the eventloop thread.
         """
         msg.metadata.cacheable = is_cacheable_msg(msg)
+
         msg_to_send = msg
-        if msg.metadata.cacheable:
-            populate_hash_if_needed(msg)
+        if config.get_option("global.skipUnchangedElements"):
+            # Elements that the client already has are replaced with
+            # "unchanged" deltas, which don't need to be cached.
+            msg_to_send = session_info.element_fingerprints.process(msg)
+
+        if msg.metadata.cacheable and msg_to_send is msg:
+            # Hashing the message serializes it. Hand the serialized payload
+            # to the cache, so that it isn't serialized again for sending.
+            payload = serialize_payload(msg) if msg.hash == "" else None
 
             if self._message_cache.has_message_reference(
                 msg, session_info.session, session_info.script_run_count
@@ -671,7 +761,7 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
             # age.
             LOGGER.debug("Caching message (hash=%s)", msg.hash)
             self._message_cache.add_message(
-                msg, session_info.session, session_info.script_run_count
+                msg, session_info.session, session_info.script_run_count, payload
             )
 
         # If this was a `script_finished` message, we increment the
@@ -694,17 +784,31 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
         # Ship it off!
         session_info.client.write_forward_msg(msg_to_send)
 
-    def _enqueued_some_message(self) -> None:
+    def _enqueued_some_message(self, session_id: str) -> None:
         """Callback called by AppSession after the AppSession has enqueued a
-        message. Sets the "needs_send_data" event, which causes our core
-        loop to wake up and flush client message queues.
+        message. Sets the session's "need_send_data" event, which causes its
+        send loop to wake up and flush the session's message queue.
 
         Notes
         -----
         Threading: SAFE. May be called on any thread.
         """
         async_objs = self._get_async_objs()
-        async_objs.eventloop.call_soon_threadsafe(async_objs.need_send_data.set)
+        async_objs.eventloop.call_soon_threadsafe(self._wake_session_sender, session_id)
+
+    def _wake_session_sender(self, session_id: str) -> None:
+        """Wake up the send loop for the given session.
+
+        Sessions without a send loop (for example, disconnected sessions)
+        are ignored; their queued messages are flushed when they reconnect.
+
+        Notes
+        -----
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        sender = self._session_senders.get(session_id)
+        if sender is not None:
+            sender.need_send_data.set()
 
     def _get_async_objs(self) -> AsyncObjects:
         """Return our AsyncObjects instance. If the Runtime hasn't been
@@ -722,5 +826,13 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
             self._state == RuntimeState.ONE_OR_MORE_SESSIONS_CONNECTED
             and self._session_mgr.num_active_sessions() == 0
         ):
-            self._get_async_objs().has_connection.clear()
             self._set_state(RuntimeState.NO_SESSIONS_CONNECTED)
+
+
+def _create_script_thread_pool() -> ScriptThreadPool:
+    """Create the pool of threads that sessions run their scripts on."""
+    # (This isn't done in Runtime.__init__, where `config` is the RuntimeConfig.)
+    return ScriptThreadPool(
+        max_threads=config.get_option("runner.maxScriptThreads"),
+        thread_name="ScriptRunner.scriptThread",
+    )
@@ -14,12 +14,12 @@
 
 """Runtime-related utility functions"""
 
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 from streamlit import config
 from streamlit.errors import MarkdownFormattedException
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
-from streamlit.runtime.forward_msg_cache import populate_hash_if_needed
+from streamlit.runtime.forward_msg_cache import serialize_payload
 
 
 class MessageSizeError(MarkdownFormattedException):
@@ -60,24 +60,54 @@ def is_cacheable_msg(msg: ForwardMsg) -> bool:
     return msg.ByteSize() >= int(config.get_option("global.minCachedMessageSize"))
 
 
-def serialize_forward_msg(msg: ForwardMsg) -> bytes:
-    """Serialize a ForwardMsg to send to a client.
+def serialize_forward_msg_parts(
+    msg: ForwardMsg, payload: Optional[bytes] = None
+) -> List[bytes]:
+    """Serialize a ForwardMsg to send to a client, as a list of byte strings
+    that make up the serialized message when concatenated.
 
-    If the message is too large, it will be converted to an exception message
-    instead.
-    """
-    populate_hash_if_needed(msg)
-    msg_str = msg.SerializeToString()
+    Writing the parts separately lets large payloads be sent without copying
+    them into a new buffer first. If the message is too large, it will be
+    converted to an exception message instead.
+
+    Parameters
+    ----------
+    msg : ForwardMsg
+    payload : bytes or None
+        The message's serialized payload, if it's already known (e.g. from
+        the ForwardMsgCache). Otherwise, it's serialized here.
 
-    if len(msg_str) > get_max_message_size_bytes():
+    """
+    # Rather than serializing the whole message, we append its hash and
+    # metadata to its payload, which we needed to serialize to hash the
+    # message anyway. Protobuf parsers merge concatenated messages, so the
+    # result decodes to the same ForwardMsg.
+    if payload is None:
+        payload = serialize_payload(msg)
+    envelope = ForwardMsg(hash=msg.hash)
+    envelope.metadata.CopyFrom(msg.metadata)
+    parts = [payload, envelope.SerializeToString()]
+
+    if sum(len(part) for part in parts) > get_max_message_size_bytes():
         import streamlit.elements.exception as exception
 
         # Overwrite the offending ForwardMsg.delta with an error to display.
         # This assumes that the size limit wasn't exceeded due to metadata.
-        exception.marshall(msg.delta.new_element.exception, MessageSizeError(msg_str))
-        msg_str = msg.SerializeToString()
+        exception.marshall(
+            msg.delta.new_element.exception, MessageSizeError(b"".join(parts))
+        )
+        parts = [msg.SerializeToString()]
 
-    return msg_str
+    return parts
+
+
+def serialize_forward_msg(msg: ForwardMsg) -> bytes:
+    """Serialize a ForwardMsg to send to a client.
+
+    If the message is too large, it will be converted to an exception message
+    instead.
+    """
+    return b"".join(serialize_forward_msg_parts(msg))
 
 
 # This needs to be initialized lazily to avoid calling config.get_option() and
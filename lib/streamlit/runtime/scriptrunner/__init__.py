@@ -13,6 +13,7 @@
 # limitations under the License.
 
 # Explicitly export public symbols
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache as ScriptCache
 from streamlit.runtime.scriptrunner.script_requests import RerunData as RerunData
 from streamlit.runtime.scriptrunner.script_run_context import (
     ScriptRunContext as ScriptRunContext,
@@ -31,3 +32,6 @@ from streamlit.runtime.scriptrunner.script_runner import (
     ScriptRunnerEvent as ScriptRunnerEvent,
 )
 from streamlit.runtime.scriptrunner.script_runner import StopException as StopException
+from streamlit.runtime.scriptrunner.script_thread_pool import (
+    ScriptThreadPool as ScriptThreadPool,
+)
@@ -0,0 +1,104 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+import os
+import threading
+from typing import Any, Dict, Tuple
+
+from typing_extensions import TypeAlias
+
+from streamlit import config, source_util
+from streamlit.runtime.scriptrunner import magic
+
+# Lets scripts use `await` at the top level. Scripts that do are compiled into
+# code objects that return a coroutine, which we run on the script thread's
+# event loop. (This flag doesn't exist before Python 3.8.)
+_ALLOW_TOP_LEVEL_AWAIT_FLAG = getattr(ast, "PyCF_ALLOW_TOP_LEVEL_AWAIT", 0)
+
+# A script file's modification time and size, and whether magic was enabled
+# when it was compiled.
+_CacheKey: TypeAlias = Tuple[int, int, bool]
+
+
+class ScriptCache:
+    """Thread-safe cache of the compiled code of app scripts.
+
+    A single ScriptCache is shared by all of the Runtime's sessions, so that
+    a script that's rerun for each widget interaction in each session is only
+    read, rewritten by magic and compiled again when it changes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[_CacheKey, Any]] = {}
+
+    def get_bytecode(self, script_path: str) -> Tuple[Any, bool]:
+        """Return the compiled code of the script at the given path, and
+        whether it came from the cache.
+
+        The cached code is used as long as the script's modification time and
+        size, and the runner.magicEnabled option, are the same as when it was
+        compiled.
+
+        Raises
+        ------
+        Any Exception raised while reading, parsing or compiling the script.
+        Scripts that fail to compile aren't cached.
+        """
+        stat = os.stat(script_path)
+        magic_enabled = bool(config.get_option("runner.magicEnabled"))
+        key = (stat.st_mtime_ns, stat.st_size, magic_enabled)
+
+        with self._lock:
+            entry = self._cache.get(script_path)
+        if entry is not None and entry[0] == key:
+            return entry[1], True
+
+        with source_util.open_python_file(script_path) as f:
+            filebody = f.read()
+
+        if magic_enabled:
+            filebody = magic.add_magic(filebody, script_path)
+
+        bytecode = compile(  # type: ignore
+            filebody,
+            # Pass in the file path so it can show up in exceptions.
+            script_path,
+            # We're compiling entire blocks of Python, so we need "exec"
+            # mode (as opposed to "eval" or "single").
+            mode="exec",
+            # Allow top-level `await`, but don't inherit any other flags
+            # or "future" statements.
+            flags=_ALLOW_TOP_LEVEL_AWAIT_FLAG,
+            dont_inherit=1,
+            # Use the default optimization options.
+            optimize=-1,
+        )
+
+        # If several sessions compile the same script at once, the last one
+        # to finish wins. Their code objects are equivalent.
+        with self._lock:
+            self._cache[script_path] = (key, bytecode)
+        return bytecode, False
+
+    def invalidate(self, script_path: str) -> None:
+        """Remove the given script's compiled code from the cache."""
+        with self._lock:
+            self._cache.pop(script_path, None)
+
+    def clear(self) -> None:
+        """Remove all compiled code from the cache."""
+        with self._lock:
+            self._cache.clear()
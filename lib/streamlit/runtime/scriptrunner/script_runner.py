@@ -12,14 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import gc
+import inspect
 import sys
 import threading
 import types
 from contextlib import contextmanager
 from enum import Enum
 from timeit import default_timer as timer
-from typing import Callable, Dict, Optional
+from typing import Any, Callable, Coroutine, Dict, Optional
 
 from blinker import Signal
 
@@ -28,17 +30,19 @@ from streamlit.error_util import handle_uncaught_app_exception
 from streamlit.logger import get_logger
 from streamlit.proto.ClientState_pb2 import ClientState
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
-from streamlit.runtime.scriptrunner import magic
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
 from streamlit.runtime.scriptrunner.script_requests import (
     RerunData,
     ScriptRequests,
     ScriptRequestType,
 )
 from streamlit.runtime.scriptrunner.script_run_context import (
+    SCRIPT_RUN_CONTEXT_ATTR_NAME,
     ScriptRunContext,
     add_script_run_ctx,
     get_script_run_ctx,
 )
+from streamlit.runtime.scriptrunner.script_thread_pool import ScriptThreadPool
 from streamlit.runtime.state import (
     SCRIPT_RUN_WITHOUT_ERRORS_KEY,
     SafeSessionState,
@@ -102,8 +106,10 @@ class ScriptRunner:
         client_state: ClientState,
         session_state: SessionState,
         uploaded_file_mgr: UploadedFileManager,
+        script_cache: ScriptCache,
         initial_rerun_data: RerunData,
         user_info: Dict[str, Optional[str]],
+        thread_pool: Optional[ScriptThreadPool] = None,
     ):
         """Initialize the ScriptRunner.
 
@@ -123,6 +129,10 @@ class ScriptRunner:
         uploaded_file_mgr : UploadedFileManager
             The File manager to store the data uploaded by the file_uploader widget.
 
+        script_cache : ScriptCache
+            A ScriptCache instance, shared by all of the Runtime's sessions, that
+            holds the compiled code of the app's scripts.
+
         user_info: Dict
             A dict that contains information about the current user. For now,
             it only contains the user's email address.
@@ -134,11 +144,17 @@ class ScriptRunner:
             Information about the current user is optionally provided when a
             websocket connection is initialized via the "X-Streamlit-User" header.
 
+        thread_pool : ScriptThreadPool | None
+            The pool to run our script on. If it's None, we start a thread of
+            our own.
+
         """
         self._session_id = session_id
         self._main_script_path = main_script_path
         self._uploaded_file_mgr = uploaded_file_mgr
+        self._script_cache = script_cache
         self._user_info = user_info
+        self._thread_pool = thread_pool
 
         # Initialize SessionState with the latest widget states
         session_state.set_widgets_from_proto(client_state.widget_states)
@@ -181,8 +197,18 @@ class ScriptRunner:
         # _maybe_handle_execution_control_request.
         self._execing = False
 
-        # This is initialized in start()
+        # This is initialized in start(), or when our thread pool runs us.
         self._script_thread: Optional[threading.Thread] = None
+        self._is_started = False
+
+        # The tracer that _install_tracer installed on our thread, if any.
+        self._tracer: Optional[Callable[..., Any]] = None
+
+        # The script thread's event loop, created the first time a script
+        # needs it, and the task running the current script's coroutine (if
+        # the script uses top-level `await`).
+        self._event_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._script_task: Optional["asyncio.Task[Any]"] = None
 
     def __repr__(self) -> str:
         return util.repr_(self)
@@ -195,6 +221,7 @@ class ScriptRunner:
         Safe to call from any thread.
         """
         self._requests.request_stop()
+        self._interrupt_script_task()
 
         # "Disconnect" our SafeSessionState wrapper from its underlying
         # SessionState instance. This will cause all further session_state
@@ -221,16 +248,43 @@ class ScriptRunner:
 
         Safe to call from any thread.
         """
-        return self._requests.request_rerun(rerun_data)
+        if not self._requests.request_rerun(rerun_data):
+            return False
+        self._interrupt_script_task()
+        return True
+
+    def _interrupt_script_task(self) -> None:
+        """Cancel the script's coroutine, if it's running, so that a pending
+        STOP or RERUN request is handled at its current `await` rather than at
+        the next `st` call.
+
+        Safe to call from any thread.
+        """
+        loop = self._event_loop
+        task = self._script_task
+        if loop is None or task is None:
+            return
+        try:
+            loop.call_soon_threadsafe(task.cancel)
+        except RuntimeError:
+            # The loop was closed, so the script has already finished.
+            pass
 
     def start(self) -> None:
-        """Start a new thread to process the ScriptEventQueue.
+        """Start processing the ScriptEventQueue on a thread from our thread
+        pool, or on a new thread if we don't have a pool. If all of the pool's
+        threads are busy, we'll start once one of them is free.
 
         This must be called only once.
 
         """
-        if self._script_thread is not None:
+        if self._is_started:
             raise Exception("ScriptRunner was already started")
+        self._is_started = True
+
+        if self._thread_pool is not None:
+            self._thread_pool.submit(self._run_script_thread_in_pool)
+            return
 
         self._script_thread = threading.Thread(
             target=self._run_script_thread,
@@ -301,6 +355,9 @@ class ScriptRunner:
 
         assert request.type == ScriptRequestType.STOP
 
+        if self._event_loop is not None:
+            _log_if_error(self._close_event_loop)
+
         # Send a SHUTDOWN event before exiting. This includes the widget values
         # as they existed after our last successful script run, which the
         # AppSession will pass on to the next ScriptRunner that gets
@@ -314,6 +371,23 @@ class ScriptRunner:
             self, event=ScriptRunnerEvent.SHUTDOWN, client_state=client_state
         )
 
+    def _run_script_thread_in_pool(self) -> None:
+        """The entry point for our script thread when it's from our thread
+        pool.
+        """
+        thread = threading.current_thread()
+        self._script_thread = thread
+        try:
+            self._run_script_thread()
+        finally:
+            # The thread will go on to run other ScriptRunners. Remove what
+            # we attached to it.
+            self._script_thread = None
+            if hasattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME):
+                delattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME)
+            if self._tracer is not None and sys.gettrace() is self._tracer:
+                sys.settrace(None)
+
     def _is_in_script_thread(self) -> bool:
         """True if the calling function is running in the script thread"""
         return self._script_thread == threading.current_thread()
@@ -383,6 +457,53 @@ class ScriptRunner:
         # Python interpreters are not required to implement sys.settrace.
         if hasattr(sys, "settrace"):
             sys.settrace(trace_calls)
+            self._tracer = trace_calls
+
+    def _get_event_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the script thread's event loop, creating it if needed."""
+        assert self._is_in_script_thread()
+
+        if self._event_loop is None:
+            self._event_loop = asyncio.new_event_loop()
+            # Make the loop the thread's current one, so that scripts calling
+            # asyncio.get_event_loop() share it.
+            asyncio.set_event_loop(self._event_loop)
+        return self._event_loop
+
+    def _close_event_loop(self) -> None:
+        loop = self._event_loop
+        assert loop is not None
+        self._event_loop = None
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    def _run_script_coroutine(self, coro: Coroutine[Any, Any, Any]) -> None:
+        """Run the coroutine of a script that uses top-level `await` to
+        completion on the script thread's event loop.
+
+        STOP and RERUN requests cancel the coroutine wherever it's awaiting,
+        and are then raised as StopException and RerunException, as if the
+        script had been interrupted in an `st` call.
+        """
+        loop = self._get_event_loop()
+        task = loop.create_task(coro)
+        self._script_task = task
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            # We cancelled the task because of a pending request. This raises
+            # the corresponding ScriptControlException.
+            self._maybe_handle_execution_control_request()
+            # The script cancelled itself.
+            raise RuntimeError("The script's coroutine was cancelled.")
+        finally:
+            self._script_task = None
+            # Don't let tasks the script spawned but didn't wait for keep
+            # running in later script runs.
+            _log_if_error(lambda: _cancel_remaining_tasks(loop))
 
     @contextmanager
     def _set_execing_flag(self):
@@ -424,6 +545,7 @@ class ScriptRunner:
         main_page_info = list(pages.values())[0]
         current_page_info = None
         uncaught_exception = None
+        script_cache_hit = False
 
         if rerun_data.page_script_hash:
             current_page_info = pages.get(rerun_data.page_script_hash, None)
@@ -486,25 +608,7 @@ class ScriptRunner:
                 msg.page_not_found.page_name = rerun_data.page_name
                 ctx.enqueue(msg)
 
-            with source_util.open_python_file(script_path) as f:
-                filebody = f.read()
-
-            if config.get_option("runner.magicEnabled"):
-                filebody = magic.add_magic(filebody, script_path)
-
-            code = compile(  # type: ignore
-                filebody,
-                # Pass in the file path so it can show up in exceptions.
-                script_path,
-                # We're compiling entire blocks of Python, so we need "exec"
-                # mode (as opposed to "eval" or "single").
-                mode="exec",
-                # Don't inherit any flags or "future" statements.
-                flags=0,
-                dont_inherit=1,
-                # Use the default optimization options.
-                optimize=-1,
-            )
+            code, script_cache_hit = self._script_cache.get_bytecode(script_path)
 
         except Exception as ex:
             # We got a compile error. Send an error event and bail immediately.
@@ -562,7 +666,12 @@ class ScriptRunner:
 
                 ctx.on_script_start()
                 prep_time = timer() - start_time
-                exec(code, module.__dict__)
+                if code.co_flags & inspect.CO_COROUTINE:
+                    # The script uses top-level `await`, so evaluating it
+                    # returns a coroutine that runs its body.
+                    self._run_script_coroutine(eval(code, module.__dict__))
+                else:
+                    exec(code, module.__dict__)
                 self._session_state[SCRIPT_RUN_WITHOUT_ERRORS_KEY] = True
         except RerunException as e:
             rerun_exception_data = e.rerun_data
@@ -597,6 +706,7 @@ class ScriptRunner:
                             ctx.tracked_commands,
                             exec_time=to_microseconds(timer() - start_time),
                             prep_time=to_microseconds(prep_time),
+                            script_cache_hit=script_cache_hit,
                             uncaught_exception=type(uncaught_exception).__name__
                             if uncaught_exception
                             else None,
@@ -689,6 +799,16 @@ def _clean_problem_modules() -> None:
             pass
 
 
+def _cancel_remaining_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    """Cancel all of a loop's tasks, and wait for them to finish."""
+    tasks = asyncio.all_tasks(loop)
+    if not tasks:
+        return
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+
 def _new_module(name: str) -> types.ModuleType:
     """Create a new module with the given name."""
     return types.ModuleType(name)
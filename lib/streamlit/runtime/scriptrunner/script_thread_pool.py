@@ -0,0 +1,150 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from collections import deque
+from timeit import default_timer as timer
+from typing import Callable, Deque, List, Tuple
+
+from typing_extensions import Final
+
+from streamlit.logger import get_logger
+from streamlit.runtime.stats import CacheStat, CounterStat, GaugeStat
+
+_LOGGER: Final = get_logger(__name__)
+
+# How long a thread waits for a new job before it exits.
+_IDLE_TIMEOUT_SECS: Final = 60.0
+
+_STATS_CATEGORY_NAME: Final = "script_threads"
+
+
+class ScriptThreadPool:
+    """A pool of threads that ScriptRunners run their scripts on.
+
+    Threads are reused for new jobs, and exit when they have been idle for
+    a while or the pool is shut down. If `max_threads` is positive, at most
+    that many jobs run at once, and jobs submitted while all of them are busy
+    wait in a queue, in submission order.
+
+    ScriptThreadPool is thread-safe.
+    """
+
+    def __init__(self, max_threads: int = 0, thread_name: str = "ScriptThread"):
+        """Create a ScriptThreadPool.
+
+        Parameters
+        ----------
+        max_threads
+            The maximum number of threads. If it's 0 or less, there is no
+            maximum, and no job has to wait for a thread.
+        thread_name
+            The name of the pool's threads.
+        """
+        self._max_threads = max_threads
+        self._thread_name = thread_name
+
+        self._cond = threading.Condition()
+        # The jobs waiting for a thread, and when they were submitted.
+        self._jobs: Deque[Tuple[Callable[[], None], float]] = deque()
+        self._num_threads = 0
+        self._num_idle_threads = 0
+        self._is_shutdown = False
+
+        # The number of jobs that were started, and the total time that they
+        # waited for a thread.
+        self._num_jobs = 0
+        self._wait_secs = 0.0
+
+    def submit(self, job: Callable[[], None]) -> None:
+        """Run the given job on one of the pool's threads.
+
+        Exceptions raised by the job are logged.
+        """
+        with self._cond:
+            if self._is_shutdown:
+                raise RuntimeError("ScriptThreadPool was shut down")
+
+            self._jobs.append((job, timer()))
+            if len(self._jobs) <= self._num_idle_threads:
+                self._cond.notify()
+            elif self._max_threads <= 0 or self._num_threads < self._max_threads:
+                self._num_threads += 1
+                threading.Thread(
+                    target=self._run_thread, name=self._thread_name
+                ).start()
+            else:
+                _LOGGER.debug(
+                    "All %s script threads are busy. %s jobs are waiting.",
+                    self._num_threads,
+                    len(self._jobs),
+                )
+
+    def shutdown(self) -> None:
+        """Let the pool's threads exit once they've run the jobs that have
+        been submitted. Jobs can't be submitted after this is called.
+        """
+        with self._cond:
+            self._is_shutdown = True
+            self._cond.notify_all()
+
+    def _run_thread(self) -> None:
+        while True:
+            with self._cond:
+                self._num_idle_threads += 1
+                while not self._jobs:
+                    if self._is_shutdown or (
+                        not self._cond.wait(_IDLE_TIMEOUT_SECS) and not self._jobs
+                    ):
+                        self._num_idle_threads -= 1
+                        self._num_threads -= 1
+                        return
+                self._num_idle_threads -= 1
+
+                job, submit_time = self._jobs.popleft()
+                self._num_jobs += 1
+                self._wait_secs += timer() - submit_time
+
+            try:
+                job()
+            except BaseException as ex:
+                _LOGGER.error("Uncaught exception in a script thread", exc_info=ex)
+
+    def get_stats(self) -> List[CacheStat]:
+        # The pool doesn't hold any cached data.
+        return []
+
+    def get_counter_stats(self) -> List[CounterStat]:
+        with self._cond:
+            return [
+                CounterStat(
+                    "script_thread_jobs", _STATS_CATEGORY_NAME, "", self._num_jobs
+                ),
+                CounterStat(
+                    "script_thread_wait_seconds",
+                    _STATS_CATEGORY_NAME,
+                    "",
+                    self._wait_secs,
+                ),
+            ]
+
+    def get_gauge_stats(self) -> List[GaugeStat]:
+        with self._cond:
+            return [
+                GaugeStat("script_threads", self._num_threads),
+                GaugeStat(
+                    "script_threads_busy", self._num_threads - self._num_idle_threads
+                ),
+                GaugeStat("script_thread_queue_depth", len(self._jobs)),
+            ]
@@ -13,14 +13,16 @@
 # limitations under the License.
 
 from abc import abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Callable, Dict, List, Optional, cast
 
 from typing_extensions import Protocol
 
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime.app_session import AppSession
+from streamlit.runtime.element_fingerprint_index import ElementFingerprintIndex
 from streamlit.runtime.script_data import ScriptData
+from streamlit.runtime.scriptrunner import ScriptCache
 from streamlit.runtime.uploaded_file_manager import UploadedFileManager
 
 
@@ -40,6 +42,19 @@ class SessionClient(Protocol):
         """
         raise NotImplementedError
 
+    async def wait_for_write_buffer_to_drain(self) -> None:
+        """Wait until the client is ready to be sent more ForwardMsgs.
+
+        The Runtime awaits this after each ForwardMsg it delivers, which lets a
+        SessionClient apply backpressure when its client is reading messages more
+        slowly than they're being written. SessionClients that don't buffer their
+        writes can use this default implementation, which returns immediately.
+
+        If the SessionClient has been disconnected, it should raise a
+        SessionClientDisconnectedError.
+        """
+        return
+
 
 @dataclass
 class ActiveSessionInfo:
@@ -52,6 +67,12 @@ class ActiveSessionInfo:
     client: SessionClient
     session: AppSession
     script_run_count: int = 0
+    # The elements that the client has, so that unchanged elements don't have
+    # to be sent again. A new client (even for an existing session) starts
+    # with an empty index.
+    element_fingerprints: ElementFingerprintIndex = field(
+        default_factory=ElementFingerprintIndex
+    )
 
 
 @dataclass
@@ -66,6 +87,9 @@ class SessionInfo:
     client: Optional[SessionClient]
     session: AppSession
     script_run_count: int = 0
+    element_fingerprints: ElementFingerprintIndex = field(
+        default_factory=ElementFingerprintIndex
+    )
 
     def is_active(self) -> bool:
         return self.client is not None
@@ -208,7 +232,8 @@ class SessionManager(Protocol):
         self,
         session_storage: SessionStorage,
         uploaded_file_manager: UploadedFileManager,
-        message_enqueued_callback: Optional[Callable[[], None]],
+        script_cache: ScriptCache,
+        message_enqueued_callback: Optional[Callable[[str], None]],
     ) -> None:
         """Initialize a SessionManager with the given SessionStorage.
 
@@ -220,8 +245,13 @@ class SessionManager(Protocol):
         uploaded_file_manager
             Used to manage files uploaded by users via the Streamlit web client.
 
+        script_cache
+            The ScriptCache instance that sessions use to get their scripts'
+            compiled code.
+
         message_enqueued_callback
-            A callback invoked after a message is enqueued to be sent to a web client.
+            A callback invoked with a session's ID after a message is enqueued to be
+            sent to that session's web client.
         """
         raise NotImplementedError
 
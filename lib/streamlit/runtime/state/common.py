@@ -16,9 +16,22 @@
 from __future__ import annotations
 
 import hashlib
+import json
+import threading
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, Generic, Optional, Tuple, TypeVar, Union
-
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from cachetools import LRUCache
 from typing_extensions import Final, TypeAlias
 
 from streamlit.errors import StreamlitAPIException
@@ -132,8 +145,43 @@ class RegisterWidgetResult(Generic[T_co]):
         return cls(value=deserializer(None, ""), value_changed=False)
 
 
+# The max number of option lists whose digests are cached by
+# _get_options_digest.
+_OPTIONS_DIGEST_CACHE_SIZE: Final = 256
+
+# Dict of [hash(option labels) -> (option labels, digest)]
+_options_digest_cache: LRUCache[int, Tuple[Tuple[str, ...], bytes]] = LRUCache(
+    maxsize=_OPTIONS_DIGEST_CACHE_SIZE
+)
+_options_digest_lock = threading.Lock()
+
+
+def _get_options_digest(options: Sequence[str]) -> bytes:
+    """Return a stable digest of a widget's option labels.
+
+    Option lists are usually the same on every rerun, so digests are cached
+    by the labels' (process-local) hash. A cached digest is only used if its
+    labels are equal to the given ones, which is far cheaper than hashing
+    them again, especially when they're the same string objects as before.
+    """
+    labels = tuple(options)
+    key = hash(labels)
+    with _options_digest_lock:
+        cached = _options_digest_cache.get(key)
+    if cached is not None and cached[0] == labels:
+        return cached[1]
+
+    digest = hashlib.new("md5", json.dumps(labels).encode("utf-8")).digest()
+    with _options_digest_lock:
+        _options_digest_cache[key] = (labels, digest)
+    return digest
+
+
 def compute_widget_id(
-    element_type: str, element_proto: WidgetProto, user_key: Optional[str] = None
+    element_type: str,
+    element_proto: WidgetProto,
+    user_key: Optional[str] = None,
+    options: Optional[Sequence[str]] = None,
 ) -> str:
     """Compute the widget id for the given widget. This id is stable: a given
     set of inputs to this function will always produce the same widget id output.
@@ -144,11 +192,18 @@ def compute_widget_id(
     The widget id includes an easily identified prefix, and the user_key as a
     suffix, to make it easy to identify it and know if a key maps to it.
 
+    Widgets with options (like selectbox) pass their option labels as
+    `options`, rather than setting them in element_proto first. They're hashed
+    separately, and the digests are cached, so long option lists aren't
+    serialized again on every rerun.
+
     Does not mutate the element_proto object.
     """
     h = hashlib.new("md5")
     h.update(element_type.encode("utf-8"))
     h.update(element_proto.SerializeToString())
+    if options is not None:
+        h.update(_get_options_digest(options))
     return f"{GENERATED_WIDGET_ID_PREFIX}-{h.hexdigest()}-{user_key}"
 
 
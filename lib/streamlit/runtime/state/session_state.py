@@ -27,7 +27,6 @@ from typing import (
     cast,
 )
 
-from pympler.asizeof import asizeof
 from typing_extensions import Final, TypeAlias
 
 import streamlit as st
@@ -96,7 +95,15 @@ class WStates(MutableMapping[str, Any]):
 
         # The widget's value is serialized. We deserialize it, and return
         # the deserialized value.
+        deserialized = self.deserialize(k, wstate)
+        self.states[k] = Value(deserialized)
+        return deserialized
+
+    def deserialize(self, k: str, wstate: Serialized) -> Any:
+        """Deserialize a serialized value of the widget with the given key.
 
+        Raise a KeyError if the widget has no metadata to deserialize it with.
+        """
         metadata = self.widget_metadata.get(k)
         if metadata is None:
             # No deserializer, which should only happen if state is
@@ -125,7 +132,6 @@ class WStates(MutableMapping[str, Any]):
             )
         )
 
-        self.states[k] = Value(deserialized)
         return deserialized
 
     def __setitem__(self, k: str, v: WState) -> None:
@@ -147,6 +153,10 @@ class WStates(MutableMapping[str, Any]):
     def keys(self) -> KeysView[str]:
         return KeysView(self.states)
 
+    def clear(self) -> None:
+        # MutableMapping.clear pops (and so deserializes) every value.
+        self.states.clear()
+
     def items(self) -> set[tuple[str, Any]]:  # type: ignore[override]
         return {(k, self[k]) for k in self}
 
@@ -193,6 +203,13 @@ class WStates(MutableMapping[str, Any]):
             return item.value
 
         # Widget value is not serialized: serialize it first!
+        return self.serialize_value(k, item.value)
+
+    def serialize_value(self, k: str, value: Any) -> WidgetStateProto | None:
+        """Serialize the given value of the widget with the given id.
+
+        If the widget has no metadata, return None.
+        """
         metadata = self.widget_metadata.get(k)
         if metadata is None:
             # We're missing the widget's metadata. (Can this happen?)
@@ -202,7 +219,7 @@ class WStates(MutableMapping[str, Any]):
         widget.id = k
 
         field = metadata.value_type
-        serialized = metadata.serializer(item.value)
+        serialized = metadata.serializer(value)
         if is_array_value_field_name(field):
             arr = getattr(widget, field)
             arr.data.extend(serialized)
@@ -242,6 +259,46 @@ class WStates(MutableMapping[str, Any]):
         callback(*args, **kwargs)
 
 
+class KeyIdMapping(MutableMapping[str, str]):
+    """A mapping of user-provided widget keys to widget IDs, which keeps the
+    reverse mapping of widget IDs to keys up to date as it's modified.
+    """
+
+    def __init__(self) -> None:
+        self._key_to_id: dict[str, str] = {}
+        self._id_to_key: dict[str, str] = {}
+
+    def __getitem__(self, key: str) -> str:
+        return self._key_to_id[key]
+
+    def __setitem__(self, key: str, widget_id: str) -> None:
+        old_widget_id = self._key_to_id.get(key)
+        if old_widget_id is not None and self._id_to_key.get(old_widget_id) == key:
+            del self._id_to_key[old_widget_id]
+        self._key_to_id[key] = widget_id
+        self._id_to_key[widget_id] = key
+
+    def __delitem__(self, key: str) -> None:
+        widget_id = self._key_to_id.pop(key)
+        if self._id_to_key.get(widget_id) == key:
+            del self._id_to_key[widget_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._key_to_id)
+
+    def __len__(self) -> int:
+        return len(self._key_to_id)
+
+    def clear(self) -> None:
+        self._key_to_id.clear()
+        self._id_to_key.clear()
+
+    @property
+    def id_to_key(self) -> dict[str, str]:
+        """The mapping of widget IDs to user-provided keys. Don't modify it."""
+        return self._id_to_key
+
+
 def _missing_key_error_message(key: str) -> str:
     return (
         f'st.session_state has no key "{key}". Did you forget to initialize it? '
@@ -278,16 +335,31 @@ class SessionState:
     _new_widget_state: WStates = field(default_factory=WStates)
 
     # Keys used for widgets will be eagerly converted to the matching widget id
-    _key_id_mapping: dict[str, str] = field(default_factory=dict)
+    _key_id_mapping: KeyIdMapping = field(default_factory=KeyIdMapping)
+
+    # The widget states last received from the frontend, keyed by widget id.
+    # Widgets whose state hasn't changed since then keep their current value.
+    _last_widget_states: dict[str, WidgetStateProto] = field(default_factory=dict)
 
-    # is it possible for a value to get through this without being deserialized?
     def _compact_state(self) -> None:
         """Copy all current session_state and widget_state values into our
         _old_state dict, and then clear our current session_state and
         widget_state.
+
+        Widget values that are still serialized, because they were never
+        accessed, are copied as they are and only deserialized when they're
+        accessed.
         """
+        wid_key_map = self._reverse_key_wid_map
         for key_or_wid in self:
-            self._old_state[key_or_wid] = self[key_or_wid]
+            wstate = self._new_widget_state.states.get(key_or_wid)
+            if (
+                isinstance(wstate, Serialized)
+                and wid_key_map.get(key_or_wid) not in self._new_session_state
+            ):
+                self._old_state[key_or_wid] = wstate
+            else:
+                self._old_state[key_or_wid] = self[key_or_wid]
         self._new_session_state.clear()
         self._new_widget_state.clear()
 
@@ -297,6 +369,7 @@ class SessionState:
         self._new_session_state.clear()
         self._new_widget_state.clear()
         self._key_id_mapping.clear()
+        self._last_widget_states.clear()
 
     @property
     def filtered_state(self) -> dict[str, Any]:
@@ -327,8 +400,7 @@ class SessionState:
     @property
     def _reverse_key_wid_map(self) -> dict[str, str]:
         """Return a mapping of widget_id : widget_key."""
-        wid_key_map = {v: k for k, v in self._key_id_mapping.items()}
-        return wid_key_map
+        return self._key_id_mapping.id_to_key
 
     def _keys(self) -> set[str]:
         """All keys active in Session State, with widget keys converted
@@ -399,19 +471,29 @@ class SessionState:
         # value.
         if widget_id is not None:
             try:
-                return self._old_state[widget_id]
+                return self._get_old_value(widget_id)
             except KeyError:
                 pass
 
         if user_key is not None:
             try:
-                return self._old_state[user_key]
+                return self._get_old_value(user_key)
             except KeyError:
                 pass
 
         # We'll never get here
         raise KeyError
 
+    def _get_old_value(self, key_or_wid: str) -> Any:
+        """Get a value from _old_state, deserializing it first if it's a
+        widget value that hasn't been accessed since it was received.
+        """
+        value = self._old_state[key_or_wid]
+        if isinstance(value, Serialized):
+            value = self._new_widget_state.deserialize(key_or_wid, value)
+            self._old_state[key_or_wid] = value
+        return value
+
     def __setitem__(self, user_key: str, value: Any) -> None:
         """Set the value of the session_state entry with the given user_key.
 
@@ -457,8 +539,24 @@ class SessionState:
             del self._old_state[widget_id]
 
     def set_widgets_from_proto(self, widget_states: WidgetStatesProto) -> None:
-        """Set the value of all widgets represented in the given WidgetStatesProto."""
+        """Set the value of all widgets represented in the given WidgetStatesProto.
+
+        Widgets whose state is the same as the one last received, and whose
+        value has since been moved to _old_state, are skipped: they keep their
+        current (possibly already deserialized) value. Trigger values are
+        always set, since a button can be clicked again.
+        """
+        last_widget_states = self._last_widget_states
+        self._last_widget_states = {}
         for state in widget_states.widgets:
+            self._last_widget_states[state.id] = state
+            if (
+                state.id in self._old_state
+                and state.id not in self._new_widget_state
+                and state.WhichOneof("value") != "trigger_value"
+                and last_widget_states.get(state.id) == state
+            ):
+                continue
             self._new_widget_state.set_widget_from_proto(state)
 
     def on_script_will_rerun(self, latest_widget_states: WidgetStatesProto) -> None:
@@ -479,8 +577,12 @@ class SessionState:
         """
         from streamlit.runtime.scriptrunner import RerunException
 
+        # Only widgets with callbacks need to be checked for changes, which
+        # saves deserializing the values of all the others.
         changed_widget_ids = [
-            wid for wid in self._new_widget_state if self._widget_changed(wid)
+            wid
+            for wid in self._new_widget_state
+            if self._has_callback(wid) and self._widget_changed(wid)
         ]
         for wid in changed_widget_ids:
             try:
@@ -490,12 +592,30 @@ class SessionState:
                     "Calling st.experimental_rerun() within a callback is a no-op."
                 )
 
+    def _has_callback(self, widget_id: str) -> bool:
+        """True if the given widget has a callback."""
+        metadata = self._new_widget_state.widget_metadata.get(widget_id)
+        return metadata is not None and metadata.callback is not None
+
     def _widget_changed(self, widget_id: str) -> bool:
         """True if the given widget's value changed between the previous
         script run and the current script run.
         """
-        new_value = self._new_widget_state.get(widget_id)
+        new_wstate = self._new_widget_state.states.get(widget_id)
         old_value = self._old_state.get(widget_id)
+        if (
+            isinstance(new_wstate, Serialized)
+            and isinstance(old_value, Serialized)
+            and new_wstate.value == old_value.value
+        ):
+            # Equal serialized values don't need to be deserialized to compare.
+            return False
+
+        new_value = self._new_widget_state.get(widget_id)
+        try:
+            old_value = self._get_old_value(widget_id)
+        except KeyError:
+            old_value = None
         changed: bool = new_value != old_value
         return changed
 
@@ -544,7 +664,23 @@ class SessionState:
 
     def get_widget_states(self) -> list[WidgetStateProto]:
         """Return a list of serialized widget values for each widget with a value."""
-        return self._new_widget_state.as_widget_states()
+        states = self._new_widget_state.as_widget_states()
+
+        # Widgets whose unchanged state was skipped by set_widgets_from_proto
+        # only have a value in _old_state.
+        for widget_id, last_state in self._last_widget_states.items():
+            if (
+                widget_id in self._new_widget_state.states
+                or widget_id not in self._old_state
+            ):
+                continue
+            value = self._old_state[widget_id]
+            if isinstance(value, Serialized):
+                states.append(value.value)
+                continue
+            state = self._new_widget_state.serialize_value(widget_id, value)
+            states.append(state if state is not None else last_state)
+        return states
 
     def _get_widget_id(self, k: str) -> str:
         """Turns a value that might be a widget id or a user provided key into
@@ -603,6 +739,9 @@ class SessionState:
             return True
 
     def get_stats(self) -> list[CacheStat]:
+        # Pympler imports numpy, which we don't want to load until it's needed.
+        from pympler.asizeof import asizeof
+
         stat = CacheStat("st_session_state", "", asizeof(self))
         return [stat]
 
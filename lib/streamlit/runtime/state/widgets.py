@@ -14,7 +14,7 @@
 
 import textwrap
 from types import MappingProxyType
-from typing import TYPE_CHECKING, Dict, Mapping, Optional
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Sequence
 
 from typing_extensions import Final, TypeAlias
 
@@ -91,6 +91,7 @@ def register_widget(
     on_change_handler: Optional[WidgetCallback] = None,
     args: Optional[WidgetArgs] = None,
     kwargs: Optional[WidgetKwargs] = None,
+    options: Optional[Sequence[str]] = None,
 ) -> RegisterWidgetResult[T]:
     """Register a widget with Streamlit, and return its current value.
     NOTE: This function should be called after the proto has been filled.
@@ -122,6 +123,10 @@ def register_widget(
         args to pass to on_change_handler when invoked
     kwargs : Optional[WidgetKwargs]
         kwargs to pass to on_change_handler when invoked
+    options : Optional[Sequence[str]]
+        The widget's option labels, for widgets that have them. These are
+        included in the widget's ID, and should be set in element_proto
+        after it's registered. (See `compute_widget_id`.)
 
     Returns
     -------
@@ -147,7 +152,7 @@ def register_widget(
         For both paths a widget return value is provided, allowing the widgets
         to be used in a non-streamlit setting.
     """
-    widget_id = compute_widget_id(element_type, element_proto, user_key)
+    widget_id = compute_widget_id(element_type, element_proto, user_key, options)
     element_proto.id = widget_id
 
     # Create the widget's updated metadata, and register it with session_state.
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 from abc import abstractmethod
-from typing import List, NamedTuple
+from typing import Dict, List, NamedTuple, Tuple, Union
 
 from typing_extensions import Protocol, runtime_checkable
 
@@ -62,6 +62,115 @@ class CacheStat(NamedTuple):
         metric_point.gauge_value.int_value = self.byte_length
 
 
+class CounterStat(NamedTuple):
+    """Describes a single counter of a cache's activity.
+
+    Properties
+    ----------
+    family_name : str
+        The name of the counter's metric family - e.g. "cache_hits". Each
+        family must be described in `COUNTER_FAMILIES`.
+    category_name : str
+        A human-readable name for the cache "category" that the counter
+        belongs to - e.g. "st_cache_data".
+    cache_name : str
+        A human-readable name for cache instance that the counter belongs to.
+    value : int or float
+        The counter's total.
+    """
+
+    family_name: str
+    category_name: str
+    cache_name: str
+    value: Union[int, float]
+
+    def to_metric_str(self) -> str:
+        return '%s_total{cache_type="%s",cache="%s"} %s' % (
+            self.family_name,
+            self.category_name,
+            self.cache_name,
+            self.value,
+        )
+
+    def marshall_metric_proto(self, metric: MetricProto) -> None:
+        """Fill an OpenMetrics `Metric` protobuf object."""
+        label = metric.labels.add()
+        label.name = "cache_type"
+        label.value = self.category_name
+
+        label = metric.labels.add()
+        label.name = "cache"
+        label.value = self.cache_name
+
+        metric_point = metric.metric_points.add()
+        if isinstance(self.value, int):
+            metric_point.counter_value.int_value = self.value
+        else:
+            metric_point.counter_value.double_value = self.value
+
+
+# The help text and unit of each family of CounterStats.
+COUNTER_FAMILIES: Dict[str, Tuple[str, str]] = {
+    "cache_hits": ("Number of calls that found their value in a cache.", ""),
+    "cache_misses": ("Number of calls that computed their value.", ""),
+    "cache_waits": (
+        "Number of calls that waited for another call to compute their value.",
+        "",
+    ),
+    "cache_wait_seconds": (
+        "Total time calls spent waiting for another call to compute their value.",
+        "seconds",
+    ),
+    "script_thread_jobs": (
+        "Number of sessions' script runners that were given a thread.",
+        "",
+    ),
+    "script_thread_wait_seconds": (
+        "Total time script runners spent waiting for a free thread.",
+        "seconds",
+    ),
+}
+
+
+class GaugeStat(NamedTuple):
+    """Describes the current value of a metric that isn't tied to a cache,
+    like the number of threads in a pool.
+
+    Properties
+    ----------
+    family_name : str
+        The name of the gauge's metric family - e.g. "script_threads". Each
+        family must be described in `GAUGE_FAMILIES`.
+    value : int or float
+        The gauge's value.
+    """
+
+    family_name: str
+    value: Union[int, float]
+
+    def to_metric_str(self) -> str:
+        return "%s %s" % (self.family_name, self.value)
+
+    def marshall_metric_proto(self, metric: MetricProto) -> None:
+        """Fill an OpenMetrics `Metric` protobuf object."""
+        metric_point = metric.metric_points.add()
+        if isinstance(self.value, int):
+            metric_point.gauge_value.int_value = self.value
+        else:
+            metric_point.gauge_value.double_value = self.value
+
+
+# The help text and unit of each family of GaugeStats.
+GAUGE_FAMILIES: Dict[str, Tuple[str, str]] = {
+    "script_threads": ("Number of threads that scripts run on.", ""),
+    "script_threads_busy": ("Number of threads that are running a script.", ""),
+    "script_thread_queue_depth": (
+        "Number of script runs that are waiting for a free thread.",
+        "",
+    ),
+}
+
+
 @runtime_checkable
 class CacheStatsProvider(Protocol):
     @abstractmethod
@@ -69,6 +178,20 @@ class CacheStatsProvider(Protocol):
         raise NotImplementedError
 
 
+@runtime_checkable
+class CounterStatsProvider(Protocol):
+    @abstractmethod
+    def get_counter_stats(self) -> List[CounterStat]:
+        raise NotImplementedError
+
+
+@runtime_checkable
+class GaugeStatsProvider(Protocol):
+    @abstractmethod
+    def get_gauge_stats(self) -> List[GaugeStat]:
+        raise NotImplementedError
+
+
 class StatsManager:
     def __init__(self):
         self._cache_stats_providers: List[CacheStatsProvider] = []
@@ -86,3 +209,23 @@ class StatsManager:
         for provider in self._cache_stats_providers:
             all_stats.extend(provider.get_stats())
         return all_stats
+
+    def get_counter_stats(self) -> List[CounterStat]:
+        """Return a list containing all counters from each registered provider
+        that also implements CounterStatsProvider.
+        """
+        all_stats: List[CounterStat] = []
+        for provider in self._cache_stats_providers:
+            if isinstance(provider, CounterStatsProvider):
+                all_stats.extend(provider.get_counter_stats())
+        return all_stats
+
+    def get_gauge_stats(self) -> List[GaugeStat]:
+        """Return a list containing all gauges from each registered provider
+        that also implements GaugeStatsProvider.
+        """
+        all_stats: List[GaugeStat] = []
+        for provider in self._cache_stats_providers:
+            if isinstance(provider, GaugeStatsProvider):
+                all_stats.extend(provider.get_gauge_stats())
+        return all_stats
@@ -13,12 +13,15 @@
 # limitations under the License.
 
 import io
+import itertools
+import mmap
 import threading
-from typing import Dict, List, NamedTuple, Tuple
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Union
 
 from blinker import Signal
+from typing_extensions import TypeAlias
 
-from streamlit import util
+from streamlit import config, util
 from streamlit.logger import get_logger
 from streamlit.runtime.stats import CacheStat, CacheStatsProvider
 
@@ -26,12 +29,17 @@ LOGGER = get_logger(__name__)
 
 
 class UploadedFileRec(NamedTuple):
-    """Metadata and raw bytes for an uploaded file. Immutable."""
+    """Metadata and raw data for an uploaded file. Immutable.
+
+    Small files are kept in memory as bytes. Larger files are spooled to a
+    temporary file while they're uploaded, and their data is a read-only
+    memory map of it.
+    """
 
     id: int
     name: str
     type: str
-    data: bytes
+    data: Union[bytes, mmap.mmap]
 
 
 class UploadedFile(io.BytesIO):
@@ -43,9 +51,11 @@ class UploadedFile(io.BytesIO):
 
     def __init__(self, record: UploadedFileRec):
         # BytesIO's copy-on-write semantics doesn't seem to be mentioned in
-        # the Python docs - possibly because it's a CPython-only optimization
-        # and not guaranteed to be in other Python runtimes. But it's detailed
-        # here: https://hg.python.org/cpython/rev/79a5fbe2c78f
+        # the Python docs - possibly because it's a CPython-only
+        # optimization and not guaranteed to be in other Python runtimes.
+        # But it's detailed here: https://hg.python.org/cpython/rev/79a5fbe2c78f
+        # (Memory-mapped data is copied. Use `open_uploaded_file` to read it
+        # directly.)
         super(UploadedFile, self).__init__(record.data)
         self.id = record.id
         self.name = record.name
@@ -53,13 +63,145 @@ class UploadedFile(io.BytesIO):
         self.size = len(record.data)
 
     def __eq__(self, other: object) -> bool:
-        if not isinstance(other, UploadedFile):
+        if not isinstance(other, (UploadedFile, MemoryMappedUploadedFile)):
+            return NotImplemented
+        return self.id == other.id
+
+    def __repr__(self) -> str:
+        return util.repr_(self)
+
+
+class _MemoryMapIO(io.RawIOBase):
+    """A read-only raw stream over a memory map.
+
+    Each stream has its own position, because the mapping's is shared by
+    everything that reads it.
+    """
+
+    def __init__(self, data: mmap.mmap):
+        self._data = data
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        view = memoryview(buffer).cast("B")
+        chunk = self._data[self._pos : self._pos + len(view)]
+        view[: len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def readall(self) -> bytes:
+        chunk = self._data[self._pos :]
+        self._pos += len(chunk)
+        return chunk
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            if offset < 0:
+                raise ValueError(f"negative seek value {offset}")
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos = max(0, self._pos + offset)
+        elif whence == io.SEEK_END:
+            self._pos = max(0, len(self._data) + offset)
+        else:
+            raise ValueError(f"invalid whence ({whence}, should be 0, 1 or 2)")
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+class MemoryMappedUploadedFile(io.BufferedReader):
+    """A read-only uploaded file, whose data is a memory map of the temporary
+    file it was spooled to.
+
+    It has the same attributes as UploadedFile, and its data is read from
+    the mapping rather than copied into memory.
+    """
+
+    def __init__(self, record: UploadedFileRec):
+        assert isinstance(record.data, mmap.mmap)
+        super(MemoryMappedUploadedFile, self).__init__(_MemoryMapIO(record.data))
+        self._data = record.data
+        self._name = record.name
+        self.id = record.id
+        self.type = record.type
+        self.size = len(record.data)
+
+    # BufferedReader's `name` is a read-only property that asks its raw
+    # stream.
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def getvalue(self) -> bytes:
+        """Return the file's entire contents, like BytesIO.getvalue()."""
+        self._check_open()
+        return self._data[:]
+
+    def getbuffer(self) -> memoryview:
+        """Return a read-only view of the file's contents, like
+        BytesIO.getbuffer()."""
+        self._check_open()
+        return memoryview(self._data)
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (UploadedFile, MemoryMappedUploadedFile)):
             return NotImplemented
         return self.id == other.id
 
     def __repr__(self) -> str:
         return util.repr_(self)
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Pickled memory-mapped files are unpickled as in-memory ones.
+        record = UploadedFileRec(
+            id=self.id, name=self.name, type=self.type, data=self.getvalue()
+        )
+        return _unpickle_uploaded_file, (record, self.tell())
+
+
+def _unpickle_uploaded_file(record: UploadedFileRec, position: int) -> UploadedFile:
+    file = UploadedFile(record)
+    file.seek(position)
+    return file
+
+
+AnyUploadedFile: TypeAlias = Union[UploadedFile, MemoryMappedUploadedFile]
+
+
+def open_uploaded_file(record: UploadedFileRec) -> AnyUploadedFile:
+    """Return a new file object for reading an uploaded file: a read-only
+    MemoryMappedUploadedFile if its data is memory-mapped, and an
+    UploadedFile otherwise.
+    """
+    if isinstance(record.data, mmap.mmap):
+        return MemoryMappedUploadedFile(record)
+    return UploadedFile(record)
+
+
+class UploadedFileQuotaExceededError(Exception):
+    """Raised when there isn't room for an uploaded file within the
+    server.maxUploadedFilesSessionSize or server.maxUploadedFilesTotalSize
+    quotas.
+    """
+
+
+def _get_quota_bytes(option_name: str) -> int:
+    """Return the size quota set by the given config option, in bytes, or 0
+    if there's no quota."""
+    return int(config.get_option(option_name) * 1024 * 1024)
+
 
 class UploadedFileManager(CacheStatsProvider):
     """Holds files uploaded by users of the running Streamlit app,
@@ -78,6 +220,17 @@ class UploadedFileManager(CacheStatsProvider):
         self._file_id_counter = 1
         self._file_id_lock = threading.Lock()
 
+        # Dict of [file ID -> access number] for each file in
+        # _files_by_id. Files with lower access numbers were accessed less
+        # recently, and are evicted first.
+        self._last_access_by_id: Dict[int, int] = {}
+        self._access_counter = itertools.count()
+
+        # The total size of the files in _files_by_id, and of each session's
+        # files, for checking the quotas without adding up every file.
+        self._total_bytes = 0
+        self._bytes_by_session_id: Dict[str, int] = {}
+
         # Prevents concurrent access to the _files_by_id dict.
         # In remove_session_files(), we iterate over the dict's keys. It's
         # an error to mutate a dict while iterating; this lock prevents that.
@@ -100,6 +253,7 @@ class UploadedFileManager(CacheStatsProvider):
         session_id: str,
         widget_id: str,
         file: UploadedFileRec,
+        is_active_session: Optional[Callable[[str], bool]] = None,
     ) -> UploadedFileRec:
         """Add a file to the FileManager, and return a new UploadedFileRec
         with its ID assigned.
@@ -116,13 +270,30 @@ class UploadedFileManager(CacheStatsProvider):
             The widget ID of the FileUploader that created the file.
         file
             The file to add.
+        is_active_session
+            If given, the file is only added if it fits within the
+            server.maxUploadedFilesSessionSize and
+            server.maxUploadedFilesTotalSize quotas, as in `ensure_space`.
+            The check and the addition are atomic, so concurrent uploads
+            can't exceed the quotas together.
 
         Returns
         -------
         UploadedFileRec
             The added file, which has its unique ID assigned.
+
+        Raises
+        ------
+        UploadedFileQuotaExceededError
+            If `is_active_session` is given, and the file doesn't fit within
+            a quota.
         """
         files_by_widget = session_id, widget_id
+        inactive_session_ids = (
+            self._get_inactive_session_ids(session_id, is_active_session)
+            if is_active_session is not None
+            else None
+        )
 
         # Assign the file a unique ID
         file_id = self._get_next_file_id()
@@ -131,11 +302,19 @@ class UploadedFileManager(CacheStatsProvider):
         )
 
         with self._files_lock:
+            if inactive_session_ids is not None:
+                self._make_space(session_id, len(file.data), inactive_session_ids)
+
             file_list = self._files_by_id.get(files_by_widget, None)
             if file_list is not None:
                 file_list.append(file)
             else:
                 self._files_by_id[files_by_widget] = [file]
+            self._last_access_by_id[file.id] = next(self._access_counter)
+            self._total_bytes += len(file.data)
+            self._bytes_by_session_id[session_id] = self._bytes_by_session_id.get(
+                session_id, 0
+            ) + len(file.data)
 
         self.on_files_updated.send(session_id)
         return file
@@ -154,7 +333,11 @@ class UploadedFileManager(CacheStatsProvider):
         """
         file_list_id = (session_id, widget_id)
         with self._files_lock:
-            return self._files_by_id.get(file_list_id, []).copy()
+            file_list = self._files_by_id.get(file_list_id, []).copy()
+            access = next(self._access_counter)
+            for file in file_list:
+                self._last_access_by_id[file.id] = access
+            return file_list
 
     def get_files(
         self, session_id: str, widget_id: str, file_ids: List[int]
@@ -226,7 +409,7 @@ class UploadedFileManager(CacheStatsProvider):
             new_list = [
                 f for f in file_list if f.id > newest_file_id or f.id in active_file_ids
             ]
-            self._files_by_id[file_list_id] = new_list
+            self._replace_file_list(file_list_id, new_list)
             num_removed = len(file_list) - len(new_list)
 
         if num_removed > 0:
@@ -252,7 +435,7 @@ class UploadedFileManager(CacheStatsProvider):
 
             # Remove the file from its list.
             new_file_list = [file for file in file_list if file.id != file_id]
-            self._files_by_id[file_list_id] = new_file_list
+            self._replace_file_list(file_list_id, new_file_list)
 
         self.on_files_updated.send(session_id)
         return True
@@ -267,7 +450,7 @@ class UploadedFileManager(CacheStatsProvider):
         """
         files_by_widget = session_id, widget_id
         with self._files_lock:
-            self._files_by_id.pop(files_by_widget, None)
+            self._replace_file_list(files_by_widget, None)
 
     def remove_files(self, session_id: str, widget_id: str) -> None:
         """Remove the file list for the provided widget in the
@@ -306,6 +489,144 @@ class UploadedFileManager(CacheStatsProvider):
             if files_id[0] == session_id:
                 self.remove_files(*files_id)
 
+    def _replace_file_list(
+        self, files_id: Tuple[str, str], new_file_list: Optional[List[UploadedFileRec]]
+    ) -> None:
+        """Replace the file list with the given ID, or remove it if
+        new_file_list is None. The access numbers and sizes of the files that
+        aren't in new_file_list are removed.
+
+        Thread safety: callers must hold `self._files_lock`.
+        """
+        if new_file_list is None:
+            old_file_list = self._files_by_id.pop(files_id, [])
+        else:
+            old_file_list = self._files_by_id.get(files_id, [])
+            self._files_by_id[files_id] = new_file_list
+
+        new_file_ids = {file.id for file in new_file_list or []}
+        removed_bytes = 0
+        for file in old_file_list:
+            if file.id not in new_file_ids:
+                self._last_access_by_id.pop(file.id, None)
+                removed_bytes += len(file.data)
+
+        if removed_bytes > 0:
+            session_id = files_id[0]
+            self._total_bytes -= removed_bytes
+            session_bytes = self._bytes_by_session_id[session_id] - removed_bytes
+            if session_bytes > 0:
+                self._bytes_by_session_id[session_id] = session_bytes
+            else:
+                del self._bytes_by_session_id[session_id]
+
+    def ensure_space(
+        self,
+        session_id: str,
+        num_bytes: int,
+        is_active_session: Callable[[str], bool],
+    ) -> None:
+        """Make sure that a file of `num_bytes` can be added for the given
+        session without exceeding the server.maxUploadedFilesSessionSize and
+        server.maxUploadedFilesTotalSize quotas.
+
+        To stay within the total quota, files from sessions that aren't active
+        (for example, sessions whose browser tab disconnected) are removed,
+        least recently accessed first. Files from active sessions are never
+        removed.
+
+        The space isn't reserved: this is for rejecting uploads early. Pass
+        `is_active_session` to `add_file` to check the quotas when adding the
+        file.
+
+        Safe to call from any thread.
+
+        Parameters
+        ----------
+        session_id
+            The ID of the session that the file would be added for.
+        num_bytes
+            The size of the file.
+        is_active_session
+            A function that returns true if a session_id belongs to an active
+            session.
+
+        Raises
+        ------
+        UploadedFileQuotaExceededError
+            If the file wouldn't fit within a quota.
+        """
+        inactive_session_ids = self._get_inactive_session_ids(
+            session_id, is_active_session
+        )
+        with self._files_lock:
+            self._make_space(session_id, num_bytes, inactive_session_ids)
+
+    def _get_inactive_session_ids(
+        self, session_id: str, is_active_session: Callable[[str], bool]
+    ) -> Set[str]:
+        """Return the IDs of the other sessions with files that aren't active.
+
+        is_active_session is called without holding our lock.
+        """
+        if _get_quota_bytes("server.maxUploadedFilesTotalSize") <= 0:
+            return set()
+
+        with self._files_lock:
+            session_ids = list(self._bytes_by_session_id)
+        return {
+            other_id
+            for other_id in session_ids
+            if other_id != session_id and not is_active_session(other_id)
+        }
+
+    def _make_space(
+        self, session_id: str, num_bytes: int, inactive_session_ids: Set[str]
+    ) -> None:
+        """Raise an UploadedFileQuotaExceededError if a file of num_bytes
+        wouldn't fit within the quotas, after evicting the files of the given
+        inactive sessions as needed.
+
+        Thread safety: callers must hold `self._files_lock`.
+        """
+        max_session_bytes = _get_quota_bytes("server.maxUploadedFilesSessionSize")
+        max_total_bytes = _get_quota_bytes("server.maxUploadedFilesTotalSize")
+
+        session_bytes = self._bytes_by_session_id.get(session_id, 0)
+        if 0 < max_session_bytes < session_bytes + num_bytes:
+            raise UploadedFileQuotaExceededError(
+                "Uploaded files for this session would exceed "
+                f"{max_session_bytes} bytes"
+            )
+
+        if max_total_bytes <= 0 or self._total_bytes + num_bytes <= max_total_bytes:
+            return
+
+        evictable_files = sorted(
+            (
+                (self._last_access_by_id.get(file.id, -1), files_id, file)
+                for files_id, file_list in self._files_by_id.items()
+                if files_id[0] in inactive_session_ids
+                for file in file_list
+            ),
+            key=lambda item: item[0],
+        )
+        num_evicted = 0
+        for _, files_id, file in evictable_files:
+            if self._total_bytes + num_bytes <= max_total_bytes:
+                break
+            new_file_list = [f for f in self._files_by_id[files_id] if f.id != file.id]
+            self._replace_file_list(files_id, new_file_list)
+            num_evicted += 1
+
+        if num_evicted > 0:
+            LOGGER.debug("Evicted %s files from inactive sessions", num_evicted)
+
+        if self._total_bytes + num_bytes > max_total_bytes:
+            raise UploadedFileQuotaExceededError(
+                f"Uploaded files would exceed {max_total_bytes} bytes"
+            )
+
     def _get_next_file_id(self) -> int:
         """Return the next file ID and increment our ID counter."""
         with self._file_id_lock:
@@ -324,6 +645,7 @@ class UploadedFileManager(CacheStatsProvider):
             for file_list in self._files_by_id.values():
                 all_files.extend(file_list)
 
+        # Memory-mapped files are stored on disk, so they aren't included.
         return [
             CacheStat(
                 category_name="UploadedFileManager",
@@ -331,4 +653,5 @@ class UploadedFileManager(CacheStatsProvider):
                 byte_length=len(file.data),
             )
             for file in all_files
+            if isinstance(file.data, bytes)
         ]
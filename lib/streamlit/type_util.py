@@ -17,8 +17,11 @@
 from __future__ import annotations
 
 import contextlib
+import io
 import re
+import threading
 import types
+import weakref
 from enum import Enum, auto
 from typing import (
     TYPE_CHECKING,
@@ -37,20 +40,21 @@ from typing import (
     overload,
 )
 
-import numpy as np
-import pyarrow as pa
-from pandas import DataFrame, Index, MultiIndex, Series
-from pandas.api.types import infer_dtype, is_dict_like, is_list_like
+from cachetools import LRUCache
 from typing_extensions import Final, Literal, Protocol, TypeAlias, TypeGuard, get_args
 
 import streamlit as st
-from streamlit import errors
+from streamlit import errors, hash_util
 from streamlit import logger as _logger
 from streamlit import string_util
+from streamlit.runtime.stats import CacheStat, CacheStatsProvider
 
 if TYPE_CHECKING:
     import graphviz
+    import numpy as np
+    import pyarrow as pa
     import sympy
+    from pandas import DataFrame, Index, Series
     from pandas.core.indexing import _iLocIndexer
     from pandas.io.formats.style import Styler
     from plotly.graph_objs import Figure
@@ -208,6 +212,7 @@ _PANDAS_INDEX_TYPE_STR: Final = "pandas.core.indexes.base.Index"
 _PANDAS_SERIES_TYPE_STR: Final = "pandas.core.series.Series"
 _PANDAS_STYLER_TYPE_STR: Final = "pandas.io.formats.style.Styler"
 _NUMPY_ARRAY_TYPE_STR: Final = "numpy.ndarray"
+_PYARROW_TABLE_TYPE_STR: Final = "pyarrow.lib.Table"
 _SNOWPARK_DF_TYPE_STR: Final = "snowflake.snowpark.dataframe.DataFrame"
 _SNOWPARK_DF_ROW_TYPE_STR: Final = "snowflake.snowpark.row.Row"
 _SNOWPARK_TABLE_TYPE_STR: Final = "snowflake.snowpark.table.Table"
@@ -374,6 +379,8 @@ def is_list_of_scalars(data: Iterable[Any]) -> bool:
     """Check if the list only contains scalar values."""
     # Overview on all value that are interpreted as scalar:
     # https://pandas.pydata.org/docs/reference/api/pandas.api.types.is_scalar.html
+    from pandas.api.types import infer_dtype
+
     return infer_dtype(data, skipna=True) not in ["mixed", "unknown-array"]
 
 
@@ -453,6 +460,13 @@ def is_pandas_styler(obj: object) -> TypeGuard[Styler]:
     return is_type(obj, _PANDAS_STYLER_TYPE_STR)
 
 
+def is_pyarrow_table(obj: object) -> TypeGuard[pa.Table]:
+    """True if obj is a pyarrow.Table. Unlike isinstance, this doesn't import
+    pyarrow.
+    """
+    return is_type(obj, _PYARROW_TABLE_TYPE_STR)
+
+
 def is_pydeck(obj: object) -> TypeGuard[Deck]:
     """True if input looks like a pydeck chart."""
     return is_type(obj, "pydeck.bindings.deck.Deck")
@@ -503,10 +517,12 @@ def convert_anything_to_df(
     pandas.DataFrame
 
     """
+    import pandas as pd
+
     # This is inefficient as the data will be converted back to Arrow
     # when marshalled to protobuf, but area/bar/line charts need
     # DataFrame magic to generate the correct output.
-    if isinstance(data, pa.Table):
+    if is_pyarrow_table(data):
         return data.to_pandas()
 
     if is_type(data, _PANDAS_DF_TYPE_STR):
@@ -517,8 +533,8 @@ def convert_anything_to_df(
 
     if is_type(data, "numpy.ndarray"):
         if len(data.shape) == 0:
-            return DataFrame([])
-        return DataFrame(data)
+            return pd.DataFrame([])
+        return pd.DataFrame(data)
 
     if (
         is_type(data, _SNOWPARK_DF_TYPE_STR)
@@ -528,7 +544,7 @@ def convert_anything_to_df(
         if is_type(data, _PYSPARK_DF_TYPE_STR):
             data = data.limit(max_unevaluated_rows).toPandas()
         else:
-            data = DataFrame(data.take(max_unevaluated_rows))
+            data = pd.DataFrame(data.take(max_unevaluated_rows))
         if data.shape[0] == max_unevaluated_rows:
             st.caption(
                 f"⚠️ Showing only {string_util.simplify_number(max_unevaluated_rows)} rows. "
@@ -540,13 +556,13 @@ def convert_anything_to_df(
     # compatible with the pandas.DataFrame constructor.
     try:
 
-        return DataFrame(data)
+        return pd.DataFrame(data)
 
     except ValueError as ex:
         if isinstance(data, dict):
             with contextlib.suppress(ValueError):
                 # Try to use index orient as back-up to support key-value dicts
-                return DataFrame.from_dict(data, orient="index")
+                return pd.DataFrame.from_dict(data, orient="index")
         raise errors.StreamlitAPIException(
             f"""
 Unable to convert object of type `{type(data)}` to `pandas.DataFrame`.
@@ -632,24 +648,128 @@ def is_pandas_version_less_than(v: str) -> bool:
     return version.parse(pd.__version__) < version.parse(v)
 
 
+class _ArrowBytesCache(CacheStatsProvider):
+    """Serialized Arrow IPC streams, keyed by a fingerprint of the dataframe
+    or pyarrow.Table they were created from.
+
+    It's shared by all sessions, so that rerunning a script doesn't re-encode
+    data that hasn't changed. Its total size is bounded by the
+    `global.maxArrowBytesCacheSize` config option.
+    """
+
+    def __init__(self):
+        # This needs to be initialized lazily to avoid calling config.get_option()
+        # and thus initializing config options when this file is first imported.
+        self._cache: LRUCache[str, bytes] | None = None
+        # The finalizers that remove the entries of pyarrow.Tables once the
+        # tables are garbage collected, by key.
+        self._finalizers: dict[str, weakref.finalize] = {}
+        # Reentrant, since a finalizer can run during a garbage collection
+        # that's triggered while the lock is held.
+        self._lock = threading.RLock()
+
+    def _get_cache(self) -> LRUCache[str, bytes]:
+        if self._cache is None:
+            from streamlit import config
+
+            max_size = int(config.get_option("global.maxArrowBytesCacheSize"))
+            self._cache = LRUCache(maxsize=max_size, getsizeof=len)
+        return self._cache
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            return self._get_cache().get(key)
+
+    def add(self, key: str, data: bytes, owner: Any = None) -> None:
+        """Add an entry to the cache.
+
+        If `owner` is given, the entry is removed when it's garbage collected.
+        """
+        with self._lock:
+            cache = self._get_cache()
+            if len(data) > cache.maxsize:
+                return
+            cache[key] = data
+            if owner is not None and key not in self._finalizers:
+                self._finalizers[key] = weakref.finalize(owner, self._remove_owned, key)
+
+    def _remove_owned(self, key: str) -> None:
+        with self._lock:
+            self._finalizers.pop(key, None)
+            self._get_cache().pop(key, None)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._get_cache().pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._get_cache().clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._get_cache())
+
+    def get_stats(self) -> list[CacheStat]:
+        with self._lock:
+            entries = list(self._get_cache().values())
+        return [
+            CacheStat(
+                category_name="ArrowBytesCache",
+                cache_name="",
+                byte_length=len(data),
+            )
+            for data in entries
+        ]
+
+
+_arrow_bytes_cache = _ArrowBytesCache()
+
+
+def get_arrow_bytes_cache_stats_provider() -> CacheStatsProvider:
+    """Return the StatsProvider for the cache of serialized Arrow tables."""
+    return _arrow_bytes_cache
+
+
+def _serialize_pyarrow_table(table: pa.Table) -> bytes:
+    # Writing into a BytesIO, rather than a pa.BufferOutputStream, lets us get
+    # the result as bytes without copying it: BytesIO.getvalue() returns its
+    # internal buffer if it isn't shared.
+    import pyarrow as pa
+
+    sink = io.BytesIO()
+    writer = pa.RecordBatchStreamWriter(sink, table.schema)
+    writer.write_table(table)
+    writer.close()
+    return sink.getvalue()
+
+
 def pyarrow_table_to_bytes(table: pa.Table) -> bytes:
     """Serialize pyarrow.Table to bytes using Apache Arrow.
 
+    pyarrow.Tables are immutable, so the result is cached for as long as the
+    table is alive.
+
     Parameters
     ----------
     table : pyarrow.Table
         A table to convert.
 
     """
-    sink = pa.BufferOutputStream()
-    writer = pa.RecordBatchStreamWriter(sink, table.schema)
-    writer.write_table(table)
-    writer.close()
-    return cast(bytes, sink.getvalue().to_pybytes())
+    key = f"table:{id(table)}"
+    data = _arrow_bytes_cache.get(key)
+    if data is None:
+        data = _serialize_pyarrow_table(table)
+        # Table IDs can be reused once the table is garbage collected, so the
+        # entry is removed along with the table.
+        _arrow_bytes_cache.add(key, data, owner=table)
+    return data
 
 
 def is_colum_type_arrow_incompatible(column: Union[Series, Index]) -> bool:
     """Return True if the column type is known to cause issues during Arrow conversion."""
+    from pandas.api.types import infer_dtype, is_dict_like, is_list_like
+
     if column.dtype.kind in [
         # timedelta is supported by pyarrow but not in the Arrow JS:
         # https://github.com/streamlit/streamlit/issues/4489
@@ -719,6 +839,8 @@ def fix_arrow_incompatible_column_types(
     -------
     The fixed dataframe.
     """
+    from pandas import MultiIndex
+
     # Make a copy, but only initialize if necessary to preserve memory.
     df_copy = None
     for col in selected_columns or df.columns:
@@ -744,17 +866,103 @@ def fix_arrow_incompatible_column_types(
     return df_copy if df_copy is not None else df
 
 
+def _hash_values(values: Series | Index) -> bytes:
+    """Return a hash of the contents of a column or index."""
+    import numpy as np
+    import pandas as pd
+    from pandas.api.types import infer_dtype
+
+    hasher = hash_util.new_hasher()
+
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufcmM":
+        # Plain numpy data can be hashed straight from its buffer.
+        data = np.ascontiguousarray(values.to_numpy()).reshape(-1).view(np.uint8)
+        hasher.update(hash_util.hash_buffer(data))
+        return hasher.digest()
+
+    inferred_type = infer_dtype(values, skipna=False)
+    hasher.update(inferred_type.encode())
+
+    if inferred_type == "string":
+        # Joining the strings is a lot faster than hashing them one by one, and
+        # unambiguous as long as none of them contains the separator.
+        joined = "\0".join(values.to_numpy())
+        if joined.count("\0") == max(len(values) - 1, 0):
+            hasher.update(
+                hash_util.hash_buffer(joined.encode("utf-8", "surrogatepass"))
+            )
+            return hasher.digest()
+
+    # pandas hashes objects via their string representations, which is why we
+    # also hashed the inferred type above: to tell e.g. 1 and "1" apart.
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+    hasher.update(hash_util.hash_buffer(np.ascontiguousarray(hashes)))
+    return hasher.digest()
+
+
+def data_frame_fingerprint(df: DataFrame) -> str | None:
+    """Return a hash of a dataframe's labels, dtypes and contents, or None if
+    it can't be hashed.
+    """
+    hasher = hash_util.new_hasher()
+    header = (
+        df.shape,
+        list(df.columns),
+        df.columns.names,
+        df.index.names,
+        list(df.dtypes),
+        df.index.dtype,
+    )
+    hasher.update(repr(header).encode())
+    try:
+        hasher.update(_hash_values(df.index))
+        for i in range(df.shape[1]):
+            hasher.update(_hash_values(df.iloc[:, i]))
+    except TypeError:
+        # The dataframe contains unhashable objects.
+        return None
+    return f"df:{hasher.hexdigest()}"
+
+
 def data_frame_to_bytes(df: DataFrame) -> bytes:
     """Serialize pandas.DataFrame to bytes using Apache Arrow.
 
+    The result is cached by a fingerprint of the dataframe's contents, so
+    displaying the same data again is cheap.
+
     Parameters
     ----------
     df : pandas.DataFrame
         A dataframe to convert.
 
     """
+    key = data_frame_fingerprint(df)
+    data = _arrow_bytes_cache.get(key) if key is not None else None
+    if data is None:
+        data = _data_frame_to_bytes(df)
+        if key is not None:
+            _arrow_bytes_cache.add(key, data)
+    return data
+
+
+def _data_frame_to_bytes(df: DataFrame) -> bytes:
+    return _serialize_pyarrow_table(data_frame_to_pyarrow_table(df))
+
+
+def data_frame_to_pyarrow_table(df: DataFrame) -> pa.Table:
+    """Convert pandas.DataFrame to pyarrow.Table, fixing any column types
+    that Arrow can't handle.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        A dataframe to convert.
+
+    """
+    import pyarrow as pa
+
     try:
-        table = pa.Table.from_pandas(df)
+        return pa.Table.from_pandas(df)
     except (pa.ArrowTypeError, pa.ArrowInvalid, pa.ArrowNotImplementedError) as ex:
         _LOGGER.info(
             "Serialization of dataframe to Arrow table was unsuccessful due to: %s. "
@@ -762,8 +970,7 @@ def data_frame_to_bytes(df: DataFrame) -> bytes:
             ex,
         )
         df = fix_arrow_incompatible_column_types(df)
-        table = pa.Table.from_pandas(df)
-    return pyarrow_table_to_bytes(table)
+        return pa.Table.from_pandas(df)
 
 
 def bytes_to_data_frame(source: bytes) -> DataFrame:
@@ -775,6 +982,8 @@ def bytes_to_data_frame(source: bytes) -> DataFrame:
         A bytes object to convert.
 
     """
+    import pyarrow as pa
+
     reader = pa.RecordBatchStreamReader(source)
     return reader.read_pandas()
 
@@ -792,9 +1001,13 @@ def determine_data_format(input_data: Any) -> DataFormat:
     DataFormat
         The data format of the input data.
     """
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+
     if input_data is None:
         return DataFormat.EMPTY
-    elif isinstance(input_data, DataFrame):
+    elif isinstance(input_data, pd.DataFrame):
         return DataFormat.PANDAS_DATAFRAME
     elif isinstance(input_data, np.ndarray):
         if len(input_data.shape) == 1:
@@ -804,9 +1017,9 @@ def determine_data_format(input_data: Any) -> DataFormat:
         return DataFormat.NUMPY_MATRIX
     elif isinstance(input_data, pa.Table):
         return DataFormat.PYARROW_TABLE
-    elif isinstance(input_data, Series):
+    elif isinstance(input_data, pd.Series):
         return DataFormat.PANDAS_SERIES
-    elif isinstance(input_data, Index):
+    elif isinstance(input_data, pd.Index):
         return DataFormat.PANDAS_INDEX
     elif is_pandas_styler(input_data):
         return DataFormat.PANDAS_STYLER
@@ -840,7 +1053,7 @@ def determine_data_format(input_data: Any) -> DataFormat:
                 return DataFormat.COLUMN_INDEX_MAPPING
             if isinstance(first_value, (list, tuple)):
                 return DataFormat.COLUMN_VALUE_MAPPING
-            if isinstance(first_value, Series):
+            if isinstance(first_value, pd.Series):
                 return DataFormat.COLUMN_SERIES_MAPPING
             # In the future, we could potentially also support the tight & split formats here
             if is_list_of_scalars(input_data.values()):
@@ -878,6 +1091,9 @@ def convert_df_to_data_format(
     pd.DataFrame, pd.Index, Styler, pa.Table, np.ndarray, tuple, list, set, dict
         The converted dataframe.
     """
+    import numpy as np
+    import pyarrow as pa
+
     if data_format in [
         DataFormat.EMPTY,
         DataFormat.PANDAS_DATAFRAME,
@@ -12,11 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import ast
 import collections
+import importlib.util
 import os
 import sys
+import threading
 import types
-from typing import Callable, Dict, List, Optional, Set
+from typing import Callable, Dict, Iterable, List, Optional, Set
 
 from streamlit import config, file_util
 from streamlit.folder_black_list import FolderBlackList
@@ -50,6 +53,19 @@ class LocalSourcesWatcher:
         )
 
         self._watched_modules: Dict[str, WatchedModule] = {}
+        # The watched paths of each watched module.
+        self._module_paths: Dict[str, Set[str]] = {}
+
+        # The import graph of the watched modules, by path: the watched
+        # modules that each watched module refers to, and the reverse.
+        self._dependencies: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = collections.defaultdict(set)
+        # The watched modules whose imports couldn't be determined. They're
+        # unloaded whenever any watched file changes.
+        self._paths_with_unknown_dependencies: Set[str] = set()
+        # Used for mutations of the import graph, which is read by the
+        # watcher's thread.
+        self._graph_lock = threading.Lock()
 
         for page_info in get_pages(self._main_script_path).values():
             self._register_watcher(
@@ -65,25 +81,61 @@ class LocalSourcesWatcher:
             LOGGER.error("Received event for non-watched file: %s", filepath)
             return
 
-        # Workaround:
-        # Delete all watched modules so we can guarantee changes to the
-        # updated module are reflected on reload.
-        #
-        # In principle, for reloading a given module, we only need to unload
-        # the module itself and all of the modules which import it (directly
-        # or indirectly) such that when we exec the application code, the
-        # changes are reloaded and reflected in the running application.
-        #
-        # However, determining all import paths for a given loaded module is
-        # non-trivial, and so as a workaround we simply unload all watched
-        # modules.
-        for wm in self._watched_modules.values():
-            if wm.module_name is not None and wm.module_name in sys.modules:
-                del sys.modules[wm.module_name]
+        # Unload the changed module and the modules which refer to it
+        # (directly or indirectly), so that when we exec the application code,
+        # the changes are reloaded and reflected in the running application.
+        # Other modules stay loaded, so that rerunning doesn't take longer
+        # for apps with many local modules.
+        with self._graph_lock:
+            module_names = self._get_modules_to_unload(filepath)
+
+        for module_name in module_names:
+            if module_name in sys.modules:
+                del sys.modules[module_name]
+            # Update the module's dependencies when it's imported again.
+            self._cached_sys_modules.discard(module_name)
 
         for cb in self._on_file_changed:
             cb(filepath)
 
+    def _get_modules_to_unload(self, filepath: str) -> Set[str]:
+        """Return the names of the watched modules that must be unloaded for
+        a change to the given path to be reflected."""
+        module_names: Set[str] = set()
+        visited_paths: Set[str] = set()
+        paths_to_visit = [filepath, *self._paths_with_unknown_dependencies]
+
+        while paths_to_visit:
+            path = paths_to_visit.pop()
+            if path in visited_paths:
+                continue
+            visited_paths.add(path)
+            paths_to_visit.extend(self._dependents.get(path, ()))
+
+            wm = self._watched_modules.get(path)
+            if wm is None or wm.module_name is None:
+                continue
+            module_name = wm.module_name
+            module_names.add(module_name)
+
+            # `import pkg.mod` only binds `pkg`, so modules that refer to
+            # a package may use any of its submodules.
+            parent_name = module_name.rpartition(".")[0]
+            while parent_name:
+                for parent_path in self._module_paths.get(parent_name, ()):
+                    paths_to_visit.extend(self._dependents.get(parent_path, ()))
+                parent_name = parent_name.rpartition(".")[0]
+
+            # A package that's imported again doesn't get attributes for the
+            # submodules that are still loaded, so unload those too.
+            if _is_package_path(path):
+                prefix = module_name + "."
+                for name, paths in self._module_paths.items():
+                    if name.startswith(prefix):
+                        paths_to_visit.extend(paths)
+
+        return module_names
+
     def close(self):
         for wm in self._watched_modules.values():
             wm.watcher.close()
@@ -109,6 +161,8 @@ class LocalSourcesWatcher:
             return
 
         self._watched_modules[filepath] = wm
+        if module_name is not None:
+            self._module_paths.setdefault(module_name, set()).add(filepath)
 
     def _deregister_watcher(self, filepath):
         if filepath not in self._watched_modules:
@@ -136,12 +190,20 @@ class LocalSourcesWatcher:
             return
 
         if set(sys.modules) != self._cached_sys_modules:
+            # Only the modules that were imported since the last update need
+            # to be examined.
+            new_modules = {
+                name: module
+                for name, module in dict(sys.modules).items()
+                if name not in self._cached_sys_modules
+            }
             modules_paths = {
                 name: self._exclude_blacklisted_paths(get_module_paths(module))
-                for name, module in dict(sys.modules).items()
+                for name, module in new_modules.items()
             }
             self._cached_sys_modules = set(sys.modules)
             self._register_necessary_watchers(modules_paths)
+            self._update_dependencies(new_modules, modules_paths)
 
     def _register_necessary_watchers(self, module_paths: Dict[str, Set[str]]) -> None:
         for name, paths in module_paths.items():
@@ -152,6 +214,59 @@ class LocalSourcesWatcher:
     def _exclude_blacklisted_paths(self, paths: Set[str]) -> Set[str]:
         return {p for p in paths if not self._folder_black_list.is_blacklisted(p)}
 
+    def _update_dependencies(
+        self,
+        modules: Dict[str, types.ModuleType],
+        modules_paths: Dict[str, Set[str]],
+    ) -> None:
+        """Update the import graph with the dependencies of the given
+        (newly imported) modules."""
+        # The paths of the modules referred to, by the modules' ids.
+        referenced_paths: Dict[int, Set[str]] = {}
+
+        for name, module in modules.items():
+            paths = {
+                path
+                for path in modules_paths.get(name, ())
+                if path in self._watched_modules
+            }
+            if not paths:
+                continue
+
+            referenced_modules = _get_referenced_modules(module)
+            imported_names = _get_imported_module_names(module)
+            if imported_names is not None:
+                referenced_modules.extend(
+                    sys.modules[name] for name in imported_names if name in sys.modules
+                )
+
+            dependencies: Set[str] = set()
+            for referenced_module in referenced_modules:
+                key = id(referenced_module)
+                if key not in referenced_paths:
+                    referenced_paths[key] = {
+                        path
+                        for path in get_module_paths(referenced_module)
+                        if path in self._watched_modules
+                    }
+                dependencies.update(referenced_paths[key])
+            dependencies -= paths
+
+            with self._graph_lock:
+                for path in paths:
+                    self._set_dependencies(path, dependencies)
+                    if imported_names is None:
+                        self._paths_with_unknown_dependencies.add(path)
+                    else:
+                        self._paths_with_unknown_dependencies.discard(path)
+
+    def _set_dependencies(self, path: str, dependencies: Iterable[str]) -> None:
+        for dependency in self._dependencies.get(path, ()):
+            self._dependents[dependency].discard(path)
+        self._dependencies[path] = set(dependencies)
+        for dependency in dependencies:
+            self._dependents[dependency].add(path)
+
 
 def get_module_paths(module: types.ModuleType) -> Set[str]:
     paths_extractors = [
@@ -194,5 +309,109 @@ def get_module_paths(module: types.ModuleType) -> Set[str]:
     return all_paths
 
 
+def _get_referenced_modules(module: types.ModuleType) -> List[types.ModuleType]:
+    """Return the modules that a module's globals come from: the modules it
+    imported, and the modules that define the functions, classes and objects
+    it imported or created.
+
+    This complements _get_imported_module_names with the modules that are
+    imported dynamically, e.g. with importlib.
+    """
+    try:
+        values = list(vars(module).values())
+    except Exception:
+        return []
+
+    submodule_prefix = "%s." % getattr(module, "__name__", "")
+    referenced_modules: Dict[int, types.ModuleType] = {}
+    for value in values:
+        if isinstance(value, types.ModuleType):
+            referenced_module: Optional[types.ModuleType] = value
+        else:
+            if isinstance(value, types.FunctionType):
+                module_name = value.__module__
+            else:
+                # Read classes' __module__ from their __dict__, so that we
+                # don't run any custom attribute lookup.
+                cls = value if isinstance(value, type) else type(value)
+                module_name = cls.__dict__.get("__module__")
+            referenced_module = (
+                sys.modules.get(module_name) if isinstance(module_name, str) else None
+            )
+
+        if referenced_module is None or referenced_module is module:
+            continue
+        # Importing a submodule binds it as an attribute of its package,
+        # which doesn't make the package depend on it.
+        if str(getattr(referenced_module, "__name__", "")).startswith(submodule_prefix):
+            continue
+        referenced_modules[id(referenced_module)] = referenced_module
+    return list(referenced_modules.values())
+
+
+def _get_imported_module_names(module: types.ModuleType) -> Optional[Set[str]]:
+    """Return the names of the modules that a module's source imports at
+    module level, including the names imported from them that may be
+    submodules.
+
+    Return None if the module's imports can't be determined, e.g. because
+    its source can't be read.
+    """
+    filepath = getattr(module, "__file__", None)
+    if filepath is None:
+        # A namespace package, which has no code.
+        return set()
+    if not isinstance(filepath, str) or not filepath.endswith(".py"):
+        return None
+
+    try:
+        with open(filepath, "rb") as f:
+            tree = ast.parse(f.read(), filepath)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    package = getattr(module, "__package__", None) or ""
+    names: Set[str] = set()
+    for node in _iter_module_level_nodes(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            from_name = "." * node.level + (node.module or "")
+            try:
+                from_name = importlib.util.resolve_name(from_name, package)
+            except (ImportError, ValueError):
+                continue
+            names.add(from_name)
+            names.update(
+                "%s.%s" % (from_name, alias.name)
+                for alias in node.names
+                if alias.name != "*"
+            )
+
+    names.discard(getattr(module, "__name__", None))
+    return names
+
+
+def _iter_module_level_nodes(node: ast.AST) -> Iterable[ast.AST]:
+    """Yield the nodes that are executed when a module is imported, i.e.
+    all nodes except those in function bodies.
+
+    Imports inside functions are executed again when the functions are
+    called, so they get the current modules anyway.
+    """
+    for child in ast.iter_child_nodes(node):
+        yield child
+        if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            yield from _iter_module_level_nodes(child)
+
+
+def _is_package_path(path: str) -> bool:
+    """True if the path is that of a package's __init__ file or of a
+    namespace package's directory."""
+    return os.path.splitext(os.path.basename(path))[0] == "__init__" or (
+        os.path.isdir(path)
+    )
+
+
 def _is_valid_path(path: Optional[str]) -> bool:
     return isinstance(path, str) and (os.path.isfile(path) or os.path.isdir(path))
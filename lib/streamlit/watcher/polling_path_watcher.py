@@ -14,9 +14,9 @@
 
 """A class that watches a given path via polling."""
 
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, Optional
+from typing import Callable, List, Optional
 
 from streamlit.logger import get_logger
 from streamlit.util import repr_
@@ -25,14 +25,18 @@ from streamlit.watcher import util
 LOGGER = get_logger(__name__)
 
 
-_MAX_WORKERS = 4
 _POLLING_PERIOD_SECS = 0.2
 
 
 class PollingPathWatcher:
     """Watches a path on disk via a polling loop."""
 
-    _executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+    # All active watchers, which are polled by a single shared thread. This
+    # keeps the cost of watching many paths to one thread that wakes up once
+    # per polling period, rather than one wakeup per path.
+    _watchers: List["PollingPathWatcher"] = []
+    _watchers_lock = threading.Lock()
+    _polling_thread: Optional[threading.Thread] = None
 
     @staticmethod
     def close_all() -> None:
@@ -54,7 +58,7 @@ class PollingPathWatcher:
         """Constructor.
 
         You do not need to retain a reference to a PollingPathWatcher to
-        prevent it from being garbage collected. (The global _executor object
+        prevent it from being garbage collected. (The global _watchers list
         retains references to all active instances.)
         """
         # TODO(vdonato): Modernize this by switching to pathlib.
@@ -74,28 +78,59 @@ class PollingPathWatcher:
             glob_pattern=self._glob_pattern,
             allow_nonexistent=self._allow_nonexistent,
         )
-        self._schedule()
+
+        with PollingPathWatcher._watchers_lock:
+            PollingPathWatcher._watchers.append(self)
+            PollingPathWatcher._start_polling_thread()
 
     def __repr__(self) -> str:
         return repr_(self)
 
-    def _schedule(self) -> None:
-        def task():
+    @staticmethod
+    def _start_polling_thread() -> None:
+        """Start the shared polling thread, if it isn't running yet.
+
+        Must be called with _watchers_lock held.
+        """
+        if PollingPathWatcher._polling_thread is not None:
+            return
+
+        thread = threading.Thread(
+            target=PollingPathWatcher._poll_forever,
+            name="PollingPathWatcher",
+            daemon=True,
+        )
+        PollingPathWatcher._polling_thread = thread
+        thread.start()
+
+    @staticmethod
+    def _poll_forever() -> None:
+        while True:
             time.sleep(_POLLING_PERIOD_SECS)
-            self._check_if_path_changed()
+            PollingPathWatcher._poll_all()
 
-        PollingPathWatcher._executor.submit(task)
+    @staticmethod
+    def _poll_all() -> None:
+        """Check every active watcher's path once."""
+        with PollingPathWatcher._watchers_lock:
+            watchers = list(PollingPathWatcher._watchers)
+
+        for watcher in watchers:
+            try:
+                watcher._check_if_path_changed()
+            except Exception:
+                # One broken path or callback mustn't stop us from watching
+                # the others.
+                LOGGER.exception("Error while polling %s", watcher._path)
 
     def _check_if_path_changed(self) -> None:
         if not self._active:
-            # Don't call self._schedule()
             return
 
         modification_time = util.path_modification_time(
             self._path, self._allow_nonexistent
         )
         if modification_time <= self._modification_time:
-            self._schedule()
             return
 
         self._modification_time = modification_time
@@ -106,7 +141,6 @@ class PollingPathWatcher:
             allow_nonexistent=self._allow_nonexistent,
         )
         if md5 == self._md5:
-            self._schedule()
             return
 
         self._md5 = md5
@@ -114,8 +148,11 @@ class PollingPathWatcher:
         LOGGER.debug("Change detected: %s", self._path)
         self._on_changed(self._path)
 
-        self._schedule()
-
     def close(self) -> None:
         """Stop watching the file system."""
         self._active = False
+        with PollingPathWatcher._watchers_lock:
+            try:
+                PollingPathWatcher._watchers.remove(self)
+            except ValueError:
+                pass
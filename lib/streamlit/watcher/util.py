@@ -18,12 +18,13 @@ These are functions that only make sense within the watcher. In particular,
 functions that use streamlit.config can go here to avoid a dependency cycle.
 """
 
-import hashlib
 import os
 import time
 from pathlib import Path
 from typing import Optional
 
+from streamlit import hash_util
+
 # How many times to try to grab the MD5 hash.
 _MAX_RETRIES = 5
 
@@ -37,11 +38,14 @@ def calc_md5_with_blocking_retries(
     glob_pattern: Optional[str] = None,
     allow_nonexistent: bool = False,
 ) -> str:
-    """Calculate the MD5 checksum of a given path.
+    """Calculate the checksum of a given path.
+
+    For a file, this means hashing the file's contents. For a directory, we
+    concatenate the directory's path with the names of all the files in it and
+    hash that.
 
-    For a file, this means calculating the md5 of the file's contents. For a
-    directory, we concatenate the directory's path with the names of all the
-    files in it and calculate the md5 of that.
+    (Despite this function's name, the checksum is computed with the hash
+    algorithm selected by the `global.hashAlgorithm` config option.)
 
     IMPORTANT: This method calls time.sleep(), which blocks execution. So you
     should only use this outside the main thread.
@@ -55,11 +59,11 @@ def calc_md5_with_blocking_retries(
     else:
         content = _get_file_content_with_blocking_retries(path)
 
-    md5 = hashlib.md5()
-    md5.update(content)
+    hasher = hash_util.new_hasher()
+    hasher.update(content)
 
     # Use hexdigest() instead of digest(), so it's easier to debug.
-    return md5.hexdigest()
+    return hasher.hexdigest()
 
 
 def path_modification_time(path: str, allow_nonexistent: bool = False) -> float:
@@ -12,17 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import base64
 import binascii
 import json
-from typing import Any, Awaitable, Dict, List, Optional, Union
+import struct
+import zlib
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, Union
 
 import tornado.concurrent
 import tornado.locks
 import tornado.netutil
 import tornado.web
 import tornado.websocket
-from tornado.websocket import WebSocketHandler
+from tornado import httputil
+from tornado.iostream import StreamClosedError
+from tornado.websocket import (
+    WebSocketClosedError,
+    WebSocketHandler,
+    WebSocketProtocol13,
+)
 from typing_extensions import Final
 
 from streamlit import config
@@ -30,11 +39,70 @@ from streamlit.logger import get_logger
 from streamlit.proto.BackMsg_pb2 import BackMsg
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime import Runtime, SessionClient, SessionClientDisconnectedError
-from streamlit.runtime.runtime_util import serialize_forward_msg
+from streamlit.runtime.runtime_util import serialize_forward_msg_parts
 from streamlit.web.server.server_util import is_url_from_allowed_origins
 
 _LOGGER: Final = get_logger(__name__)
 
+# On uncompressed connections, messages at least this large are written
+# straight to the IOStream, rather than being copied into a new frame by
+# write_message.
+_DIRECT_WRITE_MIN_MESSAGE_SIZE: Final = 64 * 1024
+
+# The first byte of a final, binary websocket frame (FIN bit + binary opcode).
+_BINARY_FRAME_FIN_OPCODE: Final = 0x82
+
+# On compressed connections, messages smaller than this are sent uncompressed:
+# compressing them costs more CPU time than it saves in transfer time.
+_COMPRESSION_MIN_MESSAGE_SIZE: Final = 1024
+
+# Messages at least this large are compressed with zlib's fastest level, which
+# is several times faster than the default one, at a slightly worse ratio.
+_FAST_COMPRESSION_MIN_MESSAGE_SIZE: Final = 1024 * 1024
+_FAST_COMPRESSION_LEVEL: Final = 1
+
+# A sync-flushed deflate stream ends with these bytes, which permessage-deflate
+# leaves out of the message (RFC 7692, section 7.2.1).
+_DEFLATE_SYNC_MARKER: Final = b"\x00\x00\xff\xff"
+
+# The flag of a compressed websocket message (RFC 7692, section 6).
+_FRAME_RSV1: Final = 0x40
+
+# (compression level, max window bits, memory level)
+_DeflateParams = Tuple[int, int, int]
+
+
+def _deflate(data: bytes, params: _DeflateParams) -> bytes:
+    """Compress data to sync-flushed deflate blocks that don't refer to any
+    data that came before it, so that the result can be sent as (part of) a
+    message on any connection that negotiated the same parameters.
+    """
+    level, max_wbits, mem_level = params
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -max_wbits, mem_level)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+class _StreamlitWebSocketProtocol(WebSocketProtocol13):
+    """A WebSocketProtocol13 that compresses each message on its own.
+
+    When a client offers the permessage-deflate extension, we accept it with
+    the server_no_context_takeover parameter, which RFC 7692 lets servers add
+    to any offer. The server's messages then don't refer to each other, so
+    BrowserWebSocketHandler can skip compressing small messages, and send the
+    same compressed payload to many clients.
+    """
+
+    def _parse_extensions_header(
+        self, headers: httputil.HTTPHeaders
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        extensions = super()._parse_extensions_header(headers)
+        return [
+            (name, {**params, "server_no_context_takeover": None})
+            if name == "permessage-deflate"
+            else (name, params)
+            for name, params in extensions
+        ]
+
 
 class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
     """Handles a WebSocket connection from the browser"""
@@ -42,6 +110,13 @@ class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
     def initialize(self, runtime: Runtime) -> None:
         self._runtime = runtime
         self._session_id: Optional[str] = None
+        # The number of bytes we've passed to write_message that haven't been
+        # flushed to the socket yet, and the Future for the most recent write.
+        self._write_buffer_size = 0
+        self._last_write: Optional["asyncio.Future[None]"] = None
+        self._max_write_buffer_size = (
+            config.get_option("server.maxWebsocketWriteBufferSize") * 1024 * 1024
+        )
         # The XSRF cookie is normally set when xsrf_form_html is used, but in a
         # pure-Javascript application that does not use any regular forms we just
         # need to read the self.xsrf_token manually to set the cookie as a side
@@ -56,11 +131,168 @@ class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
 
     def write_forward_msg(self, msg: ForwardMsg) -> None:
         """Send a ForwardMsg to the browser."""
+        # A cacheable message's payload was serialized when it was hashed, and
+        # is kept in the message cache.
+        payload = (
+            self._runtime.message_cache.get_serialized_payload(msg.hash)
+            if msg.hash
+            else None
+        )
+        parts = serialize_forward_msg_parts(msg, payload)
+        msg_size = sum(len(part) for part in parts)
+        try:
+            write = self._write_parts(
+                parts, msg_size, msg.hash if parts[0] is payload else None
+            )
+        except WebSocketClosedError as e:
+            raise SessionClientDisconnectedError from e
+
+        self._write_buffer_size += msg_size
+        self._last_write = write
+
+        def on_write_done(future: "asyncio.Future[None]") -> None:
+            self._write_buffer_size -= msg_size
+            # Retrieve the exception (if any) so that asyncio doesn't log it as
+            # never retrieved. A closed socket is handled by on_close.
+            if not future.cancelled():
+                future.exception()
+
+        write.add_done_callback(on_write_done)
+
+    def _write_parts(
+        self, parts: List[bytes], msg_size: int, cached_msg_hash: Optional[str]
+    ) -> "asyncio.Future[None]":
+        """Write a message, made up of the given parts, to the client.
+
+        If the message's first part is its payload from the ForwardMsgCache,
+        cached_msg_hash is the message's hash.
+        """
+        if not self._can_write_frames_directly():
+            return self.write_message(b"".join(parts), binary=True)
+
+        assert isinstance(self.ws_connection, WebSocketProtocol13)
+        compressor = self.ws_connection._compressor
+        if compressor is None:
+            if msg_size >= _DIRECT_WRITE_MIN_MESSAGE_SIZE:
+                return self._write_binary_frame(parts, msg_size)
+            return self.write_message(b"".join(parts), binary=True)
+
+        if msg_size < _COMPRESSION_MIN_MESSAGE_SIZE:
+            return self._write_binary_frame(parts, msg_size)
+
+        level = (
+            _FAST_COMPRESSION_LEVEL
+            if msg_size >= _FAST_COMPRESSION_MIN_MESSAGE_SIZE
+            else compressor._compression_level
+        )
+        params = (level, compressor._max_wbits, compressor._mem_level)
+
+        # The deflate blocks of the parts can be concatenated, since none of
+        # them refers to the others' data.
+        compressed_parts = []
+        for i, part in enumerate(parts):
+            if i == 0 and cached_msg_hash is not None:
+                compressed = self._runtime.message_cache.get_compressed_payload(
+                    cached_msg_hash, params, lambda data: _deflate(data, params)
+                )
+            else:
+                compressed = _deflate(part, params)
+            compressed_parts.append(compressed)
+        compressed_parts[-1] = compressed_parts[-1][: -len(_DEFLATE_SYNC_MARKER)]
+
+        return self._write_binary_frame(compressed_parts, msg_size, compressed=True)
+
+    def _can_write_frames_directly(self) -> bool:
+        """True if frames can be written to this connection's IOStream as-is.
+
+        That's only the case for an RFC 6455 connection whose messages don't
+        depend on each other: either it didn't negotiate the permessage-deflate
+        extension with the client, or it negotiated it without context
+        takeover on our side (see _StreamlitWebSocketProtocol). Server-to-client
+        frames are never masked.
+        """
+        ws_connection = self.ws_connection
+        return (
+            isinstance(ws_connection, WebSocketProtocol13)
+            and (
+                ws_connection._compressor is None
+                # A compressor without its own zlib compressor makes a new
+                # one for each message.
+                or ws_connection._compressor._compressor is None
+            )
+            and not ws_connection.mask_outgoing
+        )
+
+    def _write_binary_frame(
+        self, parts: List[bytes], msg_size: int, compressed: bool = False
+    ) -> "asyncio.Future[None]":
+        """Write a binary websocket message, made up of the given parts, as a
+        single frame.
+
+        write_message copies the message into a new buffer along with the
+        frame header. Large serialized payloads are immutable (and often shared
+        with the ForwardMsgCache), so we write the header and the parts to the
+        IOStream separately instead, which buffers them without copying.
+        This must only be used if _can_write_frames_directly is True.
+
+        If `compressed` is True, the parts are the message's deflate blocks,
+        and msg_size is the size of the uncompressed message.
+        """
+        ws_connection = self.ws_connection
+        if (
+            ws_connection is None
+            or ws_connection.is_closing()
+            or ws_connection.stream is None
+        ):
+            raise WebSocketClosedError()
+        assert isinstance(ws_connection, WebSocketProtocol13)
+
+        frame_size = sum(len(part) for part in parts) if compressed else msg_size
+        first_byte = _BINARY_FRAME_FIN_OPCODE | (_FRAME_RSV1 if compressed else 0)
+
+        # Server-to-client frames are never masked.
+        if frame_size < 126:
+            header = struct.pack("!BB", first_byte, frame_size)
+        elif frame_size <= 0xFFFF:
+            header = struct.pack("!BBH", first_byte, 126, frame_size)
+        else:
+            header = struct.pack("!BBQ", first_byte, 127, frame_size)
+
+        try:
+            write = ws_connection.stream.write(header)
+            for part in parts:
+                write = ws_connection.stream.write(part)
+        except StreamClosedError as e:
+            raise WebSocketClosedError() from e
+
+        # Keep the connection's traffic counters in line with write_message.
+        ws_connection._message_bytes_out += msg_size
+        ws_connection._wire_bytes_out += len(header) + frame_size
+        return write
+
+    async def wait_for_write_buffer_to_drain(self) -> None:
+        """Wait for our buffered writes to be flushed if they're over the
+        configured limit.
+        """
+        if (
+            self._write_buffer_size <= self._max_write_buffer_size
+            or self._last_write is None
+        ):
+            return
+
         try:
-            self.write_message(serialize_forward_msg(msg), binary=True)
-        except tornado.websocket.WebSocketClosedError as e:
+            await self._last_write
+        except (WebSocketClosedError, StreamClosedError) as e:
             raise SessionClientDisconnectedError from e
 
+    def get_websocket_protocol(self) -> Optional[tornado.websocket.WebSocketProtocol]:
+        protocol = super().get_websocket_protocol()
+        if type(protocol) is WebSocketProtocol13:
+            return _StreamlitWebSocketProtocol(
+                self, protocol.mask_outgoing, protocol.params
+            )
+        return protocol
+
     def select_subprotocol(self, subprotocols: List[str]) -> Optional[str]:
         """Return the first subprotocol in the given list.
 
@@ -137,7 +369,8 @@ class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
         """Enable WebSocket compression.
 
         Returning an empty dict enables websocket compression. Returning
-        None disables it.
+        None disables it. (Which messages are compressed, and how, is decided
+        in _write_parts.)
 
         (See the docstring in the parent class.)
         """
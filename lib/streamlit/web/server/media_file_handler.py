@@ -12,12 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Optional
+from typing import Optional, Union
 from urllib.parse import quote, unquote_plus
 
 import tornado.web
 
 from streamlit.logger import get_logger
+from streamlit.runtime.disk_media_file_storage import DiskFile, DiskMediaFileStorage
 from streamlit.runtime.media_file_storage import MediaFileKind, MediaFileStorageError
 from streamlit.runtime.memory_media_file_storage import (
     MemoryMediaFileStorage,
@@ -30,11 +31,13 @@ _LOGGER = get_logger(__name__)
 
 
 class MediaFileHandler(tornado.web.StaticFileHandler):
-    _storage: MemoryMediaFileStorage
+    _storage: Union[MemoryMediaFileStorage, DiskMediaFileStorage]
 
     @classmethod
-    def initialize_storage(cls, storage: MemoryMediaFileStorage) -> None:
-        """Set the MemoryMediaFileStorage object used by instances of this
+    def initialize_storage(
+        cls, storage: Union[MemoryMediaFileStorage, DiskMediaFileStorage]
+    ) -> None:
+        """Set the MediaFileStorage object used by instances of this
         handler. Must be called on server startup.
         """
         # This is a class method, rather than an instance method, because
@@ -112,8 +115,8 @@ class MediaFileHandler(tornado.web.StaticFileHandler):
 
     @classmethod
     def get_absolute_path(cls, root: str, path: str) -> str:
-        # All files are stored in memory, so the absolute path is just the
-        # path itself. In the MediaFileHandler, it's just the filename
+        # Files are looked up in the storage by name, so the absolute path is
+        # just the path itself. In the MediaFileHandler, it's just the filename
         return path
 
     @classmethod
@@ -133,6 +136,11 @@ class MediaFileHandler(tornado.web.StaticFileHandler):
             "MediaFileHandler: Sending %s file %s", media_file.mimetype, abspath
         )
 
+        # Files on disk are streamed in chunks, and only the requested range
+        # is read.
+        if isinstance(media_file, DiskFile):
+            return media_file.read_chunks(start, end)
+
         # If there is no start and end, just return the full content
         if start is None and end is None:
             return media_file.content
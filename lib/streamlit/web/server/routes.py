@@ -18,7 +18,10 @@ import tornado.web
 
 from streamlit import config, file_util
 from streamlit.logger import get_logger
-from streamlit.runtime.runtime_util import serialize_forward_msg
+from streamlit.runtime.runtime_util import (
+    get_max_message_size_bytes,
+    serialize_forward_msg,
+)
 from streamlit.web.server.server_util import emit_endpoint_deprecation_notice
 
 _LOGGER = get_logger(__name__)
@@ -237,8 +240,8 @@ class MessageCacheHandler(tornado.web.RequestHandler):
             self.set_status(404)
             raise tornado.web.Finish()
 
-        message = self._cache.get_message(msg_hash)
-        if message is None:
+        msg_str = self._cache.get_serialized_message(msg_hash)
+        if msg_str is None:
             # Message not in our cache.
             _LOGGER.error(
                 "HTTP request for cached message could not be fulfilled. "
@@ -248,7 +251,11 @@ class MessageCacheHandler(tornado.web.RequestHandler):
             raise tornado.web.Finish()
 
         _LOGGER.debug("MessageCache HIT")
-        msg_str = serialize_forward_msg(message)
+        if len(msg_str) > get_max_message_size_bytes():
+            # Let serialize_forward_msg replace the message with an error.
+            message = self._cache.get_message(msg_hash)
+            assert message is not None
+            msg_str = serialize_forward_msg(message)
         self.set_header("Content-Type", "application/octet-stream")
         self.write(msg_str)
         self.set_status(200)
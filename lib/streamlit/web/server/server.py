@@ -35,6 +35,7 @@ from streamlit.components.v1.components import ComponentRegistry
 from streamlit.config_option import ConfigOption
 from streamlit.logger import get_logger
 from streamlit.runtime import Runtime, RuntimeConfig, RuntimeState
+from streamlit.runtime.disk_media_file_storage import DiskMediaFileStorage
 from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.runtime.runtime_util import get_max_message_size_bytes
 from streamlit.web.cache_storage_manager_config import (
@@ -218,6 +219,23 @@ def start_listening_tcp_socket(http_server: HTTPServer) -> None:
         )
 
 
+def _create_media_file_storage() -> Union[MemoryMediaFileStorage, DiskMediaFileStorage]:
+    """Create the MediaFileStorage selected by server.mediaFileStorage."""
+    storage_type = config.get_option("server.mediaFileStorage")
+    if storage_type == "disk":
+        return DiskMediaFileStorage(
+            MEDIA_ENDPOINT,
+            directory=config.get_option("server.mediaFileStorageDir") or None,
+            max_memory_bytes=int(config.get_option("server.mediaFileMemorySize") * 1e6),
+        )
+
+    if storage_type != "memory":
+        LOGGER.warning(
+            'Unknown server.mediaFileStorage "%s". Using "memory".', storage_type
+        )
+    return MemoryMediaFileStorage(MEDIA_ENDPOINT)
+
+
 class Server:
     def __init__(self, main_script_path: str, command_line: Optional[str]):
         """Create the server. It won't be started yet."""
@@ -226,7 +244,7 @@ class Server:
         self._main_script_path = main_script_path
 
         # Initialize MediaFileStorage and its associated endpoint
-        media_file_storage = MemoryMediaFileStorage(MEDIA_ENDPOINT)
+        media_file_storage = _create_media_file_storage()
         MediaFileHandler.initialize_storage(media_file_storage)
 
         self._runtime = Runtime(
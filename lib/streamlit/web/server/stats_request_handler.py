@@ -12,13 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
+from typing import Dict, List, Sequence, TypeVar
 
 import tornado.web
 
-from streamlit.proto.openmetrics_data_model_pb2 import GAUGE
+from streamlit.proto.openmetrics_data_model_pb2 import COUNTER, GAUGE
 from streamlit.proto.openmetrics_data_model_pb2 import MetricSet as MetricSetProto
-from streamlit.runtime.stats import CacheStat, StatsManager
+from streamlit.runtime.stats import (
+    COUNTER_FAMILIES,
+    GAUGE_FAMILIES,
+    CacheStat,
+    CounterStat,
+    GaugeStat,
+    StatsManager,
+)
 from streamlit.web.server.server_util import emit_endpoint_deprecation_notice
 
 
@@ -43,34 +50,62 @@ class StatsRequestHandler(tornado.web.RequestHandler):
             emit_endpoint_deprecation_notice(self, new_path="/_stcore/metrics")
 
         stats = self._manager.get_stats()
+        counter_stats = self._manager.get_counter_stats()
+        gauge_stats = self._manager.get_gauge_stats()
 
         # If the request asked for protobuf output, we return a serialized
         # protobuf. Else we return text.
         if "application/x-protobuf" in self.request.headers.get_list("Accept"):
-            self.write(self._stats_to_proto(stats).SerializeToString())
+            self.write(
+                self._stats_to_proto(
+                    stats, counter_stats, gauge_stats
+                ).SerializeToString()
+            )
             self.set_header("Content-Type", "application/x-protobuf")
             self.set_status(200)
         else:
-            self.write(self._stats_to_text(self._manager.get_stats()))
+            self.write(self._stats_to_text(stats, counter_stats, gauge_stats))
             self.set_header("Content-Type", "application/openmetrics-text")
             self.set_status(200)
 
     @staticmethod
-    def _stats_to_text(stats: List[CacheStat]) -> str:
+    def _stats_to_text(
+        stats: List[CacheStat],
+        counter_stats: List[CounterStat],
+        gauge_stats: List[GaugeStat],
+    ) -> str:
         metric_type = "# TYPE cache_memory_bytes gauge"
         metric_unit = "# UNIT cache_memory_bytes bytes"
         metric_help = "# HELP Total memory consumed by a cache."
         openmetrics_eof = "# EOF\n"
 
-        # Format: header, stats, EOF
+        # Format: header, stats, (header, counters)..., (header, gauges)..., EOF
         result = [metric_type, metric_unit, metric_help]
         result.extend(stat.to_metric_str() for stat in stats)
+        for family_name, family_stats in _group_by_family(counter_stats).items():
+            help, unit = COUNTER_FAMILIES[family_name]
+            result.append(f"# TYPE {family_name} counter")
+            if unit:
+                result.append(f"# UNIT {family_name} {unit}")
+            result.append(f"# HELP {family_name} {help}")
+            result.extend(stat.to_metric_str() for stat in family_stats)
+        for family_name, family_gauges in _group_by_family(gauge_stats).items():
+            help, unit = GAUGE_FAMILIES[family_name]
+            result.append(f"# TYPE {family_name} gauge")
+            if unit:
+                result.append(f"# UNIT {family_name} {unit}")
+            result.append(f"# HELP {family_name} {help}")
+            result.extend(stat.to_metric_str() for stat in family_gauges)
         result.append(openmetrics_eof)
 
         return "\n".join(result)
 
     @staticmethod
-    def _stats_to_proto(stats: List[CacheStat]) -> MetricSetProto:
+    def _stats_to_proto(
+        stats: List[CacheStat],
+        counter_stats: List[CounterStat],
+        gauge_stats: List[GaugeStat],
+    ) -> MetricSetProto:
         metric_set = MetricSetProto()
 
         metric_family = metric_set.metric_families.add()
@@ -83,6 +118,35 @@ class StatsRequestHandler(tornado.web.RequestHandler):
             metric_proto = metric_family.metrics.add()
             stat.marshall_metric_proto(metric_proto)
 
-        metric_set = MetricSetProto()
-        metric_set.metric_families.append(metric_family)
+        for family_name, family_stats in _group_by_family(counter_stats).items():
+            metric_family = metric_set.metric_families.add()
+            metric_family.name = family_name
+            metric_family.type = COUNTER
+            metric_family.help, metric_family.unit = COUNTER_FAMILIES[family_name]
+
+            for counter_stat in family_stats:
+                metric_proto = metric_family.metrics.add()
+                counter_stat.marshall_metric_proto(metric_proto)
+
+        for family_name, family_gauges in _group_by_family(gauge_stats).items():
+            metric_family = metric_set.metric_families.add()
+            metric_family.name = family_name
+            metric_family.type = GAUGE
+            metric_family.help, metric_family.unit = GAUGE_FAMILIES[family_name]
+
+            for gauge_stat in family_gauges:
+                metric_proto = metric_family.metrics.add()
+                gauge_stat.marshall_metric_proto(metric_proto)
+
         return metric_set
+
+
+_StatT = TypeVar("_StatT", CounterStat, GaugeStat)
+
+
+def _group_by_family(stats: Sequence[_StatT]) -> Dict[str, List[_StatT]]:
+    """Group stats by their metric family, in order of first appearance."""
+    families: Dict[str, List[_StatT]] = {}
+    for stat in stats:
+        families.setdefault(stat.family_name, []).append(stat)
+    return families
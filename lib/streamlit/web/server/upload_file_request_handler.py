@@ -12,14 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Callable, Dict, List
+import email.message
+import email.utils
+import mmap
+import tempfile
+from typing import IO, Callable, Dict, List, NamedTuple, Optional, Union
 
 import tornado.httputil
 import tornado.web
+from typing_extensions import Final
 
 from streamlit import config
 from streamlit.logger import get_logger
-from streamlit.runtime.uploaded_file_manager import UploadedFileManager, UploadedFileRec
+from streamlit.runtime.uploaded_file_manager import (
+    UploadedFileManager,
+    UploadedFileQuotaExceededError,
+    UploadedFileRec,
+)
 from streamlit.web.server import routes, server_util
 
 # /_stcore/upload_file/(optional session id)/(optional widget id)
@@ -28,7 +37,199 @@ UPLOAD_FILE_ROUTE = (
 )
 LOGGER = get_logger(__name__)
 
+# The max size of the headers of each part of a multipart body.
+_MAX_PART_HEADERS_SIZE: Final = 64 * 1024
+
+
+class _UploadedPart(NamedTuple):
+    """A file in a multipart/form-data body."""
+
+    filename: str
+    content_type: str
+    file: IO[bytes]
+
+
+class _MultipartParser:
+    """Incrementally parses a multipart/form-data request body, as it's
+    received.
+
+    Form fields are kept in memory. Files are written to
+    SpooledTemporaryFiles, which are moved to disk once they're larger than
+    `spool_size` bytes.
+    """
+
+    def __init__(self, boundary: bytes, spool_size: int):
+        self._delimiter = b"--" + boundary
+        self._body_delimiter = b"\r\n" + self._delimiter
+        self._spool_size = spool_size
+        self._buffer = bytearray()
+        self._parse = self._parse_preamble
+        self._field_name: Optional[str] = None
+        self._field_data: Optional[bytearray] = None
+        self._file: Optional[_UploadedPart] = None
+        self._is_done = False
+
+        self.args: Dict[str, List[bytes]] = {}
+        self.files: List[_UploadedPart] = []
+        # The number of bytes written to files so far.
+        self.num_file_bytes = 0
+
+    @classmethod
+    def from_content_type(
+        cls, content_type: str, spool_size: int
+    ) -> "_MultipartParser":
+        """Create a parser for a body with the given Content-Type header.
+        Raise a ValueError if it's not a multipart/form-data body.
+        """
+        message = email.message.Message()
+        message["content-type"] = content_type
+        boundary = message.get_param("boundary")
+        if message.get_content_type() != "multipart/form-data" or not isinstance(
+            boundary, str
+        ):
+            raise ValueError("Expected a multipart/form-data body")
+        return cls(boundary.encode("latin1"), spool_size)
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse the next chunk of the body. Raise a ValueError if the body
+        is malformed.
+        """
+        if self._is_done:
+            return
+        self._buffer += chunk
+        # Each parse step returns False once it needs more data.
+        while not self._is_done and self._parse():
+            pass
+
+    @property
+    def num_buffered_bytes(self) -> int:
+        """The number of bytes that were fed to the parser, but haven't been
+        parsed yet."""
+        return len(self._buffer)
+
+    def close(self) -> None:
+        """Finish parsing. Raise a ValueError if the body was incomplete."""
+        if not self._is_done:
+            raise ValueError("Incomplete multipart/form-data body")
+
+    def _parse_preamble(self) -> bool:
+        index = self._buffer.find(self._delimiter)
+        if index == -1:
+            # Keep enough of the buffer to find a delimiter that's split
+            # across chunks.
+            del self._buffer[: -len(self._delimiter)]
+            return False
+        del self._buffer[: index + len(self._delimiter)]
+        self._parse = self._parse_delimiter_end
+        return True
+
+    def _parse_delimiter_end(self) -> bool:
+        if len(self._buffer) < 2:
+            return False
+        if self._buffer.startswith(b"--"):
+            # The final delimiter. Anything after it is ignored.
+            self._buffer.clear()
+            self._is_done = True
+            return False
+        if not self._buffer.startswith(b"\r\n"):
+            raise ValueError("Invalid multipart/form-data delimiter")
+        del self._buffer[:2]
+        self._parse = self._parse_part_headers
+        return True
+
+    def _parse_part_headers(self) -> bool:
+        index = self._buffer.find(b"\r\n\r\n")
+        if index == -1:
+            if len(self._buffer) > _MAX_PART_HEADERS_SIZE:
+                raise ValueError("multipart/form-data part headers are too large")
+            return False
 
+        headers = tornado.httputil.HTTPHeaders.parse(
+            self._buffer[:index].decode("utf-8")
+        )
+        del self._buffer[: index + 4]
+
+        message = email.message.Message()
+        message["content-disposition"] = headers.get("Content-Disposition", "")
+        if message.get_content_disposition() != "form-data":
+            raise ValueError("Invalid multipart/form-data Content-Disposition")
+        name = message.get_param("name", header="content-disposition")
+        if name is None:
+            raise ValueError("multipart/form-data part is missing a name")
+
+        filename = message.get_filename()
+        if filename is None:
+            self._field_name = email.utils.collapse_rfc2231_value(name)
+            self._field_data = bytearray()
+        else:
+            self._file = _UploadedPart(
+                filename=filename,
+                content_type=headers.get("Content-Type", "application/unknown"),
+                file=tempfile.SpooledTemporaryFile(max_size=self._spool_size),
+            )
+        self._parse = self._parse_part_body
+        return True
+
+    def _parse_part_body(self) -> bool:
+        index = self._buffer.find(self._body_delimiter)
+        if index == -1:
+            # Everything but a possible partial delimiter at the end of the
+            # buffer is part of the body.
+            end = len(self._buffer) - len(self._body_delimiter) + 1
+            if end > 0:
+                self._write_part_body(self._buffer[:end])
+                del self._buffer[:end]
+            return False
+
+        self._write_part_body(self._buffer[:index])
+        del self._buffer[: index + len(self._body_delimiter)]
+
+        if self._file is not None:
+            self.files.append(self._file)
+            self._file = None
+        else:
+            assert self._field_name is not None and self._field_data is not None
+            self.args.setdefault(self._field_name, []).append(bytes(self._field_data))
+            self._field_name = None
+            self._field_data = None
+
+        self._parse = self._parse_delimiter_end
+        return True
+
+    def close_files(self) -> None:
+        """Close all the files in the body, including one that was only
+        partially received."""
+        for file in self.files:
+            file.file.close()
+        if self._file is not None:
+            self._file.file.close()
+
+    def _write_part_body(self, data: bytearray) -> None:
+        if self._file is not None:
+            self._file.file.write(data)
+            self.num_file_bytes += len(data)
+        else:
+            assert self._field_data is not None
+            self._field_data += data
+
+
+def _read_uploaded_data(file: IO[bytes], spool_size: int) -> Union[bytes, mmap.mmap]:
+    """Return an uploaded file's content, and close the file.
+
+    Files that were small enough to stay in memory are returned as bytes, and
+    larger ones are memory-mapped.
+    """
+    with file:
+        size = file.tell()
+        if size <= spool_size:
+            file.seek(0)
+            return file.read()
+        # The mapping stays valid after the file is closed (and the temporary
+        # file is removed once it's unmapped).
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@tornado.web.stream_request_body
 class UploadFileRequestHandler(tornado.web.RequestHandler):
     """Implements the POST /upload_file endpoint."""
 
@@ -101,19 +302,113 @@ class UploadFileRequestHandler(tornado.web.RequestHandler):
         # Convert bytes to string
         return arg[0].decode("utf-8")
 
+    def prepare(self) -> None:
+        self._spool_size = int(
+            config.get_option("server.uploadedFileMemorySize") * 1024 * 1024
+        )
+        self._parser: Optional[_MultipartParser] = None
+        self._num_bytes_received = 0
+        self._checked_quota = False
+        if self.request.method != "POST":
+            return
+
+        # The body is parsed as it's received, so large files never need to
+        # be held in memory.
+        try:
+            self._parser = _MultipartParser.from_content_type(
+                self.request.headers.get("Content-Type", ""), self._spool_size
+            )
+        except ValueError as e:
+            raise tornado.web.HTTPError(400, reason=str(e))
+
+    def data_received(self, chunk: bytes) -> None:
+        if self._parser is None or self._finished:
+            return
+        self._num_bytes_received += len(chunk)
+        try:
+            self._parser.feed(chunk)
+        except ValueError as e:
+            # Exceptions raised here would close the connection without a
+            # response, so the error is sent straight away instead. The rest
+            # of the body is discarded.
+            self.send_error(400, reason=str(e))
+            return
+
+        if not self._checked_quota:
+            self._check_quota_early()
+
+    def _check_quota_early(self) -> None:
+        """Reject the upload with a 413 if it won't fit within the uploaded
+        file quotas, before the rest of the body is received.
+
+        This is checked once the session ID is known, using the rest of the
+        body's size as an upper bound for the file's size.
+        """
+        assert self._parser is not None
+        content_length = self.request.headers.get("Content-Length")
+        if content_length is None:
+            # Without a Content-Length, the quota is only checked once the
+            # whole body is received.
+            return
+
+        session_id = self.path_kwargs.get("session_id")
+        if not session_id:
+            session_ids = self._parser.args.get("sessionId")
+            if session_ids is None:
+                return
+            session_id = session_ids[0].decode("utf-8")
+
+        self._checked_quota = True
+        if not self._is_active_session(session_id):
+            # post() rejects uploads for invalid sessions.
+            return
+
+        try:
+            max_file_size = (
+                self._parser.num_file_bytes
+                + self._parser.num_buffered_bytes
+                + int(content_length)
+                - self._num_bytes_received
+            )
+        except ValueError:
+            return
+
+        try:
+            self._file_mgr.ensure_space(
+                session_id, max_file_size, self._is_active_session
+            )
+        except UploadedFileQuotaExceededError as e:
+            self.send_error(413, reason=str(e))
+
+    def on_finish(self) -> None:
+        # Files that weren't added to the file_mgr (because the request was
+        # invalid) are removed.
+        if self._parser is not None:
+            self._parser.close_files()
+
+    def on_connection_close(self) -> None:
+        super().on_connection_close()
+        # The client stopped uploading partway through.
+        if self._parser is not None:
+            self._parser.close_files()
+
     def post(self, **kwargs):
         """Receive an uploaded file and add it to our UploadedFileManager.
         Return the file's ID, so that the client can refer to it.
         """
-        args: Dict[str, List[bytes]] = {}
-        files: Dict[str, List[Any]] = {}
-
-        tornado.httputil.parse_body_arguments(
-            content_type=self.request.headers["Content-Type"],
-            body=self.request.body,
-            arguments=args,
-            files=files,
-        )
+        if self._finished:
+            # An error was already sent while the body was being received.
+            return
+
+        assert self._parser is not None
+        try:
+            self._parser.close()
+        except ValueError as e:
+            self.send_error(400, reason=str(e))
+            return
+
+        args = self._parser.args
+        files = self._parser.files
 
         try:
             session_id = self._require_arg(args, "sessionId")
@@ -125,32 +420,36 @@ class UploadFileRequestHandler(tornado.web.RequestHandler):
             self.send_error(400, reason=str(e))
             return
 
-        # Create an UploadedFile object for each file.
-        # We assign an initial, invalid file_id to each file in this loop.
-        # The file_mgr will assign unique file IDs and return in `add_file`,
-        # below.
-        uploaded_files: List[UploadedFileRec] = []
-        for _, flist in files.items():
-            for file in flist:
-                uploaded_files.append(
-                    UploadedFileRec(
-                        id=0,
-                        name=file["filename"],
-                        type=file["content_type"],
-                        data=file["body"],
-                    )
-                )
-
-        if len(uploaded_files) != 1:
-            self.send_error(
-                400, reason=f"Expected 1 file, but got {len(uploaded_files)}"
-            )
+        if len(files) != 1:
+            self.send_error(400, reason=f"Expected 1 file, but got {len(files)}")
             return
 
-        added_file = self._file_mgr.add_file(
-            session_id=session_id, widget_id=widget_id, file=uploaded_files[0]
+        file = files[0]
+        # We assign an initial, invalid file_id to the file. The file_mgr will
+        # assign a unique file ID and return it in `add_file`, below.
+        uploaded_file = UploadedFileRec(
+            id=0,
+            name=file.filename,
+            type=file.content_type,
+            data=_read_uploaded_data(file.file, self._spool_size),
         )
 
+        try:
+            # The quotas were checked as the upload started, but other uploads
+            # may have been added since. They're checked again as the file is
+            # added, atomically.
+            added_file = self._file_mgr.add_file(
+                session_id=session_id,
+                widget_id=widget_id,
+                file=uploaded_file,
+                is_active_session=self._is_active_session,
+            )
+        except UploadedFileQuotaExceededError as e:
+            if isinstance(uploaded_file.data, mmap.mmap):
+                uploaded_file.data.close()
+            self.send_error(413, reason=str(e))
+            return
+
         # Return the file_id to the client. (The client will parse
         # the string back to an int.)
         self.write(str(added_file.id))
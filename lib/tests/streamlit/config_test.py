@@ -16,6 +16,7 @@
 import copy
 import os
 import textwrap
+import threading
 import unittest
 from unittest.mock import MagicMock, mock_open, patch
 
@@ -324,10 +325,14 @@ class ConfigTest(unittest.TestCase):
                 "deprecation.showPyplotGlobalUse",
                 "global.developmentMode",
                 "global.disableWatchdogWarning",
+                "global.hashAlgorithm",
                 "global.logLevel",
+                "global.maxArrowBytesCacheSize",
                 "global.maxCachedMessageAge",
+                "global.maxMessageCacheSize",
                 "global.minCachedMessageSize",
                 "global.showWarningOnDirectExecution",
+                "global.skipUnchangedElements",
                 "global.suppressDeprecationWarnings",
                 "global.unitTest",
                 "global.dataFrameSerialization",
@@ -338,6 +343,7 @@ class ConfigTest(unittest.TestCase):
                 "runner.installTracer",
                 "runner.fixMatplotlib",
                 "runner.postScriptGC",
+                "runner.maxScriptThreads",
                 "runner.fastReruns",
                 "mapbox.token",
                 "server.baseUrlPath",
@@ -354,7 +360,14 @@ class ConfigTest(unittest.TestCase):
                 "server.port",
                 "server.runOnSave",
                 "server.maxUploadSize",
+                "server.maxUploadedFilesSessionSize",
+                "server.maxUploadedFilesTotalSize",
+                "server.uploadedFileMemorySize",
                 "server.maxMessageSize",
+                "server.maxWebsocketWriteBufferSize",
+                "server.mediaFileStorage",
+                "server.mediaFileStorageDir",
+                "server.mediaFileMemorySize",
                 "server.enableStaticServing",
                 "server.sslCertFile",
                 "server.sslKeyFile",
@@ -754,6 +767,43 @@ class ConfigLoadingTest(unittest.TestCase):
             self.assertEqual("dark", config.get_option("theme.base"))
             self.assertEqual(None, config.get_option("theme.font"))
 
+    def test_reparse_swaps_options_when_done(self):
+        """Test that options read while config files are re-parsed have their
+        previous values, not their defaults."""
+
+        global_config_path = "/mock/home/folder/.streamlit/config.toml"
+        pathexists_patch = patch("streamlit.config.os.path.exists")
+        pathexists_patch.side_effect = lambda path: path == global_config_path
+
+        open_patch = patch(
+            "streamlit.config.open", mock_open(read_data='[theme]\nbase = "dark"')
+        )
+        with open_patch, pathexists_patch:
+            config.get_config_options()
+        self.assertEqual("dark", config.get_option("theme.base"))
+
+        values_during_reparse = []
+
+        def read_during_reparse(*args, **kwargs):
+            # Read from another thread, which can't wait for _config_lock.
+            thread = threading.Thread(
+                target=lambda: values_during_reparse.append(
+                    config.get_option("theme.base")
+                )
+            )
+            thread.start()
+            thread.join(timeout=5)
+            if thread.is_alive():
+                values_during_reparse.append("blocked")
+            return mock_open(read_data='[theme]\nbase = "light"')(*args, **kwargs)
+
+        with patch("streamlit.config.open", read_during_reparse), pathexists_patch:
+            config.get_config_options(force_reparse=True)
+
+        self.assertTrue(values_during_reparse)
+        self.assertEqual({"dark"}, set(values_during_reparse))
+        self.assertEqual("light", config.get_option("theme.base"))
+
     @patch("streamlit.logger.get_logger")
     def test_config_options_warn_on_server_change(self, get_logger):
         """Test that a warning is logged if a user changes a config file in the
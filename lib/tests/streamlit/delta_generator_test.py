@@ -34,6 +34,7 @@ from streamlit.errors import DuplicateWidgetID, StreamlitAPIException
 from streamlit.logger import get_logger
 from streamlit.proto.Element_pb2 import Element
 from streamlit.proto.Empty_pb2 import Empty as EmptyProto
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.proto.RootContainer_pb2 import RootContainer
 from streamlit.proto.Text_pb2 import Text as TextProto
 from streamlit.proto.TextArea_pb2 import TextArea
@@ -316,6 +317,31 @@ class DeltaGeneratorClassTest(DeltaGeneratorTestCase):
         element = self.get_delta_from_queue().new_element
         self.assertEqual(element.text.body, test_data)
 
+    def test_enqueue_forward_msg(self):
+        """An element marshalled into a ForwardMsg is enqueued without
+        being copied."""
+        dg = DeltaGenerator(root_container=RootContainer.MAIN)
+        msg = ForwardMsg()
+        text_proto = msg.delta.new_element.text
+        text_proto.body = "some test data"
+        dg._enqueue("text", text_proto, forward_msg=msg)
+
+        self.assertIs(msg, self.get_message_from_queue())
+        self.assertEqual(
+            make_delta_path(RootContainer.MAIN, (), 0), msg.metadata.delta_path
+        )
+        self.assertEqual("some test data", msg.delta.new_element.text.body)
+
+    def test_enqueue_forward_msg_with_default_element(self):
+        """An element with only default values is still set in its ForwardMsg."""
+        dg = DeltaGenerator(root_container=RootContainer.MAIN)
+        msg = ForwardMsg()
+        dg._enqueue("empty", msg.delta.new_element.empty, forward_msg=msg)
+
+        self.assertEqual(
+            "empty", self.get_delta_from_queue().new_element.WhichOneof("type")
+        )
+
     def test_enqueue_same_id(self):
         cursor = LockedCursor(root_container=RootContainer.MAIN, index=123)
         dg = DeltaGenerator(root_container=RootContainer.MAIN, cursor=cursor)
@@ -0,0 +1,92 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import unittest
+from unittest.mock import MagicMock, patch
+
+from parameterized import parameterized
+
+from streamlit import hash_util
+from tests.testutil import patch_config_options
+
+
+class HashUtilTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        hash_util._hasher_factory = None
+
+    def test_md5(self):
+        hasher = hash_util.get_hasher_factory("md5")()
+        hasher.update(b"hello")
+        self.assertEqual(hashlib.md5(b"hello").hexdigest(), hasher.hexdigest())
+
+    def test_blake2b(self):
+        hasher = hash_util.get_hasher_factory("blake2b")()
+        hasher.update(b"hello")
+        self.assertEqual(
+            hashlib.blake2b(b"hello", digest_size=16).hexdigest(), hasher.hexdigest()
+        )
+        self.assertEqual(16, len(hasher.digest()))
+
+    @patch("streamlit.hash_util._get_xxh3_factory", MagicMock(return_value=None))
+    def test_auto_falls_back_to_blake2b(self):
+        """Without xxhash installed, "auto" should select BLAKE2b."""
+        self.assertIs(hash_util._new_blake2b, hash_util.get_hasher_factory("auto"))
+
+    def test_auto_prefers_xxh3(self):
+        """With xxhash installed, "auto" should select xxh3."""
+        xxh3_factory = MagicMock()
+        with patch(
+            "streamlit.hash_util._get_xxh3_factory",
+            MagicMock(return_value=xxh3_factory),
+        ):
+            self.assertIs(xxh3_factory, hash_util.get_hasher_factory("auto"))
+
+    @patch("streamlit.hash_util._get_xxh3_factory", MagicMock(return_value=None))
+    def test_xxh3_requires_xxhash(self):
+        with self.assertRaises(RuntimeError):
+            hash_util.get_hasher_factory("xxh3")
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            hash_util.get_hasher_factory("sha1")
+
+    @parameterized.expand([("md5",), ("blake2b",)])
+    def test_new_hasher_uses_config(self, algorithm: str):
+        hash_util._hasher_factory = None
+        with patch_config_options({"global.hashAlgorithm": algorithm}):
+            hasher = hash_util.new_hasher()
+
+        expected = hash_util.get_hasher_factory(algorithm)()
+        hasher.update(b"hello")
+        expected.update(b"hello")
+        self.assertEqual(expected.hexdigest(), hasher.hexdigest())
+
+    @patch("streamlit.hash_util._CHUNK_SIZE", 4)
+    def test_hash_buffer(self):
+        """hash_buffer digests large buffers chunk by chunk, with the same
+        result on any number of CPUs."""
+        data = b"0123456789"
+        self.assertEqual(hash_util.hash_buffer(data), hash_util.hash_buffer(data))
+        self.assertNotEqual(
+            hash_util.hash_buffer(data), hash_util.hash_buffer(b"0123456780")
+        )
+        # Small buffers are hashed directly.
+        self.assertEqual(hash_util._digest(b"012"), hash_util.hash_buffer(b"012"))
+
+        with patch("os.cpu_count", MagicMock(return_value=1)):
+            serial = hash_util.hash_buffer(data)
+        with patch("os.cpu_count", MagicMock(return_value=4)):
+            parallel = hash_util.hash_buffer(data)
+        self.assertEqual(serial, parallel)
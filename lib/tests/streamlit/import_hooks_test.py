@@ -0,0 +1,102 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""import_hooks unit tests."""
+
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from importlib.machinery import SourceFileLoader
+from types import ModuleType
+from typing import List
+
+from streamlit import import_hooks
+
+
+class ImportHooksTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self._dir.name, "hooked_pkg"))
+        self._write("hooked_pkg/__init__.py", "")
+        self._write("hooked_pkg/sub.py", "VALUE = 1")
+        self._write("hooked_mod.py", "VALUE = 2")
+        sys.path.insert(0, self._dir.name)
+
+    def tearDown(self) -> None:
+        sys.path.remove(self._dir.name)
+        for name in ["hooked_pkg", "hooked_pkg.sub", "hooked_mod"]:
+            sys.modules.pop(name, None)
+            import_hooks._callbacks.pop(name, None)
+        self._dir.cleanup()
+
+    def _write(self, path: str, body: str) -> None:
+        with open(os.path.join(self._dir.name, path), "w") as f:
+            f.write(body)
+
+    def test_callback_after_import(self):
+        """The callback is called with the module once it has been executed."""
+        values: List[int] = []
+        import_hooks.on_import("hooked_mod", lambda module: values.append(module.VALUE))
+        self.assertEqual([], values)
+
+        module = importlib.import_module("hooked_mod")
+        self.assertEqual([2], values)
+
+        # The module looks like it was imported normally.
+        self.assertIsInstance(module.__loader__, SourceFileLoader)
+        self.assertIsInstance(module.__spec__.loader, SourceFileLoader)
+
+        # The callback is only called once.
+        importlib.reload(module)
+        self.assertEqual([2], values)
+
+    def test_submodule(self):
+        """Callbacks work for submodules."""
+        modules: List[ModuleType] = []
+        import_hooks.on_import("hooked_pkg.sub", modules.append)
+
+        importlib.import_module("hooked_pkg")
+        self.assertEqual([], modules)
+
+        importlib.import_module("hooked_pkg.sub")
+        self.assertEqual([sys.modules["hooked_pkg.sub"]], modules)
+
+    def test_already_imported(self):
+        """The callback is called right away if the module was imported."""
+        module = importlib.import_module("hooked_mod")
+        modules: List[ModuleType] = []
+        import_hooks.on_import("hooked_mod", modules.append)
+        self.assertEqual([module], modules)
+
+    def test_callback_exception(self):
+        """A callback's exception is logged, and doesn't break the import."""
+
+        def fail(module: ModuleType) -> None:
+            raise RuntimeError("oh no")
+
+        import_hooks.on_import("hooked_mod", fail)
+        with self.assertLogs("streamlit.import_hooks", level="ERROR"):
+            module = importlib.import_module("hooked_mod")
+        self.assertEqual(2, module.VALUE)
+
+    def test_missing_module(self):
+        """Importing a module that doesn't exist still fails as usual."""
+        import_hooks.on_import("hooked_missing", lambda module: None)
+        try:
+            with self.assertRaises(ModuleNotFoundError):
+                importlib.import_module("hooked_missing")
+        finally:
+            import_hooks._callbacks.pop("hooked_missing", None)
@@ -68,6 +68,7 @@ def _create_test_session(event_loop: Optional[AbstractEventLoop] = None) -> AppS
         return AppSession(
             script_data=ScriptData("/fake/script_path.py", "fake_command_line"),
             uploaded_file_manager=MagicMock(),
+            script_cache=MagicMock(),
             message_enqueued_callback=None,
             local_sources_watcher=MagicMock(),
             user_info={"email": "test@test.com"},
@@ -263,8 +264,10 @@ class AppSessionTest(unittest.TestCase):
             client_state=session._client_state,
             session_state=session._session_state,
             uploaded_file_mgr=session._uploaded_file_mgr,
+            script_cache=session._script_cache,
             initial_rerun_data=RerunData(),
             user_info={"email": "test@test.com"},
+            thread_pool=Runtime.instance().script_thread_pool,
         )
 
         self.assertIsNotNone(session._scriptrunner)
@@ -347,6 +350,16 @@ class AppSessionTest(unittest.TestCase):
 
         self.assertEqual(session.request_rerun.called, False)
 
+    @patch(
+        "streamlit.runtime.app_session.AppSession._should_rerun_on_file_change",
+        MagicMock(return_value=False),
+    )
+    def test_invalidates_script_cache_on_source_file_change(self):
+        session = _create_test_session()
+        session._on_source_file_changed("/fake/script_path.py")
+
+        session._script_cache.invalidate.assert_called_once_with("/fake/script_path.py")
+
     @patch(
         "streamlit.runtime.app_session.source_util.get_pages",
         MagicMock(
@@ -14,6 +14,8 @@
 
 """Tests that are common to both st.cache_data and st.cache_resource"""
 
+import asyncio
+import inspect
 import threading
 import time
 import unittest
@@ -30,7 +32,10 @@ from streamlit.runtime.caching import (
     CACHE_RESOURCE_MESSAGE_REPLAY_CTX,
     cache_data,
     cache_resource,
+    get_data_cache_stats_provider,
+    get_resource_cache_stats_provider,
 )
+from streamlit.runtime.caching.cache_data_api import DataCache
 from streamlit.runtime.caching.cache_errors import CacheReplayClosureError
 from streamlit.runtime.caching.cache_type import CacheType
 from streamlit.runtime.caching.cache_utils import CachedResult
@@ -626,6 +631,31 @@ class CommonCacheTest(DeltaGeneratorTestCase):
         self.assertEqual(2, foo_call_count[0])
         self.assertEqual(1, bar_call_count[0])
 
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_coroutine_function(self, _, cache_decorator):
+        """Coroutine functions are cached by their awaited values."""
+        call_count = [0]
+
+        @cache_decorator
+        async def foo(x):
+            call_count[0] += 1
+            await asyncio.sleep(0)
+            return [x]
+
+        self.assertTrue(inspect.iscoroutinefunction(foo))
+
+        async def run():
+            return await foo(1), await foo(1), await foo(2)
+
+        self.assertEqual(([1], [1], [2]), asyncio.run(run()))
+        self.assertEqual(2, call_count[0])
+
+        foo.clear()
+        self.assertEqual(([1], [1], [2]), asyncio.run(run()))
+        self.assertEqual(4, call_count[0])
+
     @parameterized.expand(
         [("cache_data", cache_data), ("cache_resource", cache_resource)]
     )
@@ -904,6 +934,96 @@ class CommonCacheThreadingTest(unittest.TestCase):
 
         call_on_threads(call_foo, num_threads=self.NUM_THREADS, timeout=0.5)
 
+    @parameterized.expand(
+        [
+            ("cache_data", cache_data, get_data_cache_stats_provider, True),
+            (
+                "cache_resource",
+                cache_resource,
+                get_resource_cache_stats_provider,
+                False,
+            ),
+        ]
+    )
+    def test_waiters_get_computed_result(
+        self, _, cache_decorator, get_stats_provider, returns_copies
+    ):
+        """Threads that wait for another thread's computation of a value get
+        its result, and are counted as waits."""
+
+        @cache_decorator
+        def foo():
+            time.sleep(0.25)
+            return [42]
+
+        results = []
+
+        def call_foo(_: int) -> None:
+            results.append(foo())
+
+        read_result = DataCache.read_result
+        read_result_calls = []
+
+        def counting_read_result(cache: DataCache, key: str) -> CachedResult:
+            read_result_calls.append(key)
+            return read_result(cache, key)
+
+        with patch.object(DataCache, "read_result", counting_read_result):
+            call_on_threads(call_foo, num_threads=self.NUM_THREADS, timeout=0.5)
+
+        self.assertEqual([[42]] * self.NUM_THREADS, results)
+        num_distinct_results = len({id(result) for result in results})
+        self.assertEqual(
+            self.NUM_THREADS if returns_copies else 1, num_distinct_results
+        )
+
+        counters = {
+            stat.family_name: stat.value
+            for stat in get_stats_provider().get_counter_stats()
+        }
+        self.assertEqual(1, counters["cache_misses"])
+        self.assertEqual(
+            self.NUM_THREADS - 1, counters["cache_hits"] + counters["cache_waits"]
+        )
+        self.assertGreater(counters["cache_waits"], 0)
+        self.assertGreater(counters["cache_wait_seconds"], 0)
+
+        if returns_copies:
+            # Each thread checks the cache once, and the computing thread checks
+            # it again before computing. Waiters don't read the value back.
+            self.assertEqual(self.NUM_THREADS + 1, len(read_result_calls))
+
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_waiter_computes_value_after_failure(self, _, cache_decorator):
+        """If a computation fails, a thread that waited for it computes the
+        value itself."""
+        cached_func_call_count = [0]
+
+        @cache_decorator
+        def foo():
+            cached_func_call_count[0] += 1
+            time.sleep(0.1)
+            if cached_func_call_count[0] == 1:
+                raise RuntimeError("oh no")
+            return 42
+
+        results = []
+        errors = []
+
+        def call_foo(_: int) -> None:
+            try:
+                results.append(foo())
+            except RuntimeError as e:
+                errors.append(e)
+
+        call_on_threads(call_foo, num_threads=self.NUM_THREADS, timeout=0.5)
+
+        self.assertEqual(1, len(errors))
+        self.assertEqual([42] * (self.NUM_THREADS - 1), results)
+        self.assertEqual(2, cached_func_call_count[0])
+
     @parameterized.expand(
         [
             ("cache_data", cache_data, cache_data.clear),
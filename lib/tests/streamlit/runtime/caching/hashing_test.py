@@ -16,6 +16,7 @@
 
 import functools
 import hashlib
+import mmap
 import os
 import re
 import tempfile
@@ -24,20 +25,18 @@ import unittest
 from dataclasses import dataclass
 from enum import Enum, auto
 from io import BytesIO, StringIO
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, patch
 
 import cffi
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 from parameterized import parameterized
 from PIL import Image
 
+from streamlit import hash_util
 from streamlit.runtime.caching.cache_errors import UnhashableTypeError
-from streamlit.runtime.caching.hashing import (
-    _NP_SIZE_LARGE,
-    _PANDAS_ROWS_LARGE,
-    _CacheFuncHasher,
-)
+from streamlit.runtime.caching.hashing import _CacheFuncHasher, _digest_memo
 
 try:
     import keras
@@ -49,7 +48,18 @@ try:
 except ImportError:
     pass
 
-from streamlit.runtime.uploaded_file_manager import UploadedFile, UploadedFileRec
+try:
+    import polars as pl
+
+    HAS_POLARS = True
+except ImportError:
+    HAS_POLARS = False
+
+from streamlit.runtime.uploaded_file_manager import (
+    UploadedFile,
+    UploadedFileRec,
+    open_uploaded_file,
+)
 from streamlit.type_util import is_type
 
 get_main_script_director = MagicMock(return_value=os.getcwd())
@@ -181,11 +191,33 @@ class HashTest(unittest.TestCase):
         self.assertEqual(get_hash(df1), get_hash(df3))
         self.assertNotEqual(get_hash(df1), get_hash(df2))
 
-        df4 = pd.DataFrame(np.zeros((_PANDAS_ROWS_LARGE, 4)), columns=list("ABCD"))
-        df5 = pd.DataFrame(np.zeros((_PANDAS_ROWS_LARGE, 4)), columns=list("ABCD"))
+        df4 = pd.DataFrame(np.zeros((200_000, 4)), columns=list("ABCD"))
+        df5 = pd.DataFrame(np.zeros((200_000, 4)), columns=list("ABCD"))
 
         self.assertEqual(get_hash(df4), get_hash(df5))
 
+        # Large dataframes are hashed in full, not sampled.
+        df5.iloc[123_456, 2] = 1
+        self.assertNotEqual(get_hash(df4), get_hash(df5))
+
+    def test_pandas_dataframe_labels(self):
+        """Dataframes with the same values but different labels or dtypes
+        have different hashes."""
+        df = pd.DataFrame({"foo": [1, 2]})
+
+        self.assertNotEqual(get_hash(df), get_hash(df.rename(columns={"foo": "bar"})))
+        self.assertNotEqual(get_hash(df), get_hash(df.set_index(pd.Index([3, 4]))))
+        self.assertNotEqual(get_hash(df), get_hash(df.astype("float64")))
+
+    def test_pandas_dataframe_unhashable(self):
+        """Dataframes with unhashable values are pickled instead."""
+        df1 = pd.DataFrame({"foo": [[1], [2]]})
+        df2 = pd.DataFrame({"foo": [[1], [3]]})
+        df3 = pd.DataFrame({"foo": [[1], [2]]})
+
+        self.assertEqual(get_hash(df1), get_hash(df3))
+        self.assertNotEqual(get_hash(df1), get_hash(df2))
+
     def test_pandas_series(self):
         series1 = pd.Series([1, 2])
         series2 = pd.Series([1, 3])
@@ -194,11 +226,16 @@ class HashTest(unittest.TestCase):
         self.assertEqual(get_hash(series1), get_hash(series3))
         self.assertNotEqual(get_hash(series1), get_hash(series2))
 
-        series4 = pd.Series(range(_PANDAS_ROWS_LARGE))
-        series5 = pd.Series(range(_PANDAS_ROWS_LARGE))
+        series4 = pd.Series(range(200_000))
+        series5 = pd.Series(range(200_000))
 
         self.assertEqual(get_hash(series4), get_hash(series5))
 
+        series5[123_456] = -1
+        self.assertNotEqual(get_hash(series4), get_hash(series5))
+
+        self.assertNotEqual(get_hash(series1), get_hash(series1.rename("foo")))
+
     def test_numpy(self):
         np1 = np.zeros(10)
         np2 = np.zeros(11)
@@ -207,11 +244,104 @@ class HashTest(unittest.TestCase):
         self.assertEqual(get_hash(np1), get_hash(np3))
         self.assertNotEqual(get_hash(np1), get_hash(np2))
 
-        np4 = np.zeros(_NP_SIZE_LARGE)
-        np5 = np.zeros(_NP_SIZE_LARGE)
+        np4 = np.zeros(2_000_000)
+        np5 = np.zeros(2_000_000)
 
         self.assertEqual(get_hash(np4), get_hash(np5))
 
+        # Large arrays are hashed in full, not sampled.
+        np5[1_234_567] = 1
+        self.assertNotEqual(get_hash(np4), get_hash(np5))
+
+        # The dtype and shape are part of the hash.
+        self.assertNotEqual(get_hash(np.zeros(4, "int64")), get_hash(np.zeros(4)))
+        self.assertNotEqual(get_hash(np.zeros((2, 2))), get_hash(np.zeros(4)))
+
+        # Non-contiguous arrays are hashed by their contents.
+        np6 = np.arange(12).reshape(3, 4)
+        self.assertEqual(get_hash(np6.T), get_hash(np.ascontiguousarray(np6.T)))
+
+    def test_numpy_objects(self):
+        np1 = np.array([1, "a", None], dtype=object)
+        np2 = np.array([1, "b", None], dtype=object)
+        np3 = np.array([1, "a", None], dtype=object)
+
+        self.assertEqual(get_hash(np1), get_hash(np3))
+        self.assertNotEqual(get_hash(np1), get_hash(np2))
+
+    def test_numpy_read_only_memo(self):
+        """The hashes of read-only arrays are remembered."""
+        arr = np.arange(10)
+        arr.flags.writeable = False
+        hash1 = get_hash(arr)
+        self.assertIn(id(arr), _digest_memo._digests)
+
+        with patch.object(
+            hash_util, "hash_buffer", side_effect=AssertionError("rehashed")
+        ):
+            self.assertEqual(hash1, get_hash(arr))
+
+        # Writeable arrays and views of them aren't remembered.
+        arr2 = np.arange(10)
+        view = arr2[:]
+        view.flags.writeable = False
+        get_hash(arr2)
+        get_hash(view)
+        self.assertNotIn(id(arr2), _digest_memo._digests)
+        self.assertNotIn(id(view), _digest_memo._digests)
+
+        # The hash is forgotten with the array.
+        arr_id = id(arr)
+        del arr
+        self.assertNotIn(arr_id, _digest_memo._digests)
+
+    def test_pyarrow_table(self):
+        table1 = pa.table({"foo": [1, 2], "bar": ["a", None]})
+        table2 = pa.table({"foo": [1, 2], "bar": ["b", None]})
+        table3 = pa.table({"foo": [1, 2], "bar": ["a", None]})
+
+        self.assertEqual(get_hash(table1), get_hash(table3))
+        self.assertNotEqual(get_hash(table1), get_hash(table2))
+        self.assertNotEqual(get_hash(table1), get_hash(table1.slice(1)))
+        self.assertNotEqual(
+            get_hash(table1), get_hash(table1.rename_columns(["baz", "bar"]))
+        )
+
+    def test_pyarrow_table_nested_and_dictionary(self):
+        table1 = pa.table(
+            {
+                "list": [[1], [2, 3]],
+                "dict": pa.array(["a", "b"]).dictionary_encode(),
+            }
+        )
+        table2 = pa.table(
+            {
+                "list": [[1, 2], [3]],
+                "dict": pa.array(["a", "b"]).dictionary_encode(),
+            }
+        )
+        table3 = pa.table(
+            {
+                "list": [[1], [2, 3]],
+                "dict": pa.array(["b", "a"]).dictionary_encode(),
+            }
+        )
+
+        self.assertEqual(get_hash(table1), get_hash(table1.combine_chunks()))
+        self.assertNotEqual(get_hash(table1), get_hash(table2))
+        self.assertNotEqual(get_hash(table1), get_hash(table3))
+
+    @unittest.skipIf(not HAS_POLARS, "polars not installed")
+    def test_polars(self):
+        df1 = pl.DataFrame({"foo": [1, 2]})
+        df2 = pl.DataFrame({"foo": [1, 3]})
+        df3 = pl.DataFrame({"foo": [1, 2]})
+
+        self.assertEqual(get_hash(df1), get_hash(df3))
+        self.assertNotEqual(get_hash(df1), get_hash(df2))
+        self.assertEqual(get_hash(df1["foo"]), get_hash(df3["foo"]))
+        self.assertNotEqual(get_hash(df1["foo"]), get_hash(df2["foo"]))
+
     def test_PIL_image(self):
         im1 = Image.new("RGB", (50, 50), (220, 20, 60))
         im2 = Image.new("RGB", (50, 50), (30, 144, 255))
@@ -220,19 +350,18 @@ class HashTest(unittest.TestCase):
         self.assertEqual(get_hash(im1), get_hash(im3))
         self.assertNotEqual(get_hash(im1), get_hash(im2))
 
-        # Check for big PIL images, they converted to numpy array with size
-        # bigger than _NP_SIZE_LARGE
-        # 1000 * 1000 * 3 = 3_000_000 > _NP_SIZE_LARGE = 1_000_000
         im4 = Image.new("RGB", (1000, 1000), (100, 20, 60))
         im5 = Image.new("RGB", (1000, 1000), (100, 20, 60))
         im6 = Image.new("RGB", (1000, 1000), (101, 21, 61))
 
-        im4_np_array = np.frombuffer(im4.tobytes(), dtype="uint8")
-        self.assertGreater(im4_np_array.size, _NP_SIZE_LARGE)
-
         self.assertEqual(get_hash(im4), get_hash(im5))
         self.assertNotEqual(get_hash(im5), get_hash(im6))
 
+        # The mode and size are part of the hash.
+        self.assertNotEqual(
+            get_hash(Image.new("L", (2, 6))), get_hash(Image.new("RGB", (2, 2)))
+        )
+
     @parameterized.expand(
         [
             (BytesIO, b"123", b"456", b"123"),
@@ -258,6 +387,30 @@ class HashTest(unittest.TestCase):
         io3.seek(0)
         self.assertNotEqual(get_hash(io1), get_hash(io3))
 
+    def test_memory_mapped_uploaded_file(self):
+        """Memory-mapped uploaded files are hashed by their contents and
+        position."""
+        with tempfile.TemporaryFile() as f1, tempfile.TemporaryFile() as f2:
+            f1.write(b"123")
+            f1.flush()
+            f2.write(b"456")
+            f2.flush()
+            with mmap.mmap(f1.fileno(), 0, access=mmap.ACCESS_READ) as data1, mmap.mmap(
+                f2.fileno(), 0, access=mmap.ACCESS_READ
+            ) as data2:
+                rec1 = UploadedFileRec(0, "name", "type", data1)
+                rec2 = UploadedFileRec(0, "name", "type", data2)
+                file1 = open_uploaded_file(rec1)
+                file2 = open_uploaded_file(rec2)
+                file3 = open_uploaded_file(rec1)
+
+                self.assertEqual(get_hash(file1), get_hash(file3))
+                self.assertNotEqual(get_hash(file1), get_hash(file2))
+
+                # Changing the stream position should change the hash
+                file1.seek(1)
+                self.assertNotEqual(get_hash(file1), get_hash(file3))
+
     def test_partial(self):
         p1 = functools.partial(int, base=2)
         p2 = functools.partial(int, base=3)
@@ -0,0 +1,206 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for DiskMediaFileStorage"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from streamlit.runtime import disk_media_file_storage
+from streamlit.runtime.disk_media_file_storage import DiskFile, DiskMediaFileStorage
+from streamlit.runtime.media_file_storage import MediaFileKind, MediaFileStorageError
+from streamlit.runtime.memory_media_file_storage import (
+    MemoryFile,
+    MemoryMediaFileStorage,
+)
+
+
+class DiskMediaFileStorageTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.storage = DiskMediaFileStorage(
+            media_endpoint="/mock/media", directory=self.tempdir.name
+        )
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+        super().tearDown()
+
+    def _load(self, storage, data, filename="file.mp4"):
+        return storage.load_and_get_id(
+            data, mimetype="video/mp4", kind=MediaFileKind.MEDIA, filename=filename
+        )
+
+    def test_load_with_bytes(self):
+        """Adding a file with bytes writes it to the storage's directory."""
+        file_id = self._load(self.storage, b"mock_bytes")
+
+        media_file = self.storage.get_file(file_id)
+        self.assertIsInstance(media_file, DiskFile)
+        self.assertEqual(os.path.join(self.tempdir.name, file_id), media_file.path)
+        self.assertEqual(len(b"mock_bytes"), media_file.content_size)
+        self.assertEqual("video/mp4", media_file.mimetype)
+        self.assertEqual(b"mock_bytes", b"".join(media_file.read_chunks()))
+
+    def test_load_with_path(self):
+        """Adding a file by path copies it to the storage's directory."""
+        src_path = os.path.join(self.tempdir.name, "src.mp4")
+        with open(src_path, "wb") as f:
+            f.write(b"mock_bytes")
+
+        file_id = self._load(self.storage, src_path)
+        media_file = self.storage.get_file(file_id)
+        self.assertNotEqual(src_path, media_file.path)
+        self.assertEqual(b"mock_bytes", b"".join(media_file.read_chunks()))
+
+    def test_load_with_bad_path(self):
+        """Adding a file by a path that doesn't exist raises an error."""
+        with self.assertRaises(MediaFileStorageError):
+            self._load(self.storage, "/not/a/valid/path.mp4")
+
+    def test_file_ids_match_memory_storage(self):
+        """File IDs are computed the same way as MemoryMediaFileStorage's."""
+        memory_storage = MemoryMediaFileStorage(media_endpoint="/mock/media")
+        self.assertEqual(
+            self._load(memory_storage, b"mock_bytes"),
+            self._load(self.storage, b"mock_bytes"),
+        )
+        self.assertEqual(
+            self._load(memory_storage, b"mock_bytes", filename=None),
+            self._load(self.storage, b"mock_bytes", filename=None),
+        )
+
+    def test_read_chunks(self):
+        """read_chunks only reads the requested range, in chunks."""
+        data = bytes(range(256)) * 1024
+        file_id = self._load(self.storage, data)
+        media_file = self.storage.get_file(file_id)
+
+        chunks = list(media_file.read_chunks())
+        self.assertEqual(len(data) // disk_media_file_storage.CHUNK_SIZE, len(chunks))
+        self.assertEqual(data, b"".join(chunks))
+        self.assertEqual(
+            data[1000:200000], b"".join(media_file.read_chunks(1000, 200000))
+        )
+        self.assertEqual(data[-10:], b"".join(media_file.read_chunks(len(data) - 10)))
+        self.assertEqual([], list(media_file.read_chunks(10, 10)))
+
+    def test_get_url(self):
+        """URLs have the file's extension."""
+        file_id = self._load(self.storage, b"mock_bytes")
+        self.assertEqual(f"/mock/media/{file_id}.mp4", self.storage.get_url(file_id))
+
+    def test_get_url_doesnt_read_file(self):
+        """get_url only needs the file's metadata, so it doesn't read a file
+        that isn't in memory, or change which files are."""
+        storage = DiskMediaFileStorage(
+            media_endpoint="/mock/media",
+            directory=self.tempdir.name,
+            max_memory_bytes=15,
+        )
+        file_id1 = self._load(storage, b"0123456789", filename="1.mp4")
+        file_id2 = self._load(storage, b"0123456789", filename="2.mp4")
+
+        with patch("builtins.open") as mock_open:
+            self.assertEqual(f"/mock/media/{file_id1}.mp4", storage.get_url(file_id1))
+        mock_open.assert_not_called()
+        self.assertEqual({file_id2}, set(storage._hot_files.keys()))
+
+        with self.assertRaises(MediaFileStorageError):
+            storage.get_url("not_a_file_id")
+
+    def test_get_invalid_file(self):
+        """Getting a file that doesn't exist raises an error."""
+        with self.assertRaises(MediaFileStorageError):
+            self.storage.get_file("not_a_file_id.mp4")
+
+    def test_delete_file(self):
+        """delete_file removes the file from the storage and the disk."""
+        file_id = self._load(self.storage, b"mock_bytes")
+        path = self.storage.get_file(file_id).path
+
+        self.storage.delete_file(file_id)
+        self.assertFalse(os.path.exists(path))
+        with self.assertRaises(MediaFileStorageError):
+            self.storage.get_file(file_id)
+
+        # Deleting it again is a no-op.
+        self.storage.delete_file(file_id)
+
+    def test_hot_tier(self):
+        """Recently used files that fit in the memory budget are returned
+        as MemoryFiles, and the least recently used are evicted first."""
+        storage = DiskMediaFileStorage(
+            media_endpoint="/mock/media",
+            directory=self.tempdir.name,
+            max_memory_bytes=25,
+        )
+        file_id1 = self._load(storage, b"0123456789", filename="1.mp4")
+        file_id2 = self._load(storage, b"0123456789", filename="2.mp4")
+        self.assertEqual(
+            MemoryFile(
+                content=b"0123456789",
+                mimetype="video/mp4",
+                kind=MediaFileKind.MEDIA,
+                filename="1.mp4",
+            ),
+            storage.get_file(file_id1),
+        )
+
+        # File 2 is the least recently used, so it's evicted by file 3.
+        file_id3 = self._load(storage, b"0123456789", filename="3.mp4")
+        self.assertIsInstance(storage.get_file(file_id3), MemoryFile)
+        self.assertIsInstance(storage.get_file(file_id1), MemoryFile)
+        self.assertEqual(20, sum(stat.byte_length for stat in storage.get_stats()))
+        # Reading the stats doesn't change which files were used last.
+        self.assertIsInstance(storage.get_file(file_id1), MemoryFile)
+
+        # Reading file 2 brings it back into memory, evicting file 3.
+        self.assertIsInstance(storage.get_file(file_id2), MemoryFile)
+        hot_file_ids = set(storage._hot_files.keys())
+        self.assertEqual({file_id1, file_id2}, hot_file_ids)
+
+        # Files that don't fit in the budget are always read from disk.
+        file_id4 = self._load(storage, b"x" * 26, filename="4.mp4")
+        self.assertIsInstance(storage.get_file(file_id4), DiskFile)
+
+    def test_cache_stats(self):
+        """Files that are only on disk don't count towards the stats."""
+        self._load(self.storage, b"mock_bytes")
+        self.assertEqual([], self.storage.get_stats())
+
+        storage = DiskMediaFileStorage(
+            media_endpoint="/mock/media",
+            directory=self.tempdir.name,
+            max_memory_bytes=100,
+        )
+        self._load(storage, b"mock_bytes")
+        stats = storage.get_stats()
+        self.assertEqual(1, len(stats))
+        self.assertEqual("st_disk_media_file_storage", stats[0].category_name)
+        self.assertEqual(len(b"mock_bytes"), stats[0].byte_length)
+
+    def test_temporary_directory(self):
+        """Without a directory, files are stored in a temporary directory
+        that's removed along with the storage."""
+        storage = DiskMediaFileStorage(media_endpoint="/mock/media")
+        directory = storage._directory
+        self._load(storage, b"mock_bytes")
+        self.assertEqual(1, len(os.listdir(directory)))
+
+        del storage
+        self.assertFalse(os.path.exists(directory))
@@ -0,0 +1,161 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for ElementFingerprintIndex"""
+
+import unittest
+from typing import List
+
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.RootContainer_pb2 import RootContainer
+from streamlit.runtime.element_fingerprint_index import ElementFingerprintIndex
+
+
+def _create_text_msg(body: str, path: List[int]) -> ForwardMsg:
+    msg = ForwardMsg()
+    msg.metadata.delta_path[:] = path
+    msg.delta.new_element.text.body = body
+    return msg
+
+
+def _create_block_msg(path: List[int]) -> ForwardMsg:
+    msg = ForwardMsg()
+    msg.metadata.delta_path[:] = path
+    msg.delta.add_block.vertical.SetInParent()
+    return msg
+
+
+def _create_new_session_msg(page_script_hash: str) -> ForwardMsg:
+    msg = ForwardMsg()
+    msg.new_session.page_script_hash = page_script_hash
+    return msg
+
+
+def _create_script_finished_msg(
+    status: "ForwardMsg.ScriptFinishedStatus.ValueType",
+) -> ForwardMsg:
+    msg = ForwardMsg()
+    msg.script_finished = status
+    return msg
+
+
+MAIN = RootContainer.MAIN
+
+
+class ElementFingerprintIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = ElementFingerprintIndex()
+
+    def _is_unchanged(self, msg: ForwardMsg) -> bool:
+        return self.index.process(msg).delta.unchanged_element
+
+    def _rerun(
+        self, status: "ForwardMsg.ScriptFinishedStatus.ValueType", page: str = "page"
+    ) -> None:
+        """Finish the current script run and start another on the given page."""
+        self.index.process(_create_script_finished_msg(status))
+        self.index.process(_create_new_session_msg(page))
+
+    def test_unchanged_element(self):
+        """An element that's the same as the one at its path is replaced."""
+        self.index.process(_create_new_session_msg("page"))
+        self.assertFalse(self._is_unchanged(_create_text_msg("a", [MAIN, 0])))
+
+        self._rerun(ForwardMsg.FINISHED_SUCCESSFULLY)
+        unchanged = self.index.process(_create_text_msg("a", [MAIN, 0]))
+        self.assertTrue(unchanged.delta.unchanged_element)
+        self.assertEqual([MAIN, 0], list(unchanged.metadata.delta_path))
+
+        # A different element, or the same element at a different path, is sent.
+        self.assertFalse(self._is_unchanged(_create_text_msg("b", [MAIN, 1])))
+        self.assertFalse(self._is_unchanged(_create_text_msg("b", [MAIN, 0])))
+
+    def test_changed_dimensions(self):
+        """An element whose dimensions changed is sent."""
+        self.index.process(_create_text_msg("a", [MAIN, 0]))
+
+        msg = _create_text_msg("a", [MAIN, 0])
+        msg.metadata.element_dimension_spec.width = 100
+        self.assertFalse(self._is_unchanged(msg))
+
+    def test_overwritten_element(self):
+        """An element that replaced another one at the same path (as with
+        st.empty) is the one that's compared against.
+        """
+        self.index.process(_create_text_msg("a", [MAIN, 0]))
+        self.index.process(_create_text_msg("b", [MAIN, 0]))
+        self.assertFalse(self._is_unchanged(_create_text_msg("a", [MAIN, 0])))
+
+    def test_replaced_block(self):
+        """An element that replaces a block removes the block's children."""
+        self.index.process(_create_block_msg([MAIN, 0]))
+        self.index.process(_create_text_msg("a", [MAIN, 0, 0]))
+        self.index.process(_create_text_msg("a", [MAIN, 0]))
+
+        self.assertFalse(self._is_unchanged(_create_text_msg("a", [MAIN, 0, 0])))
+
+    def test_added_rows(self):
+        """An element that had rows added to it is sent again."""
+        self.index.process(_create_text_msg("a", [MAIN, 0]))
+
+        add_rows_msg = ForwardMsg()
+        add_rows_msg.metadata.delta_path[:] = [MAIN, 0]
+        add_rows_msg.delta.arrow_add_rows.SetInParent()
+        self.index.process(add_rows_msg)
+
+        self.assertFalse(self._is_unchanged(_create_text_msg("a", [MAIN, 0])))
+
+    def test_stale_elements_pruned(self):
+        """Elements that weren't sent during a successful run are forgotten,
+        since the frontend clears them.
+        """
+        self.index.process(_create_new_session_msg("page"))
+        self.index.process(_create_text_msg("a", [MAIN, 0]))
+        self.index.process(_create_text_msg("b", [MAIN, 1]))
+
+        # Only the first element is sent during a run that's interrupted.
+        self._rerun(ForwardMsg.FINISHED_SUCCESSFULLY)
+        self.assertTrue(self._is_unchanged(_create_text_msg("a", [MAIN, 0])))
+        self._rerun(ForwardMsg.FINISHED_EARLY_FOR_RERUN)
+
+        # The second element is still on the frontend.
+        self.assertTrue(self._is_unchanged(_create_text_msg("a", [MAIN, 0])))
+        self.assertTrue(self._is_unchanged(_create_text_msg("b", [MAIN, 1])))
+
+        # Only the first element is sent during a successful run.
+        self._rerun(ForwardMsg.FINISHED_SUCCESSFULLY)
+        self.assertTrue(self._is_unchanged(_create_text_msg("a", [MAIN, 0])))
+        self._rerun(ForwardMsg.FINISHED_SUCCESSFULLY)
+
+        # The second element was cleared.
+        self.assertFalse(self._is_unchanged(_create_text_msg("b", [MAIN, 1])))
+
+    def test_page_change(self):
+        """All elements are forgotten when the page changes."""
+        self.index.process(_create_new_session_msg("page1"))
+        self.index.process(_create_text_msg("a", [MAIN, 0]))
+
+        self._rerun(ForwardMsg.FINISHED_SUCCESSFULLY, page="page2")
+        self.assertFalse(self._is_unchanged(_create_text_msg("a", [MAIN, 0])))
+
+    def test_set_value_widget(self):
+        """A widget whose value is set by the script is always sent."""
+        msg = ForwardMsg()
+        msg.metadata.delta_path[:] = [MAIN, 0]
+        msg.delta.new_element.checkbox.id = "checkbox"
+        msg.delta.new_element.checkbox.value = True
+        msg.delta.new_element.checkbox.set_value = True
+
+        self.index.process(msg)
+        self.assertFalse(self._is_unchanged(msg))
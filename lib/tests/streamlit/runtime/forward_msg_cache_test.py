@@ -26,8 +26,10 @@ from streamlit.runtime.forward_msg_cache import (
     ForwardMsgCache,
     create_reference_msg,
     populate_hash_if_needed,
+    serialize_payload,
 )
 from streamlit.runtime.stats import CacheStat
+from tests.testutil import patch_config_options
 
 
 def _create_dataframe_msg(df, id=1):
@@ -59,6 +61,47 @@ class ForwardMsgCacheTest(unittest.TestCase):
         msg2 = _create_dataframe_msg([1, 2, 3], 2)
         self.assertEqual(populate_hash_if_needed(msg1), populate_hash_if_needed(msg2))
 
+    def test_serialized_payload(self):
+        """Test that a ForwardMsg's payload excludes its hash and metadata"""
+        msg = _create_dataframe_msg([1, 2, 3], 1)
+        payload = serialize_payload(msg)
+
+        payload_msg = ForwardMsg()
+        payload_msg.ParseFromString(payload)
+        self.assertEqual("", payload_msg.hash)
+        self.assertFalse(payload_msg.HasField("metadata"))
+        self.assertEqual(msg.delta, payload_msg.delta)
+
+        # Computing the payload populates the hash, and leaves the
+        # metadata untouched.
+        self.assertNotEqual("", msg.hash)
+        self.assertEqual([RootContainer.SIDEBAR, 1], msg.metadata.delta_path)
+
+    def test_cache_stores_serialized_payload(self):
+        """Test that the cache keeps the payload it's given, and serves it to
+        every session that sends the same message"""
+        cache = ForwardMsgCache()
+        msg1 = _create_dataframe_msg([1, 2, 3], 1)
+        payload = serialize_payload(msg1)
+        cache.add_message(msg1, _create_mock_session(), 0, payload)
+        self.assertIs(payload, cache.get_serialized_payload(msg1.hash))
+
+        # Another session's copy of the message doesn't replace the payload.
+        msg2 = _create_dataframe_msg([1, 2, 3], 2)
+        cache.add_message(msg2, _create_mock_session(), 0, serialize_payload(msg2))
+        self.assertIs(payload, cache.get_serialized_payload(msg2.hash))
+
+    def test_get_serialized_message(self):
+        """Test that a cached message serializes to the original message"""
+        cache = ForwardMsgCache()
+        msg = _create_dataframe_msg([1, 2, 3], 1)
+        cache.add_message(msg, _create_mock_session(), 0)
+
+        deserialized_msg = ForwardMsg()
+        deserialized_msg.ParseFromString(cache.get_serialized_message(msg.hash))
+        self.assertEqual(msg, deserialized_msg)
+        self.assertIsNone(cache.get_serialized_message("not_a_hash"))
+
     def test_reference_msg(self):
         """Test creation of 'reference' ForwardMsgs"""
         msg = _create_dataframe_msg([1, 2, 3], 34)
@@ -141,6 +184,92 @@ class ForwardMsgCacheTest(unittest.TestCase):
         cache.remove_expired_session_entries(session2, runcount2)
         self.assertIsNone(cache.get_message(msg_hash))
 
+    def test_total_byte_length(self):
+        """Test that ForwardMsgCache tracks the size of its entries"""
+        cache = ForwardMsgCache()
+        session = _create_mock_session()
+        self.assertEqual(0, cache.total_byte_length)
+
+        msg1 = _create_dataframe_msg([1, 2, 3])
+        cache.add_message(msg1, session, 0)
+        msg2 = _create_dataframe_msg([5, 4, 3, 2, 1, 0])
+        cache.add_message(msg2, session, 0)
+        self.assertEqual(msg1.ByteSize() + msg2.ByteSize(), cache.total_byte_length)
+
+        # Adding a message that's already cached doesn't change the total.
+        cache.add_message(msg1, _create_mock_session(), 0)
+        self.assertEqual(msg1.ByteSize() + msg2.ByteSize(), cache.total_byte_length)
+
+        cache.clear()
+        self.assertEqual(0, cache.total_byte_length)
+
+    def test_compressed_payload(self):
+        """Test that compressed payloads are cached with their message, and
+        count towards its size"""
+        cache = ForwardMsgCache()
+        msg = _create_dataframe_msg([1, 2, 3])
+        cache.add_message(msg, _create_mock_session(), 0)
+        byte_length = cache.total_byte_length
+
+        compress = MagicMock(return_value=b"compressed")
+        self.assertEqual(
+            b"compressed", cache.get_compressed_payload(msg.hash, 1, compress)
+        )
+        self.assertEqual(
+            b"compressed", cache.get_compressed_payload(msg.hash, 1, compress)
+        )
+        compress.assert_called_once_with(cache.get_serialized_payload(msg.hash))
+        self.assertEqual(byte_length + len(b"compressed"), cache.total_byte_length)
+
+        # Other parameters need another compressed payload.
+        cache.get_compressed_payload(msg.hash, 2, compress)
+        self.assertEqual(2, compress.call_count)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used messages are evicted when the
+        cache exceeds its byte budget"""
+        cache = ForwardMsgCache()
+        session = _create_mock_session()
+
+        msgs = [_create_dataframe_msg([i] * 10) for i in range(1, 4)]
+        for msg in msgs:
+            populate_hash_if_needed(msg)
+        max_size = msgs[0].ByteSize() + msgs[1].ByteSize()
+
+        with patch_config_options({"global.maxMessageCacheSize": max_size}):
+            cache.add_message(msgs[0], session, 0)
+            cache.add_message(msgs[1], session, 0)
+
+            # Using msgs[0] again makes msgs[1] the least recently used entry.
+            cache.add_message(msgs[0], session, 0)
+            cache.add_message(msgs[2], session, 0)
+
+            self.assertIsNotNone(cache.get_message(msgs[0].hash))
+            self.assertIsNone(cache.get_message(msgs[1].hash))
+            self.assertIsNotNone(cache.get_message(msgs[2].hash))
+            self.assertLessEqual(cache.total_byte_length, max_size)
+
+            # An evicted message is no longer referenced by the session, so it
+            # will be sent in full rather than as a reference.
+            self.assertFalse(cache.has_message_reference(msgs[1], session, 0))
+            self.assertTrue(cache.has_message_reference(msgs[2], session, 0))
+
+    @patch_config_options({"global.maxMessageCacheSize": 1})
+    def test_never_evicts_newest_message(self):
+        """Test that a message larger than the byte budget is still cached,
+        since it's about to be sent."""
+        cache = ForwardMsgCache()
+        session = _create_mock_session()
+
+        msg1 = _create_dataframe_msg([1, 2, 3])
+        cache.add_message(msg1, session, 0)
+        self.assertIsNotNone(cache.get_message(msg1.hash))
+
+        msg2 = _create_dataframe_msg([4, 5, 6])
+        cache.add_message(msg2, session, 0)
+        self.assertIsNone(cache.get_message(msg1.hash))
+        self.assertIsNotNone(cache.get_message(msg2.hash))
+
     def test_cache_stats_provider(self):
         """Test ForwardMsgCache's CacheStatsProvider implementation."""
         cache = ForwardMsgCache()
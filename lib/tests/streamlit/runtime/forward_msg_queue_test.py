@@ -16,8 +16,10 @@
 
 import copy
 import unittest
-from typing import Tuple
+from typing import Optional, Tuple
+from unittest.mock import MagicMock, patch
 
+import pandas as pd
 from parameterized import parameterized
 
 from streamlit.cursor import make_delta_path
@@ -25,6 +27,7 @@ from streamlit.elements import legacy_data_frame
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.proto.RootContainer_pb2 import RootContainer
 from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+from streamlit.type_util import bytes_to_data_frame, data_frame_to_bytes
 
 # For the messages below, we don't really care about their contents so much as
 # their general type.
@@ -324,3 +327,98 @@ class ForwardMsgQueueTest(unittest.TestCase):
 
         assert_deltas(RootContainer.MAIN, (), 1)
         assert_deltas(RootContainer.SIDEBAR, (0, 0, 1), 4)
+
+    def test_coalesce_arrow_add_rows(self):
+        """Consecutive arrow_add_rows Deltas for the same element are coalesced."""
+        rq = ForwardMsgQueue()
+        rq.enqueue(NEW_SESSION_MSG)
+        rq.enqueue(_create_arrow_add_rows_msg(pd.DataFrame({"a": [1, 2]}), 1))
+        rq.enqueue(_create_arrow_add_rows_msg(pd.DataFrame({"a": [3]}), 2))
+        rq.enqueue(_create_arrow_add_rows_msg(pd.DataFrame({"a": [4]}), 1))
+        rq.enqueue(_create_arrow_add_rows_msg(pd.DataFrame({"a": [5, 6]}), 1))
+
+        queue = rq.flush()
+        self.assertEqual(3, len(queue))
+
+        df = bytes_to_data_frame(queue[1].delta.arrow_add_rows.data.data)
+        pd.testing.assert_frame_equal(pd.DataFrame({"a": [1, 2, 4, 5, 6]}), df)
+        self.assertEqual(
+            make_delta_path(RootContainer.MAIN, (), 1), queue[1].metadata.delta_path
+        )
+
+        df = bytes_to_data_frame(queue[2].delta.arrow_add_rows.data.data)
+        pd.testing.assert_frame_equal(pd.DataFrame({"a": [3]}), df)
+
+    def test_coalesce_arrow_add_rows_keeps_index(self):
+        """Non-range indexes are concatenated too."""
+        rq = ForwardMsgQueue()
+        rq.enqueue(_create_arrow_add_rows_msg(pd.DataFrame({"a": [1]}, index=["x"]), 1))
+        rq.enqueue(_create_arrow_add_rows_msg(pd.DataFrame({"a": [2]}, index=["y"]), 1))
+
+        queue = rq.flush()
+        self.assertEqual(1, len(queue))
+        df = bytes_to_data_frame(queue[0].delta.arrow_add_rows.data.data)
+        pd.testing.assert_frame_equal(pd.DataFrame({"a": [1, 2]}, index=["x", "y"]), df)
+
+    @patch(
+        "streamlit.runtime.forward_msg_queue._concat_arrow_data",
+        MagicMock(side_effect=RuntimeError("oh no")),
+    )
+    def test_coalesce_arrow_add_rows_failure(self):
+        """If the coalesced Arrow data can't be concatenated, the Deltas are
+        flushed as they were enqueued."""
+        rq = ForwardMsgQueue()
+        rq.enqueue(_create_arrow_add_rows_msg(pd.DataFrame({"a": [1]}), 1))
+        rq.enqueue(_create_arrow_add_rows_msg(pd.DataFrame({"a": [2]}), 2))
+        rq.enqueue(_create_arrow_add_rows_msg(pd.DataFrame({"a": [3]}), 1))
+        rq.enqueue(_create_arrow_add_rows_msg(pd.DataFrame({"a": [4]}), 1))
+
+        queue = rq.flush()
+        self.assertEqual(4, len(queue))
+        for msg, expected_rows, delta_index in zip(
+            queue, [[1], [3], [4], [2]], [1, 1, 1, 2]
+        ):
+            df = bytes_to_data_frame(msg.delta.arrow_add_rows.data.data)
+            pd.testing.assert_frame_equal(pd.DataFrame({"a": expected_rows}), df)
+            self.assertEqual(
+                make_delta_path(RootContainer.MAIN, (), delta_index),
+                msg.metadata.delta_path,
+            )
+
+    @parameterized.expand(
+        [
+            ("different schema", pd.DataFrame({"a": ["x"]}), "", None),
+            ("different name", pd.DataFrame({"a": [2]}), "name", None),
+            ("new element in between", pd.DataFrame({"a": [2]}), "", DF_DELTA_MSG),
+            ("other message in between", pd.DataFrame({"a": [2]}), "", NEW_SESSION_MSG),
+        ]
+    )
+    def test_dont_coalesce_arrow_add_rows(
+        self, _, df: pd.DataFrame, name: str, msg_in_between: Optional[ForwardMsg]
+    ):
+        rq = ForwardMsgQueue()
+        rq.enqueue(_create_arrow_add_rows_msg(pd.DataFrame({"a": [1]}), 1))
+        if msg_in_between is not None:
+            msg_in_between = copy.deepcopy(msg_in_between)
+            msg_in_between.metadata.delta_path[:] = make_delta_path(
+                RootContainer.MAIN, (), 1
+            )
+            rq.enqueue(msg_in_between)
+        rq.enqueue(_create_arrow_add_rows_msg(df, 1, name))
+
+        queue = rq.flush()
+        self.assertEqual(3 if msg_in_between is not None else 2, len(queue))
+        df = bytes_to_data_frame(queue[0].delta.arrow_add_rows.data.data)
+        pd.testing.assert_frame_equal(pd.DataFrame({"a": [1]}), df)
+
+
+def _create_arrow_add_rows_msg(
+    df: pd.DataFrame, delta_index: int, name: str = ""
+) -> ForwardMsg:
+    msg = ForwardMsg()
+    msg.delta.arrow_add_rows.data.data = data_frame_to_bytes(df)
+    if name:
+        msg.delta.arrow_add_rows.name = name
+        msg.delta.arrow_add_rows.has_name = True
+    msg.metadata.delta_path[:] = make_delta_path(RootContainer.MAIN, (), delta_index)
+    return msg
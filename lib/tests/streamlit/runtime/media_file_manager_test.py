@@ -421,3 +421,58 @@ class MediaFileManagerThreadingTest(unittest.TestCase):
 
         # Our files should be gone!
         self.assertEqual(0, len(self.media_file_manager._file_metadata))
+
+    @mock.patch(
+        "streamlit.runtime.media_file_manager._get_session_id",
+        MagicMock(return_value="mock_session_id"),
+    )
+    def test_add_file_loads_outside_lock(self):
+        """Files are loaded into storage without holding the manager's lock,
+        so other sessions aren't blocked while a large file is hashed."""
+        load_and_get_id = self.storage.load_and_get_id
+
+        def load_without_lock(*args, **kwargs):
+            self.assertFalse(self.media_file_manager._lock.locked())
+            return load_and_get_id(*args, **kwargs)
+
+        with mock.patch.object(
+            self.storage, "load_and_get_id", side_effect=load_without_lock
+        ):
+            url = self.media_file_manager.add(b"mock_data", "image/png", "1.0.0")
+
+        file_id = _calculate_file_id(b"mock_data", "image/png")
+        self.assertEqual(self.storage.get_url(file_id), url)
+
+    @mock.patch(
+        "streamlit.runtime.media_file_manager._get_session_id",
+        MagicMock(return_value="mock_session_id"),
+    )
+    def test_add_file_removed_while_loading(self):
+        """If an orphaned copy of a file is removed while it's being added,
+        it's added again."""
+        # Add a file, then orphan it.
+        self.media_file_manager.add(b"mock_data", "image/png", "1.0.0")
+        self.media_file_manager.clear_session_refs("mock_session_id")
+
+        load_and_get_id = self.storage.load_and_get_id
+        num_loads = 0
+
+        def load_then_remove_orphans(*args, **kwargs):
+            nonlocal num_loads
+            num_loads += 1
+            file_id = load_and_get_id(*args, **kwargs)
+            if num_loads == 1:
+                # Another thread removes the orphaned file before it's
+                # referenced by this session.
+                self.media_file_manager.remove_orphaned_files()
+            return file_id
+
+        with mock.patch.object(
+            self.storage, "load_and_get_id", side_effect=load_then_remove_orphans
+        ):
+            url = self.media_file_manager.add(b"mock_data", "image/png", "1.0.0")
+
+        self.assertEqual(2, num_loads)
+        file_id = _calculate_file_id(b"mock_data", "image/png")
+        self.assertEqual(self.storage.get_url(file_id), url)
+        self.assertIn(file_id, self.media_file_manager._file_metadata)
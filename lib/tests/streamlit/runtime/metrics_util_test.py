@@ -164,11 +164,13 @@ class PageTelemetryTest(DeltaGeneratorTestCase):
             ],
             exec_time=1000,
             prep_time=2000,
+            script_cache_hit=True,
         )
 
         self.assertEqual(len(forward_msg.page_profile.commands), 1)
         self.assertEqual(forward_msg.page_profile.exec_time, 1000)
         self.assertEqual(forward_msg.page_profile.prep_time, 2000)
+        self.assertTrue(forward_msg.page_profile.script_cache_hit)
         self.assertEqual(forward_msg.page_profile.commands[0].name, "dataframe")
 
     def test_gather_metrics_decorator(self):
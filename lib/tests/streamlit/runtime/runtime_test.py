@@ -398,6 +398,124 @@ class RuntimeTest(RuntimeTestCase):
         raise_disconnected_error.assert_called_once()
         self.assertFalse(self.runtime.is_active_session(session_id))
 
+    async def test_session_send_loops_are_independent(self):
+        """A session whose client is applying backpressure shouldn't hold up
+        message delivery to other sessions.
+        """
+        await self.runtime.start()
+
+        slow_client = MockSessionClient()
+        drained = asyncio.Event()
+
+        async def wait_for_drain() -> None:
+            await drained.wait()
+
+        slow_client.wait_for_write_buffer_to_drain = wait_for_drain
+        slow_session_id = self.runtime.connect_session(
+            client=slow_client, user_info=MagicMock()
+        )
+
+        fast_client = MockSessionClient()
+        fast_session_id = self.runtime.connect_session(
+            client=fast_client, user_info=MagicMock()
+        )
+
+        for i in range(3):
+            self.enqueue_forward_msg(slow_session_id, create_dataframe_msg([i], i))
+        self.enqueue_forward_msg(fast_session_id, create_dataframe_msg([1, 2, 3]))
+        await self.tick_runtime_loop()
+
+        # The slow session's first message was written, but its send loop is
+        # waiting for the client's write buffer to drain.
+        self.assertEqual(1, len(slow_client.forward_msgs))
+        self.assertEqual(1, len(fast_client.forward_msgs))
+
+        drained.set()
+        await self.tick_runtime_loop()
+        self.assertEqual(3, len(slow_client.forward_msgs))
+
+    async def test_enqueued_message_wakes_only_its_session(self):
+        """`_enqueued_some_message` should only flush the given session's queue."""
+        await self.runtime.start()
+
+        session_ids = [
+            self.runtime.connect_session(MockSessionClient(), MagicMock())
+            for _ in range(2)
+        ]
+        await self.tick_runtime_loop()
+
+        sessions = [
+            self.runtime._session_mgr.get_active_session_info(session_id).session
+            for session_id in session_ids
+        ]
+        with patch.object(
+            sessions[0], "flush_browser_queue", return_value=[]
+        ) as flush_0, patch.object(
+            sessions[1], "flush_browser_queue", return_value=[]
+        ) as flush_1:
+            self.runtime._enqueued_some_message(session_ids[0])
+            await self.tick_runtime_loop()
+
+            flush_0.assert_called_once()
+            flush_1.assert_not_called()
+
+    async def test_disconnect_session_stops_send_loop(self):
+        """Disconnecting a session should cancel its send loop."""
+        await self.runtime.start()
+
+        session_id = self.runtime.connect_session(MockSessionClient(), MagicMock())
+        send_task = self.runtime._session_senders[session_id].task
+
+        self.runtime.disconnect_session(session_id)
+        await self.tick_runtime_loop()
+
+        self.assertNotIn(session_id, self.runtime._session_senders)
+        self.assertTrue(send_task.done())
+
+    @patch("streamlit.runtime.runtime.LOGGER")
+    async def test_send_loop_survives_errors(self, patched_logger):
+        """An unexpected error while flushing or sending a session's messages
+        should be logged, and shouldn't stop its send loop.
+        """
+        await self.runtime.start()
+
+        client = MockSessionClient()
+        session_id = self.runtime.connect_session(client, MagicMock())
+        await self.tick_runtime_loop()
+        session = self.runtime._session_mgr.get_active_session_info(session_id).session
+
+        with patch.object(
+            session, "flush_browser_queue", side_effect=RuntimeError("flush failed")
+        ):
+            self.runtime._enqueued_some_message(session_id)
+            await self.tick_runtime_loop()
+
+        with patch.object(
+            self.runtime, "_send_message", side_effect=RuntimeError("send failed")
+        ):
+            self.enqueue_forward_msg(session_id, create_dataframe_msg([1, 2, 3]))
+            await self.tick_runtime_loop()
+
+        self.assertEqual(2, patched_logger.exception.call_count)
+
+        # The send loop is still running, and delivers later messages.
+        self.enqueue_forward_msg(session_id, create_dataframe_msg([4, 5, 6]))
+        await self.tick_runtime_loop()
+        self.assertEqual(1, len(client.forward_msgs))
+        self.assertFalse(self.runtime._session_senders[session_id].task.done())
+
+    async def test_stop_waits_for_send_loops(self):
+        """Stopping the runtime should wait for cancelled send loops to finish."""
+        await self.runtime.start()
+
+        session_id = self.runtime.connect_session(MockSessionClient(), MagicMock())
+        send_task = self.runtime._session_senders[session_id].task
+
+        self.runtime.stop()
+        await self.runtime.stopped
+
+        self.assertTrue(send_task.done())
+
     async def test_forwardmsg_hashing(self):
         """Test that outgoing ForwardMsgs contain hashes."""
         await self.runtime.start()
@@ -479,7 +597,10 @@ class RuntimeTest(RuntimeTestCase):
         finish running.
         """
         with patch_config_options(
-            {"global.minCachedMessageSize": 0, "global.maxCachedMessageAge": 1}
+            {
+                "global.minCachedMessageSize": 0,
+                "global.maxCachedMessageAge": 1,
+            }
         ):
             await self.runtime.start()
 
@@ -537,6 +658,51 @@ class RuntimeTest(RuntimeTestCase):
             await finish_script(True)
             self.assertFalse(is_data_msg_cached())
 
+    async def test_unchanged_element_replacement(self):
+        """An element that's sent again to the same delta path, unchanged,
+        should be replaced with an "unchanged" delta if
+        global.skipUnchangedElements is True.
+        """
+        with patch_config_options({"global.skipUnchangedElements": True}):
+            await self.runtime.start()
+
+            client = MockSessionClient()
+            session_id = self.runtime.connect_session(
+                client=client, user_info=MagicMock()
+            )
+
+            self.enqueue_forward_msg(session_id, create_dataframe_msg([1, 2, 3]))
+            await self.tick_runtime_loop()
+            self.assertEqual(
+                "new_element", client.forward_msgs.pop().delta.WhichOneof("type")
+            )
+
+            self.enqueue_forward_msg(session_id, create_dataframe_msg([1, 2, 3]))
+            await self.tick_runtime_loop()
+            unchanged = client.forward_msgs.pop()
+            self.assertTrue(unchanged.delta.unchanged_element)
+            self.assertEqual([1, 1], list(unchanged.metadata.delta_path))
+
+            self.enqueue_forward_msg(session_id, create_dataframe_msg([4, 5, 6]))
+            await self.tick_runtime_loop()
+            self.assertEqual(
+                "new_element", client.forward_msgs.pop().delta.WhichOneof("type")
+            )
+
+    async def test_unchanged_element_replacement_disabled(self):
+        """Unchanged elements are sent again by default."""
+        await self.runtime.start()
+
+        client = MockSessionClient()
+        session_id = self.runtime.connect_session(client=client, user_info=MagicMock())
+
+        for _ in range(2):
+            self.enqueue_forward_msg(session_id, create_dataframe_msg([1, 2, 3]))
+            await self.tick_runtime_loop()
+            self.assertEqual(
+                "new_element", client.forward_msgs.pop().delta.WhichOneof("type")
+            )
+
     async def test_orphaned_upload_file_deletion(self):
         """An uploaded file with no associated AppSession should be
         deleted.
@@ -24,6 +24,7 @@ from streamlit.runtime.caching.storage.dummy_cache_storage import (
 )
 from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.runtime.script_data import ScriptData
+from streamlit.runtime.scriptrunner import ScriptCache
 from streamlit.runtime.session_manager import (
     SessionClient,
     SessionInfo,
@@ -45,9 +46,11 @@ class MockSessionManager(SessionManager):
         self,
         session_storage: SessionStorage,
         uploaded_file_manager: UploadedFileManager,
-        message_enqueued_callback: Optional[Callable[[], None]],
+        script_cache: ScriptCache,
+        message_enqueued_callback: Optional[Callable[[str], None]],
     ) -> None:
         self._uploaded_file_mgr = uploaded_file_manager
+        self._script_cache = script_cache
         self._message_enqueued_callback = message_enqueued_callback
 
         # Mapping of AppSession.id -> SessionInfo.
@@ -66,6 +69,7 @@ class MockSessionManager(SessionManager):
             session = AppSession(
                 script_data=script_data,
                 uploaded_file_manager=self._uploaded_file_mgr,
+                script_cache=self._script_cache,
                 message_enqueued_callback=self._message_enqueued_callback,
                 local_sources_watcher=mock.MagicMock(),
                 user_info=user_info,
@@ -119,9 +123,9 @@ class RuntimeTestCase(IsolatedAsyncioTestCase):
         """Sleep just long enough to guarantee that the Runtime's loop
         has a chance to run.
         """
-        # Our sleep time needs to be longer than the longest sleep time inside the
-        # Runtime loop, which is 0.01 + (1 tick * number of connected sessions).
-        # 0.03 is near-instant, and conservative enough that the tick will happen
+        # Each session's send loop yields for 1 tick per message it sends, so
+        # we just need to sleep for longer than a handful of ticks. 0.03 is
+        # near-instant, and conservative enough that the ticks will happen
         # under our test circumstances.
         await asyncio.sleep(0.03)
 
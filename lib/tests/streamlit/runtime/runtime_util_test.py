@@ -18,7 +18,12 @@ import unittest
 
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime import runtime_util
-from streamlit.runtime.runtime_util import is_cacheable_msg, serialize_forward_msg
+from streamlit.runtime.forward_msg_cache import serialize_payload
+from streamlit.runtime.runtime_util import (
+    is_cacheable_msg,
+    serialize_forward_msg,
+    serialize_forward_msg_parts,
+)
 from tests.streamlit.message_mocks import create_dataframe_msg
 from tests.testutil import patch_config_options
 
@@ -32,6 +37,28 @@ class RuntimeUtilTest(unittest.TestCase):
         with patch_config_options({"global.minCachedMessageSize": 1000}):
             self.assertFalse(is_cacheable_msg(create_dataframe_msg([1, 2, 3])))
 
+    def test_serialize_forward_msg(self):
+        """serialize_forward_msg should produce a message that deserializes to
+        the original, including its hash and metadata."""
+        msg = create_dataframe_msg([1, 2, 3], 7)
+        msg.metadata.cacheable = True
+
+        deserialized_msg = ForwardMsg()
+        deserialized_msg.ParseFromString(serialize_forward_msg(msg))
+
+        self.assertNotEqual("", msg.hash)
+        self.assertEqual(msg, deserialized_msg)
+
+    def test_serialize_forward_msg_parts_reuses_payload(self):
+        """serialize_forward_msg_parts should use the given serialized payload
+        itself, rather than a copy."""
+        msg = create_dataframe_msg([1, 2, 3], 8)
+        payload = serialize_payload(msg)
+        parts = serialize_forward_msg_parts(msg, payload)
+
+        self.assertIs(payload, parts[0])
+        self.assertEqual(serialize_forward_msg(msg), b"".join(parts))
+
     def test_should_limit_msg_size(self):
         max_message_size_mb = 50
 
@@ -0,0 +1,88 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""ScriptCache unit tests."""
+
+import os
+import tempfile
+import unittest
+
+from streamlit.runtime.scriptrunner import ScriptCache
+from tests.testutil import patch_config_options
+
+
+class ScriptCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.script_path = os.path.join(self._dir.name, "script.py")
+        self._write_script("x = 1")
+        self.cache = ScriptCache()
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def _write_script(self, body: str) -> None:
+        with open(self.script_path, "w") as f:
+            f.write(body)
+
+    def test_cache_hit(self):
+        """The compiled code of an unchanged script comes from the cache."""
+        bytecode, cache_hit = self.cache.get_bytecode(self.script_path)
+        self.assertFalse(cache_hit)
+        self.assertEqual(self.script_path, bytecode.co_filename)
+
+        cached_bytecode, cache_hit = self.cache.get_bytecode(self.script_path)
+        self.assertTrue(cache_hit)
+        self.assertIs(bytecode, cached_bytecode)
+
+    def test_changed_script(self):
+        """A script that's changed is compiled again."""
+        self.cache.get_bytecode(self.script_path)
+        self._write_script("x = 12")
+
+        bytecode, cache_hit = self.cache.get_bytecode(self.script_path)
+        self.assertFalse(cache_hit)
+        self.assertIn(12, bytecode.co_consts)
+
+    def test_changed_magic_option(self):
+        """A script is compiled again when runner.magicEnabled changes."""
+        with patch_config_options({"runner.magicEnabled": True}):
+            self.cache.get_bytecode(self.script_path)
+        with patch_config_options({"runner.magicEnabled": False}):
+            _, cache_hit = self.cache.get_bytecode(self.script_path)
+        self.assertFalse(cache_hit)
+
+    def test_invalidate(self):
+        """A script is compiled again after it's invalidated."""
+        self.cache.get_bytecode(self.script_path)
+        self.cache.invalidate(self.script_path)
+        _, cache_hit = self.cache.get_bytecode(self.script_path)
+        self.assertFalse(cache_hit)
+
+        self.cache.clear()
+        _, cache_hit = self.cache.get_bytecode(self.script_path)
+        self.assertFalse(cache_hit)
+
+    def test_compile_error(self):
+        """A script that doesn't compile isn't cached."""
+        self._write_script("x = ")
+
+        with self.assertRaises(SyntaxError):
+            self.cache.get_bytecode(self.script_path)
+        self.assertEqual({}, self.cache._cache)
+
+    def test_missing_script(self):
+        """A script that doesn't exist raises an error."""
+        with self.assertRaises(FileNotFoundError):
+            self.cache.get_bytecode(os.path.join(self._dir.name, "missing.py"))
@@ -16,6 +16,7 @@
 
 import os
 import sys
+import threading
 import time
 from typing import Any, List, Optional
 from unittest.mock import MagicMock, patch
@@ -39,8 +40,10 @@ from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.runtime.scriptrunner import (
     RerunData,
     RerunException,
+    ScriptCache,
     ScriptRunner,
     ScriptRunnerEvent,
+    ScriptThreadPool,
     StopException,
 )
 from streamlit.runtime.scriptrunner.script_requests import (
@@ -48,6 +51,9 @@ from streamlit.runtime.scriptrunner.script_requests import (
     ScriptRequests,
     ScriptRequestType,
 )
+from streamlit.runtime.scriptrunner.script_run_context import (
+    SCRIPT_RUN_CONTEXT_ATTR_NAME,
+)
 from streamlit.runtime.state.session_state import SessionState
 from streamlit.runtime.uploaded_file_manager import UploadedFileManager
 from tests import testutil
@@ -550,6 +556,66 @@ class ScriptRunnerTest(AsyncTestCase):
         )
         self._assert_text_deltas(scriptrunner, ["loop_forever"])
 
+    @pytest.mark.skipif(
+        sys.version_info < (3, 8), reason="Top-level await requires Python 3.8"
+    )
+    def test_run_async_script(self):
+        """Tests that we can run a script that uses top-level await."""
+        scriptrunner = TestScriptRunner("async_script.py.txt")
+        scriptrunner.request_rerun(RerunData())
+        scriptrunner.start()
+        scriptrunner.join()
+
+        self._assert_no_exceptions(scriptrunner)
+        self._assert_events(
+            scriptrunner,
+            [
+                ScriptRunnerEvent.SCRIPT_STARTED,
+                ScriptRunnerEvent.ENQUEUE_FORWARD_MSG,
+                ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+                ScriptRunnerEvent.SHUTDOWN,
+            ],
+        )
+        self._assert_text_deltas(scriptrunner, ["async script"])
+        # The event loop is closed when the script thread shuts down.
+        self.assertIsNone(scriptrunner._event_loop)
+
+    @pytest.mark.skipif(
+        sys.version_info < (3, 8), reason="Top-level await requires Python 3.8"
+    )
+    def test_rerun_async_script_while_awaiting(self):
+        """Tests that a rerun request interrupts a script at an await, even
+        if it doesn't call any st commands.
+        """
+        scriptrunner = TestScriptRunner("async_infinite_await.py.txt")
+        scriptrunner.request_rerun(RerunData())
+        scriptrunner.start()
+
+        # Wait for the script to reach its await.
+        _wait_for_events(scriptrunner, 2)
+        scriptrunner.request_rerun(RerunData())
+        # Wait for the rerun to reach its await.
+        _wait_for_events(scriptrunner, 5)
+        scriptrunner.request_stop()
+        scriptrunner.join()
+
+        self._assert_no_exceptions(scriptrunner)
+        # As with scripts interrupted in an st call, a stopped script run
+        # counts as successful.
+        self._assert_events(
+            scriptrunner,
+            [
+                ScriptRunnerEvent.SCRIPT_STARTED,
+                ScriptRunnerEvent.ENQUEUE_FORWARD_MSG,
+                ScriptRunnerEvent.SCRIPT_STOPPED_FOR_RERUN,
+                ScriptRunnerEvent.SCRIPT_STARTED,
+                ScriptRunnerEvent.ENQUEUE_FORWARD_MSG,
+                ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+                ScriptRunnerEvent.SHUTDOWN,
+            ],
+        )
+        self._assert_text_deltas(scriptrunner, ["awaiting_forever"])
+
     def test_sessionstate_is_disconnected_after_stop(self):
         """After ScriptRunner.request_stop is called, any operations on its
         SessionState instance are no-ops.
@@ -664,6 +730,25 @@ class ScriptRunnerTest(AsyncTestCase):
         self.assertEqual(shutdown_data["client_state"].query_string, "foo=bar")
         self.assertEqual(shutdown_data["client_state"].page_script_hash, "hash1")
 
+    def test_run_in_thread_pool(self):
+        """ScriptRunners that share a ScriptThreadPool reuse its threads, and
+        leave nothing behind on them.
+        """
+        pool = ScriptThreadPool(max_threads=1)
+        pool_threads = []
+        for _ in range(2):
+            scriptrunner = TestScriptRunner("good_script.py", thread_pool=pool)
+            scriptrunner.start()
+            scriptrunner.join()
+
+            self._assert_no_exceptions(scriptrunner)
+            self._assert_text_deltas(scriptrunner, [text_utf])
+            pool_threads.append(scriptrunner.pool_thread)
+        pool.shutdown()
+
+        self.assertIs(pool_threads[0], pool_threads[1])
+        self.assertFalse(hasattr(pool_threads[0], SCRIPT_RUN_CONTEXT_ATTR_NAME))
+
     def test_coalesce_rerun(self):
         """Tests that multiple pending rerun requests get coalesced."""
         scriptrunner = TestScriptRunner("good_script.py")
@@ -1054,7 +1139,9 @@ class TestScriptRunner(ScriptRunner):
     # To prevent PytestCollectionWarning we set __test__ property to False
     __test__ = False
 
-    def __init__(self, script_name: str):
+    def __init__(
+        self, script_name: str, thread_pool: Optional[ScriptThreadPool] = None
+    ):
         """Initializes the ScriptRunner for the given script_name"""
         # DeltaGenerator deltas will be enqueued into self.forward_msg_queue.
         self.forward_msg_queue = ForwardMsgQueue()
@@ -1069,10 +1156,16 @@ class TestScriptRunner(ScriptRunner):
             client_state=ClientState(),
             session_state=SessionState(),
             uploaded_file_mgr=UploadedFileManager(),
+            script_cache=ScriptCache(),
             initial_rerun_data=RerunData(),
             user_info={"email": "test@test.com"},
+            thread_pool=thread_pool,
         )
 
+        # Set when we're done with the thread from our thread pool.
+        self.pool_thread: Optional[threading.Thread] = None
+        self._pool_thread_done = threading.Event()
+
         # Accumulates uncaught exceptions thrown by our run thread.
         self.script_thread_exceptions: List[BaseException] = []
 
@@ -1109,9 +1202,18 @@ class TestScriptRunner(ScriptRunner):
         self.forward_msg_queue.clear()
         super()._run_script(rerun_data)
 
+    def _run_script_thread_in_pool(self) -> None:
+        self.pool_thread = threading.current_thread()
+        try:
+            super()._run_script_thread_in_pool()
+        finally:
+            self._pool_thread_done.set()
+
     def join(self) -> None:
         """Join the script_thread if it's running."""
-        if self._script_thread is not None:
+        if self._thread_pool is not None:
+            self._pool_thread_done.wait()
+        elif self._script_thread is not None:
             self._script_thread.join()
 
     def clear_forward_msgs(self) -> None:
@@ -1187,3 +1289,22 @@ def require_widgets_deltas(
         runner.join()
 
     raise RuntimeError(err_string)
+
+
+def _wait_for_events(
+    runner: TestScriptRunner, num_events: int, timeout: float = 5
+) -> None:
+    """Wait for the given ScriptRunner to emit at least num_events events.
+    If the timeout is reached, the runner is shutdown and an error is thrown.
+    """
+    t0 = time.time()
+    while time.time() - t0 < timeout:
+        if len(runner.events) >= num_events:
+            return
+        time.sleep(0.01)
+
+    runner.request_stop()
+    runner.join()
+    raise RuntimeError(
+        f"_wait_for_events() timed out after {timeout}s: {runner.events}"
+    )
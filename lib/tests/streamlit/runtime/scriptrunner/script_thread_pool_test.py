@@ -0,0 +1,122 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""ScriptThreadPool unit tests."""
+
+import threading
+import unittest
+from typing import Callable, List
+
+from streamlit.runtime.scriptrunner import ScriptThreadPool
+from streamlit.runtime.stats import CounterStat, GaugeStat
+
+_TIMEOUT_SECS = 5
+
+
+class ScriptThreadPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pool = ScriptThreadPool(max_threads=1)
+
+    def tearDown(self) -> None:
+        self.pool.shutdown()
+
+    def _submit(self, job: Callable[[], None]) -> threading.Event:
+        """Submit a job, and return an Event that's set when it's done."""
+        done = threading.Event()
+
+        def run() -> None:
+            try:
+                job()
+            finally:
+                done.set()
+
+        self.pool.submit(run)
+        return done
+
+    def test_reuses_threads(self):
+        """Jobs run one after another on the same thread."""
+        threads: List[threading.Thread] = []
+        for _ in range(3):
+            done = self._submit(lambda: threads.append(threading.current_thread()))
+            self.assertTrue(done.wait(_TIMEOUT_SECS))
+
+        self.assertEqual(3, len(threads))
+        self.assertEqual(1, len(set(threads)))
+        self.assertIsNot(threading.current_thread(), threads[0])
+
+    def test_queues_jobs_when_saturated(self):
+        """Jobs wait for a thread when all of them are busy."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def block() -> None:
+            started.set()
+            release.wait(_TIMEOUT_SECS)
+
+        first_done = self._submit(block)
+        self.assertTrue(started.wait(_TIMEOUT_SECS))
+        second_done = self._submit(lambda: None)
+
+        self.assertFalse(second_done.wait(0.1))
+        self.assertEqual(
+            [
+                GaugeStat("script_threads", 1),
+                GaugeStat("script_threads_busy", 1),
+                GaugeStat("script_thread_queue_depth", 1),
+            ],
+            self.pool.get_gauge_stats(),
+        )
+
+        release.set()
+        self.assertTrue(first_done.wait(_TIMEOUT_SECS))
+        self.assertTrue(second_done.wait(_TIMEOUT_SECS))
+
+        counter_stats = self.pool.get_counter_stats()
+        self.assertEqual(
+            CounterStat("script_thread_jobs", "script_threads", "", 2),
+            counter_stats[0],
+        )
+        self.assertEqual("script_thread_wait_seconds", counter_stats[1].family_name)
+        self.assertGreater(counter_stats[1].value, 0)
+
+    def test_unbounded(self):
+        """Without a maximum, jobs never wait for a busy thread."""
+        pool = ScriptThreadPool(max_threads=0)
+        release = threading.Event()
+        pool.submit(lambda: release.wait(_TIMEOUT_SECS))
+        pool.submit(lambda: release.wait(_TIMEOUT_SECS))
+
+        gauge_stats = pool.get_gauge_stats()
+        release.set()
+        pool.shutdown()
+
+        self.assertEqual(GaugeStat("script_threads", 2), gauge_stats[0])
+
+    def test_job_exception(self):
+        """A job's exception doesn't stop the thread from running others."""
+
+        def fail() -> None:
+            raise RuntimeError("oh no")
+
+        with self.assertLogs(
+            "streamlit.runtime.scriptrunner.script_thread_pool", level="ERROR"
+        ):
+            self.assertTrue(self._submit(fail).wait(_TIMEOUT_SECS))
+        self.assertTrue(self._submit(lambda: None).wait(_TIMEOUT_SECS))
+
+    def test_shutdown(self):
+        """A pool that's shut down doesn't accept jobs."""
+        self.pool.shutdown()
+        with self.assertRaises(RuntimeError):
+            self.pool.submit(lambda: None)
@@ -32,6 +32,7 @@ from streamlit.runtime.scriptrunner import get_script_run_ctx
 from streamlit.runtime.state import SessionState, get_session_state
 from streamlit.runtime.state.common import GENERATED_WIDGET_ID_PREFIX
 from streamlit.runtime.state.session_state import (
+    KeyIdMapping,
     Serialized,
     Value,
     WidgetMetadata,
@@ -648,6 +649,129 @@ class SessionStateMethodTests(unittest.TestCase):
         assert self.session_state["widget_id_1"] == WIDGET_VALUE
 
 
+def _int_widget_states(values: dict) -> WidgetStatesProto:
+    widget_states = WidgetStatesProto()
+    for widget_id, value in values.items():
+        widget_state = widget_states.widgets.add()
+        widget_state.id = widget_id
+        widget_state.int_value = value
+    return widget_states
+
+
+def _int_widget_values(session_state: SessionState) -> dict:
+    return {state.id: state.int_value for state in session_state.get_widget_states()}
+
+
+class SessionStateWidgetStatesTest(unittest.TestCase):
+    def setUp(self):
+        self.session_state = SessionState()
+        self.deserializer = MagicMock(side_effect=lambda x, _: 0 if x is None else x)
+        for widget_id in ("w1", "w2"):
+            self.session_state.register_widget(
+                WidgetMetadata(
+                    id=widget_id,
+                    deserializer=self.deserializer,
+                    serializer=identity,
+                    value_type="int_value",
+                ),
+                user_key=None,
+            )
+        self.deserializer.reset_mock()
+
+    def test_unchanged_widget_states_are_not_deserialized_again(self):
+        """Widgets whose state is the same as last time keep their value."""
+        self.session_state.on_script_will_rerun(_int_widget_states({"w1": 1, "w2": 2}))
+        assert self.session_state["w1"] == 1
+        assert self.session_state["w2"] == 2
+        assert self.deserializer.call_count == 2
+
+        self.deserializer.reset_mock()
+        self.session_state.on_script_will_rerun(_int_widget_states({"w1": 1, "w2": 3}))
+        assert "w1" not in self.session_state._new_widget_state
+        assert self.session_state["w1"] == 1
+        assert self.session_state["w2"] == 3
+        self.deserializer.assert_called_once_with(3, "w2")
+
+    def test_get_widget_states_includes_unchanged_widgets(self):
+        """Widgets skipped because their state didn't change are still
+        returned by get_widget_states."""
+        for _ in range(2):
+            self.session_state.on_script_will_rerun(
+                _int_widget_states({"w1": 1, "w2": 2})
+            )
+            assert _int_widget_values(self.session_state) == {"w1": 1, "w2": 2}
+
+        self.session_state.on_script_will_rerun(_int_widget_states({"w1": 1, "w2": 3}))
+        assert _int_widget_values(self.session_state) == {"w1": 1, "w2": 3}
+
+        # A value that was accessed (deserialized) is serialized again.
+        assert self.session_state["w1"] == 1
+        self.session_state._compact_state()
+        assert _int_widget_values(self.session_state) == {"w1": 1, "w2": 3}
+
+    def test_unaccessed_widget_states_stay_serialized(self):
+        """Compacting the state doesn't deserialize values that were never
+        accessed, and they're deserialized when they are."""
+        self.session_state.on_script_will_rerun(_int_widget_states({"w1": 1, "w2": 2}))
+        self.session_state._compact_state()
+        assert isinstance(self.session_state._old_state["w1"], Serialized)
+        self.deserializer.assert_not_called()
+
+        assert self.session_state["w1"] == 1
+        assert self.session_state._old_state["w1"] == 1
+
+    def test_trigger_values_are_always_set(self):
+        """A button that's clicked twice in a row is triggered both times."""
+        widget_states = WidgetStatesProto()
+        widget_state = widget_states.widgets.add()
+        widget_state.id = "w1"
+        widget_state.trigger_value = True
+
+        for _ in range(2):
+            self.session_state.on_script_will_rerun(widget_states)
+            assert self.session_state["w1"] is True
+            self.session_state.on_script_finished({"w1", "w2"})
+            assert self.session_state["w1"] is False
+
+    def test_callbacks_of_unchanged_widgets(self):
+        """Callbacks are only called for widgets whose value changed."""
+        callback = MagicMock()
+        self.session_state._new_widget_state.set_widget_metadata(
+            WidgetMetadata(
+                id="w1",
+                deserializer=self.deserializer,
+                serializer=identity,
+                value_type="int_value",
+                callback=callback,
+            )
+        )
+        self.session_state.on_script_will_rerun(_int_widget_states({"w1": 1}))
+        callback.assert_called_once()
+
+        callback.reset_mock()
+        self.session_state.on_script_will_rerun(_int_widget_states({"w1": 1}))
+        callback.assert_not_called()
+
+
+class KeyIdMappingTest(unittest.TestCase):
+    def test_reverse_mapping(self):
+        """The mapping of widget ids to keys is kept up to date."""
+        mapping = KeyIdMapping()
+        mapping["key1"] = "wid1"
+        mapping["key2"] = "wid2"
+        assert {"wid1": "key1", "wid2": "key2"} == mapping.id_to_key
+
+        mapping["key1"] = "wid3"
+        assert {"wid2": "key2", "wid3": "key1"} == mapping.id_to_key
+
+        del mapping["key2"]
+        assert {"wid3": "key1"} == mapping.id_to_key
+        assert {"key1": "wid3"} == dict(mapping)
+
+        mapping.clear()
+        assert {} == mapping.id_to_key
+
+
 @given(state=stst.session_state())
 def test_compact_idempotent(state):
     assert _compact_copy(state) == _compact_copy(_compact_copy(state))
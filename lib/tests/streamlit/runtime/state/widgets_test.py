@@ -14,6 +14,7 @@
 
 """Tests widget-related functionality"""
 
+import json
 import unittest
 from unittest.mock import MagicMock, call, patch
 
@@ -22,6 +23,7 @@ from parameterized import parameterized
 import streamlit as st
 from streamlit import errors
 from streamlit.proto.Button_pb2 import Button as ButtonProto
+from streamlit.proto.Selectbox_pb2 import Selectbox as SelectboxProto
 from streamlit.proto.WidgetStates_pb2 import WidgetStates
 from streamlit.runtime.scriptrunner.script_run_context import get_script_run_ctx
 from streamlit.runtime.state import coalesce_widget_states
@@ -244,6 +246,48 @@ class WidgetHelperTests(unittest.TestCase):
             )
         )
 
+    def test_widget_id_includes_options(self):
+        """Widgets with the same options have the same ID, and widgets with
+        different options have different IDs."""
+        proto = SelectboxProto()
+        proto.label = "the label"
+
+        widget_id = compute_widget_id("selectbox", proto, options=["a", "b"])
+        self.assertEqual(
+            widget_id, compute_widget_id("selectbox", proto, options=["a", "b"])
+        )
+        self.assertNotEqual(
+            widget_id, compute_widget_id("selectbox", proto, options=["a", "c"])
+        )
+        self.assertNotEqual(
+            widget_id, compute_widget_id("selectbox", proto, options=["a\x00b"])
+        )
+        self.assertNotEqual(widget_id, compute_widget_id("selectbox", proto))
+        # The options don't need to be set in the proto.
+        self.assertTrue(widget_id.startswith(GENERATED_WIDGET_ID_PREFIX))
+        self.assertEqual(0, len(proto.options))
+
+    def test_options_digest_cache(self):
+        """Option labels are only hashed again if they changed."""
+        options = [f"option {i}" for i in range(1000)]
+        with patch(
+            "streamlit.runtime.state.common.json.dumps", wraps=json.dumps
+        ) as dumps:
+            widget_id = compute_widget_id("multiselect", ButtonProto(), options=options)
+            self.assertEqual(
+                widget_id,
+                compute_widget_id("multiselect", ButtonProto(), options=list(options)),
+            )
+            self.assertEqual(1, dumps.call_count)
+
+            # Mutating the list in place changes the widget's ID.
+            options[500] = "changed"
+            self.assertNotEqual(
+                widget_id,
+                compute_widget_id("multiselect", ButtonProto(), options=options),
+            )
+            self.assertEqual(2, dumps.call_count)
+
 
 class WidgetIdDisabledTests(DeltaGeneratorTestCase):
     @parameterized.expand(
@@ -15,7 +15,12 @@
 import unittest
 from typing import List
 
-from streamlit.runtime.stats import CacheStat, CacheStatsProvider, StatsManager
+from streamlit.runtime.stats import (
+    CacheStat,
+    CacheStatsProvider,
+    CounterStat,
+    StatsManager,
+)
 
 
 class MockStatsProvider(CacheStatsProvider):
@@ -26,6 +31,15 @@ class MockStatsProvider(CacheStatsProvider):
         return self.stats
 
 
+class MockCounterStatsProvider(MockStatsProvider):
+    def __init__(self):
+        super().__init__()
+        self.counter_stats: List[CounterStat] = []
+
+    def get_counter_stats(self) -> List[CounterStat]:
+        return self.counter_stats
+
+
 class StatsManagerTest(unittest.TestCase):
     def test_get_stats(self):
         """StatsManager.get_stats should return all providers' stats."""
@@ -50,3 +64,22 @@ class StatsManagerTest(unittest.TestCase):
         ]
 
         self.assertEqual(provider1.stats + provider2.stats, manager.get_stats())
+
+    def test_get_counter_stats(self):
+        """StatsManager.get_counter_stats should return the counters of all
+        providers that have them."""
+        manager = StatsManager()
+        provider1 = MockStatsProvider()
+        provider2 = MockCounterStatsProvider()
+        manager.register_provider(provider1)
+        manager.register_provider(provider2)
+
+        self.assertEqual([], manager.get_counter_stats())
+
+        provider1.stats = [CacheStat("provider1", "foo", 1)]
+        provider2.counter_stats = [
+            CounterStat("cache_hits", "provider2", "bar", 2),
+            CounterStat("cache_wait_seconds", "provider2", "bar", 0.5),
+        ]
+
+        self.assertEqual(provider2.counter_stats, manager.get_counter_stats())
@@ -14,11 +14,23 @@
 
 """Unit tests for UploadedFileManager"""
 
+import io
+import mmap
+import pickle
+import tempfile
 import unittest
 
 from streamlit.runtime.stats import CacheStat
-from streamlit.runtime.uploaded_file_manager import UploadedFileManager, UploadedFileRec
+from streamlit.runtime.uploaded_file_manager import (
+    MemoryMappedUploadedFile,
+    UploadedFile,
+    UploadedFileManager,
+    UploadedFileQuotaExceededError,
+    UploadedFileRec,
+    open_uploaded_file,
+)
 from tests.exception_capturing_thread import call_on_threads
+from tests.testutil import patch_config_options
 
 FILE_1 = UploadedFileRec(id=0, name="file1", type="type", data=b"file1")
 FILE_2 = UploadedFileRec(id=0, name="file2", type="type", data=b"file222")
@@ -166,6 +178,98 @@ class UploadedFileManagerTest(unittest.TestCase):
         ]
         self.assertEqual(expected, self.mgr.get_stats())
 
+    @patch_config_options({"server.maxUploadedFilesSessionSize": 10 / 1024 / 1024})
+    def test_session_quota(self):
+        """Files can't be added beyond server.maxUploadedFilesSessionSize."""
+        self.mgr.add_file("session1", "widget1", FILE_1)
+
+        # FILE_1 is 5 bytes, so there's room for 5 more in session1.
+        self.mgr.ensure_space("session1", 5, lambda session_id: True)
+        with self.assertRaises(UploadedFileQuotaExceededError):
+            self.mgr.ensure_space("session1", 6, lambda session_id: True)
+
+        # Other sessions have their own quota.
+        self.mgr.ensure_space("session2", 10, lambda session_id: True)
+
+    @patch_config_options({"server.maxUploadedFilesTotalSize": 20 / 1024 / 1024})
+    def test_total_quota_evicts_inactive_sessions(self):
+        """Files from inactive sessions are evicted, least recently accessed
+        first, to stay within server.maxUploadedFilesTotalSize."""
+        file_a = self.mgr.add_file("inactive1", "widget", FILE_1)
+        file_b = self.mgr.add_file("inactive2", "widget", FILE_1)
+        file_c = self.mgr.add_file("active", "widget", FILE_2)
+        # Accessing inactive1's file makes inactive2's the least recent.
+        self.mgr.get_all_files("inactive1", "widget")
+
+        def is_active_session(session_id):
+            return session_id == "active"
+
+        # 17 bytes are used, so 3 more fit without evicting anything.
+        self.mgr.ensure_space("active", 3, is_active_session)
+        self.assertEqual(3, len(self.mgr.get_stats()))
+
+        # Room for 6 bytes is made by evicting inactive2's file.
+        self.mgr.ensure_space("active", 6, is_active_session)
+        self.assertEqual([file_a], self.mgr.get_all_files("inactive1", "widget"))
+        self.assertEqual([], self.mgr.get_all_files("inactive2", "widget"))
+        self.assertEqual([file_c], self.mgr.get_all_files("active", "widget"))
+
+        # Files from active sessions are never evicted.
+        with self.assertRaises(UploadedFileQuotaExceededError):
+            self.mgr.ensure_space("active", 14, is_active_session)
+        self.assertEqual([], self.mgr.get_all_files("inactive1", "widget"))
+        self.assertEqual([file_c], self.mgr.get_all_files("active", "widget"))
+        self.assertNotIn(file_b.id, self.mgr._last_access_by_id)
+
+    def test_no_quota(self):
+        """Without quotas, there's always room for files."""
+        self.mgr.add_file("session1", "widget1", FILE_1)
+        self.mgr.ensure_space("session1", 2**40, lambda session_id: False)
+        self.assertEqual(1, len(self.mgr.get_all_files("session1", "widget1")))
+
+    @patch_config_options({"server.maxUploadedFilesSessionSize": 10 / 1024 / 1024})
+    def test_add_file_within_quota(self):
+        """add_file checks the quotas when it's given is_active_session."""
+        self.mgr.add_file("session1", "widget1", FILE_1, lambda session_id: True)
+        with self.assertRaises(UploadedFileQuotaExceededError):
+            self.mgr.add_file("session1", "widget1", FILE_2, lambda session_id: True)
+        self.assertEqual(1, len(self.mgr.get_all_files("session1", "widget1")))
+
+        # Without is_active_session, the quotas aren't checked.
+        self.mgr.add_file("session1", "widget1", FILE_2)
+        self.assertEqual(2, len(self.mgr.get_all_files("session1", "widget1")))
+
+    def test_byte_totals(self):
+        """The total size of the files, and of each session's, are kept up to
+        date as files are added and removed."""
+        file_1 = self.mgr.add_file("session1", "widget1", FILE_1)
+        file_2 = self.mgr.add_file("session1", "widget1", FILE_2)
+        self.mgr.add_file("session1", "widget2", FILE_1)
+        self.mgr.add_file("session2", "widget1", FILE_2)
+        self.assertEqual(5 + 7 + 5 + 7, self.mgr._total_bytes)
+        self.assertEqual(
+            {"session1": 5 + 7 + 5, "session2": 7}, self.mgr._bytes_by_session_id
+        )
+
+        self.mgr.remove_file("session1", "widget1", file_1.id)
+        self.mgr.remove_orphaned_files("session1", "widget1", file_2.id, [])
+        self.assertEqual({"session1": 5, "session2": 7}, self.mgr._bytes_by_session_id)
+
+        self.mgr.remove_session_files("session1")
+        self.assertEqual(7, self.mgr._total_bytes)
+        self.assertEqual({"session2": 7}, self.mgr._bytes_by_session_id)
+
+    def test_removed_files_are_forgotten(self):
+        """Files' access numbers are removed along with the files."""
+        file_1 = self.mgr.add_file("session1", "widget1", FILE_1)
+        file_2 = self.mgr.add_file("session1", "widget1", FILE_2)
+        self.mgr.add_file("session1", "widget2", FILE_1)
+
+        self.mgr.remove_file("session1", "widget1", file_1.id)
+        self.mgr.remove_orphaned_files("session1", "widget1", file_2.id, [])
+        self.mgr.remove_files("session1", "widget2")
+        self.assertEqual({}, self.mgr._last_access_by_id)
+
 
 class UploadedFileManagerThreadingTest(unittest.TestCase):
     # The number of threads to run our tests on
@@ -199,6 +303,25 @@ class UploadedFileManagerThreadingTest(unittest.TestCase):
             file_ids.update(file.id for file in file_list)
         self.assertEqual(self.NUM_THREADS, len(file_ids))
 
+    @patch_config_options({"server.maxUploadedFilesTotalSize": 30 / 1024 / 1024})
+    def test_add_file_within_quota(self):
+        """Concurrent uploads can't exceed the quotas together."""
+
+        def add_file(index: int) -> None:
+            file = UploadedFileRec(id=0, name=f"file_{index}", type="type", data=b"123")
+            try:
+                self.mgr.add_file(
+                    f"session_{index}", "widget", file, lambda session_id: True
+                )
+            except UploadedFileQuotaExceededError:
+                pass
+
+        call_on_threads(add_file, num_threads=self.NUM_THREADS)
+
+        num_files = sum(len(files) for files in self.mgr._files_by_id.values())
+        self.assertEqual(10, num_files)
+        self.assertEqual(30, self.mgr._total_bytes)
+
     def test_remove_file(self):
         """`remove_file` is thread-safe."""
         # Add a bunch of files to a single widget
@@ -280,3 +403,122 @@ class UploadedFileManagerThreadingTest(unittest.TestCase):
             self.assertEqual(sorted(active_file_ids), sorted(remaining_ids))
 
         call_on_threads(remove_orphans, num_threads=self.NUM_THREADS)
+
+
+class MemoryMappedUploadedFileTest(unittest.TestCase):
+    """Tests UploadedFiles whose data is a memory map."""
+
+    def setUp(self):
+        self.tempfile = tempfile.TemporaryFile()
+        self.tempfile.write(b"line1\nline2\nlast")
+        self.tempfile.flush()
+        self.rec = UploadedFileRec(
+            id=1,
+            name="file",
+            type="text/plain",
+            data=mmap.mmap(self.tempfile.fileno(), 0, access=mmap.ACCESS_READ),
+        )
+
+    def tearDown(self):
+        self.rec.data.close()
+        self.tempfile.close()
+
+    def test_open(self):
+        """Memory-mapped records are opened as MemoryMappedUploadedFiles, and
+        others as UploadedFiles."""
+        self.assertIsInstance(open_uploaded_file(self.rec), MemoryMappedUploadedFile)
+        self.assertIsInstance(open_uploaded_file(FILE_1), UploadedFile)
+
+        # An UploadedFile can still be created from a memory-mapped record, by
+        # copying its data.
+        file = UploadedFile(self.rec)
+        self.assertEqual(b"line1\nline2\nlast", file.getvalue())
+
+    def test_read(self):
+        """Memory-mapped files can be read like in-memory ones."""
+        file = open_uploaded_file(self.rec)
+        self.assertIsInstance(file, io.BufferedIOBase)
+        self.assertEqual(1, file.id)
+        self.assertEqual("file", file.name)
+        self.assertEqual("text/plain", file.type)
+        self.assertEqual(16, file.size)
+        self.assertEqual(b"line1\nline2\nlast", file.getvalue())
+        self.assertEqual(b"line1\nline2\nlast", bytes(file.getbuffer()))
+
+        self.assertEqual(b"lin", file.read(3))
+        self.assertEqual(b"e1\n", file.readline())
+        self.assertEqual(6, file.tell())
+        self.assertEqual([b"line2\n", b"last"], file.readlines())
+        self.assertEqual(b"", file.read())
+
+        self.assertEqual(12, file.seek(-4, io.SEEK_END))
+        buffer = bytearray(10)
+        self.assertEqual(4, file.readinto(buffer))
+        self.assertEqual(b"last", buffer[:4])
+
+        file.seek(0)
+        self.assertEqual([b"line1\n", b"line2\n", b"last"], list(file))
+        file.seek(6)
+        self.assertEqual(b"line2\nlast", file.read())
+
+    def test_independent_positions(self):
+        """Files for the same record have their own positions."""
+        file1 = open_uploaded_file(self.rec)
+        file2 = open_uploaded_file(self.rec)
+        self.assertEqual(b"line1", file1.read(5))
+        self.assertEqual(b"line1\n", file2.readline())
+        self.assertEqual(b"\n", file1.read(1))
+
+    def test_read_only(self):
+        """Memory-mapped files can't be written to."""
+        file = open_uploaded_file(self.rec)
+        self.assertFalse(file.writable())
+        with self.assertRaises(io.UnsupportedOperation):
+            file.write(b"data")
+        with self.assertRaises(io.UnsupportedOperation):
+            file.truncate()
+        with self.assertRaises(TypeError):
+            file.getbuffer()[0] = 0
+
+    def test_closed(self):
+        """Closed memory-mapped files can't be read."""
+        file = open_uploaded_file(self.rec)
+        file.close()
+        with self.assertRaises(ValueError):
+            file.read()
+        with self.assertRaises(ValueError):
+            file.getvalue()
+
+    def test_equality(self):
+        """Files are equal to the other files for the same record."""
+        self.assertEqual(open_uploaded_file(self.rec), open_uploaded_file(self.rec))
+        self.assertEqual(open_uploaded_file(self.rec), UploadedFile(self.rec))
+        self.assertEqual(UploadedFile(self.rec), open_uploaded_file(self.rec))
+        self.assertNotEqual(open_uploaded_file(self.rec), UploadedFile(FILE_1))
+
+    def test_pickle(self):
+        """Memory-mapped files are unpickled as in-memory files."""
+        file = open_uploaded_file(self.rec)
+        file.seek(6)
+        unpickled = pickle.loads(pickle.dumps(file))
+        self.assertIsInstance(unpickled, UploadedFile)
+        self.assertEqual(file, unpickled)
+        self.assertEqual("file", unpickled.name)
+        self.assertEqual(6, unpickled.tell())
+        self.assertEqual(b"line2\nlast", unpickled.read())
+
+    def test_cache_stats(self):
+        """Memory-mapped files aren't included in the CacheStats."""
+        mgr = UploadedFileManager()
+        mgr.add_file("session1", "widget1", self.rec)
+        mgr.add_file("session1", "widget2", FILE_1)
+        self.assertEqual(
+            [
+                CacheStat(
+                    category_name="UploadedFileManager",
+                    cache_name="",
+                    byte_length=len(FILE_1.data),
+                )
+            ],
+            mgr.get_stats(),
+        )
@@ -188,6 +188,21 @@ class StreamlitTest(unittest.TestCase):
         finally:
             os.chdir(cwd)
 
+    def test_import_does_not_load_heavy_dependencies(self):
+        """Test that importing streamlit doesn't import large libraries that
+        only some apps use."""
+        heavy_modules = ["altair", "numpy", "pandas", "PIL", "plotly", "pyarrow"]
+        # Run in a separate process, since these modules are already loaded here.
+        output = subprocess.check_output(
+            [
+                sys.executable,
+                "-c",
+                "import sys, streamlit; "
+                f"print([m for m in {heavy_modules!r} if m in sys.modules])",
+            ]
+        ).decode()
+        self.assertEqual("[]", output.strip())
+
 
 class StreamlitAPITest(DeltaGeneratorTestCase):
     """Test Public Streamlit Public APIs."""
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import unittest
+import weakref
 from collections import namedtuple
 from datetime import date
 from decimal import Decimal
@@ -22,11 +23,13 @@ from unittest.mock import patch
 import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
+import pyarrow as pa
 import pytest
 from pandas.api.types import infer_dtype
 from parameterized import parameterized
 
 from streamlit import type_util
+from streamlit.runtime.stats import CacheStat
 from streamlit.type_util import (
     DataFormat,
     convert_anything_to_df,
@@ -51,7 +54,7 @@ from tests.streamlit.data_mocks import (
 )
 from tests.streamlit.snowpark_mocks import DataFrame as SnowparkDataFrame
 from tests.streamlit.snowpark_mocks import Row as SnowparkRow
-from tests.testutil import create_snowpark_session
+from tests.testutil import create_snowpark_session, patch_config_options
 
 
 class TypeUtilTest(unittest.TestCase):
@@ -371,6 +374,149 @@ dtype: object""",
                 f"Unsupported types of this dataframe should have been automatically fixed: {ex}"
             )
 
+    @parameterized.expand(
+        [
+            (BASE_TYPES_DF,),
+            (DATETIME_TYPES_DF,),
+            (INTERVAL_TYPES_DF,),
+            (LIST_TYPES_DF,),
+            (PERIOD_TYPES_DF,),
+            (NUMBER_TYPES_DF,),
+            (SPECIAL_TYPES_DF,),
+            (UNSUPPORTED_TYPES_DF,),
+        ]
+    )
+    def test_data_frame_to_bytes_cached(self, input_df: pd.DataFrame):
+        """Test that cached Arrow bytes match freshly serialized ones."""
+        type_util._arrow_bytes_cache.clear()
+        first = data_frame_to_bytes(input_df)
+        second = data_frame_to_bytes(input_df.copy())
+
+        self.assertEqual(first, second)
+        self.assertEqual(type_util._data_frame_to_bytes(input_df), second)
+
+    def test_data_frame_to_bytes_reuses_cached_bytes(self):
+        """Test that equal dataframes are only serialized once."""
+        type_util._arrow_bytes_cache.clear()
+        df = pd.DataFrame({"ints": [1, 2, 3], "strings": ["a", "b", "c"]})
+
+        with patch(
+            "streamlit.type_util._data_frame_to_bytes",
+            wraps=type_util._data_frame_to_bytes,
+        ) as to_bytes:
+            data_frame_to_bytes(df)
+            data_frame_to_bytes(df.copy())
+            self.assertEqual(1, to_bytes.call_count)
+
+            # Mutating the dataframe invalidates its cached bytes.
+            df.iloc[0, 0] = 10
+            data_frame_to_bytes(df)
+            self.assertEqual(2, to_bytes.call_count)
+
+    @parameterized.expand(
+        [
+            ("int vs str", [1, 2], ["1", "2"]),
+            ("int vs float", [1, 2], [1.0, 2.0]),
+            ("separator in strings", ["a\0b", "c"], ["a", "b\0c"]),
+            ("None vs str", [None, "a"], ["None", "a"]),
+        ]
+    )
+    def test_data_frame_fingerprint_distinguishes_values(self, _, values1, values2):
+        self.assertNotEqual(
+            type_util.data_frame_fingerprint(pd.DataFrame({"col": values1})),
+            type_util.data_frame_fingerprint(pd.DataFrame({"col": values2})),
+        )
+
+    def test_data_frame_fingerprint_distinguishes_labels(self):
+        df = pd.DataFrame({"a": [1, 2]})
+        self.assertNotEqual(
+            type_util.data_frame_fingerprint(df),
+            type_util.data_frame_fingerprint(df.rename(columns={"a": "b"})),
+        )
+        self.assertNotEqual(
+            type_util.data_frame_fingerprint(df),
+            type_util.data_frame_fingerprint(df.set_axis([5, 6])),
+        )
+
+    def test_data_frame_fingerprint_unhashable(self):
+        """Dataframes with unhashable values can't be fingerprinted."""
+        df = pd.DataFrame({"lists": [[1, 2], [3]]})
+        self.assertIsNone(type_util.data_frame_fingerprint(df))
+        self.assertEqual(type_util._data_frame_to_bytes(df), data_frame_to_bytes(df))
+
+    def test_pyarrow_table_to_bytes_cached_by_identity(self):
+        type_util._arrow_bytes_cache.clear()
+        table = pa.Table.from_pandas(pd.DataFrame({"a": [1, 2, 3]}))
+
+        with patch(
+            "streamlit.type_util._serialize_pyarrow_table",
+            wraps=type_util._serialize_pyarrow_table,
+        ) as serialize:
+            first = type_util.pyarrow_table_to_bytes(table)
+            second = type_util.pyarrow_table_to_bytes(table)
+            self.assertEqual(1, serialize.call_count)
+            self.assertEqual(first, second)
+
+    def test_pyarrow_table_bytes_dropped_with_table(self):
+        type_util._arrow_bytes_cache.clear()
+        table = pa.Table.from_pandas(pd.DataFrame({"a": [1, 2, 3]}))
+        type_util.pyarrow_table_to_bytes(table)
+        self.assertEqual(1, len(type_util._arrow_bytes_cache))
+
+        del table
+        self.assertEqual(0, len(type_util._arrow_bytes_cache))
+
+    def test_pyarrow_table_finalizer_registered_once(self):
+        """A table gets at most one finalizer, and none if it isn't cached."""
+        type_util._arrow_bytes_cache.clear()
+        table = pa.Table.from_pandas(pd.DataFrame({"a": [1, 2, 3]}))
+
+        with patch(
+            "streamlit.type_util.weakref.finalize", wraps=weakref.finalize
+        ) as finalize:
+            with patch_config_options(
+                {"global.maxArrowBytesCacheSize": 1}
+            ), patch.object(type_util._arrow_bytes_cache, "_cache", None):
+                # Too large to be cached.
+                type_util.pyarrow_table_to_bytes(table)
+                type_util.pyarrow_table_to_bytes(table)
+            finalize.assert_not_called()
+
+            type_util.pyarrow_table_to_bytes(table)
+            # Evicted, and cached again.
+            type_util._arrow_bytes_cache.clear()
+            type_util.pyarrow_table_to_bytes(table)
+            finalize.assert_called_once()
+            # The mock's call args would keep the table alive.
+            finalize.reset_mock()
+
+        self.assertEqual(1, len(type_util._arrow_bytes_cache))
+        del table
+        self.assertEqual(0, len(type_util._arrow_bytes_cache))
+
+    def test_arrow_bytes_cache_stats(self):
+        """Test that the Arrow bytes cache reports its entries' sizes."""
+        type_util._arrow_bytes_cache.clear()
+        data = data_frame_to_bytes(pd.DataFrame({"a": [1, 2, 3]}))
+
+        self.assertEqual(
+            [CacheStat("ArrowBytesCache", "", len(data))],
+            type_util.get_arrow_bytes_cache_stats_provider().get_stats(),
+        )
+
+    def test_arrow_bytes_cache_max_size(self):
+        """Test that the Arrow bytes cache is bounded by its config option."""
+        data = data_frame_to_bytes(pd.DataFrame({"a": [1, 2, 3]}))
+        cache = type_util._ArrowBytesCache()
+        with patch_config_options({"global.maxArrowBytesCacheSize": len(data)}):
+            cache.add("first", data)
+            cache.add("second", data)
+            cache.add("too_large", data + b"\0")
+
+        self.assertIsNone(cache.get("first"))
+        self.assertEqual(data, cache.get("second"))
+        self.assertIsNone(cache.get("too_large"))
+
     def test_is_snowpark_dataframe(self):
         df = pd.DataFrame(
             {
@@ -14,9 +14,12 @@
 
 """streamlit.LocalSourcesWatcher unit test."""
 
+import importlib
 import os
 import sys
+import tempfile
 import unittest
+from typing import Set
 from unittest.mock import MagicMock, patch
 
 import tests.streamlit.watcher.test_data.dummy_module1 as DUMMY_MODULE_1
@@ -360,6 +363,130 @@ class LocalSourcesWatcherTest(unittest.TestCase):
         self.assertEqual(saved_filepath, SCRIPT_PATH)
 
 
+@patch("streamlit.source_util._cached_pages", new=None)
+@patch("streamlit.watcher.local_sources_watcher.PathWatcher", MagicMock())
+class LocalSourcesWatcherImportGraphTest(unittest.TestCase):
+    """Test that only changed modules and their dependents are unloaded."""
+
+    MODULES = {
+        "graph_a.py": "from graph_b import f",
+        "graph_b.py": "def f():\n    pass",
+        "graph_c.py": "import graph_d",
+        "graph_d.py": "",
+        "graph_e.py": "import graph_pkg.mod",
+        "graph_f.py": "from graph_b import f as _f\n\ndef g():\n    import graph_d",
+        "graph_pkg/__init__.py": "",
+        "graph_pkg/mod.py": "class C:\n    pass",
+        "graph_g.py": "from graph_pkg.mod import C\n\nINSTANCE = C()",
+        "graph_consts.py": "X = 1\nCFG = {'key': 'value'}",
+        "graph_h.py": "from graph_consts import X, CFG",
+        "graph_rel_pkg/__init__.py": "",
+        "graph_rel_pkg/consts.py": "VALUE = 1",
+        "graph_rel_pkg/rel.py": "from .consts import VALUE",
+    }
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self._dir.name, "graph_pkg"))
+        os.makedirs(os.path.join(self._dir.name, "graph_rel_pkg"))
+        for path, source in self.MODULES.items():
+            with open(os.path.join(self._dir.name, path), "w") as f:
+                f.write(source)
+        sys.path.insert(0, self._dir.name)
+
+        for path in self.MODULES:
+            importlib.import_module(self._module_name(path))
+
+        self.lsw = local_sources_watcher.LocalSourcesWatcher(
+            os.path.join(self._dir.name, "streamlit_app.py")
+        )
+        self.lsw.update_watched_modules()
+
+    def tearDown(self):
+        sys.path.remove(self._dir.name)
+        for name in list(sys.modules):
+            if name.startswith("graph_"):
+                del sys.modules[name]
+        self._dir.cleanup()
+
+    @staticmethod
+    def _module_name(path: str) -> str:
+        name = os.path.splitext(path)[0].replace("/", ".")
+        return name[: -len(".__init__")] if name.endswith(".__init__") else name
+
+    def _unloaded_modules_on_change(self, path: str) -> Set[str]:
+        before = {name for name in sys.modules if name.startswith("graph_")}
+        self.lsw.on_file_changed(os.path.join(self._dir.name, path))
+        return before - set(sys.modules)
+
+    def test_unloads_dependents(self):
+        self.assertEqual(
+            {"graph_a", "graph_b", "graph_f"},
+            self._unloaded_modules_on_change("graph_b.py"),
+        )
+
+    def test_ignores_imports_in_functions(self):
+        self.assertEqual(
+            {"graph_c", "graph_d"}, self._unloaded_modules_on_change("graph_d.py")
+        )
+
+    def test_unloads_dependents_of_parent_package(self):
+        """Modules that import a submodule via its package are unloaded, but
+        not the package itself."""
+        self.assertEqual(
+            {"graph_pkg.mod", "graph_e", "graph_g"},
+            self._unloaded_modules_on_change("graph_pkg/mod.py"),
+        )
+
+    def test_unloads_submodules_of_package(self):
+        self.assertEqual(
+            {"graph_pkg", "graph_pkg.mod", "graph_e", "graph_g"},
+            self._unloaded_modules_on_change("graph_pkg/__init__.py"),
+        )
+
+    def test_unloads_dependents_of_imported_constants(self):
+        """Modules that only import constants from a module are unloaded."""
+        self.assertEqual(
+            {"graph_consts", "graph_h"},
+            self._unloaded_modules_on_change("graph_consts.py"),
+        )
+
+    def test_unloads_dependents_of_relative_imports(self):
+        self.assertEqual(
+            {"graph_rel_pkg.consts", "graph_rel_pkg.rel"},
+            self._unloaded_modules_on_change("graph_rel_pkg/consts.py"),
+        )
+
+    def test_unloads_modules_with_unknown_imports(self):
+        """Modules whose imports can't be determined are unloaded whenever
+        a watched file changes."""
+        self._unloaded_modules_on_change("graph_a.py")
+        importlib.import_module("graph_a")
+        with patch(
+            "streamlit.watcher.local_sources_watcher._get_imported_module_names",
+            return_value=None,
+        ):
+            self.lsw.update_watched_modules()
+
+        self.assertEqual(
+            {"graph_a", "graph_d", "graph_c"},
+            self._unloaded_modules_on_change("graph_d.py"),
+        )
+
+    def test_updates_graph_when_reimported(self):
+        """A module's dependencies are updated once it's imported again."""
+        self._unloaded_modules_on_change("graph_d.py")
+        with open(os.path.join(self._dir.name, "graph_c.py"), "w") as f:
+            f.write("import graph_b")
+        importlib.invalidate_caches()
+        importlib.import_module("graph_c")
+        importlib.import_module("graph_d")
+        self.lsw.update_watched_modules()
+
+        self.assertEqual({"graph_d"}, self._unloaded_modules_on_change("graph_d.py"))
+        self.assertIn("graph_c", self._unloaded_modules_on_change("graph_b.py"))
+
+
 def test_get_module_paths_outputs_abs_paths():
     mock_module = MagicMock()
     mock_module.__file__ = os.path.relpath(DUMMY_MODULE_1_FILE)
@@ -26,39 +26,25 @@ class PollingPathWatcherTest(unittest.TestCase):
         self.util_patch = mock.patch("streamlit.watcher.polling_path_watcher.util")
         self.util_mock = self.util_patch.start()
 
-        # Patch PollingPathWatcher's thread pool executor. We want to do
-        # all of our test polling on the test thread, so we accumulate
-        # tasks here and run them manually via `_run_executor_tasks`.
-        self._executor_tasks = []
-        self.executor_patch = mock.patch(
-            "streamlit.watcher.polling_path_watcher.PollingPathWatcher._executor",
+        # Patch out PollingPathWatcher's polling thread. We want to do all of
+        # our test polling on the test thread, so we run the polling sweep
+        # manually via `_poll`.
+        self.thread_patch = mock.patch(
+            "streamlit.watcher.polling_path_watcher.PollingPathWatcher"
+            "._start_polling_thread"
         )
-        executor_mock = self.executor_patch.start()
-        executor_mock.submit = self._submit_executor_task
-
-        # Patch PollingPathWatcher's `time.sleep` to no-op, so that the tasks
-        # submitted to our mock executor don't block.
-        self.sleep_patch = mock.patch(
-            "streamlit.watcher.polling_path_watcher.time.sleep"
-        )
-        self.sleep_patch.start()
+        self.thread_patch.start()
 
     def tearDown(self):
         super(PollingPathWatcherTest, self).tearDown()
         self.util_patch.stop()
-        self.executor_patch.stop()
-        self.sleep_patch.stop()
-
-    def _submit_executor_task(self, task):
-        """Submit a new task to our mock executor."""
-        self._executor_tasks.append(task)
+        self.thread_patch.stop()
+        polling_path_watcher.PollingPathWatcher._watchers.clear()
 
-    def _run_executor_tasks(self):
-        """Run all tasks that have been submitted to our mock executor."""
-        tasks = self._executor_tasks
-        self._executor_tasks = []
-        for task in tasks:
-            task()
+    @staticmethod
+    def _poll():
+        """Check all watched paths once, as the polling thread does."""
+        polling_path_watcher.PollingPathWatcher._poll_all()
 
     def test_file_watch_and_callback(self):
         """Test that when a file is modified, the callback is called."""
@@ -71,13 +57,13 @@ class PollingPathWatcherTest(unittest.TestCase):
             "/this/is/my/file.py", callback
         )
 
-        self._run_executor_tasks()
+        self._poll()
         callback.assert_not_called()
 
         self.util_mock.path_modification_time = lambda *args: 102.0
         self.util_mock.calc_md5_with_blocking_retries = lambda _, **kwargs: "2"
 
-        self._run_executor_tasks()
+        self._poll()
         callback.assert_called_once()
 
         watcher.close()
@@ -93,14 +79,14 @@ class PollingPathWatcherTest(unittest.TestCase):
             "/this/is/my/file.py", callback
         )
 
-        self._run_executor_tasks()
+        self._poll()
         callback.assert_not_called()
 
         # Same mtime!
         self.util_mock.calc_md5_with_blocking_retries = lambda _, **kwargs: "2"
 
         # This is the test:
-        self._run_executor_tasks()
+        self._poll()
         callback.assert_not_called()
 
         watcher.close()
@@ -116,14 +102,14 @@ class PollingPathWatcherTest(unittest.TestCase):
             "/this/is/my/file.py", callback
         )
 
-        self._run_executor_tasks()
+        self._poll()
         callback.assert_not_called()
 
         self.util_mock.path_modification_time = lambda *args: 102.0
         # Same MD5
 
         # This is the test:
-        self._run_executor_tasks()
+        self._poll()
         callback.assert_not_called()
 
         watcher.close()
@@ -150,7 +136,7 @@ class PollingPathWatcherTest(unittest.TestCase):
             allow_nonexistent=True,
         )
 
-        self._run_executor_tasks()
+        self._poll()
         callback.assert_not_called()
         _, kwargs = self.util_mock.calc_md5_with_blocking_retries.call_args
         assert kwargs == {"glob_pattern": "*.py", "allow_nonexistent": True}
@@ -158,7 +144,7 @@ class PollingPathWatcherTest(unittest.TestCase):
         self.util_mock.path_modification_time = lambda *args: 102.0
         self.util_mock.calc_md5_with_blocking_retries = mock.Mock(return_value="2")
 
-        self._run_executor_tasks()
+        self._poll()
         callback.assert_called_once()
         _, kwargs = self.util_mock.calc_md5_with_blocking_retries.call_args
         assert kwargs == {"glob_pattern": "*.py", "allow_nonexistent": True}
@@ -187,14 +173,14 @@ class PollingPathWatcherTest(unittest.TestCase):
         watcher1 = polling_path_watcher.PollingPathWatcher(filename, callback1)
         watcher2 = polling_path_watcher.PollingPathWatcher(filename, callback2)
 
-        self._run_executor_tasks()
+        self._poll()
 
         callback1.assert_not_called()
         callback2.assert_not_called()
 
         # "Modify" our file
         modify_mock_file()
-        self._run_executor_tasks()
+        self._poll()
 
         self.assertEqual(callback1.call_count, 1)
         self.assertEqual(callback2.call_count, 1)
@@ -204,7 +190,7 @@ class PollingPathWatcherTest(unittest.TestCase):
 
         # Modify our file again
         modify_mock_file()
-        self._run_executor_tasks()
+        self._poll()
 
         self.assertEqual(callback1.call_count, 1)
         self.assertEqual(callback2.call_count, 2)
@@ -218,3 +204,43 @@ class PollingPathWatcherTest(unittest.TestCase):
         # should not have increased.
         self.assertEqual(callback1.call_count, 1)
         self.assertEqual(callback2.call_count, 2)
+
+    def test_error_does_not_stop_polling(self):
+        """Test that an error checking one path doesn't stop us from checking
+        the others."""
+        self.util_mock.path_modification_time = lambda *args: 101.0
+        self.util_mock.calc_md5_with_blocking_retries = lambda _, **kwargs: "1"
+
+        callback1 = mock.Mock(side_effect=RuntimeError("boom"))
+        callback2 = mock.Mock()
+        watcher1 = polling_path_watcher.PollingPathWatcher("/file1.py", callback1)
+        watcher2 = polling_path_watcher.PollingPathWatcher("/file2.py", callback2)
+
+        self.util_mock.path_modification_time = lambda *args: 102.0
+        self.util_mock.calc_md5_with_blocking_retries = lambda _, **kwargs: "2"
+        self._poll()
+
+        callback1.assert_called_once()
+        callback2.assert_called_once()
+
+        watcher1.close()
+        watcher2.close()
+
+    def test_watchers_share_polling_thread(self):
+        """Test that all watchers are polled by a single thread."""
+        self.thread_patch.stop()
+        with mock.patch(
+            "streamlit.watcher.polling_path_watcher.threading.Thread"
+        ) as thread_mock, mock.patch.object(
+            polling_path_watcher.PollingPathWatcher, "_polling_thread", None
+        ):
+            watcher1 = polling_path_watcher.PollingPathWatcher("/file1.py", mock.Mock())
+            watcher2 = polling_path_watcher.PollingPathWatcher("/file2.py", mock.Mock())
+
+            thread_mock.assert_called_once()
+            thread_mock.return_value.start.assert_called_once()
+
+        watcher1.close()
+        watcher2.close()
+        self.assertEqual([], polling_path_watcher.PollingPathWatcher._watchers)
+        self.thread_patch.start()
@@ -16,9 +16,12 @@ import tempfile
 import unittest
 from unittest.mock import MagicMock, mock_open, patch
 
+from streamlit import hash_util
 from streamlit.watcher import util
 
 
+# Pin the hash algorithm, so that we can compare against known checksums.
+@patch("streamlit.hash_util._hasher_factory", new=hash_util.get_hasher_factory("md5"))
 class UtilTest(unittest.TestCase):
     def test_md5_calculation_succeeds_with_bytes_input(self):
         with patch("streamlit.watcher.util.open", mock_open(read_data=b"hello")) as m:
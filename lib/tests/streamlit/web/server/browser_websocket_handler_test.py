@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 from unittest.mock import ANY, MagicMock, patch
 
 import tornado.httpserver
@@ -22,6 +23,8 @@ import tornado.websocket
 from streamlit.proto.BackMsg_pb2 import BackMsg
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime import Runtime, SessionClientDisconnectedError
+from streamlit.runtime.forward_msg_cache import populate_hash_if_needed
+from streamlit.web.server import browser_websocket_handler
 from streamlit.web.server.server import BrowserWebSocketHandler
 from tests.isolated_asyncio_test_case import IsolatedAsyncioTestCase
 from tests.streamlit.web.server.server_test_case import ServerTestCase
@@ -93,6 +96,180 @@ class BrowserWebSocketHandlerTest(ServerTestCase):
 
                 write_message_mock.assert_called_once()
 
+    @patch_config_options({"server.maxWebsocketWriteBufferSize": 0})
+    @tornado.testing.gen_test
+    async def test_wait_for_write_buffer_to_drain(self):
+        """`wait_for_write_buffer_to_drain` should block until buffered writes
+        over the configured limit have been flushed.
+        """
+        with self._patch_app_session():
+            await self.server.start()
+            await self.ws_connect()
+
+            session_info = self.server._runtime._session_mgr.list_active_sessions()[0]
+            websocket_handler: BrowserWebSocketHandler = session_info.client
+
+            with patch.object(websocket_handler, "write_message") as write_message_mock:
+                pending_write = asyncio.get_running_loop().create_future()
+                write_message_mock.return_value = pending_write
+
+                msg = ForwardMsg()
+                msg.script_finished = (
+                    ForwardMsg.ScriptFinishedStatus.FINISHED_SUCCESSFULLY
+                )
+                websocket_handler.write_forward_msg(msg)
+                self.assertGreater(websocket_handler._write_buffer_size, 0)
+
+                drain_task = asyncio.create_task(
+                    websocket_handler.wait_for_write_buffer_to_drain()
+                )
+                await asyncio.sleep(0)
+                self.assertFalse(drain_task.done())
+
+                pending_write.set_result(None)
+                await drain_task
+                self.assertEqual(0, websocket_handler._write_buffer_size)
+
+    @tornado.testing.gen_test
+    async def test_write_large_forward_msg(self):
+        """Large messages are written straight to the IOStream, and must still
+        arrive at the client intact."""
+        with self._patch_app_session():
+            await self.server.start()
+            ws_client = await self.ws_connect()
+
+            session_info = self.server._runtime._session_mgr.list_active_sessions()[0]
+            websocket_handler: BrowserWebSocketHandler = session_info.client
+
+            msg = ForwardMsg()
+            msg.delta.new_element.markdown.body = "X" * (200 * 1024)
+            msg.metadata.delta_path[:] = [0, 1]
+
+            with patch.object(websocket_handler, "write_message") as write_message_mock:
+                websocket_handler.write_forward_msg(msg)
+                write_message_mock.assert_not_called()
+
+            received_msg = ForwardMsg()
+            received_msg.ParseFromString(await ws_client.read_message())
+            self.assertEqual(msg, received_msg)
+
+    async def _ws_connect_with_compression(
+        self,
+    ) -> tornado.websocket.WebSocketClientConnection:
+        return await tornado.websocket.websocket_connect(
+            self.get_ws_url("/_stcore/stream"),
+            subprotocols=["streamlit"],
+            compression_options={},
+        )
+
+    @patch_config_options({"server.enableWebsocketCompression": True})
+    @tornado.testing.gen_test
+    async def test_write_forward_msgs_with_compression(self):
+        """If the client negotiated compression, small messages are sent
+        uncompressed and larger ones compressed, each on its own."""
+        with self._patch_app_session():
+            await self.server.start()
+            ws_client = await self._ws_connect_with_compression()
+            self.assertIn(
+                "server_no_context_takeover",
+                ws_client.headers["Sec-WebSocket-Extensions"],
+            )
+
+            session_info = self.server._runtime._session_mgr.list_active_sessions()[0]
+            websocket_handler: BrowserWebSocketHandler = session_info.client
+            self.assertTrue(websocket_handler._can_write_frames_directly())
+            ws_connection = websocket_handler.ws_connection
+
+            # Too small to compress, compressed, and compressed at the fastest
+            # level.
+            for body_size, is_compressed in [
+                (100, False),
+                (200 * 1024, True),
+                (2 * 1024 * 1024, True),
+            ]:
+                msg = ForwardMsg()
+                msg.delta.new_element.markdown.body = "X" * body_size
+                msg.metadata.delta_path[:] = [0, 1]
+
+                wire_bytes_out = ws_connection._wire_bytes_out
+                with patch.object(
+                    websocket_handler, "write_message"
+                ) as write_message_mock:
+                    websocket_handler.write_forward_msg(msg)
+                    write_message_mock.assert_not_called()
+
+                frame_size = ws_connection._wire_bytes_out - wire_bytes_out
+                if is_compressed:
+                    self.assertLess(frame_size, body_size / 10)
+                else:
+                    self.assertGreater(frame_size, body_size)
+
+                received_msg = ForwardMsg()
+                received_msg.ParseFromString(await ws_client.read_message())
+                self.assertEqual(msg, received_msg)
+
+    @patch_config_options({"server.enableWebsocketCompression": True})
+    @tornado.testing.gen_test
+    async def test_cached_payload_compressed_once(self):
+        """A cached message's payload is compressed once for all clients."""
+        with self._patch_app_session():
+            await self.server.start()
+            ws_clients = [
+                await self._ws_connect_with_compression(),
+                await self._ws_connect_with_compression(),
+            ]
+            sessions = self.server._runtime._session_mgr.list_active_sessions()
+
+            msg = ForwardMsg()
+            msg.delta.new_element.markdown.body = "X" * (200 * 1024)
+            populate_hash_if_needed(msg)
+            message_cache = self.server._runtime.message_cache
+            message_cache.add_message(msg, sessions[0].session, 0)
+
+            with patch(
+                "streamlit.web.server.browser_websocket_handler._deflate",
+                wraps=browser_websocket_handler._deflate,
+            ) as deflate_mock:
+                for session_info in sessions:
+                    session_info.client.write_forward_msg(msg)
+
+            payload = message_cache.get_serialized_payload(msg.hash)
+            compressed_data = [call.args[0] for call in deflate_mock.call_args_list]
+            self.assertEqual(1, compressed_data.count(payload))
+
+            for ws_client in ws_clients:
+                received_msg = ForwardMsg()
+                received_msg.ParseFromString(await ws_client.read_message())
+                self.assertEqual(msg, received_msg)
+
+    @patch_config_options({"server.enableWebsocketCompression": True})
+    @tornado.testing.gen_test
+    async def test_write_large_forward_msg_compression_not_negotiated(self):
+        """Large messages are written straight to the IOStream if compression
+        is enabled but the client didn't negotiate it."""
+        with self._patch_app_session():
+            await self.server.start()
+            ws_client = await self.ws_connect()
+
+            session_info = self.server._runtime._session_mgr.list_active_sessions()[0]
+            websocket_handler: BrowserWebSocketHandler = session_info.client
+            self.assertTrue(websocket_handler._can_write_frames_directly())
+
+            # Just over the direct-write threshold, and well over it.
+            for body_size in (65 * 1024, 200 * 1024):
+                msg = ForwardMsg()
+                msg.delta.new_element.markdown.body = "X" * body_size
+
+                with patch.object(
+                    websocket_handler, "write_message"
+                ) as write_message_mock:
+                    websocket_handler.write_forward_msg(msg)
+                    write_message_mock.assert_not_called()
+
+                received_msg = ForwardMsg()
+                received_msg.ParseFromString(await ws_client.read_message())
+                self.assertEqual(msg, received_msg)
+
     @tornado.testing.gen_test
     async def test_backmsg_deserialization_exception(self):
         """If BackMsg deserialization raises an Exception, we should call the Runtime's
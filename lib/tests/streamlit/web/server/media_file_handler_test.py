@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import tempfile
 from unittest import mock
 from unittest.mock import MagicMock
 
@@ -20,7 +21,9 @@ import tornado.web
 from parameterized import parameterized
 from typing_extensions import Final
 
+from streamlit.runtime.disk_media_file_storage import DiskMediaFileStorage
 from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.media_file_storage import MediaFileKind
 from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.web.server.media_file_handler import MediaFileHandler
 
@@ -94,3 +97,45 @@ class MediaFileHandlerTest(tornado.testing.AsyncHTTPTestCase):
         url = f"{MOCK_ENDPOINT}/invalid_media_file.mp4"
         rsp = self.fetch(url, method="GET")
         self.assertEqual(404, rsp.code)
+
+
+class DiskMediaFileHandlerTest(tornado.testing.AsyncHTTPTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.storage = DiskMediaFileStorage(MOCK_ENDPOINT, directory=self.tempdir.name)
+        MediaFileHandler.initialize_storage(self.storage)
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+        super().tearDown()
+
+    def get_app(self) -> tornado.web.Application:
+        return tornado.web.Application(
+            [(f"{MOCK_ENDPOINT}/(.*)", MediaFileHandler, {"path": ""})]
+        )
+
+    def test_media_file(self) -> None:
+        """Files on disk are served whole."""
+        data = bytes(range(256)) * 1024
+        file_id = self.storage.load_and_get_id(data, "video/mp4", MediaFileKind.MEDIA)
+        rsp = self.fetch(self.storage.get_url(file_id), method="GET")
+
+        self.assertEqual(200, rsp.code)
+        self.assertEqual(data, rsp.body)
+        self.assertEqual("video/mp4", rsp.headers["Content-Type"])
+        self.assertEqual(str(len(data)), rsp.headers["Content-Length"])
+
+    def test_range_request(self) -> None:
+        """Range requests for files on disk only return the requested bytes."""
+        data = bytes(range(256)) * 1024
+        file_id = self.storage.load_and_get_id(data, "video/mp4", MediaFileKind.MEDIA)
+        rsp = self.fetch(
+            self.storage.get_url(file_id),
+            method="GET",
+            headers={"Range": "bytes=1000-199999"},
+        )
+
+        self.assertEqual(206, rsp.code)
+        self.assertEqual(data[1000:200000], rsp.body)
+        self.assertEqual(f"bytes 1000-199999/{len(data)}", rsp.headers["Content-Range"])
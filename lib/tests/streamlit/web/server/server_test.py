@@ -257,7 +257,7 @@ class ServerTest(ServerTestCase):
                 # and the Websocket client's write_message will be called,
                 # raising our WebSocketClosedError.
                 while not flush_browser_queue.called:
-                    self.server._runtime._get_async_objs().need_send_data.set()
+                    self.server._runtime._enqueued_some_message(session_info.session.id)
                     await asyncio.sleep(0)
 
                 flush_browser_queue.assert_called_once()
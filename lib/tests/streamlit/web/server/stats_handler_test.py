@@ -20,7 +20,7 @@ from google.protobuf.json_format import MessageToDict
 from tornado.httputil import HTTPHeaders
 
 from streamlit.proto.openmetrics_data_model_pb2 import MetricSet as MetricSetProto
-from streamlit.runtime.stats import CacheStat
+from streamlit.runtime.stats import CacheStat, CounterStat, GaugeStat
 from streamlit.web.server.server import METRIC_ENDPOINT
 from streamlit.web.server.stats_request_handler import StatsRequestHandler
 
@@ -28,8 +28,16 @@ from streamlit.web.server.stats_request_handler import StatsRequestHandler
 class StatsHandlerTest(tornado.testing.AsyncHTTPTestCase):
     def get_app(self):
         self.mock_stats = []
+        self.mock_counter_stats = []
+        self.mock_gauge_stats = []
         mock_stats_manager = MagicMock()
         mock_stats_manager.get_stats = MagicMock(side_effect=lambda: self.mock_stats)
+        mock_stats_manager.get_counter_stats = MagicMock(
+            side_effect=lambda: self.mock_counter_stats
+        )
+        mock_stats_manager.get_gauge_stats = MagicMock(
+            side_effect=lambda: self.mock_gauge_stats
+        )
         return tornado.web.Application(
             [
                 (
@@ -159,3 +167,134 @@ class StatsHandlerTest(tornado.testing.AsyncHTTPTestCase):
         }
 
         self.assertEqual(expected, MessageToDict(metric_set))
+
+    def test_counter_stats(self):
+        """Counters are grouped into one metric family each."""
+        self.mock_counter_stats = [
+            CounterStat("cache_hits", "st_cache_data", "foo", 3),
+            CounterStat("cache_wait_seconds", "st_cache_data", "foo", 0.5),
+            CounterStat("cache_hits", "st_cache_data", "bar", 1),
+        ]
+
+        response = self.fetch("/_stcore/metrics")
+        self.assertEqual(200, response.code)
+
+        expected_body = (
+            "# TYPE cache_memory_bytes gauge\n"
+            "# UNIT cache_memory_bytes bytes\n"
+            "# HELP Total memory consumed by a cache.\n"
+            "# TYPE cache_hits counter\n"
+            "# HELP cache_hits Number of calls that found their value in a cache.\n"
+            'cache_hits_total{cache_type="st_cache_data",cache="foo"} 3\n'
+            'cache_hits_total{cache_type="st_cache_data",cache="bar"} 1\n'
+            "# TYPE cache_wait_seconds counter\n"
+            "# UNIT cache_wait_seconds seconds\n"
+            "# HELP cache_wait_seconds Total time calls spent waiting for another "
+            "call to compute their value.\n"
+            'cache_wait_seconds_total{cache_type="st_cache_data",cache="foo"} 0.5\n'
+            "# EOF\n"
+        ).encode("utf-8")
+
+        self.assertEqual(expected_body, response.body)
+
+    def test_protobuf_counter_stats(self):
+        self.mock_counter_stats = [
+            CounterStat("cache_hits", "st_cache_data", "foo", 3),
+            CounterStat("cache_wait_seconds", "st_cache_data", "foo", 0.5),
+        ]
+
+        headers = HTTPHeaders()
+        headers.add("Accept", "application/x-protobuf")
+        response = self.fetch("/_stcore/metrics", headers=headers)
+        self.assertEqual(200, response.code)
+
+        metric_set = MetricSetProto()
+        metric_set.ParseFromString(response.body)
+
+        labels = [
+            {"name": "cache_type", "value": "st_cache_data"},
+            {"name": "cache", "value": "foo"},
+        ]
+        expected = [
+            {
+                "name": "cache_hits",
+                "type": "COUNTER",
+                "help": "Number of calls that found their value in a cache.",
+                "metrics": [
+                    {
+                        "labels": labels,
+                        "metricPoints": [{"counterValue": {"intValue": "3"}}],
+                    }
+                ],
+            },
+            {
+                "name": "cache_wait_seconds",
+                "type": "COUNTER",
+                "unit": "seconds",
+                "help": "Total time calls spent waiting for another call to "
+                "compute their value.",
+                "metrics": [
+                    {
+                        "labels": labels,
+                        "metricPoints": [{"counterValue": {"doubleValue": 0.5}}],
+                    }
+                ],
+            },
+        ]
+
+        self.assertEqual(expected, MessageToDict(metric_set)["metricFamilies"][1:])
+
+    def test_gauge_stats(self):
+        """Gauges are grouped into one metric family each, after counters."""
+        self.mock_counter_stats = [
+            CounterStat("script_thread_jobs", "script_threads", "", 2),
+        ]
+        self.mock_gauge_stats = [
+            GaugeStat("script_threads", 2),
+            GaugeStat("script_thread_queue_depth", 1),
+        ]
+
+        response = self.fetch("/_stcore/metrics")
+        self.assertEqual(200, response.code)
+
+        expected_body = (
+            "# TYPE cache_memory_bytes gauge\n"
+            "# UNIT cache_memory_bytes bytes\n"
+            "# HELP Total memory consumed by a cache.\n"
+            "# TYPE script_thread_jobs counter\n"
+            "# HELP script_thread_jobs Number of sessions' script runners that "
+            "were given a thread.\n"
+            'script_thread_jobs_total{cache_type="script_threads",cache=""} 2\n'
+            "# TYPE script_threads gauge\n"
+            "# HELP script_threads Number of threads that scripts run on.\n"
+            "script_threads 2\n"
+            "# TYPE script_thread_queue_depth gauge\n"
+            "# HELP script_thread_queue_depth Number of script runs that are "
+            "waiting for a free thread.\n"
+            "script_thread_queue_depth 1\n"
+            "# EOF\n"
+        ).encode("utf-8")
+
+        self.assertEqual(expected_body, response.body)
+
+    def test_protobuf_gauge_stats(self):
+        self.mock_gauge_stats = [GaugeStat("script_threads", 2)]
+
+        headers = HTTPHeaders()
+        headers.add("Accept", "application/x-protobuf")
+        response = self.fetch("/_stcore/metrics", headers=headers)
+        self.assertEqual(200, response.code)
+
+        metric_set = MetricSetProto()
+        metric_set.ParseFromString(response.body)
+
+        expected = [
+            {
+                "name": "script_threads",
+                "type": "GAUGE",
+                "help": "Number of threads that scripts run on.",
+                "metrics": [{"metricPoints": [{"gaugeValue": {"intValue": "2"}}]}],
+            },
+        ]
+
+        self.assertEqual(expected, MessageToDict(metric_set)["metricFamilies"][1:])
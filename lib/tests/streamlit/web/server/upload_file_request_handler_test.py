@@ -14,19 +14,29 @@
 
 """UploadFileHandler.py unit tests"""
 
+import mmap
+import unittest
 from typing import NamedTuple
+from unittest import mock
 
 import requests
 import tornado.testing
 import tornado.web
 import tornado.websocket
+from parameterized import parameterized
 
 from streamlit.logger import get_logger
-from streamlit.runtime.uploaded_file_manager import UploadedFileManager
+from streamlit.runtime.uploaded_file_manager import (
+    UploadedFile,
+    UploadedFileManager,
+    UploadedFileRec,
+)
 from streamlit.web.server.upload_file_request_handler import (
     UPLOAD_FILE_ROUTE,
     UploadFileRequestHandler,
+    _MultipartParser,
 )
+from tests.testutil import patch_config_options
 
 LOGGER = get_logger(__name__)
 
@@ -134,6 +144,193 @@ class UploadFileRequestHandlerTest(tornado.testing.AsyncHTTPTestCase):
         self.assertEqual(400, response.code)
         self.assertIn("Expected 1 file, but got 0", response.reason)
 
+    def test_upload_large_file(self):
+        """Files larger than server.uploadedFileMemorySize are memory-mapped."""
+        data = bytes(range(256)) * 4096
+        params = {
+            "filename": data,
+            "sessionId": (None, "mockSessionId"),
+            "widgetId": (None, "mockWidgetId"),
+        }
+        with patch_config_options({"server.uploadedFileMemorySize": 0.5}):
+            response = self._upload_files(params)
+        self.assertEqual(200, response.code, response.reason)
+
+        [rec] = self.file_mgr.get_all_files("mockSessionId", "mockWidgetId")
+        self.assertIsInstance(rec.data, mmap.mmap)
+        self.assertEqual(data, rec.data[:])
+        self.assertEqual(data, UploadedFile(rec).read())
+
+    def test_upload_small_file(self):
+        """Files up to server.uploadedFileMemorySize are kept in memory."""
+        with patch_config_options({"server.uploadedFileMemorySize": 0.5}):
+            response = self._upload_files(
+                {
+                    "filename": b"123",
+                    "sessionId": (None, "mockSessionId"),
+                    "widgetId": (None, "mockWidgetId"),
+                }
+            )
+        self.assertEqual(200, response.code, response.reason)
+
+        [rec] = self.file_mgr.get_all_files("mockSessionId", "mockWidgetId")
+        self.assertEqual(b"123", rec.data)
+
+    def test_upload_not_multipart_error(self):
+        """Bodies that aren't multipart/form-data fail with 400 status."""
+        response = self.fetch(
+            "/_stcore/upload_file",
+            method="POST",
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            body="sessionId=mockSessionId&widgetId=mockWidgetId",
+        )
+        self.assertEqual(400, response.code)
+        self.assertIn("Expected a multipart/form-data body", response.reason)
+
+    def test_upload_incomplete_body_error(self):
+        """Truncated bodies fail with 400 status."""
+        req = requests.Request(
+            method="POST",
+            url=self.get_url("/_stcore/upload_file"),
+            files={
+                "filename": b"123",
+                "sessionId": (None, "mockSessionId"),
+                "widgetId": (None, "mockWidgetId"),
+            },
+        ).prepare()
+        response = self.fetch(
+            "/_stcore/upload_file",
+            method=req.method,
+            headers={"Content-Type": req.headers["Content-Type"]},
+            body=req.body[:-10],
+        )
+        self.assertEqual(400, response.code)
+        self.assertIn("Incomplete multipart/form-data body", response.reason)
+
+    def test_upload_malformed_body_error(self):
+        """Malformed bodies fail with 400 status as soon as they're parsed,
+        and the rest of the body is discarded."""
+        response = self.fetch(
+            "/_stcore/upload_file",
+            method="POST",
+            headers={"Content-Type": "multipart/form-data; boundary=boundary"},
+            body=b"--boundary\r\nContent-Type: text/plain\r\n\r\n"
+            + b"x" * 1_000_000
+            + b"\r\n--boundary--",
+        )
+        self.assertEqual(400, response.code)
+        self.assertIn(
+            "Invalid multipart/form-data Content-Disposition", response.reason
+        )
+
+    def test_upload_session_quota_error(self):
+        """Uploads that don't fit in the session's quota fail with 413 status
+        as soon as the session ID is received."""
+        self.file_mgr.add_file(
+            "mockSessionId",
+            "mockWidgetId",
+            UploadedFileRec(id=0, name="file", type="type", data=b"x" * 1000),
+        )
+        params = {
+            "sessionId": (None, "mockSessionId"),
+            "widgetId": (None, "mockWidgetId"),
+            "filename": b"x" * 1_000_000,
+        }
+        with patch_config_options(
+            {"server.maxUploadedFilesSessionSize": 0.5}
+        ), mock.patch.object(
+            self.file_mgr, "ensure_space", wraps=self.file_mgr.ensure_space
+        ) as ensure_space:
+            response = self._upload_files(params)
+        self.assertEqual(413, response.code)
+        # The upload was rejected before its body was complete.
+        ensure_space.assert_called_once()
+        self.assertIn("would exceed 524288 bytes", response.reason)
+        self.assertEqual(
+            1, len(self.file_mgr.get_all_files("mockSessionId", "mockWidgetId"))
+        )
+
+    def test_upload_quota_checked_when_added(self):
+        """Uploads are rejected with 413 status if other uploads filled the
+        quota while they were being received."""
+        params = {
+            "sessionId": (None, "mockSessionId"),
+            "widgetId": (None, "mockWidgetId"),
+            "filename": b"x" * 1000,
+        }
+        with patch_config_options(
+            {"server.maxUploadedFilesSessionSize": 0.5}
+        ), mock.patch.object(self.file_mgr, "ensure_space"):
+            # Fill the quota once the early check has passed.
+            self.file_mgr.add_file(
+                "mockSessionId",
+                "otherWidgetId",
+                UploadedFileRec(id=0, name="file", type="type", data=b"x" * 524000),
+            )
+            response = self._upload_files(params)
+        self.assertEqual(413, response.code)
+        self.assertEqual(
+            [], self.file_mgr.get_all_files("mockSessionId", "mockWidgetId")
+        )
+
+    def test_upload_within_quota(self):
+        """Uploads that fit in the quotas succeed."""
+        params = {
+            "sessionId": (None, "mockSessionId"),
+            "widgetId": (None, "mockWidgetId"),
+            "filename": b"x" * 1000,
+        }
+        with patch_config_options(
+            {
+                "server.maxUploadedFilesSessionSize": 0.5,
+                "server.maxUploadedFilesTotalSize": 0.5,
+            }
+        ):
+            response = self._upload_files(params)
+        self.assertEqual(200, response.code, response.reason)
+
+
+class MultipartParserTest(unittest.TestCase):
+    """Tests the incremental multipart/form-data parser."""
+
+    def _create_body(self):
+        return requests.Request(
+            method="POST",
+            url="http://localhost/_stcore/upload_file",
+            files={
+                "file.txt": ("file.txt", b"--\r\nfile\r\n--content", "text/plain"),
+                "sessionId": (None, "mockSessionId"),
+                "widgetId": (None, "mockWidgetId"),
+            },
+        ).prepare()
+
+    @parameterized.expand([(1,), (3,), (7,), (100000,)])
+    def test_chunked_body(self, chunk_size):
+        """Bodies are parsed the same however they're split into chunks."""
+        req = self._create_body()
+        parser = _MultipartParser.from_content_type(
+            req.headers["Content-Type"], spool_size=1024
+        )
+        for start in range(0, len(req.body), chunk_size):
+            parser.feed(req.body[start : start + chunk_size])
+        parser.close()
+
+        self.assertEqual(
+            {"sessionId": [b"mockSessionId"], "widgetId": [b"mockWidgetId"]},
+            parser.args,
+        )
+        [file] = parser.files
+        self.assertEqual("file.txt", file.filename)
+        self.assertEqual("text/plain", file.content_type)
+        file.file.seek(0)
+        self.assertEqual(b"--\r\nfile\r\n--content", file.file.read())
+
+    def test_invalid_part(self):
+        """Parts without a form-data Content-Disposition are invalid."""
+        parser = _MultipartParser(b"boundary", spool_size=1024)
+        with self.assertRaises(ValueError):
+            parser.feed(b"--boundary\r\nContent-Type: text/plain\r\n\r\ndata")
+
 
 class UploadFileRequestHandlerInvalidSessionTest(tornado.testing.AsyncHTTPTestCase):
     """Tests the /upload_file endpoint."""
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the peak memory used to get a large pyarrow.Table from
+`st.dataframe` into a websocket frame.
+
+"legacy" reproduces the previous path: serialize the table via
+pa.BufferOutputStream + to_pybytes, serialize the ForwardMsg once for hashing
+and once for sending, and copy it into a frame along with its header.
+"current" uses the real code path, which hands the serialized parts to the
+IOStream as-is (see BrowserWebSocketHandler._write_binary_frame).
+
+Each variant runs in a fresh process, and reports its peak RSS above the RSS
+it had after creating the table.
+
+Usage: python scripts/benchmarks/arrow_peak_memory.py [--rows N]
+"""
+
+import gc
+import hashlib
+import multiprocessing
+import resource
+import struct
+import time
+from typing import Any, List, Tuple
+
+import click
+import numpy as np
+import pyarrow as pa
+
+
+def _legacy(table: pa.Table) -> List[Any]:
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    sink = pa.BufferOutputStream()
+    writer = pa.RecordBatchStreamWriter(sink, table.schema)
+    writer.write_table(table)
+    writer.close()
+
+    msg = ForwardMsg()
+    msg.delta.new_element.arrow_data_frame.data = sink.getvalue().to_pybytes()
+    msg.hash = hashlib.md5(msg.SerializeToString()).hexdigest()
+    msg_str = msg.SerializeToString()
+    frame = struct.pack("!BBQ", 0x82, 127, len(msg_str)) + msg_str
+    return [msg, frame]
+
+
+def _current(table: pa.Table) -> List[Any]:
+    from streamlit.elements import arrow
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from streamlit.runtime.runtime_util import serialize_forward_msg_parts
+
+    msg = ForwardMsg()
+    arrow.marshall(msg.delta.new_element.arrow_data_frame, table)
+    parts = serialize_forward_msg_parts(msg)
+    # The IOStream holds on to the header and the parts until they're sent.
+    header = struct.pack("!BBQ", 0x82, 127, sum(len(part) for part in parts))
+    return [msg, header, *parts]
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(variant: str, rows: int) -> Tuple[float, float, int]:
+    from streamlit import config
+
+    # Allow for messages of any size.
+    config.set_option("server.maxMessageSize", 100_000)
+
+    table = pa.table({name: np.random.rand(rows) for name in "abcd"})
+    gc.collect()
+    baseline = _max_rss_mb()
+
+    start = time.perf_counter()
+    outputs = (_legacy if variant == "legacy" else _current)(table)
+    seconds = time.perf_counter() - start
+
+    return _max_rss_mb() - baseline, seconds, sum(len(o) for o in outputs[1:])
+
+
+@click.command()
+@click.option("--rows", default=5_000_000, help="Number of table rows.")
+def main(rows: int) -> None:
+    table_mb = rows * 4 * 8 / 1e6
+    click.secho(f"Table of 4 float64 columns, {table_mb:.0f} MB", bold=True)
+
+    ctx = multiprocessing.get_context("spawn")
+    for variant in ("legacy", "current"):
+        with ctx.Pool(1) as pool:
+            peak_mb, seconds, frame_bytes = pool.apply(_measure, (variant, rows))
+        click.echo(
+            f"  {variant:<8} peak +{peak_mb:7.0f} MB  {seconds * 1000:8.0f} ms  "
+            f"(frame {frame_bytes / 1e6:.0f} MB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure how long st.cache_data takes to hash large dataframes, arrays and
+pyarrow tables.
+
+"legacy" reproduces the previous hashing, which sampled dataframes with more
+than 100k rows and arrays with more than 1M elements (and so could return
+stale results for data that only differed outside the sample). "current" uses
+the real hashing code, which hashes all of the data. For read-only arrays and
+pyarrow tables, "current" also reports a repeated call, whose digest is reused.
+
+Usage: python scripts/benchmarks/cache_data_hashing.py [--rows N] [--runs N]
+"""
+
+import hashlib
+import statistics
+import time
+from typing import Any, Callable, List
+
+import click
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from streamlit.runtime.caching.cache_type import CacheType
+from streamlit.runtime.caching.hashing import update_hash
+
+
+def _legacy_hash(obj: Any) -> bytes:
+    hasher = hashlib.md5()
+    if isinstance(obj, pd.DataFrame):
+        if len(obj) >= 100_000:
+            obj = obj.sample(n=10_000, random_state=0)
+        hasher.update(b"%s" % pd.util.hash_pandas_object(obj).sum())
+    elif isinstance(obj, np.ndarray):
+        hasher.update(repr(obj.shape).encode())
+        if obj.size >= 1_000_000:
+            obj = np.random.RandomState(0).choice(obj.flat, size=100_000)
+        hasher.update(obj.tobytes())
+    else:
+        # The legacy hashing fell back to pickling anything else.
+        import pickle
+
+        hasher.update(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+    return hasher.digest()
+
+
+def _current_hash(obj: Any) -> bytes:
+    hasher = hashlib.md5()
+    update_hash(obj, hasher, CacheType.DATA)
+    return hasher.digest()
+
+
+def _time_ms(func: Callable[[], Any], runs: int) -> float:
+    times: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+@click.command()
+@click.option("--rows", default=5_000_000, help="Number of rows of the data.")
+@click.option("--runs", default=5, help="Number of timed runs per variant.")
+def main(rows: int, runs: int) -> None:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "int": rng.integers(0, 1000, rows),
+            "float": rng.random(rows),
+            "str": pd.Series(rng.integers(0, 1000, rows)).astype(str),
+        }
+    )
+    array = rng.random((rows, 4))
+    read_only_array = array.copy()
+    read_only_array.flags.writeable = False
+    table = pa.Table.from_pandas(df)
+
+    click.secho(f"Hashing {rows:,} rows ({runs} runs, median)", bold=True)
+    for name, obj in [
+        ("DataFrame", df),
+        ("ndarray", array),
+        ("read-only ndarray", read_only_array),
+        ("pyarrow.Table", table),
+    ]:
+        legacy = _time_ms(lambda: _legacy_hash(obj), runs)
+        # The first call fills the digest memo of immutable data.
+        first = _time_ms(lambda: _current_hash(obj), 1)
+        current = _time_ms(lambda: _current_hash(obj), runs)
+        click.echo(
+            f"  {name:<18} legacy {legacy:9.1f} ms   "
+            f"current {first:9.1f} ms first, {current:9.1f} ms repeated"
+        )
+
+
+if __name__ == "__main__":
+    main()
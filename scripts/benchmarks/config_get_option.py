@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the throughput of `config.get_option` from several threads, like
+script threads that read options for every message they send.
+
+"legacy" reproduces the previous implementation, which took the config lock
+(an RLock) for every call. "current" calls the real `config.get_option`, which
+doesn't take the lock.
+
+Usage: python scripts/benchmarks/config_get_option.py [--threads N] [--calls N]
+"""
+
+import threading
+import time
+from typing import Any, Callable, List
+
+import click
+
+from streamlit import config
+
+_KEYS = [
+    "server.enableWebsocketCompression",
+    "runner.magicEnabled",
+    "global.maxCachedMessageAge",
+    "server.maxUploadSize",
+]
+
+
+def _legacy_get_option(key: str) -> Any:
+    with config._config_lock:
+        config_options = config.get_config_options()
+
+        if key not in config_options:
+            raise RuntimeError('Config key "%s" not defined.' % key)
+        return config_options[key].value
+
+
+def _measure(get_option: Callable[[str], Any], threads: int, calls: int) -> float:
+    """Return the number of calls per second, over all threads."""
+    start_barrier = threading.Barrier(threads + 1)
+
+    def read_options() -> None:
+        start_barrier.wait()
+        for i in range(calls):
+            get_option(_KEYS[i % len(_KEYS)])
+
+    workers: List[threading.Thread] = [
+        threading.Thread(target=read_options) for _ in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return threads * calls / (time.perf_counter() - start)
+
+
+@click.command()
+@click.option("--threads", default=8, help="Number of reading threads.")
+@click.option("--calls", default=200_000, help="Number of calls per thread.")
+def main(threads: int, calls: int) -> None:
+    # Parse the config files before measuring.
+    config.get_config_options()
+
+    click.secho(f"get_option, {threads} threads x {calls:,} calls", bold=True)
+    for name, get_option in [
+        ("legacy", _legacy_get_option),
+        ("current", config.get_option),
+    ]:
+        for num_threads in sorted({1, threads}):
+            calls_per_sec = _measure(get_option, num_threads, calls)
+            click.echo(
+                f"  {name:<8} {num_threads:3d} threads  "
+                f"{calls_per_sec / 1e6:6.2f}M calls/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
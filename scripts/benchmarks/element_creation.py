@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure how long `st.dataframe` and `st.plotly_chart` take to create
+their elements and enqueue them.
+
+"copy" reproduces the previous path, where each element was marshalled into
+a standalone proto which was then copied into a new ForwardMsg. "direct" uses
+the real code path, which marshalls the element into the ForwardMsg that's
+enqueued. The times of the "api" rows are for the st commands themselves.
+
+Usage: python scripts/benchmarks/element_creation.py [--rows N] [--runs N]
+"""
+
+import statistics
+import threading
+import time
+from typing import Callable, List
+
+import click
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+import streamlit as st
+from streamlit import config
+from streamlit.elements import arrow, plotly_chart
+from streamlit.proto.Arrow_pb2 import Arrow as ArrowProto
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+from streamlit.runtime.scriptrunner import ScriptRunContext, add_script_run_ctx
+from streamlit.runtime.state import SafeSessionState, SessionState
+from streamlit.runtime.uploaded_file_manager import UploadedFileManager
+
+
+def _time_ms(func: Callable[[], object], runs: int) -> float:
+    times: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def _copy_dataframe(df: pd.DataFrame) -> ForwardMsg:
+    proto = ArrowProto()
+    arrow.marshall(proto, df)
+    msg = ForwardMsg()
+    msg.delta.new_element.arrow_data_frame.CopyFrom(proto)
+    return msg
+
+
+def _direct_dataframe(df: pd.DataFrame) -> ForwardMsg:
+    msg = ForwardMsg()
+    arrow.marshall(msg.delta.new_element.arrow_data_frame, df)
+    return msg
+
+
+def _copy_plotly_chart(fig: go.Figure) -> ForwardMsg:
+    proto = PlotlyChartProto()
+    plotly_chart.marshall(proto, fig, False, "streamlit", "streamlit")
+    msg = ForwardMsg()
+    msg.delta.new_element.plotly_chart.CopyFrom(proto)
+    return msg
+
+
+def _direct_plotly_chart(fig: go.Figure) -> ForwardMsg:
+    msg = ForwardMsg()
+    plotly_chart.marshall(
+        msg.delta.new_element.plotly_chart, fig, False, "streamlit", "streamlit"
+    )
+    return msg
+
+
+@click.command()
+@click.option("--rows", default=200_000, help="Number of rows of data.")
+@click.option("--runs", default=20, help="Number of runs to take the median of.")
+def main(rows: int, runs: int) -> None:
+    # Allow for messages of any size.
+    config.set_option("server.maxMessageSize", 100_000)
+
+    queue: List[ForwardMsg] = []
+    ctx = ScriptRunContext(
+        session_id="benchmark",
+        _enqueue=queue.append,
+        query_string="",
+        session_state=SafeSessionState(SessionState()),
+        uploaded_file_mgr=UploadedFileManager(),
+        page_script_hash="",
+        user_info={},
+    )
+    add_script_run_ctx(threading.current_thread(), ctx)
+
+    df = pd.DataFrame(np.random.rand(rows, 10))
+    fig = go.Figure(go.Scatter(x=np.arange(rows), y=np.random.rand(rows)))
+
+    def run_api(command: Callable[[], object]) -> Callable[[], None]:
+        def run() -> None:
+            command()
+            queue.clear()
+
+        return run
+
+    click.secho(f"{rows} rows, median of {runs} runs", bold=True)
+    for name, copy, direct, api in (
+        (
+            "st.dataframe",
+            lambda: _copy_dataframe(df),
+            lambda: _direct_dataframe(df),
+            run_api(lambda: st.dataframe(df)),
+        ),
+        (
+            "st.plotly_chart",
+            lambda: _copy_plotly_chart(fig),
+            lambda: _direct_plotly_chart(fig),
+            run_api(lambda: st.plotly_chart(fig)),
+        ),
+    ):
+        click.echo(name)
+        for variant, func in (("copy", copy), ("direct", direct), ("api", api)):
+            click.echo(f"  {variant:<8} {_time_ms(func, runs):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
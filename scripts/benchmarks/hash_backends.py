@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the throughput of the hash algorithms supported by
+`global.hashAlgorithm` on DataFrame-sized ForwardMsg payloads.
+
+Usage: python scripts/benchmarks/hash_backends.py [--rows N] [--repeat N]
+"""
+
+import timeit
+from typing import List, Tuple
+
+import click
+import numpy as np
+import pandas as pd
+
+from streamlit import hash_util
+from streamlit.elements import arrow
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.runtime import forward_msg_cache
+
+
+def _create_payloads(rows: int) -> List[Tuple[str, bytes]]:
+    df = pd.DataFrame(
+        {
+            "ints": np.arange(rows),
+            "floats": np.random.rand(rows),
+            "strings": [f"row {i}" for i in range(rows)],
+        }
+    )
+
+    msg = ForwardMsg()
+    arrow.marshall(msg.delta.new_element.arrow_data_frame, df)
+    forward_msg_payload = forward_msg_cache._serialize_payload(msg)
+
+    return [
+        ("arrow table", msg.delta.new_element.arrow_data_frame.data),
+        ("ForwardMsg", forward_msg_payload),
+    ]
+
+
+def _algorithms() -> List[str]:
+    algorithms = ["md5", "blake2b"]
+    if hash_util._get_xxh3_factory() is not None:
+        algorithms.append("xxh3")
+    else:
+        click.secho("xxhash is not installed; skipping xxh3.", fg="yellow")
+    return algorithms
+
+
+@click.command()
+@click.option("--rows", default=1_000_000, help="Number of DataFrame rows.")
+@click.option("--repeat", default=10, help="Number of times to hash each payload.")
+def main(rows: int, repeat: int) -> None:
+    algorithms = _algorithms()
+    for name, payload in _create_payloads(rows):
+        click.secho(f"\n{name}: {len(payload) / 1e6:.1f} MB", bold=True)
+        for algorithm in algorithms:
+            factory = hash_util.get_hasher_factory(algorithm)
+
+            def run() -> None:
+                hasher = factory()
+                hasher.update(payload)
+                hasher.digest()
+
+            seconds = min(timeit.repeat(run, number=1, repeat=repeat))
+            throughput = len(payload) / seconds / 1e9
+            click.echo(
+                f"  {algorithm:<8} {seconds * 1000:8.2f} ms  {throughput:6.2f} GB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
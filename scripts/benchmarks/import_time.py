@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the cold-start time and memory of `import streamlit` and of
+`streamlit run` on a hello-world app.
+
+"import" runs `import streamlit` in fresh processes, and reports the median
+import time, the peak RSS, and which heavy third-party modules were loaded.
+
+"run" starts `streamlit run` on an app that only calls st.write, connects to
+it like a browser would, and reports the time until the first script run
+finished, and the server's RSS after it. (RSS is read from /proc, so this
+part only works on Linux.)
+
+Usage: python scripts/benchmarks/import_time.py [--runs N] [--skip-run]
+"""
+
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+import click
+
+# Modules that should only be imported by apps that use them.
+_HEAVY_MODULES = [
+    "altair",
+    "matplotlib",
+    "numpy",
+    "pandas",
+    "PIL",
+    "plotly",
+    "pyarrow",
+    "pympler",
+    "requests",
+]
+
+_IMPORT_SCRIPT = f"""
+import json, resource, sys, time
+start = time.perf_counter()
+import streamlit
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    # ru_maxrss is in kilobytes on Linux.
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy_modules": [m for m in {_HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+_HELLO_WORLD_APP = """
+import streamlit as st
+
+st.write("Hello, world!")
+"""
+
+
+def _measure_import() -> Dict[str, Any]:
+    output = subprocess.check_output([sys.executable, "-c", _IMPORT_SCRIPT])
+    return json.loads(output)
+
+
+def _get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def _get_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmRSS not found")
+
+
+async def _wait_for_first_run(
+    proc: "subprocess.Popen[bytes]", port: int, timeout: float
+) -> None:
+    from tornado import websocket
+
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            ws = await websocket.websocket_connect(
+                f"ws://localhost:{port}/_stcore/stream"
+            )
+            break
+        except OSError:
+            if proc.poll() is not None:
+                raise RuntimeError("`streamlit run` exited")
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.01)
+
+    # Ask for a script run, as the browser does when it connects.
+    back_msg = BackMsg()
+    back_msg.rerun_script.SetInParent()
+    await ws.write_message(back_msg.SerializeToString(), binary=True)
+
+    while True:
+        data = await ws.read_message()
+        if data is None:
+            raise RuntimeError("The server closed the connection")
+        msg = ForwardMsg()
+        msg.ParseFromString(data)
+        if msg.WhichOneof("type") == "script_finished":
+            ws.close()
+            return
+
+
+def _measure_run(app_path: str, timeout: float) -> Tuple[float, float]:
+    port = _get_free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "streamlit",
+            "run",
+            app_path,
+            "--server.headless=true",
+            # Otherwise the port can't be set when Streamlit is installed
+            # in editable mode.
+            "--global.developmentMode=false",
+            f"--server.port={port}",
+            "--browser.gatherUsageStats=false",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(_wait_for_first_run(proc, port, timeout))
+        seconds = time.perf_counter() - start
+        return seconds, _get_rss_mb(proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def _summarize(name: str, seconds: List[float], rss_mb: List[float]) -> None:
+    click.echo(
+        f"  {name:<8} median {statistics.median(seconds) * 1000:7.0f} ms  "
+        f"min {min(seconds) * 1000:7.0f} ms  "
+        f"RSS {statistics.median(rss_mb):6.1f} MB"
+    )
+
+
+@click.command()
+@click.option("--runs", default=10, help="Number of fresh processes to measure.")
+@click.option("--skip-run", is_flag=True, help="Only measure `import streamlit`.")
+@click.option("--timeout", default=60.0, help="Seconds to wait for `streamlit run`.")
+def main(runs: int, skip_run: bool, timeout: float) -> None:
+    click.secho(f"import streamlit ({runs} runs)", bold=True)
+    results = [_measure_import() for _ in range(runs)]
+    _summarize(
+        "import",
+        [r["seconds"] for r in results],
+        [r["max_rss_mb"] for r in results],
+    )
+    heavy_modules = results[0]["heavy_modules"]
+    click.echo(f"  heavy modules loaded: {', '.join(heavy_modules) or 'none'}")
+
+    if skip_run:
+        return
+
+    click.secho(f"streamlit run, until the first script run ({runs} runs)", bold=True)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app_path = os.path.join(tmpdir, "hello_world.py")
+        with open(app_path, "w") as f:
+            f.write(_HELLO_WORLD_APP)
+
+        measurements = [_measure_run(app_path, timeout) for _ in range(runs)]
+    _summarize("run", [m[0] for m in measurements], [m[1] for m in measurements])
+
+
+if __name__ == "__main__":
+    main()
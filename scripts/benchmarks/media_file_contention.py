@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure how long sessions wait to add small media files to the
+MediaFileManager while other sessions are adding large ones.
+
+Each of N threads acts as a session that adds small images; one more thread
+keeps adding large videos. The latency of the small adds is reported.
+
+Usage: python scripts/benchmarks/media_file_contention.py [--threads N]
+    [--adds N] [--large-mb N] [--storage memory|disk]
+"""
+
+import os
+import statistics
+import threading
+import time
+from typing import List
+from unittest import mock
+
+import click
+
+from streamlit.runtime import media_file_manager
+from streamlit.runtime.disk_media_file_storage import DiskMediaFileStorage
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.media_file_storage import MediaFileStorage
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+SMALL_FILE_BYTES = 50 * 1024
+
+
+def _create_storage(storage_type: str) -> MediaFileStorage:
+    if storage_type == "disk":
+        return DiskMediaFileStorage("/media")
+    return MemoryMediaFileStorage("/media")
+
+
+@click.command()
+@click.option("--threads", default=8, help="Number of sessions adding small files.")
+@click.option("--adds", default=200, help="Number of small files each session adds.")
+@click.option("--large-mb", default=100, help="Size of the large files, in MB.")
+@click.option(
+    "--storage",
+    type=click.Choice(["memory", "disk"]),
+    default="memory",
+    help="The MediaFileStorage to add files to.",
+)
+def main(threads: int, adds: int, large_mb: int, storage: str) -> None:
+    manager = MediaFileManager(_create_storage(storage))
+    session_ids = threading.local()
+    latencies: List[float] = []
+    latencies_lock = threading.Lock()
+    done = threading.Event()
+
+    def add_small_files(session: int) -> None:
+        session_ids.value = f"session-{session}"
+        for i in range(adds):
+            data = os.urandom(SMALL_FILE_BYTES)
+            start = time.perf_counter()
+            manager.add(data, "image/png", f"{i}")
+            elapsed = time.perf_counter() - start
+            with latencies_lock:
+                latencies.append(elapsed)
+
+    large_data = os.urandom(large_mb * 1024 * 1024)
+    large_started = threading.Event()
+
+    def add_large_files() -> None:
+        session_ids.value = "large-session"
+        i = 0
+        while not done.is_set():
+            # Each large file gets a unique name, so it's always hashed and
+            # stored.
+            large_started.set()
+            manager.add(large_data, "video/mp4", "0", file_name=f"{i}.mp4")
+            manager.clear_session_refs("large-session")
+            manager.remove_orphaned_files()
+            i += 1
+
+    with mock.patch.object(
+        media_file_manager, "_get_session_id", lambda: session_ids.value
+    ):
+        large_thread = threading.Thread(target=add_large_files)
+        large_thread.start()
+        large_started.wait()
+        small_threads = [
+            threading.Thread(target=add_small_files, args=(session,))
+            for session in range(threads)
+        ]
+        start = time.perf_counter()
+        for thread in small_threads:
+            thread.start()
+        for thread in small_threads:
+            thread.join()
+        total = time.perf_counter() - start
+        done.set()
+        large_thread.join()
+
+    latencies.sort()
+    click.echo(
+        f"{len(latencies)} small adds from {threads} sessions in {total:.2f}s "
+        f"({storage} storage, {large_mb} MB large files)"
+    )
+    for name, value in [
+        ("p50", statistics.median(latencies)),
+        ("p99", latencies[int(len(latencies) * 0.99) - 1]),
+        ("max", latencies[-1]),
+    ]:
+        click.echo(f"  {name}: {value * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure how long it takes to rerun an app with many local modules after
+one of them changes: the LocalSourcesWatcher unloads modules, the app imports
+them again, and the watcher examines the newly imported modules.
+
+The app imports every module. Each module imports the one before it, so
+changing module `i` affects `i` and the modules after it.
+
+"legacy" reproduces the previous implementation, which unloaded every watched
+module on any change. "current" calls the real `on_file_changed`, which only
+unloads the changed module and the modules that refer to it.
+
+Usage: python scripts/benchmarks/source_watcher_rerun.py [--modules N] [--reruns N]
+"""
+
+import importlib
+import os
+import sys
+import tempfile
+import time
+from typing import Callable
+from unittest.mock import MagicMock, patch
+
+import click
+
+from streamlit.watcher import local_sources_watcher
+
+_PREFIX = "bench_module_"
+
+
+def _write_modules(dirname: str, num_modules: int) -> None:
+    for i in range(num_modules):
+        with open(os.path.join(dirname, f"{_PREFIX}{i}.py"), "w") as f:
+            if i > 0:
+                f.write(f"from {_PREFIX}{i - 1} import VALUE as _PREVIOUS\n")
+            # Give each module some code to compile and execute.
+            f.write(f"VALUE = {i}\n")
+            for j in range(50):
+                f.write(f"def function_{j}(x):\n    return x + {j}\n")
+
+
+def _import_all(num_modules: int) -> None:
+    for i in range(num_modules):
+        importlib.import_module(f"{_PREFIX}{i}")
+
+
+def _legacy_on_file_changed(
+    lsw: local_sources_watcher.LocalSourcesWatcher, filepath: str
+) -> None:
+    for wm in lsw._watched_modules.values():
+        if wm.module_name is not None and wm.module_name in sys.modules:
+            del sys.modules[wm.module_name]
+
+
+def _measure(
+    on_file_changed: Callable[[local_sources_watcher.LocalSourcesWatcher, str], None],
+    dirname: str,
+    num_modules: int,
+    reruns: int,
+) -> float:
+    """Return the mean time of a rerun, in seconds."""
+    lsw = local_sources_watcher.LocalSourcesWatcher(
+        os.path.join(dirname, "streamlit_app.py")
+    )
+    _import_all(num_modules)
+    lsw.update_watched_modules()
+
+    # Change the last module, as a developer editing a page would.
+    changed_path = os.path.join(dirname, f"{_PREFIX}{num_modules - 1}.py")
+    start = time.perf_counter()
+    for _ in range(reruns):
+        on_file_changed(lsw, changed_path)
+        _import_all(num_modules)
+        lsw.update_watched_modules()
+    elapsed = time.perf_counter() - start
+
+    lsw.close()
+    for name in [name for name in sys.modules if name.startswith(_PREFIX)]:
+        del sys.modules[name]
+    return elapsed / reruns
+
+
+@click.command()
+@click.option("--modules", default=300, help="Number of local modules.")
+@click.option("--reruns", default=20, help="Number of reruns to measure.")
+def main(modules: int, reruns: int) -> None:
+    with tempfile.TemporaryDirectory() as dirname, patch(
+        "streamlit.watcher.local_sources_watcher.PathWatcher", MagicMock()
+    ), patch("streamlit.source_util._cached_pages", new=None):
+        _write_modules(dirname, modules)
+        sys.path.insert(0, dirname)
+        # Don't let cached bytecode hide the cost of reimporting.
+        sys.dont_write_bytecode = True
+
+        click.secho(f"Rerun after a change, {modules} local modules", bold=True)
+        for name, on_file_changed in [
+            ("legacy", _legacy_on_file_changed),
+            ("current", lambda lsw, path: lsw.on_file_changed(path)),
+        ]:
+            seconds = _measure(on_file_changed, dirname, modules, reruns)
+            click.echo(f"  {name:<8} {seconds * 1000:8.2f} ms/rerun")
+
+        sys.path.remove(dirname)
+
+
+if __name__ == "__main__":
+    main()